@@ -325,7 +325,7 @@ def prompt_integrations(
             value="caching",
         ),
         questionary.Choice(
-            "Rate limiting (slowapi) — optional Redis storage",
+            "Rate limiting (GCRA) — optional Redis storage",
             value="rate_limiting",
         ),
         questionary.Choice(
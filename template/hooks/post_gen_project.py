@@ -90,6 +90,7 @@ if not enable_ai_agent:
     # Remove entire agents directory when AI is disabled
     remove_dir(os.path.join(backend_app, "agents"))
     remove_file(os.path.join(backend_app, "api", "routes", "v1", "agent.py"))
+    remove_file(os.path.join(os.getcwd(), "backend", "scripts", "benchmark_agent_setup.py"))
 else:
     # Remove framework-specific files based on selection
     if not use_pydantic_ai:
@@ -102,6 +103,10 @@ else:
         remove_file(os.path.join(backend_app, "agents", "crewai_assistant.py"))
     if not use_deepagents:
         remove_file(os.path.join(backend_app, "agents", "deepagents_assistant.py"))
+    if not (use_pydantic_ai or use_langchain or use_langgraph):
+        remove_file(os.path.join(backend_app, "agents", "completion_cache.py"))
+        remove_file(os.path.join(backend_app, "agents", "registry.py"))
+        remove_file(os.path.join(os.getcwd(), "backend", "scripts", "benchmark_agent_setup.py"))
 
 # --- Example CRUD files ---
 if not include_example_crud or not use_database:
@@ -117,6 +122,7 @@ if not enable_conversation_persistence:
     remove_file(os.path.join(backend_app, "db", "models", "conversation.py"))
     remove_file(os.path.join(backend_app, "repositories", "conversation.py"))
     remove_file(os.path.join(backend_app, "services", "conversation.py"))
+    remove_file(os.path.join(backend_app, "services", "message_buffer.py"))
     remove_file(os.path.join(backend_app, "schemas", "conversation.py"))
 
 # --- Webhook files ---
@@ -126,6 +132,9 @@ if not enable_webhooks or not use_database:
     remove_file(os.path.join(backend_app, "repositories", "webhook.py"))
     remove_file(os.path.join(backend_app, "services", "webhook.py"))
     remove_file(os.path.join(backend_app, "schemas", "webhook.py"))
+    remove_file(os.path.join(backend_app, "clients", "webhook.py"))
+    remove_file(os.path.join(backend_app, "services", "webhook_queue.py"))
+    remove_file(os.path.join(backend_app, "core", "webhook_index.py"))
 
 # --- Session management files ---
 if not enable_session_management or not use_jwt:
@@ -135,6 +144,9 @@ if not enable_session_management or not use_jwt:
     remove_file(os.path.join(backend_app, "services", "session.py"))
     remove_file(os.path.join(backend_app, "schemas", "session.py"))
 
+if not enable_session_management or not use_jwt or not enable_redis or use_sqlite:
+    remove_file(os.path.join(backend_app, "core", "session_store.py"))
+
 # --- WebSocket files ---
 if not enable_websockets:
     remove_file(os.path.join(backend_app, "api", "routes", "v1", "ws.py"))
@@ -172,6 +184,7 @@ if not use_jwt:
     remove_file(os.path.join(backend_app, "services", "user.py"))
     remove_file(os.path.join(backend_app, "schemas", "user.py"))
     remove_file(os.path.join(backend_app, "schemas", "token.py"))
+    remove_file(os.path.join(backend_app, "core", "user_cache.py"))
 
 # --- Logfire setup file (when logfire is disabled) ---
 if not enable_logfire:
@@ -201,6 +214,10 @@ else:
         remove_file(os.path.join(worker_dir, "tasks", "taskiq_examples.py"))
     if not use_arq:
         remove_file(os.path.join(worker_dir, "arq_app.py"))
+    # Webhook delivery tasks exist for Celery, and for Taskiq with an async database
+    webhook_tasks = use_celery or (use_taskiq and not use_sqlite)
+    if not (enable_webhooks and use_database and webhook_tasks):
+        remove_file(os.path.join(worker_dir, "tasks", "webhooks.py"))
 
 
 # --- Cleanup empty directories ---
@@ -9,6 +9,8 @@ from sqlalchemy.orm import DeclarativeBase
 from sqladmin import Admin, ModelView
 {%- if cookiecutter.admin_require_auth %}
 from sqladmin.authentication import AuthenticationBackend
+{%- endif %}
+{%- if cookiecutter.admin_require_auth or cookiecutter.use_jwt %}
 from starlette.requests import Request
 {%- endif %}
 
@@ -16,6 +18,9 @@ from app.core.config import settings
 {%- if cookiecutter.admin_require_auth %}
 from app.core.security import verify_password
 {%- endif %}
+{%- if cookiecutter.use_jwt %}
+from app.core.user_cache import user_cache
+{%- endif %}
 from app.db.base import Base
 from app.db.models.user import User
 {%- if cookiecutter.enable_session_management %}
@@ -174,6 +179,7 @@ def create_model_admin(
     can_edit: bool = True,
     can_delete: bool = True,
     can_view_details: bool = True,
+    view_class: type[ModelView] = ModelView,
 ) -> type[ModelView]:
     """Dynamically create a ModelView class for a SQLAlchemy model.
 
@@ -190,6 +196,7 @@ def create_model_admin(
         can_edit: Allow editing records.
         can_delete: Allow deleting records.
         can_view_details: Allow viewing record details.
+        view_class: ModelView subclass to derive the view from, for custom hooks.
 
     Returns:
         A dynamically created ModelView subclass.
@@ -253,7 +260,7 @@ def create_model_admin(
     class_name = f"{model_name}Admin"
     admin_class = types.new_class(
         class_name,
-        (ModelView,),
+        (view_class,),
         {"model": model},  # Pass model to metaclass
         exec_body,
     )
@@ -300,6 +307,27 @@ def register_models_auto(
     return registered_views
 
 
+{%- if cookiecutter.use_jwt %}
+
+
+class UserModelView(ModelView):
+    """Drops users edited or deleted in the admin panel from the user cache.
+
+    SQLAdmin commits through its own session, so the ``UserService`` hooks
+    never see these changes.
+    """
+
+    async def after_model_change(
+        self, data: dict[str, Any], model: Any, is_created: bool, request: Request
+    ) -> None:
+        if not is_created:
+            {% if not cookiecutter.use_sqlite %}await {% endif %}user_cache.invalidate(model.id)
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        {% if not cookiecutter.use_sqlite %}await {% endif %}user_cache.invalidate(model.id)
+{%- endif %}
+
+
 # SQLAdmin requires a synchronous engine
 _sync_engine: Engine | None = None
 
@@ -379,6 +407,9 @@ CUSTOM_MODEL_CONFIGS: dict[type, dict[str, Any]] = {
     User: {
         "icon": "fa-solid fa-user",
         "form_excluded_columns": [User.hashed_password, User.created_at, User.updated_at],
+{%- if cookiecutter.use_jwt %}
+        "view_class": UserModelView,
+{%- endif %}
     },
 {%- if cookiecutter.enable_session_management %}
     Session: {
@@ -22,6 +22,7 @@ from pydantic_ai.providers.openai import OpenAIProvider
 {%- endif %}
 {%- if cookiecutter.use_anthropic %}
 from pydantic_ai.models.anthropic import AnthropicModel
+from pydantic_ai.providers.anthropic import AnthropicProvider
 {%- endif %}
 {%- if cookiecutter.use_openrouter %}
 from pydantic_ai.models.openrouter import OpenRouterModel
@@ -29,7 +30,9 @@ from pydantic_ai.providers.openrouter import OpenRouterProvider
 {%- endif %}
 from pydantic_ai.settings import ModelSettings
 
+from app.agents.completion_cache import CachedCompletion, completion_cache, completion_key
 from app.agents.prompts import DEFAULT_SYSTEM_PROMPT
+from app.agents.registry import agent_registry
 from app.agents.tools import get_current_datetime
 from app.core.config import settings
 
@@ -70,19 +73,28 @@ class AssistantAgent:
 {%- if cookiecutter.use_openai %}
         model = OpenAIChatModel(
             self.model_name,
-            provider=OpenAIProvider(api_key=settings.OPENAI_API_KEY),
+            provider=OpenAIProvider(
+                api_key=settings.OPENAI_API_KEY,
+                http_client=agent_registry.http_client,
+            ),
         )
 {%- endif %}
 {%- if cookiecutter.use_anthropic %}
         model = AnthropicModel(
             self.model_name,
-            api_key=settings.ANTHROPIC_API_KEY,
+            provider=AnthropicProvider(
+                api_key=settings.ANTHROPIC_API_KEY,
+                http_client=agent_registry.http_client,
+            ),
         )
 {%- endif %}
 {%- if cookiecutter.use_openrouter %}
         model = OpenRouterModel(
             self.model_name,
-            provider=OpenRouterProvider(api_key=settings.OPENROUTER_API_KEY),
+            provider=OpenRouterProvider(
+                api_key=settings.OPENROUTER_API_KEY,
+                http_client=agent_registry.http_client,
+            ),
         )
 {%- endif %}
 
@@ -122,6 +134,9 @@ class AssistantAgent:
     ) -> tuple[str, list[Any], Deps]:
         """Run agent and return the output along with tool call events.
 
+        With ``AGENT_CACHE_ENABLED``, repeated prompts are answered from the
+        completion cache. Runs that call tools are not cached.
+
         Args:
             user_input: User's message.
             history: Conversation history as list of {"role": "...", "content": "..."}.
@@ -142,6 +157,18 @@ class AssistantAgent:
 
         agent_deps = deps if deps is not None else Deps()
 
+        cache_key = completion_key(
+            model_name=self.model_name,
+            temperature=self.temperature,
+            system_prompt=self.system_prompt,
+            history=history,
+            user_input=user_input,
+        )
+        cached = await completion_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Agent run served from the completion cache")
+            return cached.output, [], agent_deps
+
         logger.info(f"Running agent with user input: {user_input[:100]}...")
         result = await self.agent.run(user_input, deps=agent_deps, message_history=model_history)
 
@@ -152,6 +179,9 @@ class AssistantAgent:
                     if hasattr(part, "tool_name"):
                         tool_events.append(part)
 
+        if not tool_events:
+            await completion_cache.set(cache_key, CachedCompletion(result.output))
+
         logger.info(f"Agent run complete. Output length: {len(result.output)} chars")
 
         return result.output, tool_events, agent_deps
@@ -193,13 +223,30 @@ class AssistantAgent:
                 yield event
 
 
-def get_agent() -> AssistantAgent:
-    """Factory function to create an AssistantAgent.
+def get_agent(
+    model_name: str | None = None,
+    temperature: float | None = None,
+    system_prompt: str | None = None,
+) -> AssistantAgent:
+    """Get the shared AssistantAgent for a configuration.
+
+    Agents keep no state between runs, so one instance (and its model client)
+    per configuration is reused across requests.
+
+    Args:
+        model_name: Model to use. Defaults to AI_MODEL.
+        temperature: Sampling temperature. Defaults to AI_TEMPERATURE.
+        system_prompt: System prompt. Defaults to DEFAULT_SYSTEM_PROMPT.
 
     Returns:
         Configured AssistantAgent instance.
     """
-    return AssistantAgent()
+    config = (
+        model_name or settings.AI_MODEL,
+        temperature or settings.AI_TEMPERATURE,
+        system_prompt or DEFAULT_SYSTEM_PROMPT,
+    )
+    return agent_registry.get(("pydantic_ai", *config), lambda: AssistantAgent(*config))
 
 
 async def run_agent(
@@ -0,0 +1,197 @@
+{%- if cookiecutter.enable_ai_agent and (cookiecutter.use_pydantic_ai or cookiecutter.use_langchain or cookiecutter.use_langgraph) %}
+"""Cache of agent completions for repeated prompts.
+
+With ``AGENT_CACHE_ENABLED``, a turn is answered from the cache when an
+earlier turn had the same model, temperature, system prompt, history and
+message. The key is a hash of those inputs with runs of whitespace collapsed,
+so "What is X?" and " What is  X?" share an entry.
+
+Each entry holds the reply and the WebSocket events that streamed it, so a
+hit can replay the same event sequence. Turns that call tools are never
+stored, since tool results (such as the current time) change between calls.
+{%- if cookiecutter.enable_redis %}
+
+There are two tiers: an in-process LRU with a short TTL
+(``AGENT_CACHE_LOCAL_TTL``) in front of Redis (``AGENT_CACHE_TTL``), which
+shares entries between worker processes.
+{%- else %}
+
+Entries live in an in-process LRU and expire after ``AGENT_CACHE_LOCAL_TTL``
+seconds.
+{%- endif %}
+"""
+
+import hashlib
+import json
+{%- if cookiecutter.enable_redis %}
+import logging
+{%- endif %}
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+{%- if cookiecutter.enable_redis %}
+
+from app.clients.redis import RedisClient
+{%- endif %}
+from app.core.config import settings
+{%- if cookiecutter.enable_redis %}
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "{{ cookiecutter.project_slug }}:completion"
+{%- endif %}
+
+# WebSocket events that mean the turn called a tool
+TOOL_EVENT_TYPES = frozenset({"tool_call", "tool_result"})
+
+
+@dataclass
+class CachedCompletion:
+    """An agent reply and the events it was streamed as."""
+
+    output: str
+    events: list[tuple[str, Any]] = field(default_factory=list)
+
+    @property
+    def calls_tools(self) -> bool:
+        """Whether any of the events is a tool call or result."""
+        return any(event_type in TOOL_EVENT_TYPES for event_type, _ in self.events)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def completion_key(
+    *,
+    model_name: str,
+    temperature: float,
+    system_prompt: str,
+    history: Iterable[dict[str, str]] | None,
+    user_input: str,
+) -> str:
+    """Hash the inputs that determine an agent reply."""
+    payload = json.dumps(
+        [
+            model_name,
+            temperature,
+            _normalize(system_prompt),
+            [[message["role"], _normalize(message["content"])] for message in history or ()],
+            _normalize(user_input),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CompletionCache:
+    """{% if cookiecutter.enable_redis %}Two-tier{% else %}In-process{% endif %} cache of agent completions keyed by ``completion_key``.
+
+    Reads return ``None`` and writes do nothing unless ``AGENT_CACHE_ENABLED``
+    is set.
+
+    Usage:
+        key = completion_key(model_name=..., history=history, user_input=message, ...)
+        cached = await completion_cache.get(key)
+        if cached is None:
+            output = await run_agent(...)
+            await completion_cache.set(key, CachedCompletion(output))
+    """
+
+    def __init__(
+        self,
+        local_ttl: float | None = None,
+        maxsize: int | None = None,
+{%- if cookiecutter.enable_redis %}
+        ttl: int | None = None,
+{%- endif %}
+    ) -> None:
+        self.local_ttl = local_ttl if local_ttl is not None else settings.AGENT_CACHE_LOCAL_TTL
+        self.maxsize = maxsize if maxsize is not None else settings.AGENT_CACHE_MAX_SIZE
+{%- if cookiecutter.enable_redis %}
+        self.ttl = ttl if ttl is not None else settings.AGENT_CACHE_TTL
+        self._redis: RedisClient | None = None
+{%- endif %}
+        self._entries: OrderedDict[str, tuple[float, CachedCompletion]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether completions are cached (``AGENT_CACHE_ENABLED``)."""
+        return settings.AGENT_CACHE_ENABLED
+{%- if cookiecutter.enable_redis %}
+
+    def setup(self, redis: RedisClient | None) -> None:
+        """Use ``redis`` as the shared second tier (``None`` for local only)."""
+        self._redis = redis
+{%- endif %}
+
+    async def get(self, key: str) -> CachedCompletion | None:
+        """Cached completion, or ``None`` on a miss."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            return entry[1]
+{%- if cookiecutter.enable_redis %}
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(f"{KEY_PREFIX}:{key}")
+        except Exception as e:
+            logger.warning(f"Completion cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        completion = _load(raw)
+        self._store(key, completion)
+        return completion
+{%- else %}
+        return None
+{%- endif %}
+
+    async def set(self, key: str, completion: CachedCompletion) -> None:
+        """Cache ``completion`` under ``key``."""
+        if not self.enabled:
+            return
+        self._store(key, completion)
+{%- if cookiecutter.enable_redis %}
+        if self._redis is not None:
+            try:
+                await self._redis.set(f"{KEY_PREFIX}:{key}", _dump(completion), ttl=self.ttl)
+            except Exception as e:
+                logger.warning(f"Completion cache write failed: {e}")
+{%- endif %}
+
+    def clear(self) -> None:
+        """Drop all local entries."""
+        self._entries.clear()
+
+    def _store(self, key: str, completion: CachedCompletion) -> None:
+        self._entries[key] = (time.monotonic() + self.local_ttl, completion)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+{%- if cookiecutter.enable_redis %}
+
+
+def _dump(completion: CachedCompletion) -> str:
+    return json.dumps({"output": completion.output, "events": completion.events})
+
+
+def _load(raw: str) -> CachedCompletion:
+    data = json.loads(raw)
+    return CachedCompletion(
+        output=data["output"],
+        events=[(event_type, event_data) for event_type, event_data in data["events"]],
+    )
+{%- endif %}
+
+
+completion_cache = CompletionCache()
+{%- else %}
+"""Agent completion cache - not configured."""
+{%- endif %}
@@ -4,13 +4,19 @@
 A multi-agent orchestration framework using CrewAI.
 Enables teams of AI agents to work together on complex tasks.
 Uses CrewAI's event system for real-time streaming to WebSocket.
+
+Kickoffs block, so they run on a shared thread pool of
+``AGENT_CREW_CONCURRENCY`` workers. Built crews are cached per configuration
+and each kickoff runs on a copy, so concurrent turns never share task outputs.
 """
 
 import asyncio
+import contextlib
 import logging
 import os
-from queue import Empty, Queue
-from threading import Thread
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any, TypedDict
 
 # Disable CrewAI interactive prompts for server use
@@ -20,7 +26,6 @@ from crewai import Agent, Crew, Process, Task
 from crewai.events import (
     crewai_event_bus,
     CrewKickoffStartedEvent,
-    CrewKickoffCompletedEvent,
     CrewKickoffFailedEvent,
     AgentExecutionStartedEvent,
     AgentExecutionCompletedEvent,
@@ -84,44 +89,106 @@ class CrewContext(TypedDict, total=False):
     metadata: dict[str, Any]
 
 
-class CrewEventQueueListener:
-    """Event listener that sends CrewAI events to a queue for WebSocket streaming.
+def _put_threadsafe(
+    loop: asyncio.AbstractEventLoop,
+    queue: asyncio.Queue[dict[str, Any] | None],
+    event: dict[str, Any] | None,
+) -> None:
+    """Put ``event`` on an asyncio queue from a worker thread.
+
+    Does nothing if the stream's event loop has already closed.
+    """
+    with contextlib.suppress(RuntimeError):
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+
+def _crew_ids(crew: Crew) -> frozenset[str]:
+    """Ids of a crew and of the agents and tasks it runs."""
+    return frozenset({
+        str(crew.id),
+        *(str(agent.id) for agent in crew.agents),
+        *(str(task.id) for task in crew.tasks),
+    })
+
+
+def _event_ids(event: Any) -> set[str]:
+    """Ids of the crew, agent and task a CrewAI event was emitted for."""
+    ids = {
+        str(entity.id)
+        for entity in (
+            getattr(event, "crew", None),
+            getattr(event, "agent", None),
+            getattr(event, "task", None),
+        )
+        if getattr(entity, "id", None) is not None
+    }
+    for attr in ("agent_id", "task_id"):
+        if value := getattr(event, attr, None):
+            ids.add(str(value))
+    return ids
+
 
-    Registers handlers with the global crewai_event_bus to capture all events
-    and forward them to a queue for async WebSocket streaming.
+class CrewEventQueueListener:
+    """Event listener that forwards CrewAI events to the streams in progress.
+
+    Registers handlers with the global crewai_event_bus once per process. Each
+    stream subscribes its queue together with the crew copy it kicked off, and
+    an event only reaches the queues whose crew, agents or tasks emitted it, so
+    concurrent kickoffs never see each other's events. The bus calls the
+    handlers from its worker threads, so events are handed over with
+    ``loop.call_soon_threadsafe``; consumers wake as soon as an event arrives
+    instead of polling.
     """
 
-    def __init__(self, event_queue: Queue):
-        self._event_queue = event_queue
+    def __init__(self):
+        self._subscribers: dict[
+            asyncio.Queue[dict[str, Any] | None],
+            tuple[asyncio.AbstractEventLoop, frozenset[str]],
+        ] = {}
+        self._lock = threading.Lock()
         self._handlers: list[Any] = []
         self._register_handlers()
 
+    def subscribe(self, queue: asyncio.Queue[dict[str, Any] | None], crew: Crew) -> None:
+        """Start forwarding the events of ``crew`` to ``queue`` on the running event loop."""
+        with self._lock:
+            self._subscribers[queue] = (asyncio.get_running_loop(), _crew_ids(crew))
+
+    def unsubscribe(self, queue: asyncio.Queue[dict[str, Any] | None]) -> None:
+        """Stop forwarding events to ``queue``."""
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def _put(self, source_event: Any, event: dict[str, Any]) -> None:
+        ids = _event_ids(source_event)
+        with self._lock:
+            subscribers = [
+                (queue, loop)
+                for queue, (loop, crew_ids) in self._subscribers.items()
+                if not ids.isdisjoint(crew_ids)
+            ]
+        for queue, loop in subscribers:
+            _put_threadsafe(loop, queue, event)
+
     def _register_handlers(self):
         """Register all event handlers with the CrewAI event bus."""
 
         def on_crew_started(source, event: CrewKickoffStartedEvent):
-            self._event_queue.put({
+            self._put(event, {
                 "type": "crew_started",
                 "crew_name": getattr(event, "crew_name", "crew"),
                 "crew_id": str(getattr(event, "crew_id", "")),
             })
 
-        def on_crew_completed(source, event: CrewKickoffCompletedEvent):
-            output = getattr(event, "output", None)
-            self._event_queue.put({
-                "type": "crew_complete",
-                "result": str(output.raw if hasattr(output, "raw") else output) if output else "",
-            })
-
         def on_crew_failed(source, event: CrewKickoffFailedEvent):
-            self._event_queue.put({
+            self._put(event, {
                 "type": "error",
                 "error": str(getattr(event, "error", "Unknown error")),
             })
 
         def on_agent_started(source, event: AgentExecutionStartedEvent):
             agent = getattr(event, "agent", None)
-            self._event_queue.put({
+            self._put(event, {
                 "type": "agent_started",
                 "agent": getattr(agent, "role", "Unknown") if agent else "Unknown",
                 "task": str(getattr(event, "task", "")),
@@ -130,7 +197,7 @@ class CrewEventQueueListener:
         def on_agent_completed(source, event: AgentExecutionCompletedEvent):
             agent = getattr(event, "agent", None)
             output = getattr(event, "output", None)
-            self._event_queue.put({
+            self._put(event, {
                 "type": "agent_completed",
                 "agent": getattr(agent, "role", "Unknown") if agent else "Unknown",
                 "output": str(output) if output else "",
@@ -138,7 +205,7 @@ class CrewEventQueueListener:
 
         def on_task_started(source, event: TaskStartedEvent):
             task = getattr(event, "task", None)
-            self._event_queue.put({
+            self._put(event, {
                 "type": "task_started",
                 "task_id": str(getattr(task, "id", "")) if task else "",
                 "description": str(getattr(task, "description", "")) if task else "",
@@ -148,7 +215,7 @@ class CrewEventQueueListener:
         def on_task_completed(source, event: TaskCompletedEvent):
             task = getattr(event, "task", None)
             output = getattr(event, "output", None)
-            self._event_queue.put({
+            self._put(event, {
                 "type": "task_completed",
                 "task_id": str(getattr(task, "id", "")) if task else "",
                 "output": str(output.raw if hasattr(output, "raw") else output) if output else "",
@@ -156,7 +223,7 @@ class CrewEventQueueListener:
             })
 
         def on_tool_started(source, event: ToolUsageStartedEvent):
-            self._event_queue.put({
+            self._put(event, {
                 "type": "tool_started",
                 "tool_name": str(getattr(event, "tool_name", "Unknown")),
                 "tool_args": str(getattr(event, "tool_args", {})),
@@ -164,7 +231,7 @@ class CrewEventQueueListener:
             })
 
         def on_tool_finished(source, event: ToolUsageFinishedEvent):
-            self._event_queue.put({
+            self._put(event, {
                 "type": "tool_finished",
                 "tool_name": str(getattr(event, "tool_name", "Unknown")),
                 "tool_result": str(getattr(event, "tool_result", "")),
@@ -172,14 +239,14 @@ class CrewEventQueueListener:
             })
 
         def on_llm_started(source, event: LLMCallStartedEvent):
-            self._event_queue.put({
+            self._put(event, {
                 "type": "llm_started",
                 "agent": str(getattr(event, "agent", "Unknown")),
             })
 
         def on_llm_completed(source, event: LLMCallCompletedEvent):
             response = getattr(event, "response", None)
-            self._event_queue.put({
+            self._put(event, {
                 "type": "llm_completed",
                 "agent": str(getattr(event, "agent", "Unknown")),
                 "response": str(response) if response else "",
@@ -187,7 +254,6 @@ class CrewEventQueueListener:
 
         # Register handlers with the event bus
         crewai_event_bus.on(CrewKickoffStartedEvent)(on_crew_started)
-        crewai_event_bus.on(CrewKickoffCompletedEvent)(on_crew_completed)
         crewai_event_bus.on(CrewKickoffFailedEvent)(on_crew_failed)
         crewai_event_bus.on(AgentExecutionStartedEvent)(on_agent_started)
         crewai_event_bus.on(AgentExecutionCompletedEvent)(on_agent_completed)
@@ -200,7 +266,7 @@ class CrewEventQueueListener:
 
         # Store references to prevent garbage collection
         self._handlers = [
-            on_crew_started, on_crew_completed, on_crew_failed,
+            on_crew_started, on_crew_failed,
             on_agent_started, on_agent_completed,
             on_task_started, on_task_completed,
             on_tool_started, on_tool_finished,
@@ -208,6 +274,44 @@ class CrewEventQueueListener:
         ]
 
 
+_listener: CrewEventQueueListener | None = None
+_listener_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_crews: dict[tuple[str, str, float], Crew] = {}
+
+
+def _get_listener() -> CrewEventQueueListener:
+    """Get the process-wide event listener, registering it on first use."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = CrewEventQueueListener()
+    return _listener
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool that runs crew kickoffs."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.AGENT_CREW_CONCURRENCY,
+            thread_name_prefix="crewai",
+        )
+    return _executor
+
+
+def shutdown_crews() -> None:
+    """Drop cached crews and stop the kickoff thread pool.
+
+    Kickoffs already running are left to finish; queued ones are cancelled.
+    """
+    global _executor
+    _crews.clear()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
 class CrewAIAssistant:
     """Multi-agent crew orchestration using CrewAI.
 
@@ -236,8 +340,6 @@ class CrewAIAssistant:
         self.model_name = model_name or settings.AI_MODEL
         self.temperature = temperature or settings.AI_TEMPERATURE
         self.system_prompt = system_prompt or DEFAULT_SYSTEM_PROMPT
-        self._crew: Crew | None = None
-        self._agents: dict[str, Agent] = {}
 
     def _default_config(self) -> CrewConfig:
         """Default crew configuration for general assistance."""
@@ -341,8 +443,8 @@ class CrewAIAssistant:
 
     def _build_crew(self) -> Crew:
         """Build and return the Crew instance."""
-        self._agents = self._build_agents()
-        tasks = self._build_tasks(self._agents)
+        agents = self._build_agents()
+        tasks = self._build_tasks(agents)
 
         process = (
             Process.hierarchical
@@ -351,7 +453,7 @@ class CrewAIAssistant:
         )
 
         return Crew(
-            agents=list(self._agents.values()),
+            agents=list(agents.values()),
             tasks=tasks,
             process=process,
             memory=self.config.memory,
@@ -360,10 +462,16 @@ class CrewAIAssistant:
 
     @property
     def crew(self) -> Crew:
-        """Get or create the Crew instance."""
-        if self._crew is None:
-            self._crew = self._build_crew()
-        return self._crew
+        """Get the Crew built for this configuration, shared by all assistants.
+
+        Kick off a ``crew.copy()`` rather than the shared instance: tasks keep
+        their outputs, so concurrent kickoffs must not share them.
+        """
+        key = (self.config.model_dump_json(), self.model_name, self.temperature)
+        crew = _crews.get(key)
+        if crew is None:
+            crew = _crews[key] = self._build_crew()
+        return crew
 
     async def run(
         self,
@@ -393,17 +501,12 @@ class CrewAIAssistant:
 
         logger.info(f"Starting CrewAI execution: {user_input[:100]}...")
 
-        # Reset crew for fresh execution
-        self._crew = None
-
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: self.crew.kickoff(inputs=inputs)
-        )
+        crew = self.crew.copy()
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_get_executor(), partial(crew.kickoff, inputs=inputs))
 
         task_results = []
-        for task in self.crew.tasks:
+        for task in crew.tasks:
             if task.output:
                 task_results.append({
                     "agent": task.agent.role if task.agent else "Unknown",
@@ -443,76 +546,47 @@ class CrewAIAssistant:
         Yields:
             Dict events with type and data.
         """
-        event_queue: Queue = Queue()
-
         inputs = {
             "user_input": user_input,
             "history": self._format_history(history),
         }
 
-        # Reset crew for fresh execution
-        self._crew = None
+        loop = asyncio.get_running_loop()
+        event_queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        crew = self.crew.copy()
 
-        # Create event listener BEFORE starting thread (keeps reference alive)
-        listener = CrewEventQueueListener(event_queue)
-
-        def run_with_events():
-            """Run crew with event listener."""
-            nonlocal listener  # Keep reference to prevent GC
+        def run_with_events() -> None:
+            """Run the crew; its events reach the queue through the listener."""
             try:
-                # Build and run crew
-                crew = self.crew
                 result = crew.kickoff(inputs=inputs)
 
-                # Ensure final result is sent (event bus may have already sent it)
+                # Sent here rather than from the event bus so each stream gets
+                # exactly one final result, with the usage of the whole kickoff
                 if result:
-                    event_queue.put({
+                    token_usage = getattr(result, "token_usage", None)
+                    _put_threadsafe(loop, event_queue, {
                         "type": "crew_complete",
                         "result": str(result.raw if hasattr(result, "raw") else result),
+                        "total_tokens": getattr(token_usage, "total_tokens", 0) or 0,
                     })
 
             except Exception as e:
                 logger.error(f"CrewAI execution error: {e}", exc_info=True)
-                event_queue.put({
+                _put_threadsafe(loop, event_queue, {
                     "type": "error",
                     "error": str(e),
                 })
             finally:
-                event_queue.put(None)  # Signal completion
-
-        # Start crew in background thread
-        thread = Thread(target=run_with_events, daemon=True)
-        thread.start()
-
-        # Yield events as they arrive
-        while True:
-            await asyncio.sleep(0.05)
-
-            while True:
-                try:
-                    event = event_queue.get_nowait()
-                    if event is None:
-                        thread.join(timeout=2.0)
-                        _ = listener  # Keep reference until done
-                        return
-                    yield event
-                except Empty:
-                    break
-
-            # Check if thread is still alive
-            if not thread.is_alive():
-                # Drain remaining events
-                while True:
-                    try:
-                        event = event_queue.get_nowait()
-                        if event is None:
-                            _ = listener  # Keep reference until done
-                            return
-                        yield event
-                    except Empty:
-                        break
-                _ = listener  # Keep reference until done
-                return
+                _put_threadsafe(loop, event_queue, None)  # Signal completion
+
+        listener = _get_listener()
+        listener.subscribe(event_queue, crew)
+        try:
+            loop.run_in_executor(_get_executor(), run_with_events)
+            while (event := await event_queue.get()) is not None:
+                yield event
+        finally:
+            listener.unsubscribe(event_queue)
 
     def _format_history(self, history: list[dict[str, str]] | None) -> str:
         """Format conversation history as context string."""
@@ -531,6 +605,8 @@ class CrewAIAssistant:
 def get_crew() -> CrewAIAssistant:
     """Factory function to create a CrewAIAssistant.
 
+    Assistants with the same configuration share one built crew.
+
     Returns:
         Configured CrewAIAssistant instance.
     """
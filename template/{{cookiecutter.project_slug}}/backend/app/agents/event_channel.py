@@ -0,0 +1,165 @@
+{%- if cookiecutter.enable_ai_agent %}
+"""Event delivery for agent WebSocket connections.
+
+Models stream replies a few characters at a time, and one frame per token
+means thousands of frames per reply. Each connection gets an
+``AgentEventChannel`` that merges consecutive ``text_delta`` events into one
+frame. A frame is sent every ``coalesce_ms`` milliseconds, or sooner once
+``coalesce_bytes`` of text is pending. Any other event sends the pending text
+first, so clients see events in the order they were produced.
+
+Clients tune this per connection with the ``coalesce_ms`` and
+``coalesce_bytes`` query parameters; ``coalesce_ms=0`` sends every delta as
+its own frame. Frames are JSON text by default. A client that requests the
+``msgpack`` WebSocket subprotocol gets binary MessagePack frames with the same
+``{"type": ..., "data": ...}`` shape.
+"""
+
+import asyncio
+import contextlib
+{%- if not cookiecutter.enable_orjson %}
+import json
+{%- endif %}
+from typing import Any
+
+import msgpack
+{%- if cookiecutter.enable_orjson %}
+import orjson
+{%- endif %}
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.core.config import settings
+
+MSGPACK_SUBPROTOCOL = "msgpack"
+# Upper bound for the client-chosen flush interval
+MAX_COALESCE_MS = 1000
+
+
+def encode_json(event: dict[str, Any]) -> str:
+    """Serialize an event as compact JSON."""
+{%- if cookiecutter.enable_orjson %}
+    return orjson.dumps(event, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+{%- else %}
+    return json.dumps(event, default=str, separators=(",", ":"), ensure_ascii=False)
+{%- endif %}
+
+
+def encode_msgpack(event: dict[str, Any]) -> bytes:
+    """Serialize an event as MessagePack."""
+    return msgpack.packb(event, default=str)  # type: ignore[no-any-return]
+
+
+def _int_param(websocket: WebSocket, name: str, default: int, maximum: int | None = None) -> int:
+    try:
+        value = max(int(websocket.query_params.get(name, default)), 0)
+    except ValueError:
+        return default
+    return min(value, maximum) if maximum is not None else value
+
+
+class AgentEventChannel:
+    """Sends events to one agent WebSocket, coalescing text deltas.
+
+    Usage:
+        channel = AgentEventChannel.from_websocket(websocket)
+        await websocket.accept(subprotocol=channel.subprotocol)
+        await channel.send("text_delta", {"content": "Hel"})
+        await channel.send("text_delta", {"content": "lo"})
+        await channel.send("complete", {})  # Sends "Hello", then "complete"
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        binary: bool = False,
+        coalesce_ms: int | None = None,
+        coalesce_bytes: int | None = None,
+    ) -> None:
+        self.websocket = websocket
+        self.binary = binary
+        self.coalesce_ms = coalesce_ms if coalesce_ms is not None else settings.AGENT_WS_COALESCE_MS
+        self.coalesce_bytes = coalesce_bytes if coalesce_bytes is not None else settings.AGENT_WS_COALESCE_BYTES
+        # Data of the pending text_delta, with "content" joined on flush
+        self._pending: dict[str, Any] | None = None
+        self._pending_content: list[str] = []
+        self._pending_bytes = 0
+        self._flush_task: asyncio.Task[None] | None = None
+        # Keeps frames in order when the timed flush and a send overlap
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_websocket(cls, websocket: WebSocket) -> "AgentEventChannel":
+        """Create a channel with the encoding and coalescing the client asked for."""
+        return cls(
+            websocket,
+            binary=MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", []),
+            coalesce_ms=_int_param(websocket, "coalesce_ms", settings.AGENT_WS_COALESCE_MS, MAX_COALESCE_MS),
+            coalesce_bytes=_int_param(websocket, "coalesce_bytes", settings.AGENT_WS_COALESCE_BYTES),
+        )
+
+    @property
+    def subprotocol(self) -> str | None:
+        """The subprotocol to accept the connection with."""
+        return MSGPACK_SUBPROTOCOL if self.binary else None
+
+    async def send(self, event_type: str, data: Any) -> None:
+        """Send an event, holding back text deltas to merge them.
+
+        Raises:
+            WebSocketDisconnect, RuntimeError: If the connection is closed.
+        """
+        if event_type == "text_delta" and self.coalesce_ms > 0 and isinstance(data, dict):
+            content = data.get("content") or ""
+            rest = {key: value for key, value in data.items() if key != "content"}
+            if self._pending is not None and self._pending != rest:
+                await self.flush()
+            self._pending = rest
+            self._pending_content.append(content)
+            self._pending_bytes += len(content.encode())
+            if self._pending_bytes >= self.coalesce_bytes:
+                await self.flush()
+            elif self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+            return
+
+        await self.flush()
+        await self._send({"type": event_type, "data": data})
+
+    async def flush(self) -> None:
+        """Send the pending text delta, if any."""
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+        self._flush_task = None
+        if self._pending is None:
+            return
+        data = {**self._pending, "content": "".join(self._pending_content)}
+        self._pending = None
+        self._pending_content = []
+        self._pending_bytes = 0
+        await self._send({"type": "text_delta", "data": data})
+
+    def close(self) -> None:
+        """Drop pending deltas and stop the flush timer."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._pending = None
+        self._pending_content = []
+        self._pending_bytes = 0
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.coalesce_ms / 1000)
+        # If the connection has closed, the next send reports it to the caller
+        with contextlib.suppress(WebSocketDisconnect, RuntimeError):
+            await self.flush()
+
+    async def _send(self, event: dict[str, Any]) -> None:
+        async with self._lock:
+            if self.binary:
+                await self.websocket.send_bytes(encode_msgpack(event))
+            else:
+                await self.websocket.send_text(encode_json(event))
+{%- else %}
+"""Agent event channel - not configured."""
+{%- endif %}
@@ -0,0 +1,115 @@
+{%- if cookiecutter.enable_ai_agent %}
+"""Server-side conversation history for agent WebSocket connections.
+
+Each connection keeps an incremental, token-bounded history buffer so the
+client only has to send the new message. When a stored conversation is
+resumed, the buffer is seeded once from the database; afterwards every turn
+appends to it and the oldest messages are dropped once the estimated token
+count exceeds ``AGENT_HISTORY_MAX_TOKENS``.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Generic, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Rough average for English text with modern BPE tokenizers
+CHARS_PER_TOKEN = 4
+# Per-message overhead for role markers and separators
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens a message will take in the prompt."""
+    return len(text) // CHARS_PER_TOKEN + MESSAGE_TOKEN_OVERHEAD
+
+
+class ConversationHistory(Generic[T]):
+    """Token-bounded history buffer for a single agent connection.
+
+    Messages are stored as ``{"role": ..., "content": ...}`` dicts. If a
+    ``convert`` callable is given, each message is also converted to the
+    framework's message type once, on insert, so building the model history
+    for a turn does not re-convert the whole conversation.
+
+    Usage:
+        history = ConversationHistory(convert=to_model_message)
+        history.append("user", "Hi")
+        history.append("assistant", "Hello!")
+        agent.run(prompt, message_history=history.model_messages())
+    """
+
+    def __init__(
+        self,
+        convert: Callable[[dict[str, str]], T | None] | None = None,
+        max_tokens: int | None = None,
+    ) -> None:
+        self.max_tokens = max_tokens if max_tokens is not None else settings.AGENT_HISTORY_MAX_TOKENS
+        self.conversation_id: str | None = None
+        self.total_tokens = 0
+        self._convert = convert
+        self._entries: deque[tuple[dict[str, str], T | None, int]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, role: str, content: str) -> None:
+        """Add a message and trim the oldest ones to fit the token budget."""
+        message = {"role": role, "content": content}
+        converted = self._convert(message) if self._convert else None
+        tokens = estimate_tokens(content)
+        self._entries.append((message, converted, tokens))
+        self.total_tokens += tokens
+        self._trim()
+
+    def replace(
+        self,
+        messages: Iterable[dict[str, str]],
+        conversation_id: str | None = None,
+    ) -> None:
+        """Replace the buffer contents (e.g. when a stored conversation is opened)."""
+        self.clear()
+        for message in messages:
+            self.append(message["role"], message["content"])
+        self.conversation_id = conversation_id
+
+    def clear(self) -> None:
+        """Remove all messages."""
+        self._entries.clear()
+        self.total_tokens = 0
+        self.conversation_id = None
+
+    @property
+    def messages(self) -> list[dict[str, str]]:
+        """History as a list of role/content dicts, oldest first."""
+        return [message for message, _, _ in self._entries]
+
+    def model_messages(self) -> list[T]:
+        """History converted to the framework's message type, oldest first.
+
+        Returns a new list, so callers may append the current prompt to it.
+        """
+        return [converted for _, converted, _ in self._entries if converted is not None]
+
+    def _trim(self) -> None:
+        """Drop the oldest messages until the buffer fits the token budget.
+
+        The newest message is always kept, and the window never starts with an
+        assistant reply whose prompt has been dropped.
+        """
+        if self.total_tokens <= self.max_tokens:
+            return
+        while len(self._entries) > 1 and self.total_tokens > self.max_tokens:
+            self._pop_oldest()
+        while len(self._entries) > 1 and self._entries[0][0]["role"] == "assistant":
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        _, _, tokens = self._entries.popleft()
+        self.total_tokens -= tokens
+{%- else %}
+"""Agent conversation history - not configured."""
+{%- endif %}
@@ -17,7 +17,9 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 {%- endif %}
 
+from app.agents.completion_cache import CachedCompletion, completion_cache, completion_key
 from app.agents.prompts import DEFAULT_SYSTEM_PROMPT
+from app.agents.registry import agent_registry
 from app.agents.tools import get_current_datetime
 from app.core.config import settings
 
@@ -78,6 +80,8 @@ class LangChainAssistant:
             model=self.model_name,
             temperature=self.temperature,
             api_key=settings.OPENAI_API_KEY,
+            http_client=agent_registry.sync_http_client,
+            http_async_client=agent_registry.http_client,
         )
 {%- endif %}
 {%- if cookiecutter.use_anthropic %}
@@ -129,6 +133,9 @@ class LangChainAssistant:
     ) -> tuple[str, list[Any], AgentContext]:
         """Run agent and return the output along with tool call events.
 
+        With ``AGENT_CACHE_ENABLED``, repeated prompts are answered from the
+        completion cache. Runs that call tools are not cached.
+
         Args:
             user_input: User's message.
             history: Conversation history as list of {"role": "...", "content": "..."}.
@@ -142,6 +149,18 @@ class LangChainAssistant:
 
         agent_context: AgentContext = context if context is not None else {}
 
+        cache_key = completion_key(
+            model_name=self.model_name,
+            temperature=self.temperature,
+            system_prompt=self.system_prompt,
+            history=history,
+            user_input=user_input,
+        )
+        cached = await completion_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Agent run served from the completion cache")
+            return cached.output, [], agent_context
+
         logger.info(f"Running agent with user input: {user_input[:100]}...")
 
         result = self.agent.invoke(
@@ -159,6 +178,9 @@ class LangChainAssistant:
             if hasattr(message, "tool_calls") and message.tool_calls:
                 tool_events.extend(message.tool_calls)
 
+        if not tool_events:
+            await completion_cache.set(cache_key, CachedCompletion(output))
+
         logger.info(f"Agent run complete. Output length: {len(output)} chars")
 
         return output, tool_events, agent_context
@@ -194,13 +216,31 @@ class LangChainAssistant:
             yield event
 
 
-def get_agent() -> LangChainAssistant:
-    """Factory function to create a LangChainAssistant.
+def get_agent(
+    model_name: str | None = None,
+    temperature: float | None = None,
+    system_prompt: str | None = None,
+) -> LangChainAssistant:
+    """Get the shared LangChainAssistant for a configuration.
+
+    The agent graph has no checkpointer and keeps no state between runs, so
+    one instance (and its model client) per configuration is reused across
+    requests.
+
+    Args:
+        model_name: Model to use. Defaults to AI_MODEL.
+        temperature: Sampling temperature. Defaults to AI_TEMPERATURE.
+        system_prompt: System prompt. Defaults to DEFAULT_SYSTEM_PROMPT.
 
     Returns:
         Configured LangChainAssistant instance.
     """
-    return LangChainAssistant()
+    config = (
+        model_name or settings.AI_MODEL,
+        temperature or settings.AI_TEMPERATURE,
+        system_prompt or DEFAULT_SYSTEM_PROMPT,
+    )
+    return agent_registry.get(("langchain", *config), lambda: LangChainAssistant(*config))
 
 
 async def run_agent(
@@ -5,10 +5,12 @@ A simple ReAct (Reasoning + Acting) agent built with LangGraph.
 Uses a graph-based architecture with conditional edges for tool execution.
 """
 
+import asyncio
 import logging
+import time
 from typing import Annotated, Any, Literal, TypedDict
 
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolCall, ToolMessage
 from langchain_core.tools import tool
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
@@ -20,7 +22,9 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 {%- endif %}
 
+from app.agents.completion_cache import CachedCompletion, completion_cache, completion_key
 from app.agents.prompts import DEFAULT_SYSTEM_PROMPT
+from app.agents.registry import agent_registry
 from app.agents.tools import get_current_datetime
 from app.core.config import settings
 
@@ -101,6 +105,8 @@ class LangGraphAssistant:
             temperature=self.temperature,
             api_key=settings.OPENAI_API_KEY,
             streaming=True,
+            http_client=agent_registry.sync_http_client,
+            http_async_client=agent_registry.http_client,
         )
 {%- endif %}
 {%- if cookiecutter.use_anthropic %}
@@ -114,12 +120,17 @@ class LangGraphAssistant:
 
         return model.bind_tools(ALL_TOOLS)
 
+    @property
+    def model(self):
+        """Get the tool-bound model, shared by all assistants with the same model settings."""
+        return agent_registry.get(("langgraph", self.model_name, self.temperature), self._create_model)
+
     def _agent_node(self, state: AgentState) -> dict[str, list[BaseMessage]]:
         """Agent node that processes messages and decides whether to call tools.
 
         This is the main reasoning node in the ReAct pattern.
         """
-        model = self._create_model()
+        model = self.model
 
         # Prepend system message to the conversation
         messages = [SystemMessage(content=self.system_prompt), *state["messages"]]
@@ -132,58 +143,65 @@ class LangGraphAssistant:
 
         return {"messages": [response]}
 
-    def _tools_node(self, state: AgentState) -> dict[str, list[ToolMessage]]:
+    async def _tools_node(self, state: AgentState) -> dict[str, list[ToolMessage]]:
         """Tools node that executes tool calls from the agent.
 
-        Processes each tool call and returns results as ToolMessages.
+        The calls of one model step are independent, so they run concurrently,
+        at most ``AGENT_TOOL_CONCURRENCY`` at a time. Results come back as
+        ToolMessages in call order.
         """
-        messages = state["messages"]
-        last_message = messages[-1]
+        last_message = state["messages"][-1]
+        tool_calls = getattr(last_message, "tool_calls", None) or []
+        semaphore = asyncio.Semaphore(settings.AGENT_TOOL_CONCURRENCY)
 
-        tool_results = []
+        async def run(tool_call: ToolCall) -> ToolMessage:
+            async with semaphore:
+                return await self._run_tool(tool_call)
 
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            for tool_call in last_message.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                tool_id = tool_call["id"]
-
-                logger.info(f"Executing tool: {tool_name} with args: {tool_args}")
-
-                try:
-                    tool_fn = TOOLS_BY_NAME.get(tool_name)
-                    if tool_fn:
-                        result = tool_fn.invoke(tool_args)
-                        tool_results.append(
-                            ToolMessage(
-                                content=str(result),
-                                tool_call_id=tool_id,
-                                name=tool_name,
-                            )
-                        )
-                        logger.info(f"Tool {tool_name} completed successfully")
-                    else:
-                        error_msg = f"Unknown tool: {tool_name}"
-                        logger.error(error_msg)
-                        tool_results.append(
-                            ToolMessage(
-                                content=error_msg,
-                                tool_call_id=tool_id,
-                                name=tool_name,
-                            )
-                        )
-                except Exception as e:
-                    error_msg = f"Error executing {tool_name}: {str(e)}"
-                    logger.error(error_msg, exc_info=True)
-                    tool_results.append(
-                        ToolMessage(
-                            content=error_msg,
-                            tool_call_id=tool_id,
-                            name=tool_name,
-                        )
-                    )
-
-        return {"messages": tool_results}
+        tool_results = await asyncio.gather(*(run(tool_call) for tool_call in tool_calls))
+        return {"messages": list(tool_results)}
+
+    @staticmethod
+    async def _run_tool(tool_call: ToolCall) -> ToolMessage:
+        """Execute one tool call within ``AGENT_TOOL_TIMEOUT``.
+
+        ``ainvoke`` runs sync tools in the default thread pool, so they do not
+        block the event loop. A timed-out sync tool keeps its thread until it
+        returns. Failures become error ToolMessages for the model to read. The
+        call's duration is kept in ``response_metadata["duration_ms"]``.
+        """
+        tool_name = tool_call["name"]
+        tool_args = tool_call["args"]
+        tool_fn = TOOLS_BY_NAME.get(tool_name)
+
+        logger.info(f"Executing tool: {tool_name} with args: {tool_args}")
+
+        status = "error"
+        start = time.perf_counter()
+        try:
+            if tool_fn:
+                async with asyncio.timeout(settings.AGENT_TOOL_TIMEOUT):
+                    content = str(await tool_fn.ainvoke(tool_args))
+                status = "success"
+                logger.info(f"Tool {tool_name} completed successfully")
+            else:
+                content = f"Unknown tool: {tool_name}"
+                logger.error(content)
+        except TimeoutError:
+            content = f"Tool {tool_name} timed out after {settings.AGENT_TOOL_TIMEOUT}s"
+            logger.error(content)
+        except Exception as e:
+            content = f"Error executing {tool_name}: {str(e)}"
+            logger.error(content, exc_info=True)
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        return ToolMessage(
+            content=content,
+            tool_call_id=tool_call["id"],
+            name=tool_name,
+            status=status,
+            response_metadata={"duration_ms": duration_ms},
+        )
 
     def _should_continue(self, state: AgentState) -> Literal["tools", "__end__"]:
         """Conditional edge that decides whether to continue to tools or end.
@@ -254,6 +272,9 @@ class LangGraphAssistant:
     ) -> tuple[str, list[Any], AgentContext]:
         """Run agent and return the output along with tool call events.
 
+        With ``AGENT_CACHE_ENABLED``, repeated prompts are answered from the
+        completion cache. Runs that call tools are not cached.
+
         Args:
             user_input: User's message.
             history: Conversation history as list of {"role": "...", "content": "..."}.
@@ -268,6 +289,18 @@ class LangGraphAssistant:
 
         agent_context: AgentContext = context if context is not None else {}
 
+        cache_key = completion_key(
+            model_name=self.model_name,
+            temperature=self.temperature,
+            system_prompt=self.system_prompt,
+            history=history,
+            user_input=user_input,
+        )
+        cached = await completion_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Agent run served from the completion cache")
+            return cached.output, [], agent_context
+
         logger.info(f"Running agent with user input: {user_input[:100]}...")
 
         config = {
@@ -290,6 +323,9 @@ class LangGraphAssistant:
                 if hasattr(message, "tool_calls") and message.tool_calls:
                     tool_events.extend(message.tool_calls)
 
+        if not tool_events:
+            await completion_cache.set(cache_key, CachedCompletion(output))
+
         logger.info(f"Agent run complete. Output length: {len(output)} chars")
 
         return output, tool_events, agent_context
@@ -339,6 +375,9 @@ class LangGraphAssistant:
 def get_agent() -> LangGraphAssistant:
     """Factory function to create a LangGraphAssistant.
 
+    Each assistant has its own checkpointer, so a new one is created per call.
+    The chat model and its HTTP client are shared through ``agent_registry``.
+
     Returns:
         Configured LangGraphAssistant instance.
     """
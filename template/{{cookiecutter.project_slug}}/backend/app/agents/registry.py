@@ -0,0 +1,92 @@
+{%- if cookiecutter.enable_ai_agent and (cookiecutter.use_pydantic_ai or cookiecutter.use_langchain or cookiecutter.use_langgraph) %}
+"""Process-wide agent instances and the HTTP clients their models share.
+
+Building an agent creates a model object and a provider client with its own
+connection pool; doing that for every WebSocket message would throw away warm
+TLS connections on each turn. The registry keeps one instance per
+configuration (framework, model, temperature, system prompt) for the life of
+the process. It also holds the pooled HTTP clients that the provider SDKs use,
+and the app lifespan closes them on shutdown.
+
+Only objects that keep no per-conversation state belong here: the
+conversation goes in with each call.
+"""
+
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+import httpx
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class AgentRegistry:
+    """Shared agent/model instances keyed by configuration, plus pooled HTTP clients.
+
+    Usage:
+        agent = agent_registry.get(
+            ("pydantic_ai", model_name, temperature, system_prompt),
+            lambda: AssistantAgent(model_name, temperature, system_prompt),
+        )
+    """
+
+    def __init__(self) -> None:
+        self._instances: dict[Hashable, Any] = {}
+        self._http_client: httpx.AsyncClient | None = None
+{%- if cookiecutter.use_langchain or cookiecutter.use_langgraph %}
+        self._sync_http_client: httpx.Client | None = None
+{%- endif %}
+
+    def get(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Return the instance for ``key``, building it with ``factory`` on first use."""
+        instance = self._instances.get(key)
+        if instance is None:
+            instance = self._instances[key] = factory()
+        return instance
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Async HTTP client shared by all provider SDK clients."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=self._timeout(), limits=self._limits())
+        return self._http_client
+{%- if cookiecutter.use_langchain or cookiecutter.use_langgraph %}
+
+    @property
+    def sync_http_client(self) -> httpx.Client:
+        """Blocking HTTP client for the SDKs' sync calls (``invoke``, ``stream``)."""
+        if self._sync_http_client is None:
+            self._sync_http_client = httpx.Client(timeout=self._timeout(), limits=self._limits())
+        return self._sync_http_client
+{%- endif %}
+
+    async def close(self) -> None:
+        """Drop all instances and close the HTTP clients."""
+        self._instances.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+{%- if cookiecutter.use_langchain or cookiecutter.use_langgraph %}
+        if self._sync_http_client is not None:
+            self._sync_http_client.close()
+            self._sync_http_client = None
+{%- endif %}
+
+    @staticmethod
+    def _timeout() -> httpx.Timeout:
+        return httpx.Timeout(settings.AGENT_HTTP_TIMEOUT, connect=5.0)
+
+    @staticmethod
+    def _limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.AGENT_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AGENT_HTTP_MAX_CONNECTIONS,
+        )
+
+
+agent_registry = AgentRegistry()
+{%- else %}
+"""Agent registry - not configured."""
+{%- endif %}
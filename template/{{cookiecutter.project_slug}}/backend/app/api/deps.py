@@ -23,9 +23,31 @@ from app.db.session import get_db_session
 {%- endif %}
 
 {%- if cookiecutter.use_postgresql %}
+from collections.abc import AsyncGenerator
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.session import primary_pinned, read_replicas
+
 DBSession = Annotated[AsyncSession, Depends(get_db_session)]
+
+
+async def get_read_db_session(db: DBSession) -> AsyncGenerator[AsyncSession, None]:
+    """Get a session for read-only work.
+
+    Uses a read replica when DATABASE_READ_URLS is set, a replica is healthy
+    and the request is not pinned to the primary. Otherwise it is the
+    primary session, which does not connect unless it is used.
+    """
+    replica = None if primary_pinned.get() else await read_replicas.connect()
+    if replica is None:
+        yield db
+        return
+    async with replica:
+        yield replica
+
+
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_db_session)]
 {%- endif %}
 
 {%- if cookiecutter.use_sqlite %}
@@ -62,6 +84,9 @@ Redis = Annotated[RedisClient, Depends(get_redis)]
 from app.services.user import UserService
 {%- if cookiecutter.enable_session_management %}
 from app.services.session import SessionService
+{%- if cookiecutter.enable_redis and not cookiecutter.use_sqlite %}
+from app.core.session_store import RedisSessionStore
+{%- endif %}
 {%- endif %}
 {%- endif %}
 {%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
@@ -80,14 +105,30 @@ from app.services.conversation import ConversationService
 def get_user_service(db: DBSession) -> UserService:
     """Create UserService instance with database session."""
     return UserService(db)
+{%- if cookiecutter.use_postgresql %}
+
+
+def get_user_read_service(db: ReadDBSession) -> UserService:
+    """Create UserService instance for read-only calls."""
+    return UserService(db)
+{%- endif %}
 
 {%- if cookiecutter.enable_session_management %}
+{%- if cookiecutter.enable_redis and cookiecutter.use_postgresql %}
+
+
+def get_session_service(db: DBSession, redis: Redis) -> SessionService:
+    """Create SessionService instance with database session and session store."""
+    store = RedisSessionStore(redis) if settings.SESSION_STORE == "redis" else None
+    return SessionService(db, store)
+{%- else %}
 
 
 def get_session_service(db: DBSession) -> SessionService:
     """Create SessionService instance with database session."""
     return SessionService(db)
 {%- endif %}
+{%- endif %}
 {%- elif cookiecutter.use_mongodb %}
 
 
@@ -96,6 +137,14 @@ def get_user_service() -> UserService:
     return UserService()
 
 {%- if cookiecutter.enable_session_management %}
+{%- if cookiecutter.enable_redis %}
+
+
+def get_session_service(redis: Redis) -> SessionService:
+    """Create SessionService instance with session store."""
+    store = RedisSessionStore(redis) if settings.SESSION_STORE == "redis" else None
+    return SessionService(store)
+{%- else %}
 
 
 def get_session_service() -> SessionService:
@@ -103,9 +152,13 @@ def get_session_service() -> SessionService:
     return SessionService()
 {%- endif %}
 {%- endif %}
+{%- endif %}
 
 
 UserSvc = Annotated[UserService, Depends(get_user_service)]
+{%- if cookiecutter.use_postgresql %}
+UserReadSvc = Annotated[UserService, Depends(get_user_read_service)]
+{%- endif %}
 {%- if cookiecutter.enable_session_management %}
 SessionSvc = Annotated[SessionService, Depends(get_session_service)]
 {%- endif %}
@@ -118,6 +171,13 @@ SessionSvc = Annotated[SessionService, Depends(get_session_service)]
 def get_webhook_service(db: DBSession) -> WebhookService:
     """Create WebhookService instance with database session."""
     return WebhookService(db)
+{%- if cookiecutter.use_postgresql %}
+
+
+def get_webhook_read_service(db: ReadDBSession) -> WebhookService:
+    """Create WebhookService instance for read-only calls."""
+    return WebhookService(db)
+{%- endif %}
 {%- elif cookiecutter.use_mongodb %}
 
 
@@ -128,6 +188,9 @@ def get_webhook_service() -> WebhookService:
 
 
 WebhookSvc = Annotated[WebhookService, Depends(get_webhook_service)]
+{%- if cookiecutter.use_postgresql %}
+WebhookReadSvc = Annotated[WebhookService, Depends(get_webhook_read_service)]
+{%- endif %}
 {%- endif %}
 
 {%- if cookiecutter.include_example_crud and cookiecutter.use_database %}
@@ -137,6 +200,13 @@ WebhookSvc = Annotated[WebhookService, Depends(get_webhook_service)]
 def get_item_service(db: DBSession) -> ItemService:
     """Create ItemService instance with database session."""
     return ItemService(db)
+{%- if cookiecutter.use_postgresql %}
+
+
+def get_item_read_service(db: ReadDBSession) -> ItemService:
+    """Create ItemService instance for read-only calls."""
+    return ItemService(db)
+{%- endif %}
 {%- elif cookiecutter.use_mongodb %}
 
 
@@ -147,6 +217,9 @@ def get_item_service() -> ItemService:
 
 
 ItemSvc = Annotated[ItemService, Depends(get_item_service)]
+{%- if cookiecutter.use_postgresql %}
+ItemReadSvc = Annotated[ItemService, Depends(get_item_read_service)]
+{%- endif %}
 {%- endif %}
 
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
@@ -156,6 +229,13 @@ ItemSvc = Annotated[ItemService, Depends(get_item_service)]
 def get_conversation_service(db: DBSession) -> ConversationService:
     """Create ConversationService instance with database session."""
     return ConversationService(db)
+{%- if cookiecutter.use_postgresql %}
+
+
+def get_conversation_read_service(db: ReadDBSession) -> ConversationService:
+    """Create ConversationService instance for read-only calls."""
+    return ConversationService(db)
+{%- endif %}
 {%- elif cookiecutter.use_mongodb %}
 
 
@@ -166,14 +246,20 @@ def get_conversation_service() -> ConversationService:
 
 
 ConversationSvc = Annotated[ConversationService, Depends(get_conversation_service)]
+{%- if cookiecutter.use_postgresql %}
+ConversationReadSvc = Annotated[ConversationService, Depends(get_conversation_read_service)]
+{%- endif %}
 {%- endif %}
 
 {%- if cookiecutter.use_jwt %}
 
 # === Authentication Dependencies ===
 
+from pydantic import ValidationError
+
 from app.core.exceptions import AuthenticationError, AuthorizationError
 from app.db.models.user import User, UserRole
+from app.schemas.token import AccessTokenClaims
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -186,7 +272,9 @@ async def get_current_user(
 ) -> User:
     """Get current authenticated user from JWT token.
 
-    Returns the full User object including role information.
+    Returns the User object including role information. It is served from
+    the user cache when possible, so it may be detached from the session:
+    reload the user through ``UserService`` before changing it.
 
     Raises:
         AuthenticationError: If token is invalid or user not found.
@@ -194,6 +282,7 @@ async def get_current_user(
     from uuid import UUID
 
     from app.core.security import verify_token
+    from app.core.user_cache import user_cache
 
     payload = verify_token(token)
     if payload is None:
@@ -207,7 +296,11 @@ async def get_current_user(
     if user_id is None:
         raise AuthenticationError(message="Invalid token payload")
 
-    user = await user_service.get_by_id(UUID(user_id))
+    user = await user_cache.get(user_id)
+    if user is None:
+        generation = user_cache.generation
+        user = await user_service.get_by_id(UUID(user_id))
+        await user_cache.set(user, generation)
     if not user.is_active:
         raise AuthenticationError(message="User account is disabled")
 
@@ -272,12 +365,15 @@ def get_current_user(
 ) -> User:
     """Get current authenticated user from JWT token.
 
-    Returns the full User object including role information.
+    Returns the User object including role information. It is served from
+    the user cache when possible, so it may be detached from the session:
+    reload the user through ``UserService`` before changing it.
 
     Raises:
         AuthenticationError: If token is invalid or user not found.
     """
     from app.core.security import verify_token
+    from app.core.user_cache import user_cache
 
     payload = verify_token(token)
     if payload is None:
@@ -291,7 +387,11 @@ def get_current_user(
     if user_id is None:
         raise AuthenticationError(message="Invalid token payload")
 
-    user = user_service.get_by_id(user_id)
+    user = user_cache.get(user_id)
+    if user is None:
+        generation = user_cache.generation
+        user = user_service.get_by_id(user_id)
+        user_cache.set(user, generation)
     if not user.is_active:
         raise AuthenticationError(message="User account is disabled")
 
@@ -356,12 +456,15 @@ async def get_current_user(
 ) -> User:
     """Get current authenticated user from JWT token.
 
-    Returns the full User object including role information.
+    Returns the User object including role information. It is served from
+    the user cache when possible, so it may be detached from the session:
+    reload the user through ``UserService`` before changing it.
 
     Raises:
         AuthenticationError: If token is invalid or user not found.
     """
     from app.core.security import verify_token
+    from app.core.user_cache import user_cache
 
     payload = verify_token(token)
     if payload is None:
@@ -375,7 +478,11 @@ async def get_current_user(
     if user_id is None:
         raise AuthenticationError(message="Invalid token payload")
 
-    user = await user_service.get_by_id(user_id)
+    user = await user_cache.get(user_id)
+    if user is None:
+        generation = user_cache.generation
+        user = await user_service.get_by_id(user_id)
+        await user_cache.set(user, generation)
     if not user.is_active:
         raise AuthenticationError(message="User account is disabled")
 
@@ -440,6 +547,35 @@ CurrentSuperuser = Annotated[User, Depends(get_current_active_superuser)]
 CurrentAdmin = Annotated[User, Depends(RoleChecker(UserRole.ADMIN))]
 
 
+def get_token_claims(token: Annotated[str, Depends(oauth2_scheme)]) -> AccessTokenClaims:
+    """Authorize from the access token alone, without loading the user.
+
+    Suits hot read endpoints that only need the user ID and role. Role and
+    active state come from the token, so changes apply only once the user's
+    current access token expires; use ``get_current_user`` where that matters.
+
+    Raises:
+        AuthenticationError: If the token is invalid, lacks the claims or the user is inactive.
+    """
+    from app.core.security import verify_token
+
+    payload = verify_token(token)
+    if payload is None:
+        raise AuthenticationError(message="Invalid or expired token")
+    if payload.get("type") != "access":
+        raise AuthenticationError(message="Invalid token type")
+    try:
+        claims = AccessTokenClaims.model_validate(payload)
+    except ValidationError as e:
+        raise AuthenticationError(message="Invalid token payload") from e
+    if not claims.is_active:
+        raise AuthenticationError(message="User account is disabled")
+    return claims
+
+
+CurrentClaims = Annotated[AccessTokenClaims, Depends(get_token_claims)]
+
+
 # WebSocket authentication dependency
 from fastapi import WebSocket, Query, Cookie
 
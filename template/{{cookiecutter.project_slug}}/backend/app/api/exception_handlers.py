@@ -41,7 +41,7 @@ async def app_exception_handler(
     else:
         logger.warning(f"{exc.code}: {exc.message}", extra=log_extra)
 
-    headers: dict[str, str] = {}
+    headers = dict(exc.headers)
     if exc.status_code == 401:
         headers["WWW-Authenticate"] = "Bearer"
 
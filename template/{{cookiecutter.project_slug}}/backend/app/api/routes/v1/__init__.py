@@ -3,7 +3,7 @@
 # ruff: noqa: I001 - Imports structured for Jinja2 template conditionals
 {%- endif %}
 
-from fastapi import APIRouter
+from fastapi import APIRouter{% if cookiecutter.enable_rate_limiting %}, Depends{% endif %}
 
 from app.api.routes.v1 import health
 {%- if cookiecutter.use_jwt %}
@@ -30,8 +30,18 @@ from app.api.routes.v1 import ws
 {%- if cookiecutter.enable_ai_agent %}
 from app.api.routes.v1 import agent
 {%- endif %}
+{%- if cookiecutter.enable_rate_limiting %}
+from app.core.rate_limit import RateLimiter
+{%- endif %}
 
 v1_router = APIRouter()
+{%- if cookiecutter.enable_rate_limiting %}
+
+# Per-client budget shared by the HTTP routes below (health checks are exempt;
+# the agent WebSocket checks its own message and token budgets)
+rate_limited = [Depends(RateLimiter())]
+{%- endif %}
+{%- set limited = ", dependencies=rate_limited" if cookiecutter.enable_rate_limiting else "" %}
 
 # Health check routes (no auth required)
 v1_router.include_router(health.router, tags=["health"])
@@ -39,40 +49,40 @@ v1_router.include_router(health.router, tags=["health"])
 {%- if cookiecutter.use_jwt %}
 
 # Authentication routes
-v1_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+v1_router.include_router(auth.router, prefix="/auth", tags=["auth"]{{ limited }})
 
 # User routes
-v1_router.include_router(users.router, prefix="/users", tags=["users"])
+v1_router.include_router(users.router, prefix="/users", tags=["users"]{{ limited }})
 {%- endif %}
 
 {%- if cookiecutter.enable_oauth %}
 
 # OAuth2 routes
-v1_router.include_router(oauth.router, prefix="/oauth", tags=["oauth"])
+v1_router.include_router(oauth.router, prefix="/oauth", tags=["oauth"]{{ limited }})
 {%- endif %}
 
 {%- if cookiecutter.enable_session_management and cookiecutter.use_jwt %}
 
 # Session management routes
-v1_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
+v1_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"]{{ limited }})
 {%- endif %}
 
 {%- if cookiecutter.include_example_crud and cookiecutter.use_database %}
 
 # Example CRUD routes (items)
-v1_router.include_router(items.router, prefix="/items", tags=["items"])
+v1_router.include_router(items.router, prefix="/items", tags=["items"]{{ limited }})
 {%- endif %}
 
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
 
 # Conversation routes (AI chat persistence)
-v1_router.include_router(conversations.router, prefix="/conversations", tags=["conversations"])
+v1_router.include_router(conversations.router, prefix="/conversations", tags=["conversations"]{{ limited }})
 {%- endif %}
 
 {%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
 
 # Webhook routes
-v1_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+v1_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"]{{ limited }})
 {%- endif %}
 
 {%- if cookiecutter.enable_websockets %}
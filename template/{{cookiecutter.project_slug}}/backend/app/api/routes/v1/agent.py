@@ -31,20 +31,34 @@ from pydantic_ai.messages import (
 )
 
 from app.agents.assistant import Deps, get_agent
+from app.agents.completion_cache import CachedCompletion, completion_cache, completion_key
+from app.agents.event_channel import AgentEventChannel
+from app.agents.history import ConversationHistory
 {%- if cookiecutter.websocket_auth_jwt %}
 from app.api.deps import get_current_user_ws
 from app.db.models.user import User
 {%- endif %}
-{%- if cookiecutter.websocket_auth_api_key %}
+{%- if cookiecutter.websocket_auth_api_key or (cookiecutter.enable_conversation_persistence and cookiecutter.use_database) %}
 from app.core.config import settings
 {%- endif %}
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_rate_limiting %}
+from app.core.rate_limit import charge_agent_tokens, check_agent_turn
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_postgresql %}
 from app.db.session import get_db_context
+{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_sqlite %}
+from app.db.session import run_in_session
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate, ToolCallCreate, ToolCallComplete
+from app.services.message_buffer import MessageBuffer
 {%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate, ToolCallCreate, ToolCallComplete
+from app.services.message_buffer import MessageBuffer
 {%- endif %}
 
 logger = logging.getLogger(__name__)
@@ -57,26 +71,50 @@ class AgentConnectionManager:
 
     def __init__(self) -> None:
         self.active_connections: list[WebSocket] = []
+        self._channels: dict[WebSocket, AgentEventChannel] = {}
+        # Events sent to connections whose turn is being recorded for the completion cache
+        self._recordings: dict[WebSocket, list[tuple[str, Any]]] = {}
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept and store a new WebSocket connection."""
-        await websocket.accept()
+        channel = AgentEventChannel.from_websocket(websocket)
+        await websocket.accept(subprotocol=channel.subprotocol)
         self.active_connections.append(websocket)
+        self._channels[websocket] = channel
         logger.info(f"Agent WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        channel = self._channels.pop(websocket, None)
+        if channel is not None:
+            channel.close()
+        self._recordings.pop(websocket, None)
         logger.info(f"Agent WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
+    def start_recording(self, websocket: WebSocket) -> None:
+        """Keep a copy of the events sent to ``websocket`` until ``stop_recording``."""
+        self._recordings[websocket] = []
+
+    def stop_recording(self, websocket: WebSocket) -> list[tuple[str, Any]]:
+        """Stop recording and return the events sent since ``start_recording``."""
+        return self._recordings.pop(websocket, [])
+
     async def send_event(self, websocket: WebSocket, event_type: str, data: Any) -> bool:
-        """Send a JSON event to a specific WebSocket client.
+        """Send an event to a specific WebSocket client.
 
+        Text deltas may be held back briefly and merged (see AgentEventChannel).
         Returns True if sent successfully, False if connection is closed.
         """
+        recording = self._recordings.get(websocket)
+        if recording is not None:
+            recording.append((event_type, data))
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return False
         try:
-            await websocket.send_json({"type": event_type, "data": data})
+            await channel.send(event_type, data)
             return True
         except (WebSocketDisconnect, RuntimeError):
             # Connection already closed
@@ -86,19 +124,15 @@ class AgentConnectionManager:
 manager = AgentConnectionManager()
 
 
-def build_message_history(history: list[dict[str, str]]) -> list[ModelRequest | ModelResponse]:
-    """Convert conversation history to PydanticAI message format."""
-    model_history: list[ModelRequest | ModelResponse] = []
-
-    for msg in history:
-        if msg["role"] == "user":
-            model_history.append(ModelRequest(parts=[UserPromptPart(content=msg["content"])]))
-        elif msg["role"] == "assistant":
-            model_history.append(ModelResponse(parts=[TextPart(content=msg["content"])]))
-        elif msg["role"] == "system":
-            model_history.append(ModelRequest(parts=[SystemPromptPart(content=msg["content"])]))
-
-    return model_history
+def to_model_message(msg: dict[str, str]) -> ModelRequest | ModelResponse | None:
+    """Convert a history message to PydanticAI message format."""
+    if msg["role"] == "user":
+        return ModelRequest(parts=[UserPromptPart(content=msg["content"])])
+    if msg["role"] == "assistant":
+        return ModelResponse(parts=[TextPart(content=msg["content"])])
+    if msg["role"] == "system":
+        return ModelRequest(parts=[SystemPromptPart(content=msg["content"])])
+    return None
 
 {%- if cookiecutter.websocket_auth_api_key %}
 
@@ -137,6 +171,11 @@ async def agent_websocket(
         "history": [{"role": "user|assistant|system", "content": "..."}]{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %},
         "conversation_id": "optional-uuid-to-continue-existing-conversation"{% endif %}
     }
+
+    Only "message" is required. History is kept server-side per connection
+    and trimmed to AGENT_HISTORY_MAX_TOKENS{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}; it is loaded from the database
+    when an existing conversation is resumed{% endif %}. An optional "history"
+    array from the client replaces it.
 {%- if cookiecutter.websocket_auth_jwt %}
 
     Authentication: Requires a valid JWT token passed as a query parameter or header.
@@ -161,11 +200,14 @@ async def agent_websocket(
 
     await manager.connect(websocket)
 
-    # Conversation state per connection
-    conversation_history: list[dict[str, str]] = []
+    # Conversation state per connection (server-side, token-bounded history)
+    conversation_history: ConversationHistory[ModelRequest | ModelResponse] = ConversationHistory(
+        convert=to_model_message
+    )
     deps = Deps()
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
     current_conversation_id: str | None = None
+    message_buffer = MessageBuffer()
 {%- endif %}
 
     try:
@@ -173,14 +215,28 @@ async def agent_websocket(
             # Receive user message
             data = await websocket.receive_json()
             user_message = data.get("message", "")
-            # Optionally accept history from client (or use server-side tracking)
+            # History is tracked server-side; a client-sent history overrides it
             if "history" in data:
-                conversation_history = data["history"]
+                conversation_history.replace(
+                    data["history"], conversation_id=conversation_history.conversation_id
+                )
 
             if not user_message:
                 await manager.send_event(websocket, "error", {"message": "Empty message"})
                 continue
 
+{%- if cookiecutter.enable_rate_limiting %}
+
+            rate_limit = await check_agent_turn(websocket)
+            if not rate_limit.allowed:
+                await manager.send_event(
+                    websocket,
+                    "error",
+                    {"message": "Rate limit exceeded", "retry_after": round(rate_limit.retry_after, 1)},
+                )
+                continue
+{%- endif %}
+
 {%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 
             # Handle conversation persistence
@@ -192,9 +248,30 @@ async def agent_websocket(
                     # Get or create conversation
                     requested_conv_id = data.get("conversation_id")
                     if requested_conv_id:
+                        if requested_conv_id != conversation_history.conversation_id:
+                            # Load recent history once (also verifies the user may open it)
+                            try:
+                                recent_messages = await conv_service.list_recent_messages(
+                                    UUID(requested_conv_id),
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                                    user_id=user.id,
+{%- endif %}
+                                )
+                            except NotFoundError:
+                                await manager.send_event(
+                                    websocket, "error", {"message": "Conversation not found"}
+                                )
+                                continue
+                            if "history" in data:
+                                # A client-sent history takes precedence over the stored one
+                                conversation_history.conversation_id = requested_conv_id
+                            else:
+                                conversation_history.replace(
+                                    ({"role": m.role, "content": m.content} for m in recent_messages),
+                                    conversation_id=requested_conv_id,
+                                )
                         current_conversation_id = requested_conv_id
-                        # Verify conversation exists
-                        await conv_service.get_conversation(UUID(requested_conv_id))
                     elif not current_conversation_id:
                         # Create new conversation
                         conv_data = ConversationCreate(
@@ -205,47 +282,74 @@ async def agent_websocket(
                         )
                         conversation = await conv_service.create_conversation(conv_data)
                         current_conversation_id = str(conversation.id)
+                        conversation_history.conversation_id = current_conversation_id
                         await manager.send_event(
                             websocket,
                             "conversation_created",
                             {"conversation_id": current_conversation_id},
                         )
 
-                    # Save user message
-                    await conv_service.add_message(
+                    # Queue user message; it is written together with the reply
+                    message_buffer.add_message(
                         UUID(current_conversation_id),
                         MessageCreate(role="user", content=user_message),
                     )
 {%- else %}
-                with get_db_session() as db:
-                    conv_service = get_conversation_service(db)
-
-                    # Get or create conversation
-                    requested_conv_id = data.get("conversation_id")
-                    if requested_conv_id:
-                        current_conversation_id = requested_conv_id
-                        conv_service.get_conversation(requested_conv_id)
-                    elif not current_conversation_id:
-                        # Create new conversation
-                        conv_data = ConversationCreate(
+                # SQLite calls block, so they run in a worker thread
+                requested_conv_id = data.get("conversation_id")
+                if requested_conv_id:
+                    if requested_conv_id != conversation_history.conversation_id:
+                        # Load recent history once (also verifies the user may open it)
+                        try:
+                            recent_messages = await run_in_session(
+                                lambda db, conv_id: get_conversation_service(db).list_recent_messages(
+                                    conv_id,
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
 {%- if cookiecutter.websocket_auth_jwt %}
-                            user_id=str(user.id),
+                                    user_id=str(user.id),
 {%- endif %}
-                            title=user_message[:50] if len(user_message) > 50 else user_message,
-                        )
-                        conversation = conv_service.create_conversation(conv_data)
-                        current_conversation_id = str(conversation.id)
-                        await manager.send_event(
-                            websocket,
-                            "conversation_created",
-                            {"conversation_id": current_conversation_id},
-                        )
-
-                    # Save user message
-                    conv_service.add_message(
-                        current_conversation_id,
-                        MessageCreate(role="user", content=user_message),
+                                ),
+                                requested_conv_id,
+                            )
+                        except NotFoundError:
+                            await manager.send_event(
+                                websocket, "error", {"message": "Conversation not found"}
+                            )
+                            continue
+                        if "history" in data:
+                            # A client-sent history takes precedence over the stored one
+                            conversation_history.conversation_id = requested_conv_id
+                        else:
+                            conversation_history.replace(
+                                ({"role": m.role, "content": m.content} for m in recent_messages),
+                                conversation_id=requested_conv_id,
+                            )
+                    current_conversation_id = requested_conv_id
+                elif not current_conversation_id:
+                    # Create new conversation
+                    conv_data = ConversationCreate(
+{%- if cookiecutter.websocket_auth_jwt %}
+                        user_id=str(user.id),
+{%- endif %}
+                        title=user_message[:50] if len(user_message) > 50 else user_message,
+                    )
+                    conversation = await run_in_session(
+                        lambda db, conv_data: get_conversation_service(db).create_conversation(conv_data),
+                        conv_data,
+                    )
+                    current_conversation_id = str(conversation.id)
+                    conversation_history.conversation_id = current_conversation_id
+                    await manager.send_event(
+                        websocket,
+                        "conversation_created",
+                        {"conversation_id": current_conversation_id},
                     )
+
+                # Queue user message; it is written together with the reply
+                message_buffer.add_message(
+                    current_conversation_id,
+                    MessageCreate(role="user", content=user_message),
+                )
 {%- endif %}
             except Exception as e:
                 logger.warning(f"Failed to persist conversation: {e}")
@@ -257,8 +361,28 @@ async def agent_websocket(
 
             requested_conv_id = data.get("conversation_id")
             if requested_conv_id:
+                if requested_conv_id != conversation_history.conversation_id:
+                    # Load recent history once (also verifies the user may open it)
+                    try:
+                        recent_messages = await conv_service.list_recent_messages(
+                            requested_conv_id,
+                            limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                            user_id=str(user.id),
+{%- endif %}
+                        )
+                    except NotFoundError:
+                        await manager.send_event(websocket, "error", {"message": "Conversation not found"})
+                        continue
+                    if "history" in data:
+                        # A client-sent history takes precedence over the stored one
+                        conversation_history.conversation_id = requested_conv_id
+                    else:
+                        conversation_history.replace(
+                            ({"role": m.role, "content": m.content} for m in recent_messages),
+                            conversation_id=requested_conv_id,
+                        )
                 current_conversation_id = requested_conv_id
-                await conv_service.get_conversation(requested_conv_id)
             elif not current_conversation_id:
                 conv_data = ConversationCreate(
 {%- if cookiecutter.websocket_auth_jwt %}
@@ -268,14 +392,15 @@ async def agent_websocket(
                 )
                 conversation = await conv_service.create_conversation(conv_data)
                 current_conversation_id = str(conversation.id)
+                conversation_history.conversation_id = current_conversation_id
                 await manager.send_event(
                     websocket,
                     "conversation_created",
                     {"conversation_id": current_conversation_id},
                 )
 
-            # Save user message
-            await conv_service.add_message(
+            # Queue user message; it is written together with the reply
+            message_buffer.add_message(
                 current_conversation_id,
                 MessageCreate(role="user", content=user_message),
             )
@@ -285,159 +410,183 @@ async def agent_websocket(
 
             try:
                 assistant = get_agent()
-                model_history = build_message_history(conversation_history)
-
-                # Use iter() on the underlying PydanticAI agent to stream all events
-                async with assistant.agent.iter(
-                    user_message,
-                    deps=deps,
-                    message_history=model_history,
-                ) as agent_run:
-                    async for node in agent_run:
-                        if Agent.is_user_prompt_node(node):
-                            await manager.send_event(
-                                websocket,
-                                "user_prompt_processed",
-                                {"prompt": node.user_prompt},
-                            )
+                model_history = conversation_history.model_messages()
+
+                cache_key = completion_key(
+                    model_name=assistant.model_name,
+                    temperature=assistant.temperature,
+                    system_prompt=assistant.system_prompt,
+                    history=conversation_history.messages,
+                    user_input=user_message,
+                )
+{%- if cookiecutter.enable_rate_limiting %}
+                tokens_used = 0
+{%- endif %}
+                cached = await completion_cache.get(cache_key)
+                if cached is not None and cached.events:
+                    # Replay the stored event stream instead of calling the model
+                    for event_type, event_data in cached.events:
+                        await manager.send_event(websocket, event_type, event_data)
+                    output = cached.output
+                else:
+                    if completion_cache.enabled:
+                        manager.start_recording(websocket)
+
+                    # Use iter() on the underlying PydanticAI agent to stream all events
+                    async with assistant.agent.iter(
+                        user_message,
+                        deps=deps,
+                        message_history=model_history,
+                    ) as agent_run:
+                        async for node in agent_run:
+                            if Agent.is_user_prompt_node(node):
+                                await manager.send_event(
+                                    websocket,
+                                    "user_prompt_processed",
+                                    {"prompt": node.user_prompt},
+                                )
 
-                        elif Agent.is_model_request_node(node):
-                            await manager.send_event(websocket, "model_request_start", {})
+                            elif Agent.is_model_request_node(node):
+                                await manager.send_event(websocket, "model_request_start", {})
 
-                            async with node.stream(agent_run.ctx) as request_stream:
-                                async for event in request_stream:
-                                    if isinstance(event, PartStartEvent):
-                                        await manager.send_event(
-                                            websocket,
-                                            "part_start",
-                                            {
-                                                "index": event.index,
-                                                "part_type": type(event.part).__name__,
-                                            },
-                                        )
-                                        # Send initial content from TextPart if present
-                                        if isinstance(event.part, TextPart) and event.part.content:
+                                async with node.stream(agent_run.ctx) as request_stream:
+                                    async for event in request_stream:
+                                        if isinstance(event, PartStartEvent):
                                             await manager.send_event(
                                                 websocket,
-                                                "text_delta",
+                                                "part_start",
                                                 {
                                                     "index": event.index,
-                                                    "content": event.part.content,
+                                                    "part_type": type(event.part).__name__,
                                                 },
                                             )
+                                            # Send initial content from TextPart if present
+                                            if isinstance(event.part, TextPart) and event.part.content:
+                                                await manager.send_event(
+                                                    websocket,
+                                                    "text_delta",
+                                                    {
+                                                        "index": event.index,
+                                                        "content": event.part.content,
+                                                    },
+                                                )
+
+                                        elif isinstance(event, PartDeltaEvent):
+                                            if isinstance(event.delta, TextPartDelta):
+                                                await manager.send_event(
+                                                    websocket,
+                                                    "text_delta",
+                                                    {
+                                                        "index": event.index,
+                                                        "content": event.delta.content_delta,
+                                                    },
+                                                )
+                                            elif isinstance(event.delta, ToolCallPartDelta):
+                                                await manager.send_event(
+                                                    websocket,
+                                                    "tool_call_delta",
+                                                    {
+                                                        "index": event.index,
+                                                        "args_delta": event.delta.args_delta,
+                                                    },
+                                                )
+
+                                        elif isinstance(event, FinalResultEvent):
+                                            await manager.send_event(
+                                                websocket,
+                                                "final_result_start",
+                                                {"tool_name": event.tool_name},
+                                            )
 
-                                    elif isinstance(event, PartDeltaEvent):
-                                        if isinstance(event.delta, TextPartDelta):
+                            elif Agent.is_call_tools_node(node):
+                                await manager.send_event(websocket, "call_tools_start", {})
+
+                                async with node.stream(agent_run.ctx) as handle_stream:
+                                    async for event in handle_stream:
+                                        if isinstance(event, FunctionToolCallEvent):
                                             await manager.send_event(
                                                 websocket,
-                                                "text_delta",
+                                                "tool_call",
                                                 {
-                                                    "index": event.index,
-                                                    "content": event.delta.content_delta,
+                                                    "tool_name": event.part.tool_name,
+                                                    "args": event.part.args,
+                                                    "tool_call_id": event.part.tool_call_id,
                                                 },
                                             )
-                                        elif isinstance(event.delta, ToolCallPartDelta):
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                                            message_buffer.start_tool_call(
+                                                ToolCallCreate(
+                                                    tool_call_id=event.part.tool_call_id,
+                                                    tool_name=event.part.tool_name,
+                                                    args=event.part.args_as_dict(),
+                                                )
+                                            )
+{%- endif %}
+
+                                        elif isinstance(event, FunctionToolResultEvent):
                                             await manager.send_event(
                                                 websocket,
-                                                "tool_call_delta",
+                                                "tool_result",
                                                 {
-                                                    "index": event.index,
-                                                    "args_delta": event.delta.args_delta,
+                                                    "tool_call_id": event.tool_call_id,
+                                                    "content": str(event.result.content),
                                                 },
                                             )
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                                            message_buffer.complete_tool_call(
+                                                event.tool_call_id,
+                                                ToolCallComplete(
+                                                    result=str(event.result.content),
+                                                    success=event.result.part_kind == "tool-return",
+                                                ),
+                                            )
+{%- endif %}
 
-                                    elif isinstance(event, FinalResultEvent):
-                                        await manager.send_event(
-                                            websocket,
-                                            "final_result_start",
-                                            {"tool_name": event.tool_name},
-                                        )
-
-                        elif Agent.is_call_tools_node(node):
-                            await manager.send_event(websocket, "call_tools_start", {})
-
-                            async with node.stream(agent_run.ctx) as handle_stream:
-                                async for event in handle_stream:
-                                    if isinstance(event, FunctionToolCallEvent):
-                                        await manager.send_event(
-                                            websocket,
-                                            "tool_call",
-                                            {
-                                                "tool_name": event.part.tool_name,
-                                                "args": event.part.args,
-                                                "tool_call_id": event.part.tool_call_id,
-                                            },
-                                        )
+                            elif Agent.is_end_node(node) and agent_run.result is not None:
+                                await manager.send_event(
+                                    websocket,
+                                    "final_result",
+                                    {"output": agent_run.result.output},
+                                )
 
-                                    elif isinstance(event, FunctionToolResultEvent):
-                                        await manager.send_event(
-                                            websocket,
-                                            "tool_result",
-                                            {
-                                                "tool_call_id": event.tool_call_id,
-                                                "content": str(event.result.content),
-                                            },
-                                        )
+                    output = agent_run.result.output if agent_run.result else ""
+{%- if cookiecutter.enable_rate_limiting %}
+                    tokens_used = agent_run.usage.total_tokens
+{%- endif %}
 
-                        elif Agent.is_end_node(node) and agent_run.result is not None:
-                            await manager.send_event(
-                                websocket,
-                                "final_result",
-                                {"output": agent_run.result.output},
-                            )
+                    completion = CachedCompletion(output, manager.stop_recording(websocket))
+                    if output and not completion.calls_tools:
+                        await completion_cache.set(cache_key, completion)
 
                 # Update conversation history
-                conversation_history.append({"role": "user", "content": user_message})
-                if agent_run.result:
-                    conversation_history.append(
-                        {"role": "assistant", "content": agent_run.result.output}
-                    )
+                conversation_history.append("user", user_message)
+                if output:
+                    conversation_history.append("assistant", output)
+{%- if cookiecutter.enable_rate_limiting %}
+                # Charge the tokens the model reported for the turn; a cached reply costs none
+                await charge_agent_tokens(websocket, tokens_used)
+{%- endif %}
 
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
 
-                # Save assistant response to database
-                if current_conversation_id and agent_run.result:
-                    try:
+                # Queue the reply and write the turn's messages and tool calls in one batch
+                if current_conversation_id and output:
+                    message_buffer.add_message(
 {%- if cookiecutter.use_postgresql %}
-                        async with get_db_context() as db:
-                            conv_service = get_conversation_service(db)
-                            await conv_service.add_message(
-                                UUID(current_conversation_id),
-                                MessageCreate(
-                                    role="assistant",
-                                    content=agent_run.result.output,
-                                    model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                ),
-                            )
+                        UUID(current_conversation_id),
 {%- else %}
-                        with get_db_session() as db:
-                            conv_service = get_conversation_service(db)
-                            conv_service.add_message(
-                                current_conversation_id,
-                                MessageCreate(
-                                    role="assistant",
-                                    content=agent_run.result.output,
-                                    model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                ),
-                            )
+                        current_conversation_id,
 {%- endif %}
-                    except Exception as e:
-                        logger.warning(f"Failed to persist assistant response: {e}")
-{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
-
-                # Save assistant response to database
-                if current_conversation_id and agent_run.result:
-                    try:
-                        await conv_service.add_message(
-                            current_conversation_id,
-                            MessageCreate(
-                                role="assistant",
-                                content=agent_run.result.output,
-                                model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                            ),
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to persist assistant response: {e}")
+                        MessageCreate(
+                            role="assistant",
+                            content=output,
+                            model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
+                        ),
+                    )
+                try:
+                    await message_buffer.maybe_flush()
+                except Exception as e:
+                    logger.warning(f"Failed to persist conversation messages: {e}")
 {%- endif %}
 
                 await manager.send_event(websocket, "complete", {
@@ -452,6 +601,7 @@ async def agent_websocket(
                 break
             except Exception as e:
                 logger.exception(f"Error processing agent request: {e}")
+                manager.stop_recording(websocket)
                 # Try to send error, but don't fail if connection is closed
                 await manager.send_event(websocket, "error", {"message": str(e)})
 
@@ -459,6 +609,13 @@ async def agent_websocket(
         pass  # Normal disconnect
     finally:
         manager.disconnect(websocket)
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+        # Write anything still buffered before the connection goes away
+        try:
+            await message_buffer.close()
+        except Exception as e:
+            logger.warning(f"Failed to persist buffered messages: {e}")
+{%- endif %}
 {%- elif cookiecutter.enable_ai_agent and cookiecutter.use_langchain %}
 """AI Agent WebSocket routes with streaming support (LangChain)."""
 
@@ -475,21 +632,35 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect{%- if cookiecutter
 
 from langchain.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage
 
+from app.agents.completion_cache import CachedCompletion, completion_cache, completion_key
+from app.agents.event_channel import AgentEventChannel
+from app.agents.history import ConversationHistory
 from app.agents.langchain_assistant import AgentContext, get_agent
 {%- if cookiecutter.websocket_auth_jwt %}
 from app.api.deps import get_current_user_ws
 from app.db.models.user import User
 {%- endif %}
-{%- if cookiecutter.websocket_auth_api_key %}
+{%- if cookiecutter.websocket_auth_api_key or (cookiecutter.enable_conversation_persistence and cookiecutter.use_database) %}
 from app.core.config import settings
 {%- endif %}
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_rate_limiting %}
+from app.core.rate_limit import charge_agent_tokens, check_agent_turn
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_postgresql %}
 from app.db.session import get_db_context
+{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_sqlite %}
+from app.db.session import run_in_session
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate, ToolCallCreate, ToolCallComplete
+from app.services.message_buffer import MessageBuffer
 {%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate, ToolCallCreate, ToolCallComplete
+from app.services.message_buffer import MessageBuffer
 {%- endif %}
 
 logger = logging.getLogger(__name__)
@@ -502,26 +673,50 @@ class AgentConnectionManager:
 
     def __init__(self) -> None:
         self.active_connections: list[WebSocket] = []
+        self._channels: dict[WebSocket, AgentEventChannel] = {}
+        # Events sent to connections whose turn is being recorded for the completion cache
+        self._recordings: dict[WebSocket, list[tuple[str, Any]]] = {}
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept and store a new WebSocket connection."""
-        await websocket.accept()
+        channel = AgentEventChannel.from_websocket(websocket)
+        await websocket.accept(subprotocol=channel.subprotocol)
         self.active_connections.append(websocket)
+        self._channels[websocket] = channel
         logger.info(f"Agent WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        channel = self._channels.pop(websocket, None)
+        if channel is not None:
+            channel.close()
+        self._recordings.pop(websocket, None)
         logger.info(f"Agent WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
+    def start_recording(self, websocket: WebSocket) -> None:
+        """Keep a copy of the events sent to ``websocket`` until ``stop_recording``."""
+        self._recordings[websocket] = []
+
+    def stop_recording(self, websocket: WebSocket) -> list[tuple[str, Any]]:
+        """Stop recording and return the events sent since ``start_recording``."""
+        return self._recordings.pop(websocket, [])
+
     async def send_event(self, websocket: WebSocket, event_type: str, data: Any) -> bool:
-        """Send a JSON event to a specific WebSocket client.
+        """Send an event to a specific WebSocket client.
 
+        Text deltas may be held back briefly and merged (see AgentEventChannel).
         Returns True if sent successfully, False if connection is closed.
         """
+        recording = self._recordings.get(websocket)
+        if recording is not None:
+            recording.append((event_type, data))
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return False
         try:
-            await websocket.send_json({"type": event_type, "data": data})
+            await channel.send(event_type, data)
             return True
         except (WebSocketDisconnect, RuntimeError):
             # Connection already closed
@@ -531,21 +726,15 @@ class AgentConnectionManager:
 manager = AgentConnectionManager()
 
 
-def build_message_history(
-    history: list[dict[str, str]]
-) -> list[HumanMessage | AIMessage | SystemMessage]:
-    """Convert conversation history to LangChain message format."""
-    messages: list[HumanMessage | AIMessage | SystemMessage] = []
-
-    for msg in history:
-        if msg["role"] == "user":
-            messages.append(HumanMessage(content=msg["content"]))
-        elif msg["role"] == "assistant":
-            messages.append(AIMessage(content=msg["content"]))
-        elif msg["role"] == "system":
-            messages.append(SystemMessage(content=msg["content"]))
-
-    return messages
+def to_model_message(msg: dict[str, str]) -> HumanMessage | AIMessage | SystemMessage | None:
+    """Convert a history message to LangChain message format."""
+    if msg["role"] == "user":
+        return HumanMessage(content=msg["content"])
+    if msg["role"] == "assistant":
+        return AIMessage(content=msg["content"])
+    if msg["role"] == "system":
+        return SystemMessage(content=msg["content"])
+    return None
 
 {%- if cookiecutter.websocket_auth_api_key %}
 
@@ -582,6 +771,11 @@ async def agent_websocket(
         "history": [{"role": "user|assistant|system", "content": "..."}]{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %},
         "conversation_id": "optional-uuid-to-continue-existing-conversation"{% endif %}
     }
+
+    Only "message" is required. History is kept server-side per connection
+    and trimmed to AGENT_HISTORY_MAX_TOKENS{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}; it is loaded from the database
+    when an existing conversation is resumed{% endif %}. An optional "history"
+    array from the client replaces it.
 {%- if cookiecutter.websocket_auth_jwt %}
 
     Authentication: Requires a valid JWT token passed as a query parameter or header.
@@ -606,8 +800,10 @@ async def agent_websocket(
 
     await manager.connect(websocket)
 
-    # Conversation state per connection
-    conversation_history: list[dict[str, str]] = []
+    # Conversation state per connection (server-side, token-bounded history)
+    conversation_history: ConversationHistory[HumanMessage | AIMessage | SystemMessage] = (
+        ConversationHistory(convert=to_model_message)
+    )
     context: AgentContext = {}
 {%- if cookiecutter.websocket_auth_jwt %}
     context["user_id"] = str(user.id) if user else None
@@ -615,6 +811,7 @@ async def agent_websocket(
 {%- endif %}
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
     current_conversation_id: str | None = None
+    message_buffer = MessageBuffer()
 {%- endif %}
 
     try:
@@ -622,14 +819,28 @@ async def agent_websocket(
             # Receive user message
             data = await websocket.receive_json()
             user_message = data.get("message", "")
-            # Optionally accept history from client (or use server-side tracking)
+            # History is tracked server-side; a client-sent history overrides it
             if "history" in data:
-                conversation_history = data["history"]
+                conversation_history.replace(
+                    data["history"], conversation_id=conversation_history.conversation_id
+                )
 
             if not user_message:
                 await manager.send_event(websocket, "error", {"message": "Empty message"})
                 continue
 
+{%- if cookiecutter.enable_rate_limiting %}
+
+            rate_limit = await check_agent_turn(websocket)
+            if not rate_limit.allowed:
+                await manager.send_event(
+                    websocket,
+                    "error",
+                    {"message": "Rate limit exceeded", "retry_after": round(rate_limit.retry_after, 1)},
+                )
+                continue
+{%- endif %}
+
 {%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 
             # Handle conversation persistence
@@ -641,9 +852,30 @@ async def agent_websocket(
                     # Get or create conversation
                     requested_conv_id = data.get("conversation_id")
                     if requested_conv_id:
+                        if requested_conv_id != conversation_history.conversation_id:
+                            # Load recent history once (also verifies the user may open it)
+                            try:
+                                recent_messages = await conv_service.list_recent_messages(
+                                    UUID(requested_conv_id),
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                                    user_id=user.id,
+{%- endif %}
+                                )
+                            except NotFoundError:
+                                await manager.send_event(
+                                    websocket, "error", {"message": "Conversation not found"}
+                                )
+                                continue
+                            if "history" in data:
+                                # A client-sent history takes precedence over the stored one
+                                conversation_history.conversation_id = requested_conv_id
+                            else:
+                                conversation_history.replace(
+                                    ({"role": m.role, "content": m.content} for m in recent_messages),
+                                    conversation_id=requested_conv_id,
+                                )
                         current_conversation_id = requested_conv_id
-                        # Verify conversation exists
-                        await conv_service.get_conversation(UUID(requested_conv_id))
                     elif not current_conversation_id:
                         # Create new conversation
                         conv_data = ConversationCreate(
@@ -654,47 +886,74 @@ async def agent_websocket(
                         )
                         conversation = await conv_service.create_conversation(conv_data)
                         current_conversation_id = str(conversation.id)
+                        conversation_history.conversation_id = current_conversation_id
                         await manager.send_event(
                             websocket,
                             "conversation_created",
                             {"conversation_id": current_conversation_id},
                         )
 
-                    # Save user message
-                    await conv_service.add_message(
+                    # Queue user message; it is written together with the reply
+                    message_buffer.add_message(
                         UUID(current_conversation_id),
                         MessageCreate(role="user", content=user_message),
                     )
 {%- else %}
-                with get_db_session() as db:
-                    conv_service = get_conversation_service(db)
-
-                    # Get or create conversation
-                    requested_conv_id = data.get("conversation_id")
-                    if requested_conv_id:
-                        current_conversation_id = requested_conv_id
-                        conv_service.get_conversation(requested_conv_id)
-                    elif not current_conversation_id:
-                        # Create new conversation
-                        conv_data = ConversationCreate(
+                # SQLite calls block, so they run in a worker thread
+                requested_conv_id = data.get("conversation_id")
+                if requested_conv_id:
+                    if requested_conv_id != conversation_history.conversation_id:
+                        # Load recent history once (also verifies the user may open it)
+                        try:
+                            recent_messages = await run_in_session(
+                                lambda db, conv_id: get_conversation_service(db).list_recent_messages(
+                                    conv_id,
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
 {%- if cookiecutter.websocket_auth_jwt %}
-                            user_id=str(user.id),
+                                    user_id=str(user.id),
 {%- endif %}
-                            title=user_message[:50] if len(user_message) > 50 else user_message,
-                        )
-                        conversation = conv_service.create_conversation(conv_data)
-                        current_conversation_id = str(conversation.id)
-                        await manager.send_event(
-                            websocket,
-                            "conversation_created",
-                            {"conversation_id": current_conversation_id},
-                        )
-
-                    # Save user message
-                    conv_service.add_message(
-                        current_conversation_id,
-                        MessageCreate(role="user", content=user_message),
+                                ),
+                                requested_conv_id,
+                            )
+                        except NotFoundError:
+                            await manager.send_event(
+                                websocket, "error", {"message": "Conversation not found"}
+                            )
+                            continue
+                        if "history" in data:
+                            # A client-sent history takes precedence over the stored one
+                            conversation_history.conversation_id = requested_conv_id
+                        else:
+                            conversation_history.replace(
+                                ({"role": m.role, "content": m.content} for m in recent_messages),
+                                conversation_id=requested_conv_id,
+                            )
+                    current_conversation_id = requested_conv_id
+                elif not current_conversation_id:
+                    # Create new conversation
+                    conv_data = ConversationCreate(
+{%- if cookiecutter.websocket_auth_jwt %}
+                        user_id=str(user.id),
+{%- endif %}
+                        title=user_message[:50] if len(user_message) > 50 else user_message,
+                    )
+                    conversation = await run_in_session(
+                        lambda db, conv_data: get_conversation_service(db).create_conversation(conv_data),
+                        conv_data,
+                    )
+                    current_conversation_id = str(conversation.id)
+                    conversation_history.conversation_id = current_conversation_id
+                    await manager.send_event(
+                        websocket,
+                        "conversation_created",
+                        {"conversation_id": current_conversation_id},
                     )
+
+                # Queue user message; it is written together with the reply
+                message_buffer.add_message(
+                    current_conversation_id,
+                    MessageCreate(role="user", content=user_message),
+                )
 {%- endif %}
             except Exception as e:
                 logger.warning(f"Failed to persist conversation: {e}")
@@ -706,8 +965,28 @@ async def agent_websocket(
 
             requested_conv_id = data.get("conversation_id")
             if requested_conv_id:
+                if requested_conv_id != conversation_history.conversation_id:
+                    # Load recent history once (also verifies the user may open it)
+                    try:
+                        recent_messages = await conv_service.list_recent_messages(
+                            requested_conv_id,
+                            limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                            user_id=str(user.id),
+{%- endif %}
+                        )
+                    except NotFoundError:
+                        await manager.send_event(websocket, "error", {"message": "Conversation not found"})
+                        continue
+                    if "history" in data:
+                        # A client-sent history takes precedence over the stored one
+                        conversation_history.conversation_id = requested_conv_id
+                    else:
+                        conversation_history.replace(
+                            ({"role": m.role, "content": m.content} for m in recent_messages),
+                            conversation_id=requested_conv_id,
+                        )
                 current_conversation_id = requested_conv_id
-                await conv_service.get_conversation(requested_conv_id)
             elif not current_conversation_id:
                 conv_data = ConversationCreate(
 {%- if cookiecutter.websocket_auth_jwt %}
@@ -717,14 +996,15 @@ async def agent_websocket(
                 )
                 conversation = await conv_service.create_conversation(conv_data)
                 current_conversation_id = str(conversation.id)
+                conversation_history.conversation_id = current_conversation_id
                 await manager.send_event(
                     websocket,
                     "conversation_created",
                     {"conversation_id": current_conversation_id},
                 )
 
-            # Save user message
-            await conv_service.add_message(
+            # Queue user message; it is written together with the reply
+            message_buffer.add_message(
                 current_conversation_id,
                 MessageCreate(role="user", content=user_message),
             )
@@ -734,148 +1014,171 @@ async def agent_websocket(
 
             try:
                 assistant = get_agent()
-                model_history = build_message_history(conversation_history)
+                model_history = conversation_history.model_messages()
                 model_history.append(HumanMessage(content=user_message))
 
-                final_output = ""
-                tool_events: list[Any] = []
-                seen_tool_call_ids: set[str] = set()
+                cache_key = completion_key(
+                    model_name=assistant.model_name,
+                    temperature=assistant.temperature,
+                    system_prompt=assistant.system_prompt,
+                    history=conversation_history.messages,
+                    user_input=user_message,
+                )
+{%- if cookiecutter.enable_rate_limiting %}
+                tokens_used = 0
+{%- endif %}
+                cached = await completion_cache.get(cache_key)
+                if cached is not None and cached.events:
+                    # Replay the stored event stream instead of calling the model
+                    for event_type, event_data in cached.events:
+                        await manager.send_event(websocket, event_type, event_data)
+                    final_output = cached.output
+                else:
+                    if completion_cache.enabled:
+                        manager.start_recording(websocket)
 
-                await manager.send_event(websocket, "model_request_start", {})
+                    final_output = ""
+                    tool_events: list[Any] = []
+                    seen_tool_call_ids: set[str] = set()
 
-                for stream_mode, data in assistant.agent.stream(
-                    {"messages": model_history},
-                    stream_mode=["messages", "updates"],
-                    config={"configurable": context} if context else None,
-                ):
-                    if stream_mode == "messages":
-                        token, metadata = data
+                    await manager.send_event(websocket, "model_request_start", {})
 
-                        if isinstance(token, AIMessageChunk):
-                            if token.content:
-                                text_content = ""
-                                if isinstance(token.content, str):
-                                    text_content = token.content
-                                elif isinstance(token.content, list):
-                                    for block in token.content:
-                                        if isinstance(block, dict) and block.get("type") == "text":
-                                            text_content += block.get("text", "")
-                                        elif isinstance(block, str):
-                                            text_content += block
-
-                                if text_content:
-                                    await manager.send_event(
-                                        websocket,
-                                        "text_delta",
-                                        {"content": text_content},
-                                    )
-                                    final_output += text_content
-
-                            if token.tool_call_chunks:
-                                for tc_chunk in token.tool_call_chunks:
-                                    tc_id = tc_chunk.get("id")
-                                    tc_name = tc_chunk.get("name")
-                                    if tc_id and tc_name and tc_id not in seen_tool_call_ids:
-                                        seen_tool_call_ids.add(tc_id)
+                    for stream_mode, data in assistant.agent.stream(
+                        {"messages": model_history},
+                        stream_mode=["messages", "updates"],
+                        config={"configurable": context} if context else None,
+                    ):
+                        if stream_mode == "messages":
+                            token, metadata = data
+
+                            if isinstance(token, AIMessageChunk):
+                                if token.content:
+                                    text_content = ""
+                                    if isinstance(token.content, str):
+                                        text_content = token.content
+                                    elif isinstance(token.content, list):
+                                        for block in token.content:
+                                            if isinstance(block, dict) and block.get("type") == "text":
+                                                text_content += block.get("text", "")
+                                            elif isinstance(block, str):
+                                                text_content += block
+
+                                    if text_content:
                                         await manager.send_event(
                                             websocket,
-                                            "tool_call",
-                                            {
-                                                "tool_name": tc_name,
-                                                "args": {},
-                                                "tool_call_id": tc_id,
-                                            },
+                                            "text_delta",
+                                            {"content": text_content},
                                         )
+                                        final_output += text_content
+
+                                if token.tool_call_chunks:
+                                    for tc_chunk in token.tool_call_chunks:
+                                        tc_id = tc_chunk.get("id")
+                                        tc_name = tc_chunk.get("name")
+                                        if tc_id and tc_name and tc_id not in seen_tool_call_ids:
+                                            seen_tool_call_ids.add(tc_id)
+                                            await manager.send_event(
+                                                websocket,
+                                                "tool_call",
+                                                {
+                                                    "tool_name": tc_name,
+                                                    "args": {},
+                                                    "tool_call_id": tc_id,
+                                                },
+                                            )
 
-                    elif stream_mode == "updates":
-                        for node_name, update in data.items():
-                            if node_name == "tools":
-                                for msg in update.get("messages", []):
-                                    if isinstance(msg, ToolMessage):
-                                        await manager.send_event(
-                                            websocket,
-                                            "tool_result",
-                                            {
-                                                "tool_call_id": msg.tool_call_id,
-                                                "content": msg.content,
-                                            },
-                                        )
-                            elif node_name == "model":
-                                for msg in update.get("messages", []):
-                                    if isinstance(msg, AIMessage) and msg.tool_calls:
-                                        for tc in msg.tool_calls:
-                                            tc_id = tc.get("id", "")
-                                            if tc_id not in seen_tool_call_ids:
-                                                seen_tool_call_ids.add(tc_id)
-                                                tool_events.append(tc)
-                                                await manager.send_event(
-                                                    websocket,
-                                                    "tool_call",
-                                                    {
-                                                        "tool_name": tc.get("name", ""),
-                                                        "args": tc.get("args", {}),
-                                                        "tool_call_id": tc_id,
-                                                    },
+                        elif stream_mode == "updates":
+                            for node_name, update in data.items():
+                                if node_name == "tools":
+                                    for msg in update.get("messages", []):
+                                        if isinstance(msg, ToolMessage):
+                                            await manager.send_event(
+                                                websocket,
+                                                "tool_result",
+                                                {
+                                                    "tool_call_id": msg.tool_call_id,
+                                                    "content": msg.content,
+                                                },
+                                            )
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                                            message_buffer.complete_tool_call(
+                                                msg.tool_call_id,
+                                                ToolCallComplete(
+                                                    result=str(msg.content),
+                                                    success=msg.status != "error",
+                                                ),
+                                            )
+{%- endif %}
+                                elif node_name == "model":
+                                    for msg in update.get("messages", []):
+{%- if cookiecutter.enable_rate_limiting %}
+                                        if isinstance(msg, AIMessage) and msg.usage_metadata:
+                                            tokens_used += msg.usage_metadata["total_tokens"]
+{%- endif %}
+                                        if isinstance(msg, AIMessage) and msg.tool_calls:
+                                            for tc in msg.tool_calls:
+                                                tc_id = tc.get("id", "")
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                                                message_buffer.start_tool_call(
+                                                    ToolCallCreate(
+                                                        tool_call_id=tc_id,
+                                                        tool_name=tc.get("name", ""),
+                                                        args=tc.get("args", {}),
+                                                    )
                                                 )
+{%- endif %}
+                                                if tc_id not in seen_tool_call_ids:
+                                                    seen_tool_call_ids.add(tc_id)
+                                                    tool_events.append(tc)
+                                                    await manager.send_event(
+                                                        websocket,
+                                                        "tool_call",
+                                                        {
+                                                            "tool_name": tc.get("name", ""),
+                                                            "args": tc.get("args", {}),
+                                                            "tool_call_id": tc_id,
+                                                        },
+                                                    )
 
-                await manager.send_event(
-                    websocket,
-                    "final_result",
-                    {"output": final_output},
-                )
+                    await manager.send_event(
+                        websocket,
+                        "final_result",
+                        {"output": final_output},
+                    )
+
+                    completion = CachedCompletion(final_output, manager.stop_recording(websocket))
+                    if final_output and not completion.calls_tools:
+                        await completion_cache.set(cache_key, completion)
 
                 # Update conversation history
-                conversation_history.append({"role": "user", "content": user_message})
+                conversation_history.append("user", user_message)
                 if final_output:
-                    conversation_history.append(
-                        {"role": "assistant", "content": final_output}
-                    )
+                    conversation_history.append("assistant", final_output)
+{%- if cookiecutter.enable_rate_limiting %}
+                # Charge the tokens the model reported for the turn; a cached reply costs none
+                await charge_agent_tokens(websocket, tokens_used)
+{%- endif %}
 
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
 
-                # Save assistant response to database
+                # Queue the reply and write the turn's messages and tool calls in one batch
                 if current_conversation_id and final_output:
-                    try:
+                    message_buffer.add_message(
 {%- if cookiecutter.use_postgresql %}
-                        async with get_db_context() as db:
-                            conv_service = get_conversation_service(db)
-                            await conv_service.add_message(
-                                UUID(current_conversation_id),
-                                MessageCreate(
-                                    role="assistant",
-                                    content=final_output,
-                                    model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                ),
-                            )
+                        UUID(current_conversation_id),
 {%- else %}
-                        with get_db_session() as db:
-                            conv_service = get_conversation_service(db)
-                            conv_service.add_message(
-                                current_conversation_id,
-                                MessageCreate(
-                                    role="assistant",
-                                    content=final_output,
-                                    model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                ),
-                            )
+                        current_conversation_id,
 {%- endif %}
-                    except Exception as e:
-                        logger.warning(f"Failed to persist assistant response: {e}")
-{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
-
-                # Save assistant response to database
-                if current_conversation_id and final_output:
-                    try:
-                        await conv_service.add_message(
-                            current_conversation_id,
-                            MessageCreate(
-                                role="assistant",
-                                content=final_output,
-                                model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                            ),
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to persist assistant response: {e}")
+                        MessageCreate(
+                            role="assistant",
+                            content=final_output,
+                            model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
+                        ),
+                    )
+                try:
+                    await message_buffer.maybe_flush()
+                except Exception as e:
+                    logger.warning(f"Failed to persist conversation messages: {e}")
 {%- endif %}
 
                 await manager.send_event(websocket, "complete", {
@@ -890,6 +1193,7 @@ async def agent_websocket(
                 break
             except Exception as e:
                 logger.exception(f"Error processing agent request: {e}")
+                manager.stop_recording(websocket)
                 # Try to send error, but don't fail if connection is closed
                 await manager.send_event(websocket, "error", {"message": str(e)})
 
@@ -897,6 +1201,13 @@ async def agent_websocket(
         pass  # Normal disconnect
     finally:
         manager.disconnect(websocket)
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+        # Write anything still buffered before the connection goes away
+        try:
+            await message_buffer.close()
+        except Exception as e:
+            logger.warning(f"Failed to persist buffered messages: {e}")
+{%- endif %}
 {%- elif cookiecutter.enable_ai_agent and cookiecutter.use_langgraph %}
 """AI Agent WebSocket routes with streaming support (LangGraph ReAct Agent)."""
 
@@ -913,21 +1224,35 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect{%- if cookiecutter
 
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage
 
+from app.agents.completion_cache import CachedCompletion, completion_cache, completion_key
+from app.agents.event_channel import AgentEventChannel
+from app.agents.history import ConversationHistory
 from app.agents.langgraph_assistant import AgentContext, get_agent
 {%- if cookiecutter.websocket_auth_jwt %}
 from app.api.deps import get_current_user_ws
 from app.db.models.user import User
 {%- endif %}
-{%- if cookiecutter.websocket_auth_api_key %}
+{%- if cookiecutter.websocket_auth_api_key or (cookiecutter.enable_conversation_persistence and cookiecutter.use_database) %}
 from app.core.config import settings
 {%- endif %}
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_rate_limiting %}
+from app.core.rate_limit import charge_agent_tokens, check_agent_turn
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_postgresql %}
 from app.db.session import get_db_context
+{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_sqlite %}
+from app.db.session import run_in_session
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate, ToolCallCreate, ToolCallComplete
+from app.services.message_buffer import MessageBuffer
 {%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate, ToolCallCreate, ToolCallComplete
+from app.services.message_buffer import MessageBuffer
 {%- endif %}
 
 logger = logging.getLogger(__name__)
@@ -940,26 +1265,50 @@ class AgentConnectionManager:
 
     def __init__(self) -> None:
         self.active_connections: list[WebSocket] = []
+        self._channels: dict[WebSocket, AgentEventChannel] = {}
+        # Events sent to connections whose turn is being recorded for the completion cache
+        self._recordings: dict[WebSocket, list[tuple[str, Any]]] = {}
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept and store a new WebSocket connection."""
-        await websocket.accept()
+        channel = AgentEventChannel.from_websocket(websocket)
+        await websocket.accept(subprotocol=channel.subprotocol)
         self.active_connections.append(websocket)
+        self._channels[websocket] = channel
         logger.info(f"Agent WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        channel = self._channels.pop(websocket, None)
+        if channel is not None:
+            channel.close()
+        self._recordings.pop(websocket, None)
         logger.info(f"Agent WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
+    def start_recording(self, websocket: WebSocket) -> None:
+        """Keep a copy of the events sent to ``websocket`` until ``stop_recording``."""
+        self._recordings[websocket] = []
+
+    def stop_recording(self, websocket: WebSocket) -> list[tuple[str, Any]]:
+        """Stop recording and return the events sent since ``start_recording``."""
+        return self._recordings.pop(websocket, [])
+
     async def send_event(self, websocket: WebSocket, event_type: str, data: Any) -> bool:
-        """Send a JSON event to a specific WebSocket client.
+        """Send an event to a specific WebSocket client.
 
+        Text deltas may be held back briefly and merged (see AgentEventChannel).
         Returns True if sent successfully, False if connection is closed.
         """
+        recording = self._recordings.get(websocket)
+        if recording is not None:
+            recording.append((event_type, data))
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return False
         try:
-            await websocket.send_json({"type": event_type, "data": data})
+            await channel.send(event_type, data)
             return True
         except (WebSocketDisconnect, RuntimeError):
             # Connection already closed
@@ -1021,6 +1370,11 @@ async def agent_websocket(
         "history": [{"role": "user|assistant|system", "content": "..."}]{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %},
         "conversation_id": "optional-uuid-to-continue-existing-conversation"{% endif %}
     }
+
+    Only "message" is required. History is kept server-side per connection
+    and trimmed to AGENT_HISTORY_MAX_TOKENS{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}; it is loaded from the database
+    when an existing conversation is resumed{% endif %}. An optional "history"
+    array from the client replaces it.
 {%- if cookiecutter.websocket_auth_jwt %}
 
     Authentication: Requires a valid JWT token passed as a query parameter or header.
@@ -1045,8 +1399,8 @@ async def agent_websocket(
 
     await manager.connect(websocket)
 
-    # Conversation state per connection
-    conversation_history: list[dict[str, str]] = []
+    # Conversation state per connection (server-side, token-bounded history)
+    conversation_history: ConversationHistory[Any] = ConversationHistory()
     context: AgentContext = {}
 {%- if cookiecutter.websocket_auth_jwt %}
     context["user_id"] = str(user.id) if user else None
@@ -1054,6 +1408,7 @@ async def agent_websocket(
 {%- endif %}
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
     current_conversation_id: str | None = None
+    message_buffer = MessageBuffer()
 {%- endif %}
 
     try:
@@ -1061,14 +1416,28 @@ async def agent_websocket(
             # Receive user message
             data = await websocket.receive_json()
             user_message = data.get("message", "")
-            # Optionally accept history from client (or use server-side tracking)
+            # History is tracked server-side; a client-sent history overrides it
             if "history" in data:
-                conversation_history = data["history"]
+                conversation_history.replace(
+                    data["history"], conversation_id=conversation_history.conversation_id
+                )
 
             if not user_message:
                 await manager.send_event(websocket, "error", {"message": "Empty message"})
                 continue
 
+{%- if cookiecutter.enable_rate_limiting %}
+
+            rate_limit = await check_agent_turn(websocket)
+            if not rate_limit.allowed:
+                await manager.send_event(
+                    websocket,
+                    "error",
+                    {"message": "Rate limit exceeded", "retry_after": round(rate_limit.retry_after, 1)},
+                )
+                continue
+{%- endif %}
+
 {%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 
             # Handle conversation persistence
@@ -1080,9 +1449,30 @@ async def agent_websocket(
                     # Get or create conversation
                     requested_conv_id = data.get("conversation_id")
                     if requested_conv_id:
+                        if requested_conv_id != conversation_history.conversation_id:
+                            # Load recent history once (also verifies the user may open it)
+                            try:
+                                recent_messages = await conv_service.list_recent_messages(
+                                    UUID(requested_conv_id),
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                                    user_id=user.id,
+{%- endif %}
+                                )
+                            except NotFoundError:
+                                await manager.send_event(
+                                    websocket, "error", {"message": "Conversation not found"}
+                                )
+                                continue
+                            if "history" in data:
+                                # A client-sent history takes precedence over the stored one
+                                conversation_history.conversation_id = requested_conv_id
+                            else:
+                                conversation_history.replace(
+                                    ({"role": m.role, "content": m.content} for m in recent_messages),
+                                    conversation_id=requested_conv_id,
+                                )
                         current_conversation_id = requested_conv_id
-                        # Verify conversation exists
-                        await conv_service.get_conversation(UUID(requested_conv_id))
                     elif not current_conversation_id:
                         # Create new conversation
                         conv_data = ConversationCreate(
@@ -1093,47 +1483,74 @@ async def agent_websocket(
                         )
                         conversation = await conv_service.create_conversation(conv_data)
                         current_conversation_id = str(conversation.id)
+                        conversation_history.conversation_id = current_conversation_id
                         await manager.send_event(
                             websocket,
                             "conversation_created",
                             {"conversation_id": current_conversation_id},
                         )
 
-                    # Save user message
-                    await conv_service.add_message(
+                    # Queue user message; it is written together with the reply
+                    message_buffer.add_message(
                         UUID(current_conversation_id),
                         MessageCreate(role="user", content=user_message),
                     )
 {%- else %}
-                with get_db_session() as db:
-                    conv_service = get_conversation_service(db)
-
-                    # Get or create conversation
-                    requested_conv_id = data.get("conversation_id")
-                    if requested_conv_id:
-                        current_conversation_id = requested_conv_id
-                        conv_service.get_conversation(requested_conv_id)
-                    elif not current_conversation_id:
-                        # Create new conversation
-                        conv_data = ConversationCreate(
+                # SQLite calls block, so they run in a worker thread
+                requested_conv_id = data.get("conversation_id")
+                if requested_conv_id:
+                    if requested_conv_id != conversation_history.conversation_id:
+                        # Load recent history once (also verifies the user may open it)
+                        try:
+                            recent_messages = await run_in_session(
+                                lambda db, conv_id: get_conversation_service(db).list_recent_messages(
+                                    conv_id,
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
 {%- if cookiecutter.websocket_auth_jwt %}
-                            user_id=str(user.id),
+                                    user_id=str(user.id),
 {%- endif %}
-                            title=user_message[:50] if len(user_message) > 50 else user_message,
-                        )
-                        conversation = conv_service.create_conversation(conv_data)
-                        current_conversation_id = str(conversation.id)
-                        await manager.send_event(
-                            websocket,
-                            "conversation_created",
-                            {"conversation_id": current_conversation_id},
-                        )
-
-                    # Save user message
-                    conv_service.add_message(
-                        current_conversation_id,
-                        MessageCreate(role="user", content=user_message),
+                                ),
+                                requested_conv_id,
+                            )
+                        except NotFoundError:
+                            await manager.send_event(
+                                websocket, "error", {"message": "Conversation not found"}
+                            )
+                            continue
+                        if "history" in data:
+                            # A client-sent history takes precedence over the stored one
+                            conversation_history.conversation_id = requested_conv_id
+                        else:
+                            conversation_history.replace(
+                                ({"role": m.role, "content": m.content} for m in recent_messages),
+                                conversation_id=requested_conv_id,
+                            )
+                    current_conversation_id = requested_conv_id
+                elif not current_conversation_id:
+                    # Create new conversation
+                    conv_data = ConversationCreate(
+{%- if cookiecutter.websocket_auth_jwt %}
+                        user_id=str(user.id),
+{%- endif %}
+                        title=user_message[:50] if len(user_message) > 50 else user_message,
+                    )
+                    conversation = await run_in_session(
+                        lambda db, conv_data: get_conversation_service(db).create_conversation(conv_data),
+                        conv_data,
                     )
+                    current_conversation_id = str(conversation.id)
+                    conversation_history.conversation_id = current_conversation_id
+                    await manager.send_event(
+                        websocket,
+                        "conversation_created",
+                        {"conversation_id": current_conversation_id},
+                    )
+
+                # Queue user message; it is written together with the reply
+                message_buffer.add_message(
+                    current_conversation_id,
+                    MessageCreate(role="user", content=user_message),
+                )
 {%- endif %}
             except Exception as e:
                 logger.warning(f"Failed to persist conversation: {e}")
@@ -1145,8 +1562,28 @@ async def agent_websocket(
 
             requested_conv_id = data.get("conversation_id")
             if requested_conv_id:
+                if requested_conv_id != conversation_history.conversation_id:
+                    # Load recent history once (also verifies the user may open it)
+                    try:
+                        recent_messages = await conv_service.list_recent_messages(
+                            requested_conv_id,
+                            limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                            user_id=str(user.id),
+{%- endif %}
+                        )
+                    except NotFoundError:
+                        await manager.send_event(websocket, "error", {"message": "Conversation not found"})
+                        continue
+                    if "history" in data:
+                        # A client-sent history takes precedence over the stored one
+                        conversation_history.conversation_id = requested_conv_id
+                    else:
+                        conversation_history.replace(
+                            ({"role": m.role, "content": m.content} for m in recent_messages),
+                            conversation_id=requested_conv_id,
+                        )
                 current_conversation_id = requested_conv_id
-                await conv_service.get_conversation(requested_conv_id)
             elif not current_conversation_id:
                 conv_data = ConversationCreate(
 {%- if cookiecutter.websocket_auth_jwt %}
@@ -1156,14 +1593,15 @@ async def agent_websocket(
                 )
                 conversation = await conv_service.create_conversation(conv_data)
                 current_conversation_id = str(conversation.id)
+                conversation_history.conversation_id = current_conversation_id
                 await manager.send_event(
                     websocket,
                     "conversation_created",
                     {"conversation_id": current_conversation_id},
                 )
 
-            # Save user message
-            await conv_service.add_message(
+            # Queue user message; it is written together with the reply
+            message_buffer.add_message(
                 current_conversation_id,
                 MessageCreate(role="user", content=user_message),
             )
@@ -1174,150 +1612,174 @@ async def agent_websocket(
             try:
                 assistant = get_agent()
 
-                final_output = ""
-                tool_events: list[Any] = []
-                seen_tool_call_ids: set[str] = set()
-
-                await manager.send_event(websocket, "model_request_start", {})
-
-                # Use LangGraph's astream with messages and updates modes
-                async for stream_mode, data in assistant.stream(
-                    user_message,
-                    history=conversation_history,
-                    context=context,
-                ):
-                    if stream_mode == "messages":
-                        chunk, _metadata = data
-
-                        if isinstance(chunk, AIMessageChunk):
-                            if chunk.content:
-                                text_content = ""
-                                if isinstance(chunk.content, str):
-                                    text_content = chunk.content
-                                elif isinstance(chunk.content, list):
-                                    for block in chunk.content:
-                                        if isinstance(block, dict) and block.get("type") == "text":
-                                            text_content += block.get("text", "")
-                                        elif isinstance(block, str):
-                                            text_content += block
+                cache_key = completion_key(
+                    model_name=assistant.model_name,
+                    temperature=assistant.temperature,
+                    system_prompt=assistant.system_prompt,
+                    history=conversation_history.messages,
+                    user_input=user_message,
+                )
+{%- if cookiecutter.enable_rate_limiting %}
+                tokens_used = 0
+{%- endif %}
+                cached = await completion_cache.get(cache_key)
+                if cached is not None and cached.events:
+                    # Replay the stored event stream instead of calling the model
+                    for event_type, event_data in cached.events:
+                        await manager.send_event(websocket, event_type, event_data)
+                    final_output = cached.output
+                else:
+                    if completion_cache.enabled:
+                        manager.start_recording(websocket)
 
-                                if text_content:
-                                    await manager.send_event(
-                                        websocket,
-                                        "text_delta",
-                                        {"content": text_content},
-                                    )
-                                    final_output += text_content
+                    final_output = ""
+                    tool_events: list[Any] = []
+                    seen_tool_call_ids: set[str] = set()
 
-                            # Handle tool call chunks
-                            if chunk.tool_call_chunks:
-                                for tc_chunk in chunk.tool_call_chunks:
-                                    tc_id = tc_chunk.get("id")
-                                    tc_name = tc_chunk.get("name")
-                                    if tc_id and tc_name and tc_id not in seen_tool_call_ids:
-                                        seen_tool_call_ids.add(tc_id)
-                                        await manager.send_event(
-                                            websocket,
-                                            "tool_call",
-                                            {
-                                                "tool_name": tc_name,
-                                                "args": {},
-                                                "tool_call_id": tc_id,
-                                            },
-                                        )
+                    await manager.send_event(websocket, "model_request_start", {})
 
-                    elif stream_mode == "updates":
-                        # Handle state updates from nodes
-                        for node_name, update in data.items():
-                            if node_name == "tools":
-                                # Tool node completed - extract tool results
-                                for msg in update.get("messages", []):
-                                    if isinstance(msg, ToolMessage):
+                    # Use LangGraph's astream with messages and updates modes
+                    async for stream_mode, data in assistant.stream(
+                        user_message,
+                        history=conversation_history.messages,
+                        context=context,
+                    ):
+                        if stream_mode == "messages":
+                            chunk, _metadata = data
+
+                            if isinstance(chunk, AIMessageChunk):
+                                if chunk.content:
+                                    text_content = ""
+                                    if isinstance(chunk.content, str):
+                                        text_content = chunk.content
+                                    elif isinstance(chunk.content, list):
+                                        for block in chunk.content:
+                                            if isinstance(block, dict) and block.get("type") == "text":
+                                                text_content += block.get("text", "")
+                                            elif isinstance(block, str):
+                                                text_content += block
+
+                                    if text_content:
                                         await manager.send_event(
                                             websocket,
-                                            "tool_result",
-                                            {
-                                                "tool_call_id": msg.tool_call_id,
-                                                "content": msg.content,
-                                            },
+                                            "text_delta",
+                                            {"content": text_content},
                                         )
-                            elif node_name == "agent":
-                                # Agent node completed - check for tool calls
-                                for msg in update.get("messages", []):
-                                    if isinstance(msg, AIMessage) and msg.tool_calls:
-                                        for tc in msg.tool_calls:
-                                            tc_id = tc.get("id", "")
-                                            if tc_id not in seen_tool_call_ids:
-                                                seen_tool_call_ids.add(tc_id)
-                                                tool_events.append(tc)
-                                                await manager.send_event(
-                                                    websocket,
-                                                    "tool_call",
-                                                    {
-                                                        "tool_name": tc.get("name", ""),
-                                                        "args": tc.get("args", {}),
-                                                        "tool_call_id": tc_id,
-                                                    },
+                                        final_output += text_content
+
+                                # Handle tool call chunks
+                                if chunk.tool_call_chunks:
+                                    for tc_chunk in chunk.tool_call_chunks:
+                                        tc_id = tc_chunk.get("id")
+                                        tc_name = tc_chunk.get("name")
+                                        if tc_id and tc_name and tc_id not in seen_tool_call_ids:
+                                            seen_tool_call_ids.add(tc_id)
+                                            await manager.send_event(
+                                                websocket,
+                                                "tool_call",
+                                                {
+                                                    "tool_name": tc_name,
+                                                    "args": {},
+                                                    "tool_call_id": tc_id,
+                                                },
+                                            )
+
+                        elif stream_mode == "updates":
+                            # Handle state updates from nodes
+                            for node_name, update in data.items():
+                                if node_name == "tools":
+                                    # Tool node completed - extract tool results
+                                    for msg in update.get("messages", []):
+                                        if isinstance(msg, ToolMessage):
+                                            await manager.send_event(
+                                                websocket,
+                                                "tool_result",
+                                                {
+                                                    "tool_call_id": msg.tool_call_id,
+                                                    "content": msg.content,
+                                                    "duration_ms": msg.response_metadata.get("duration_ms"),
+                                                },
+                                            )
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                                            message_buffer.complete_tool_call(
+                                                msg.tool_call_id,
+                                                ToolCallComplete(
+                                                    result=str(msg.content),
+                                                    success=msg.status != "error",
+                                                ),
+                                            )
+{%- endif %}
+                                elif node_name == "agent":
+                                    # Agent node completed - check for tool calls
+                                    for msg in update.get("messages", []):
+{%- if cookiecutter.enable_rate_limiting %}
+                                        if isinstance(msg, AIMessage) and msg.usage_metadata:
+                                            tokens_used += msg.usage_metadata["total_tokens"]
+{%- endif %}
+                                        if isinstance(msg, AIMessage) and msg.tool_calls:
+                                            for tc in msg.tool_calls:
+                                                tc_id = tc.get("id", "")
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                                                message_buffer.start_tool_call(
+                                                    ToolCallCreate(
+                                                        tool_call_id=tc_id,
+                                                        tool_name=tc.get("name", ""),
+                                                        args=tc.get("args", {}),
+                                                    )
                                                 )
+{%- endif %}
+                                                if tc_id not in seen_tool_call_ids:
+                                                    seen_tool_call_ids.add(tc_id)
+                                                    tool_events.append(tc)
+                                                    await manager.send_event(
+                                                        websocket,
+                                                        "tool_call",
+                                                        {
+                                                            "tool_name": tc.get("name", ""),
+                                                            "args": tc.get("args", {}),
+                                                            "tool_call_id": tc_id,
+                                                        },
+                                                    )
 
-                await manager.send_event(
-                    websocket,
-                    "final_result",
-                    {"output": final_output},
-                )
+                    await manager.send_event(
+                        websocket,
+                        "final_result",
+                        {"output": final_output},
+                    )
+
+                    completion = CachedCompletion(final_output, manager.stop_recording(websocket))
+                    if final_output and not completion.calls_tools:
+                        await completion_cache.set(cache_key, completion)
 
                 # Update conversation history
-                conversation_history.append({"role": "user", "content": user_message})
+                conversation_history.append("user", user_message)
                 if final_output:
-                    conversation_history.append(
-                        {"role": "assistant", "content": final_output}
-                    )
+                    conversation_history.append("assistant", final_output)
+{%- if cookiecutter.enable_rate_limiting %}
+                # Charge the tokens the model reported for the turn; a cached reply costs none
+                await charge_agent_tokens(websocket, tokens_used)
+{%- endif %}
 
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
 
-                # Save assistant response to database
+                # Queue the reply and write the turn's messages and tool calls in one batch
                 if current_conversation_id and final_output:
-                    try:
+                    message_buffer.add_message(
 {%- if cookiecutter.use_postgresql %}
-                        async with get_db_context() as db:
-                            conv_service = get_conversation_service(db)
-                            await conv_service.add_message(
-                                UUID(current_conversation_id),
-                                MessageCreate(
-                                    role="assistant",
-                                    content=final_output,
-                                    model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                ),
-                            )
+                        UUID(current_conversation_id),
 {%- else %}
-                        with get_db_session() as db:
-                            conv_service = get_conversation_service(db)
-                            conv_service.add_message(
-                                current_conversation_id,
-                                MessageCreate(
-                                    role="assistant",
-                                    content=final_output,
-                                    model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                ),
-                            )
+                        current_conversation_id,
 {%- endif %}
-                    except Exception as e:
-                        logger.warning(f"Failed to persist assistant response: {e}")
-{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
-
-                # Save assistant response to database
-                if current_conversation_id and final_output:
-                    try:
-                        await conv_service.add_message(
-                            current_conversation_id,
-                            MessageCreate(
-                                role="assistant",
-                                content=final_output,
-                                model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                            ),
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to persist assistant response: {e}")
+                        MessageCreate(
+                            role="assistant",
+                            content=final_output,
+                            model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
+                        ),
+                    )
+                try:
+                    await message_buffer.maybe_flush()
+                except Exception as e:
+                    logger.warning(f"Failed to persist conversation messages: {e}")
 {%- endif %}
 
                 await manager.send_event(websocket, "complete", {
@@ -1332,6 +1794,7 @@ async def agent_websocket(
                 break
             except Exception as e:
                 logger.exception(f"Error processing agent request: {e}")
+                manager.stop_recording(websocket)
                 # Try to send error, but don't fail if connection is closed
                 await manager.send_event(websocket, "error", {"message": str(e)})
 
@@ -1339,6 +1802,13 @@ async def agent_websocket(
         pass  # Normal disconnect
     finally:
         manager.disconnect(websocket)
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+        # Write anything still buffered before the connection goes away
+        try:
+            await message_buffer.close()
+        except Exception as e:
+            logger.warning(f"Failed to persist buffered messages: {e}")
+{%- endif %}
 {%- elif cookiecutter.enable_ai_agent and cookiecutter.use_crewai %}
 """AI Agent WebSocket routes with streaming support (CrewAI Multi-Agent)."""
 
@@ -1354,20 +1824,33 @@ from uuid import UUID
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect{%- if cookiecutter.websocket_auth_jwt %}, Depends{%- endif %}{%- if cookiecutter.websocket_auth_api_key %}, Query{%- endif %}
 
 from app.agents.crewai_assistant import CrewContext, get_crew
+from app.agents.event_channel import AgentEventChannel
+from app.agents.history import ConversationHistory
 {%- if cookiecutter.websocket_auth_jwt %}
 from app.api.deps import get_current_user_ws
 from app.db.models.user import User
 {%- endif %}
-{%- if cookiecutter.websocket_auth_api_key %}
+{%- if cookiecutter.websocket_auth_api_key or (cookiecutter.enable_conversation_persistence and cookiecutter.use_database) %}
 from app.core.config import settings
 {%- endif %}
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_rate_limiting %}
+from app.core.rate_limit import charge_agent_tokens, check_agent_turn
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_postgresql %}
 from app.db.session import get_db_context
+{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_sqlite %}
+from app.db.session import run_in_session
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate
+from app.services.message_buffer import MessageBuffer
 {%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate
+from app.services.message_buffer import MessageBuffer
 {%- endif %}
 
 logger = logging.getLogger(__name__)
@@ -1380,26 +1863,36 @@ class AgentConnectionManager:
 
     def __init__(self) -> None:
         self.active_connections: list[WebSocket] = []
+        self._channels: dict[WebSocket, AgentEventChannel] = {}
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept and store a new WebSocket connection."""
-        await websocket.accept()
+        channel = AgentEventChannel.from_websocket(websocket)
+        await websocket.accept(subprotocol=channel.subprotocol)
         self.active_connections.append(websocket)
+        self._channels[websocket] = channel
         logger.info(f"Agent WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        channel = self._channels.pop(websocket, None)
+        if channel is not None:
+            channel.close()
         logger.info(f"Agent WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
     async def send_event(self, websocket: WebSocket, event_type: str, data: Any) -> bool:
-        """Send a JSON event to a specific WebSocket client.
+        """Send an event to a specific WebSocket client.
 
+        Text deltas may be held back briefly and merged (see AgentEventChannel).
         Returns True if sent successfully, False if connection is closed.
         """
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return False
         try:
-            await websocket.send_json({"type": event_type, "data": data})
+            await channel.send(event_type, data)
             return True
         except (WebSocketDisconnect, RuntimeError):
             # Connection already closed
@@ -1444,6 +1937,11 @@ async def agent_websocket(
         "history": [{"role": "user|assistant|system", "content": "..."}]{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %},
         "conversation_id": "optional-uuid-to-continue-existing-conversation"{% endif %}
     }
+
+    Only "message" is required. History is kept server-side per connection
+    and trimmed to AGENT_HISTORY_MAX_TOKENS{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}; it is loaded from the database
+    when an existing conversation is resumed{% endif %}. An optional "history"
+    array from the client replaces it.
 {%- if cookiecutter.websocket_auth_jwt %}
 
     Authentication: Requires a valid JWT token passed as a query parameter or header.
@@ -1468,8 +1966,8 @@ async def agent_websocket(
 
     await manager.connect(websocket)
 
-    # Conversation state per connection
-    conversation_history: list[dict[str, str]] = []
+    # Conversation state per connection (server-side, token-bounded history)
+    conversation_history: ConversationHistory[Any] = ConversationHistory()
     context: CrewContext = {}
 {%- if cookiecutter.websocket_auth_jwt %}
     context["user_id"] = str(user.id) if user else None
@@ -1477,6 +1975,7 @@ async def agent_websocket(
 {%- endif %}
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
     current_conversation_id: str | None = None
+    message_buffer = MessageBuffer()
 {%- endif %}
 
     try:
@@ -1484,14 +1983,28 @@ async def agent_websocket(
             # Receive user message
             data = await websocket.receive_json()
             user_message = data.get("message", "")
-            # Optionally accept history from client (or use server-side tracking)
+            # History is tracked server-side; a client-sent history overrides it
             if "history" in data:
-                conversation_history = data["history"]
+                conversation_history.replace(
+                    data["history"], conversation_id=conversation_history.conversation_id
+                )
 
             if not user_message:
                 await manager.send_event(websocket, "error", {"message": "Empty message"})
                 continue
 
+{%- if cookiecutter.enable_rate_limiting %}
+
+            rate_limit = await check_agent_turn(websocket)
+            if not rate_limit.allowed:
+                await manager.send_event(
+                    websocket,
+                    "error",
+                    {"message": "Rate limit exceeded", "retry_after": round(rate_limit.retry_after, 1)},
+                )
+                continue
+{%- endif %}
+
 {%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 
             # Handle conversation persistence
@@ -1503,9 +2016,30 @@ async def agent_websocket(
                     # Get or create conversation
                     requested_conv_id = data.get("conversation_id")
                     if requested_conv_id:
+                        if requested_conv_id != conversation_history.conversation_id:
+                            # Load recent history once (also verifies the user may open it)
+                            try:
+                                recent_messages = await conv_service.list_recent_messages(
+                                    UUID(requested_conv_id),
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                                    user_id=user.id,
+{%- endif %}
+                                )
+                            except NotFoundError:
+                                await manager.send_event(
+                                    websocket, "error", {"message": "Conversation not found"}
+                                )
+                                continue
+                            if "history" in data:
+                                # A client-sent history takes precedence over the stored one
+                                conversation_history.conversation_id = requested_conv_id
+                            else:
+                                conversation_history.replace(
+                                    ({"role": m.role, "content": m.content} for m in recent_messages),
+                                    conversation_id=requested_conv_id,
+                                )
                         current_conversation_id = requested_conv_id
-                        # Verify conversation exists
-                        await conv_service.get_conversation(UUID(requested_conv_id))
                     elif not current_conversation_id:
                         # Create new conversation
                         conv_data = ConversationCreate(
@@ -1516,47 +2050,74 @@ async def agent_websocket(
                         )
                         conversation = await conv_service.create_conversation(conv_data)
                         current_conversation_id = str(conversation.id)
+                        conversation_history.conversation_id = current_conversation_id
                         await manager.send_event(
                             websocket,
                             "conversation_created",
                             {"conversation_id": current_conversation_id},
                         )
 
-                    # Save user message
-                    await conv_service.add_message(
+                    # Queue user message; it is written together with the reply
+                    message_buffer.add_message(
                         UUID(current_conversation_id),
                         MessageCreate(role="user", content=user_message),
                     )
 {%- else %}
-                with get_db_session() as db:
-                    conv_service = get_conversation_service(db)
-
-                    # Get or create conversation
-                    requested_conv_id = data.get("conversation_id")
-                    if requested_conv_id:
-                        current_conversation_id = requested_conv_id
-                        conv_service.get_conversation(requested_conv_id)
-                    elif not current_conversation_id:
-                        # Create new conversation
-                        conv_data = ConversationCreate(
+                # SQLite calls block, so they run in a worker thread
+                requested_conv_id = data.get("conversation_id")
+                if requested_conv_id:
+                    if requested_conv_id != conversation_history.conversation_id:
+                        # Load recent history once (also verifies the user may open it)
+                        try:
+                            recent_messages = await run_in_session(
+                                lambda db, conv_id: get_conversation_service(db).list_recent_messages(
+                                    conv_id,
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
 {%- if cookiecutter.websocket_auth_jwt %}
-                            user_id=str(user.id),
+                                    user_id=str(user.id),
 {%- endif %}
-                            title=user_message[:50] if len(user_message) > 50 else user_message,
-                        )
-                        conversation = conv_service.create_conversation(conv_data)
-                        current_conversation_id = str(conversation.id)
-                        await manager.send_event(
-                            websocket,
-                            "conversation_created",
-                            {"conversation_id": current_conversation_id},
-                        )
-
-                    # Save user message
-                    conv_service.add_message(
-                        current_conversation_id,
-                        MessageCreate(role="user", content=user_message),
+                                ),
+                                requested_conv_id,
+                            )
+                        except NotFoundError:
+                            await manager.send_event(
+                                websocket, "error", {"message": "Conversation not found"}
+                            )
+                            continue
+                        if "history" in data:
+                            # A client-sent history takes precedence over the stored one
+                            conversation_history.conversation_id = requested_conv_id
+                        else:
+                            conversation_history.replace(
+                                ({"role": m.role, "content": m.content} for m in recent_messages),
+                                conversation_id=requested_conv_id,
+                            )
+                    current_conversation_id = requested_conv_id
+                elif not current_conversation_id:
+                    # Create new conversation
+                    conv_data = ConversationCreate(
+{%- if cookiecutter.websocket_auth_jwt %}
+                        user_id=str(user.id),
+{%- endif %}
+                        title=user_message[:50] if len(user_message) > 50 else user_message,
+                    )
+                    conversation = await run_in_session(
+                        lambda db, conv_data: get_conversation_service(db).create_conversation(conv_data),
+                        conv_data,
                     )
+                    current_conversation_id = str(conversation.id)
+                    conversation_history.conversation_id = current_conversation_id
+                    await manager.send_event(
+                        websocket,
+                        "conversation_created",
+                        {"conversation_id": current_conversation_id},
+                    )
+
+                # Queue user message; it is written together with the reply
+                message_buffer.add_message(
+                    current_conversation_id,
+                    MessageCreate(role="user", content=user_message),
+                )
 {%- endif %}
             except Exception as e:
                 logger.warning(f"Failed to persist conversation: {e}")
@@ -1568,8 +2129,28 @@ async def agent_websocket(
 
             requested_conv_id = data.get("conversation_id")
             if requested_conv_id:
+                if requested_conv_id != conversation_history.conversation_id:
+                    # Load recent history once (also verifies the user may open it)
+                    try:
+                        recent_messages = await conv_service.list_recent_messages(
+                            requested_conv_id,
+                            limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                            user_id=str(user.id),
+{%- endif %}
+                        )
+                    except NotFoundError:
+                        await manager.send_event(websocket, "error", {"message": "Conversation not found"})
+                        continue
+                    if "history" in data:
+                        # A client-sent history takes precedence over the stored one
+                        conversation_history.conversation_id = requested_conv_id
+                    else:
+                        conversation_history.replace(
+                            ({"role": m.role, "content": m.content} for m in recent_messages),
+                            conversation_id=requested_conv_id,
+                        )
                 current_conversation_id = requested_conv_id
-                await conv_service.get_conversation(requested_conv_id)
             elif not current_conversation_id:
                 conv_data = ConversationCreate(
 {%- if cookiecutter.websocket_auth_jwt %}
@@ -1579,14 +2160,15 @@ async def agent_websocket(
                 )
                 conversation = await conv_service.create_conversation(conv_data)
                 current_conversation_id = str(conversation.id)
+                conversation_history.conversation_id = current_conversation_id
                 await manager.send_event(
                     websocket,
                     "conversation_created",
                     {"conversation_id": current_conversation_id},
                 )
 
-            # Save user message
-            await conv_service.add_message(
+            # Queue user message; it is written together with the reply
+            message_buffer.add_message(
                 current_conversation_id,
                 MessageCreate(role="user", content=user_message),
             )
@@ -1598,6 +2180,9 @@ async def agent_websocket(
                 crew_assistant = get_crew()
 
                 final_output = ""
+{%- if cookiecutter.enable_rate_limiting %}
+                tokens_used = 0
+{%- endif %}
 
                 await manager.send_event(websocket, "crew_start", {
                     "crew_name": crew_assistant.config.name,
@@ -1607,7 +2192,7 @@ async def agent_websocket(
                 # Stream crew execution events
                 async for event in crew_assistant.stream(
                     user_message,
-                    history=conversation_history,
+                    history=conversation_history.messages,
                     context=context,
                 ):
                     event_type = event.get("type", "unknown")
@@ -1645,46 +2230,20 @@ async def agent_websocket(
                                 "output": agent_output,
                             },
                         )
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
-                        # Save agent's output as a separate message
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                        # Queue agent's output as a separate message
                         if current_conversation_id and agent_output:
-                            try:
+                            message_buffer.add_message(
 {%- if cookiecutter.use_postgresql %}
-                                async with get_db_context() as db:
-                                    conv_service = get_conversation_service(db)
-                                    await conv_service.add_message(
-                                        UUID(current_conversation_id),
-                                        MessageCreate(
-                                            role="assistant",
-                                            content=f"✅ **{agent_name}**\n\n{agent_output}",
-                                        ),
-                                    )
+                                UUID(current_conversation_id),
 {%- else %}
-                                with get_db_session() as db:
-                                    conv_service = get_conversation_service(db)
-                                    conv_service.add_message(
-                                        current_conversation_id,
-                                        MessageCreate(
-                                            role="assistant",
-                                            content=f"✅ **{agent_name}**\n\n{agent_output}",
-                                        ),
-                                    )
+                                current_conversation_id,
 {%- endif %}
-                            except Exception as e:
-                                logger.warning(f"Failed to persist agent response: {e}")
-{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
-                        # Save agent's output as a separate message
-                        if current_conversation_id and agent_output:
-                            try:
-                                await conv_service.add_message(
-                                    current_conversation_id,
-                                    MessageCreate(
-                                        role="assistant",
-                                        content=f"✅ **{agent_name}**\n\n{agent_output}",
-                                    ),
-                                )
-                            except Exception as e:
-                                logger.warning(f"Failed to persist agent response: {e}")
+                                MessageCreate(
+                                    role="assistant",
+                                    content=f"✅ **{agent_name}**\n\n{agent_output}",
+                                ),
+                            )
 {%- endif %}
 
                     # Task events
@@ -1756,6 +2315,10 @@ async def agent_websocket(
                     # Final result
                     elif event_type == "crew_complete":
                         final_output = event.get("result", "")
+{%- if cookiecutter.enable_rate_limiting %}
+                        if "total_tokens" in event:
+                            tokens_used = event["total_tokens"]
+{%- endif %}
                         await manager.send_event(
                             websocket,
                             "final_result",
@@ -1771,14 +2334,21 @@ async def agent_websocket(
                         )
 
                 # Update conversation history
-                conversation_history.append({"role": "user", "content": user_message})
+                conversation_history.append("user", user_message)
                 if final_output:
-                    conversation_history.append(
-                        {"role": "assistant", "content": final_output}
-                    )
+                    conversation_history.append("assistant", final_output)
+{%- if cookiecutter.enable_rate_limiting %}
+                # Charge the tokens the crew's model calls reported
+                await charge_agent_tokens(websocket, tokens_used)
+{%- endif %}
 
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
-                # Note: Agent outputs are saved individually in agent_completed events above
+
+                # Agent outputs were queued in agent_completed events; write the turn in one batch
+                try:
+                    await message_buffer.maybe_flush()
+                except Exception as e:
+                    logger.warning(f"Failed to persist conversation messages: {e}")
 {%- endif %}
 
                 await manager.send_event(websocket, "complete", {
@@ -1800,6 +2370,13 @@ async def agent_websocket(
         pass  # Normal disconnect
     finally:
         manager.disconnect(websocket)
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+        # Write anything still buffered before the connection goes away
+        try:
+            await message_buffer.close()
+        except Exception as e:
+            logger.warning(f"Failed to persist buffered messages: {e}")
+{%- endif %}
 {%- elif cookiecutter.enable_ai_agent and cookiecutter.use_deepagents %}
 """AI Agent WebSocket routes with streaming and human-in-the-loop support (DeepAgents)."""
 
@@ -1818,20 +2395,33 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect{%- if cookiecutter
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage
 
 from app.agents.deepagents_assistant import AgentContext, Decision, InterruptData, get_agent
+from app.agents.event_channel import AgentEventChannel
+from app.agents.history import ConversationHistory
 {%- if cookiecutter.websocket_auth_jwt %}
 from app.api.deps import get_current_user_ws
 from app.db.models.user import User
 {%- endif %}
-{%- if cookiecutter.websocket_auth_api_key %}
+{%- if cookiecutter.websocket_auth_api_key or (cookiecutter.enable_conversation_persistence and cookiecutter.use_database) %}
 from app.core.config import settings
 {%- endif %}
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_rate_limiting %}
+from app.core.rate_limit import charge_agent_tokens, check_agent_turn
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_postgresql %}
 from app.db.session import get_db_context
+{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_sqlite %}
+from app.db.session import run_in_session
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate, ToolCallCreate, ToolCallComplete
+from app.services.message_buffer import MessageBuffer
 {%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
 from app.api.deps import ConversationSvc, get_conversation_service
+from app.core.exceptions import NotFoundError
 from app.schemas.conversation import ConversationCreate, MessageCreate, ToolCallCreate, ToolCallComplete
+from app.services.message_buffer import MessageBuffer
 {%- endif %}
 
 logger = logging.getLogger(__name__)
@@ -1844,26 +2434,36 @@ class AgentConnectionManager:
 
     def __init__(self) -> None:
         self.active_connections: list[WebSocket] = []
+        self._channels: dict[WebSocket, AgentEventChannel] = {}
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept and store a new WebSocket connection."""
-        await websocket.accept()
+        channel = AgentEventChannel.from_websocket(websocket)
+        await websocket.accept(subprotocol=channel.subprotocol)
         self.active_connections.append(websocket)
+        self._channels[websocket] = channel
         logger.info(f"Agent WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        channel = self._channels.pop(websocket, None)
+        if channel is not None:
+            channel.close()
         logger.info(f"Agent WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
     async def send_event(self, websocket: WebSocket, event_type: str, data: Any) -> bool:
-        """Send a JSON event to a specific WebSocket client.
+        """Send an event to a specific WebSocket client.
 
+        Text deltas may be held back briefly and merged (see AgentEventChannel).
         Returns True if sent successfully, False if connection is closed.
         """
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return False
         try:
-            await websocket.send_json({"type": event_type, "data": data})
+            await channel.send(event_type, data)
             return True
         except (WebSocketDisconnect, RuntimeError):
             # Connection already closed
@@ -1935,6 +2535,11 @@ async def agent_websocket(
         "conversation_id": "optional-uuid"{% endif %}
     }
 
+    Only "message" is required. History is kept server-side per connection
+    and trimmed to AGENT_HISTORY_MAX_TOKENS{% if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}; it is loaded from the database
+    when an existing conversation is resumed{% endif %}. An optional "history"
+    array from the client replaces it.
+
     Resume after interrupt:
     {
         "type": "resume",
@@ -1968,8 +2573,8 @@ async def agent_websocket(
 
     await manager.connect(websocket)
 
-    # Conversation state per connection
-    conversation_history: list[dict[str, str]] = []
+    # Conversation state per connection (server-side, token-bounded history)
+    conversation_history: ConversationHistory[Any] = ConversationHistory()
     context: AgentContext = {}
     # Thread ID for LangGraph state persistence (required for HITL)
     thread_id: str = str(uuid.uuid4())
@@ -1981,6 +2586,7 @@ async def agent_websocket(
 {%- endif %}
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
     current_conversation_id: str | None = None
+    message_buffer = MessageBuffer()
 {%- endif %}
 
     # Create assistant instance (reused for the connection)
@@ -2014,6 +2620,9 @@ async def agent_websocket(
                     await manager.send_event(websocket, "resume_start", {})
 
                     final_output = ""
+{%- if cookiecutter.enable_rate_limiting %}
+                    tokens_used = 0
+{%- endif %}
                     seen_tool_call_ids: set[str] = set()
 
                     # Stream resume
@@ -2061,11 +2670,20 @@ async def agent_websocket(
                                                 "tool_result",
                                                 {"tool_call_id": msg.tool_call_id, "content": msg.content},
                                             )
+{%- if cookiecutter.enable_rate_limiting %}
+                                elif node_name == "agent":
+                                    for msg in update.get("messages", []):
+                                        if isinstance(msg, AIMessage) and msg.usage_metadata:
+                                            tokens_used += msg.usage_metadata["total_tokens"]
+
+                    # Charge the tokens the model reported, including for runs that paused again
+                    await charge_agent_tokens(websocket, tokens_used)
+{%- endif %}
 
                     if not pending_interrupt:
                         # No interrupt, send final result
                         if final_output:
-                            conversation_history.append({"role": "assistant", "content": final_output})
+                            conversation_history.append("assistant", final_output)
                         await manager.send_event(websocket, "final_result", {"output": final_output})
                         await manager.send_event(websocket, "complete", {})
 
@@ -2077,14 +2695,28 @@ async def agent_websocket(
 
             # Regular message handling
             user_message = raw_data.get("message", "")
-            # Optionally accept history from client (or use server-side tracking)
+            # History is tracked server-side; a client-sent history overrides it
             if "history" in raw_data:
-                conversation_history = raw_data["history"]
+                conversation_history.replace(
+                    raw_data["history"], conversation_id=conversation_history.conversation_id
+                )
 
             if not user_message:
                 await manager.send_event(websocket, "error", {"message": "Empty message"})
                 continue
 
+{%- if cookiecutter.enable_rate_limiting %}
+
+            rate_limit = await check_agent_turn(websocket)
+            if not rate_limit.allowed:
+                await manager.send_event(
+                    websocket,
+                    "error",
+                    {"message": "Rate limit exceeded", "retry_after": round(rate_limit.retry_after, 1)},
+                )
+                continue
+{%- endif %}
+
 {%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
 
             # Handle conversation persistence
@@ -2096,9 +2728,30 @@ async def agent_websocket(
                     # Get or create conversation
                     requested_conv_id = raw_data.get("conversation_id")
                     if requested_conv_id:
+                        if requested_conv_id != conversation_history.conversation_id:
+                            # Load recent history once (also verifies the user may open it)
+                            try:
+                                recent_messages = await conv_service.list_recent_messages(
+                                    UUID(requested_conv_id),
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                                    user_id=user.id,
+{%- endif %}
+                                )
+                            except NotFoundError:
+                                await manager.send_event(
+                                    websocket, "error", {"message": "Conversation not found"}
+                                )
+                                continue
+                            if "history" in raw_data:
+                                # A client-sent history takes precedence over the stored one
+                                conversation_history.conversation_id = requested_conv_id
+                            else:
+                                conversation_history.replace(
+                                    ({"role": m.role, "content": m.content} for m in recent_messages),
+                                    conversation_id=requested_conv_id,
+                                )
                         current_conversation_id = requested_conv_id
-                        # Verify conversation exists
-                        await conv_service.get_conversation(UUID(requested_conv_id))
                     elif not current_conversation_id:
                         # Create new conversation
                         conv_data = ConversationCreate(
@@ -2109,47 +2762,74 @@ async def agent_websocket(
                         )
                         conversation = await conv_service.create_conversation(conv_data)
                         current_conversation_id = str(conversation.id)
+                        conversation_history.conversation_id = current_conversation_id
                         await manager.send_event(
                             websocket,
                             "conversation_created",
                             {"conversation_id": current_conversation_id},
                         )
 
-                    # Save user message
-                    await conv_service.add_message(
+                    # Queue user message; it is written together with the reply
+                    message_buffer.add_message(
                         UUID(current_conversation_id),
                         MessageCreate(role="user", content=user_message),
                     )
 {%- else %}
-                with get_db_session() as db:
-                    conv_service = get_conversation_service(db)
-
-                    # Get or create conversation
-                    requested_conv_id = raw_data.get("conversation_id")
-                    if requested_conv_id:
-                        current_conversation_id = requested_conv_id
-                        conv_service.get_conversation(requested_conv_id)
-                    elif not current_conversation_id:
-                        # Create new conversation
-                        conv_data = ConversationCreate(
+                # SQLite calls block, so they run in a worker thread
+                requested_conv_id = raw_data.get("conversation_id")
+                if requested_conv_id:
+                    if requested_conv_id != conversation_history.conversation_id:
+                        # Load recent history once (also verifies the user may open it)
+                        try:
+                            recent_messages = await run_in_session(
+                                lambda db, conv_id: get_conversation_service(db).list_recent_messages(
+                                    conv_id,
+                                    limit=settings.AGENT_HISTORY_LOAD_LIMIT,
 {%- if cookiecutter.websocket_auth_jwt %}
-                            user_id=str(user.id),
+                                    user_id=str(user.id),
 {%- endif %}
-                            title=user_message[:50] if len(user_message) > 50 else user_message,
-                        )
-                        conversation = conv_service.create_conversation(conv_data)
-                        current_conversation_id = str(conversation.id)
-                        await manager.send_event(
-                            websocket,
-                            "conversation_created",
-                            {"conversation_id": current_conversation_id},
-                        )
-
-                    # Save user message
-                    conv_service.add_message(
-                        current_conversation_id,
-                        MessageCreate(role="user", content=user_message),
+                                ),
+                                requested_conv_id,
+                            )
+                        except NotFoundError:
+                            await manager.send_event(
+                                websocket, "error", {"message": "Conversation not found"}
+                            )
+                            continue
+                        if "history" in raw_data:
+                            # A client-sent history takes precedence over the stored one
+                            conversation_history.conversation_id = requested_conv_id
+                        else:
+                            conversation_history.replace(
+                                ({"role": m.role, "content": m.content} for m in recent_messages),
+                                conversation_id=requested_conv_id,
+                            )
+                    current_conversation_id = requested_conv_id
+                elif not current_conversation_id:
+                    # Create new conversation
+                    conv_data = ConversationCreate(
+{%- if cookiecutter.websocket_auth_jwt %}
+                        user_id=str(user.id),
+{%- endif %}
+                        title=user_message[:50] if len(user_message) > 50 else user_message,
+                    )
+                    conversation = await run_in_session(
+                        lambda db, conv_data: get_conversation_service(db).create_conversation(conv_data),
+                        conv_data,
+                    )
+                    current_conversation_id = str(conversation.id)
+                    conversation_history.conversation_id = current_conversation_id
+                    await manager.send_event(
+                        websocket,
+                        "conversation_created",
+                        {"conversation_id": current_conversation_id},
                     )
+
+                # Queue user message; it is written together with the reply
+                message_buffer.add_message(
+                    current_conversation_id,
+                    MessageCreate(role="user", content=user_message),
+                )
 {%- endif %}
             except Exception as e:
                 logger.warning(f"Failed to persist conversation: {e}")
@@ -2161,8 +2841,28 @@ async def agent_websocket(
 
             requested_conv_id = raw_data.get("conversation_id")
             if requested_conv_id:
+                if requested_conv_id != conversation_history.conversation_id:
+                    # Load recent history once (also verifies the user may open it)
+                    try:
+                        recent_messages = await conv_service.list_recent_messages(
+                            requested_conv_id,
+                            limit=settings.AGENT_HISTORY_LOAD_LIMIT,
+{%- if cookiecutter.websocket_auth_jwt %}
+                            user_id=str(user.id),
+{%- endif %}
+                        )
+                    except NotFoundError:
+                        await manager.send_event(websocket, "error", {"message": "Conversation not found"})
+                        continue
+                    if "history" in raw_data:
+                        # A client-sent history takes precedence over the stored one
+                        conversation_history.conversation_id = requested_conv_id
+                    else:
+                        conversation_history.replace(
+                            ({"role": m.role, "content": m.content} for m in recent_messages),
+                            conversation_id=requested_conv_id,
+                        )
                 current_conversation_id = requested_conv_id
-                await conv_service.get_conversation(requested_conv_id)
             elif not current_conversation_id:
                 conv_data = ConversationCreate(
 {%- if cookiecutter.websocket_auth_jwt %}
@@ -2172,14 +2872,15 @@ async def agent_websocket(
                 )
                 conversation = await conv_service.create_conversation(conv_data)
                 current_conversation_id = str(conversation.id)
+                conversation_history.conversation_id = current_conversation_id
                 await manager.send_event(
                     websocket,
                     "conversation_created",
                     {"conversation_id": current_conversation_id},
                 )
 
-            # Save user message
-            await conv_service.add_message(
+            # Queue user message; it is written together with the reply
+            message_buffer.add_message(
                 current_conversation_id,
                 MessageCreate(role="user", content=user_message),
             )
@@ -2189,6 +2890,9 @@ async def agent_websocket(
 
             try:
                 final_output = ""
+{%- if cookiecutter.enable_rate_limiting %}
+                tokens_used = 0
+{%- endif %}
                 tool_events: list[Any] = []
                 seen_tool_call_ids: set[str] = set()
 
@@ -2197,7 +2901,7 @@ async def agent_websocket(
                 # Use DeepAgents' stream() which wraps LangGraph's astream
                 async for stream_mode, stream_data in assistant.stream(
                     user_message,
-                    history=conversation_history,
+                    history=conversation_history.messages,
                     context=context,
                     thread_id=thread_id,
                 ):
@@ -2269,12 +2973,34 @@ async def agent_websocket(
                                                 "content": msg.content,
                                             },
                                         )
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                                        message_buffer.complete_tool_call(
+                                            msg.tool_call_id,
+                                            ToolCallComplete(
+                                                result=str(msg.content),
+                                                success=msg.status != "error",
+                                            ),
+                                        )
+{%- endif %}
                             elif node_name == "agent":
                                 # Agent node completed - check for tool calls
                                 for msg in update.get("messages", []):
+{%- if cookiecutter.enable_rate_limiting %}
+                                    if isinstance(msg, AIMessage) and msg.usage_metadata:
+                                        tokens_used += msg.usage_metadata["total_tokens"]
+{%- endif %}
                                     if isinstance(msg, AIMessage) and msg.tool_calls:
                                         for tc in msg.tool_calls:
                                             tc_id = tc.get("id", "")
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+                                            message_buffer.start_tool_call(
+                                                ToolCallCreate(
+                                                    tool_call_id=tc_id,
+                                                    tool_name=tc.get("name", ""),
+                                                    args=tc.get("args", {}),
+                                                )
+                                            )
+{%- endif %}
                                             if tc_id not in seen_tool_call_ids:
                                                 seen_tool_call_ids.add(tc_id)
                                                 tool_events.append(tc)
@@ -2288,6 +3014,11 @@ async def agent_websocket(
                                                     },
                                                 )
 
+{%- if cookiecutter.enable_rate_limiting %}
+                # Charge the tokens the model reported, also when the run paused for approval
+                await charge_agent_tokens(websocket, tokens_used)
+{%- endif %}
+
                 # Only send final result if not interrupted
                 if not pending_interrupt:
                     await manager.send_event(
@@ -2297,57 +3028,30 @@ async def agent_websocket(
                     )
 
                     # Update conversation history
-                    conversation_history.append({"role": "user", "content": user_message})
+                    conversation_history.append("user", user_message)
                     if final_output:
-                        conversation_history.append(
-                            {"role": "assistant", "content": final_output}
-                        )
+                        conversation_history.append("assistant", final_output)
 
-{%- if cookiecutter.enable_conversation_persistence and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
 
-                    # Save assistant response to database
+                    # Queue the reply and write the turn's messages and tool calls in one batch
                     if current_conversation_id and final_output:
-                        try:
+                        message_buffer.add_message(
 {%- if cookiecutter.use_postgresql %}
-                            async with get_db_context() as db:
-                                conv_service = get_conversation_service(db)
-                                await conv_service.add_message(
-                                    UUID(current_conversation_id),
-                                    MessageCreate(
-                                        role="assistant",
-                                        content=final_output,
-                                        model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                    ),
-                                )
+                            UUID(current_conversation_id),
 {%- else %}
-                            with get_db_session() as db:
-                                conv_service = get_conversation_service(db)
-                                conv_service.add_message(
-                                    current_conversation_id,
-                                    MessageCreate(
-                                        role="assistant",
-                                        content=final_output,
-                                        model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                    ),
-                                )
+                            current_conversation_id,
 {%- endif %}
-                        except Exception as e:
-                            logger.warning(f"Failed to persist assistant response: {e}")
-{%- elif cookiecutter.enable_conversation_persistence and cookiecutter.use_mongodb %}
-
-                    # Save assistant response to database
-                    if current_conversation_id and final_output:
-                        try:
-                            await conv_service.add_message(
-                                current_conversation_id,
-                                MessageCreate(
-                                    role="assistant",
-                                    content=final_output,
-                                    model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
-                                ),
-                            )
-                        except Exception as e:
-                            logger.warning(f"Failed to persist assistant response: {e}")
+                            MessageCreate(
+                                role="assistant",
+                                content=final_output,
+                                model_name=assistant.model_name if hasattr(assistant, "model_name") else None,
+                            ),
+                        )
+                    try:
+                        await message_buffer.maybe_flush()
+                    except Exception as e:
+                        logger.warning(f"Failed to persist conversation messages: {e}")
 {%- endif %}
 
                     await manager.send_event(websocket, "complete", {
@@ -2369,6 +3073,13 @@ async def agent_websocket(
         pass  # Normal disconnect
     finally:
         manager.disconnect(websocket)
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+        # Write anything still buffered before the connection goes away
+        try:
+            await message_buffer.close()
+        except Exception as e:
+            logger.warning(f"Failed to persist buffered messages: {e}")
+{%- endif %}
 {%- else %}
 """AI Agent routes - not configured."""
 {%- endif %}
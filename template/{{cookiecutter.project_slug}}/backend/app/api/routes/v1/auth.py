@@ -6,22 +6,54 @@ from typing import Annotated
 from uuid import UUID
 {%- endif %}
 
-from fastapi import APIRouter, Depends{% if cookiecutter.enable_session_management %}, Request{% endif %}, status
+from fastapi import APIRouter, Depends{% if cookiecutter.enable_session_management %}, Request{% endif %}, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.api.deps import CurrentUser{% if cookiecutter.enable_session_management %}, SessionSvc{% endif %}, UserSvc
 from app.core.exceptions import AuthenticationError
-from app.core.security import create_access_token, create_refresh_token, verify_token
+{%- if cookiecutter.enable_rate_limiting %}
+from app.core.rate_limit import rate_limit_cost
+{%- endif %}
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    get_jwks,
+    user_claims,
+{%- if not cookiecutter.enable_session_management %}
+    verify_token,
+{%- endif %}
+)
 from app.schemas.token import RefreshTokenRequest, Token
 from app.schemas.user import UserCreate, UserRead
 
 router = APIRouter()
+{%- if cookiecutter.enable_rate_limiting %}
+
+# Password hashing makes these routes the most expensive to serve
+CREDENTIAL_ROUTE_COST = 5
+{%- endif %}
+
+
+@router.get("/jwks.json")
+{%- if cookiecutter.enable_rate_limiting %}
+@rate_limit_cost(0)
+{%- endif %}
+def jwks(response: Response) -> dict[str, list[dict[str, str]]]:
+    """Public keys for verifying access tokens (JWK Set).
+
+    Empty unless tokens are signed with an asymmetric algorithm (ES256, EdDSA).
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_jwks()
 
 
 {%- if cookiecutter.use_postgresql %}
 
 
 @router.post("/login", response_model=Token)
+{%- if cookiecutter.enable_rate_limiting %}
+@rate_limit_cost(CREDENTIAL_ROUTE_COST)
+{%- endif %}
 async def login(
 {%- if cookiecutter.enable_session_management %}
     request: Request,
@@ -38,7 +70,7 @@ async def login(
     Raises domain exceptions handled by exception handlers.
     """
     user = await user_service.authenticate(form_data.username, form_data.password)
-    access_token = create_access_token(subject=str(user.id))
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
     refresh_token = create_refresh_token(subject=str(user.id))
 {%- if cookiecutter.enable_session_management %}
 
@@ -54,6 +86,9 @@ async def login(
 
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+{%- if cookiecutter.enable_rate_limiting %}
+@rate_limit_cost(CREDENTIAL_ROUTE_COST)
+{%- endif %}
 async def register(
     user_in: UserCreate,
     user_service: UserSvc,
@@ -83,11 +118,12 @@ async def refresh_token(
     """
 {%- if cookiecutter.enable_session_management %}
 
-    # Validate refresh token against stored session
-    session = await session_service.validate_refresh_token(body.refresh_token)
-    if not session:
-        raise AuthenticationError(message="Invalid or expired refresh token")
-
+    # Retire the stored session and insert its successor in one transaction
+    session, new_refresh_token = await session_service.rotate_refresh_token(
+        body.refresh_token,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("User-Agent"),
+    )
     user = await user_service.get_by_id(session.user_id)
 {%- else %}
 
@@ -108,18 +144,9 @@ async def refresh_token(
     if not user.is_active:
         raise AuthenticationError(message="User account is disabled")
 
-    access_token = create_access_token(subject=str(user.id))
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
+{%- if not cookiecutter.enable_session_management %}
     new_refresh_token = create_refresh_token(subject=str(user.id))
-{%- if cookiecutter.enable_session_management %}
-
-    # Invalidate old session and create new one
-    await session_service.logout_by_refresh_token(body.refresh_token)
-    await session_service.create_session(
-        user_id=user.id,
-        refresh_token=new_refresh_token,
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("User-Agent"),
-    )
 {%- endif %}
     return Token(access_token=access_token, refresh_token=new_refresh_token)
 
@@ -147,6 +174,9 @@ async def get_current_user_info(current_user: CurrentUser):
 
 
 @router.post("/login", response_model=Token)
+{%- if cookiecutter.enable_rate_limiting %}
+@rate_limit_cost(CREDENTIAL_ROUTE_COST)
+{%- endif %}
 async def login(
 {%- if cookiecutter.enable_session_management %}
     request: Request,
@@ -163,7 +193,7 @@ async def login(
     Raises domain exceptions handled by exception handlers.
     """
     user = await user_service.authenticate(form_data.username, form_data.password)
-    access_token = create_access_token(subject=str(user.id))
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
     refresh_token = create_refresh_token(subject=str(user.id))
 {%- if cookiecutter.enable_session_management %}
 
@@ -179,6 +209,9 @@ async def login(
 
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+{%- if cookiecutter.enable_rate_limiting %}
+@rate_limit_cost(CREDENTIAL_ROUTE_COST)
+{%- endif %}
 async def register(
     user_in: UserCreate,
     user_service: UserSvc,
@@ -207,11 +240,12 @@ async def refresh_token(
     Raises AuthenticationError if refresh token is invalid or expired.
     """
 {%- if cookiecutter.enable_session_management %}
-    # Validate refresh token against stored session
-    session = await session_service.validate_refresh_token(body.refresh_token)
-    if not session:
-        raise AuthenticationError(message="Invalid or expired refresh token")
-
+    # Retire the stored session and insert its successor in one transaction
+    session, new_refresh_token = await session_service.rotate_refresh_token(
+        body.refresh_token,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("User-Agent"),
+    )
     user = await user_service.get_by_id(session.user_id)
 {%- else %}
     payload = verify_token(body.refresh_token)
@@ -231,18 +265,9 @@ async def refresh_token(
     if not user.is_active:
         raise AuthenticationError(message="User account is disabled")
 
-    access_token = create_access_token(subject=str(user.id))
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
+{%- if not cookiecutter.enable_session_management %}
     new_refresh_token = create_refresh_token(subject=str(user.id))
-{%- if cookiecutter.enable_session_management %}
-
-    # Invalidate old session and create new one
-    await session_service.logout_by_refresh_token(body.refresh_token)
-    await session_service.create_session(
-        user_id=str(user.id),
-        refresh_token=new_refresh_token,
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("User-Agent"),
-    )
 {%- endif %}
     return Token(access_token=access_token, refresh_token=new_refresh_token)
 
@@ -270,6 +295,9 @@ async def get_current_user_info(current_user: CurrentUser):
 
 
 @router.post("/login", response_model=Token)
+{%- if cookiecutter.enable_rate_limiting %}
+@rate_limit_cost(CREDENTIAL_ROUTE_COST)
+{%- endif %}
 def login(
 {%- if cookiecutter.enable_session_management %}
     request: Request,
@@ -286,7 +314,7 @@ def login(
     Raises domain exceptions handled by exception handlers.
     """
     user = user_service.authenticate(form_data.username, form_data.password)
-    access_token = create_access_token(subject=user.id)
+    access_token = create_access_token(subject=user.id, claims=user_claims(user))
     refresh_token = create_refresh_token(subject=user.id)
 {%- if cookiecutter.enable_session_management %}
 
@@ -302,6 +330,9 @@ def login(
 
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+{%- if cookiecutter.enable_rate_limiting %}
+@rate_limit_cost(CREDENTIAL_ROUTE_COST)
+{%- endif %}
 def register(
     user_in: UserCreate,
     user_service: UserSvc,
@@ -330,11 +361,12 @@ def refresh_token(
     Raises AuthenticationError if refresh token is invalid or expired.
     """
 {%- if cookiecutter.enable_session_management %}
-    # Validate refresh token against stored session
-    session = session_service.validate_refresh_token(body.refresh_token)
-    if not session:
-        raise AuthenticationError(message="Invalid or expired refresh token")
-
+    # Retire the stored session and insert its successor in one transaction
+    session, new_refresh_token = session_service.rotate_refresh_token(
+        body.refresh_token,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("User-Agent"),
+    )
     user = user_service.get_by_id(session.user_id)
 {%- else %}
     payload = verify_token(body.refresh_token)
@@ -354,18 +386,9 @@ def refresh_token(
     if not user.is_active:
         raise AuthenticationError(message="User account is disabled")
 
-    access_token = create_access_token(subject=user.id)
+    access_token = create_access_token(subject=user.id, claims=user_claims(user))
+{%- if not cookiecutter.enable_session_management %}
     new_refresh_token = create_refresh_token(subject=user.id)
-{%- if cookiecutter.enable_session_management %}
-
-    # Invalidate old session and create new one
-    session_service.logout_by_refresh_token(body.refresh_token)
-    session_service.create_session(
-        user_id=user.id,
-        refresh_token=new_refresh_token,
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("User-Agent"),
-    )
 {%- endif %}
     return Token(access_token=access_token, refresh_token=new_refresh_token)
 
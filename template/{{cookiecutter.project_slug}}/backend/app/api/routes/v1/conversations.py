@@ -21,11 +21,13 @@ from fastapi import APIRouter, Query, status
 
 {%- if cookiecutter.use_mongodb %}
 from app.api.deps import ConversationSvc
+{%- elif cookiecutter.use_postgresql %}
+from app.api.deps import DBSession, ConversationReadSvc, ConversationSvc
 {%- else %}
 from app.api.deps import DBSession, ConversationSvc
 {%- endif %}
 {%- if cookiecutter.use_jwt %}
-from app.api.deps import CurrentUser
+from app.api.deps import CurrentClaims, CurrentUser
 {%- endif %}
 from app.schemas.conversation import (
     ConversationCreate,
@@ -47,27 +49,31 @@ router = APIRouter()
 
 @router.get("", response_model=ConversationList)
 async def list_conversations(
-    conversation_service: ConversationSvc,
+    conversation_service: ConversationReadSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
     skip: int = Query(0, ge=0, description="Number of conversations to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum conversations to return"),
     include_archived: bool = Query(False, description="Include archived conversations"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """List conversations for the current user.
 
-    Returns conversations ordered by most recently updated.
+    Returns conversations ordered by most recently updated. Pass the returned
+    `next_cursor` back as `cursor` for fast keyset pagination; `total` is only
+    included for offset (`skip`) pagination.
     """
-    items, total = await conversation_service.list_conversations(
+    items, total, next_cursor = await conversation_service.list_conversations(
 {%- if cookiecutter.use_jwt %}
-        user_id=current_user.id,
+        user_id=UUID(claims.sub),
 {%- endif %}
         skip=skip,
         limit=limit,
         include_archived=include_archived,
+        cursor=cursor,
     )
-    return ConversationList(items=items, total=total)
+    return ConversationList(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.post("", response_model=ConversationRead, status_code=status.HTTP_201_CREATED)
@@ -95,14 +101,20 @@ async def get_conversation(
     conversation_id: UUID,
     conversation_service: ConversationSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
 ):
     """Get a conversation with all its messages.
 
-    Raises 404 if the conversation does not exist.
+    Raises 404 if the conversation does not exist{% if cookiecutter.use_jwt %} or belongs to another user{% endif %}.
     """
-    return await conversation_service.get_conversation(conversation_id, include_messages=True)
+{%- if cookiecutter.use_jwt %}
+    return await conversation_service.get_conversation_with_messages(
+        conversation_id, user_id=UUID(claims.sub)
+    )
+{%- else %}
+    return await conversation_service.get_conversation_with_messages(conversation_id)
+{%- endif %}
 
 
 @router.patch("/{conversation_id}", response_model=ConversationRead)
@@ -157,19 +169,30 @@ async def archive_conversation(
 @router.get("/{conversation_id}/messages", response_model=MessageList)
 async def list_messages(
     conversation_id: UUID,
-    conversation_service: ConversationSvc,
+    conversation_service: ConversationReadSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """List messages in a conversation.
 
-    Returns messages ordered by creation time (oldest first).
+    Returns messages ordered by creation time (oldest first). Pass the returned
+    `next_cursor` back as `cursor` for fast keyset pagination.{% if cookiecutter.use_jwt %} Raises 404 if the
+    conversation belongs to another user.{% endif %}
     """
-    items, total = await conversation_service.list_messages(conversation_id, skip=skip, limit=limit)
-    return MessageList(items=items, total=total)
+    items, total, next_cursor = await conversation_service.list_messages(
+        conversation_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+{%- if cookiecutter.use_jwt %}
+        user_id=UUID(claims.sub),
+{%- endif %}
+    )
+    return MessageList(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.post(
@@ -199,25 +222,29 @@ async def add_message(
 def list_conversations(
     conversation_service: ConversationSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
     skip: int = Query(0, ge=0, description="Number of conversations to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum conversations to return"),
     include_archived: bool = Query(False, description="Include archived conversations"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """List conversations for the current user.
 
-    Returns conversations ordered by most recently updated.
+    Returns conversations ordered by most recently updated. Pass the returned
+    `next_cursor` back as `cursor` for fast keyset pagination; `total` is only
+    included for offset (`skip`) pagination.
     """
-    items, total = conversation_service.list_conversations(
+    items, total, next_cursor = conversation_service.list_conversations(
 {%- if cookiecutter.use_jwt %}
-        user_id=str(current_user.id),
+        user_id=claims.sub,
 {%- endif %}
         skip=skip,
         limit=limit,
         include_archived=include_archived,
+        cursor=cursor,
     )
-    return ConversationList(items=items, total=total)
+    return ConversationList(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.post("", response_model=ConversationRead, status_code=status.HTTP_201_CREATED)
@@ -245,14 +272,20 @@ def get_conversation(
     conversation_id: str,
     conversation_service: ConversationSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
 ):
     """Get a conversation with all its messages.
 
-    Raises 404 if the conversation does not exist.
+    Raises 404 if the conversation does not exist{% if cookiecutter.use_jwt %} or belongs to another user{% endif %}.
     """
+{%- if cookiecutter.use_jwt %}
+    return conversation_service.get_conversation(
+        conversation_id, include_messages=True, user_id=claims.sub
+    )
+{%- else %}
     return conversation_service.get_conversation(conversation_id, include_messages=True)
+{%- endif %}
 
 
 @router.patch("/{conversation_id}", response_model=ConversationRead)
@@ -309,17 +342,28 @@ def list_messages(
     conversation_id: str,
     conversation_service: ConversationSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """List messages in a conversation.
 
-    Returns messages ordered by creation time (oldest first).
+    Returns messages ordered by creation time (oldest first). Pass the returned
+    `next_cursor` back as `cursor` for fast keyset pagination.{% if cookiecutter.use_jwt %} Raises 404 if the
+    conversation belongs to another user.{% endif %}
     """
-    items, total = conversation_service.list_messages(conversation_id, skip=skip, limit=limit)
-    return MessageList(items=items, total=total)
+    items, total, next_cursor = conversation_service.list_messages(
+        conversation_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+{%- if cookiecutter.use_jwt %}
+        user_id=claims.sub,
+{%- endif %}
+    )
+    return MessageList(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.post(
@@ -349,25 +393,29 @@ def add_message(
 async def list_conversations(
     conversation_service: ConversationSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
     skip: int = Query(0, ge=0, description="Number of conversations to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum conversations to return"),
     include_archived: bool = Query(False, description="Include archived conversations"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """List conversations for the current user.
 
-    Returns conversations ordered by most recently updated.
+    Returns conversations ordered by most recently updated. Pass the returned
+    `next_cursor` back as `cursor` for fast keyset pagination; `total` is only
+    included for offset (`skip`) pagination.
     """
-    items, total = await conversation_service.list_conversations(
+    items, total, next_cursor = await conversation_service.list_conversations(
 {%- if cookiecutter.use_jwt %}
-        user_id=str(current_user.id),
+        user_id=claims.sub,
 {%- endif %}
         skip=skip,
         limit=limit,
         include_archived=include_archived,
+        cursor=cursor,
     )
-    return ConversationList(items=items, total=total)
+    return ConversationList(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.post("", response_model=ConversationRead, status_code=status.HTTP_201_CREATED)
@@ -395,14 +443,20 @@ async def get_conversation(
     conversation_id: str,
     conversation_service: ConversationSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
 ):
     """Get a conversation with all its messages.
 
-    Raises 404 if the conversation does not exist.
+    Raises 404 if the conversation does not exist{% if cookiecutter.use_jwt %} or belongs to another user{% endif %}.
     """
+{%- if cookiecutter.use_jwt %}
+    return await conversation_service.get_conversation(
+        conversation_id, include_messages=True, user_id=claims.sub
+    )
+{%- else %}
     return await conversation_service.get_conversation(conversation_id, include_messages=True)
+{%- endif %}
 
 
 @router.patch("/{conversation_id}", response_model=ConversationRead)
@@ -459,17 +513,28 @@ async def list_messages(
     conversation_id: str,
     conversation_service: ConversationSvc,
 {%- if cookiecutter.use_jwt %}
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 {%- endif %}
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """List messages in a conversation.
 
-    Returns messages ordered by creation time (oldest first).
+    Returns messages ordered by creation time (oldest first). Pass the returned
+    `next_cursor` back as `cursor` for fast keyset pagination.{% if cookiecutter.use_jwt %} Raises 404 if the
+    conversation belongs to another user.{% endif %}
     """
-    items, total = await conversation_service.list_messages(conversation_id, skip=skip, limit=limit)
-    return MessageList(items=items, total=total)
+    items, total, next_cursor = await conversation_service.list_messages(
+        conversation_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+{%- if cookiecutter.use_jwt %}
+        user_id=claims.sub,
+{%- endif %}
+    )
+    return MessageList(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.post(
@@ -18,6 +18,9 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import text
 {%- endif %}
 
+{%- if cookiecutter.enable_caching and cookiecutter.use_postgresql %}
+from app.core.cache import service_cache
+{%- endif %}
 from app.core.config import settings
 {%- if cookiecutter.use_database or cookiecutter.enable_redis %}
 from app.api.deps import {% if cookiecutter.use_database %}DBSession{% endif %}{% if cookiecutter.use_database and cookiecutter.enable_redis %}, {% endif %}{% if cookiecutter.enable_redis %}Redis{% endif %}
@@ -67,13 +70,17 @@ async def liveness_probe() -> dict[str, Any]:
     Failure indicates the container should be restarted.
 
     Returns:
-        Structured response with timestamp and service info.
+        Structured response with timestamp and service info{% if cookiecutter.enable_caching and cookiecutter.use_postgresql %},
+        including this process's service cache hit/miss counters{% endif %}.
     """
     return _build_health_response(
         status="alive",
         details={
             "version": getattr(settings, "VERSION", "1.0.0"),
             "environment": settings.ENVIRONMENT,
+{%- if cookiecutter.enable_caching and cookiecutter.use_postgresql %}
+            "service_cache": service_cache.stats.as_dict(),
+{%- endif %}
         },
     )
 
@@ -16,8 +16,13 @@ The endpoints are:
 
 from uuid import UUID
 {%- endif %}
+{%- if cookiecutter.enable_pagination and not cookiecutter.use_mongodb %}
 
 from fastapi import APIRouter, status
+{%- else %}
+
+from fastapi import APIRouter, Response, status
+{%- endif %}
 {%- if cookiecutter.enable_pagination and cookiecutter.use_postgresql %}
 from fastapi_pagination import Page
 from fastapi_pagination.ext.sqlalchemy import paginate
@@ -30,6 +35,10 @@ from sqlalchemy import select
 
 {%- if cookiecutter.use_mongodb %}
 from app.api.deps import ItemSvc
+{%- elif cookiecutter.use_postgresql and cookiecutter.enable_pagination %}
+from app.api.deps import ItemSvc, ReadDBSession
+{%- elif cookiecutter.use_postgresql %}
+from app.api.deps import ItemReadSvc, ItemSvc
 {%- elif cookiecutter.enable_pagination %}
 from app.api.deps import DBSession, ItemSvc
 {%- else %}
@@ -49,7 +58,7 @@ router = APIRouter()
 
 
 @router.get("", response_model=Page[ItemRead])
-async def list_items(db: DBSession):
+async def list_items(db: ReadDBSession):
     """List all items with pagination.
 
     Returns a paginated list of items. Use query parameters
@@ -61,15 +70,22 @@ async def list_items(db: DBSession):
 
 @router.get("", response_model=list[ItemRead])
 async def list_items(
-    item_service: ItemSvc,
+    item_service: ItemReadSvc,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ):
     """List all items.
 
-    Returns a list of items with offset-based pagination.
+    Returns a list of items, oldest first, with offset-based pagination.
+    For keyset pagination, pass the `X-Next-Cursor` response header back
+    as `cursor` instead of increasing `skip`.
     """
-    return await item_service.get_multi(skip=skip, limit=limit)
+    items, next_cursor = await item_service.get_page(skip=skip, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 {%- endif %}
 
 
@@ -94,7 +110,7 @@ async def get_item(
 
     Raises 404 if the item does not exist.
     """
-    return await item_service.get_by_id(item_id)
+    return await item_service.get_item(item_id)
 
 
 @router.patch("/{item_id}", response_model=ItemRead)
@@ -142,14 +158,21 @@ def list_items(db: DBSession):
 @router.get("", response_model=list[ItemRead])
 def list_items(
     item_service: ItemSvc,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ):
     """List all items.
 
-    Returns a list of items with offset-based pagination.
+    Returns a list of items, oldest first, with offset-based pagination.
+    For keyset pagination, pass the `X-Next-Cursor` response header back
+    as `cursor` instead of increasing `skip`.
     """
-    return item_service.get_multi(skip=skip, limit=limit)
+    items, next_cursor = item_service.get_page(skip=skip, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 {%- endif %}
 
 
@@ -209,14 +232,21 @@ def delete_item(
 @router.get("", response_model=list[ItemRead])
 async def list_items(
     item_service: ItemSvc,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ):
     """List all items.
 
-    Returns a list of items with offset-based pagination.
+    Returns a list of items, oldest first, with offset-based pagination.
+    For keyset pagination, pass the `X-Next-Cursor` response header back
+    as `cursor` instead of increasing `skip`.
     """
-    return await item_service.get_multi(skip=skip, limit=limit)
+    items, next_cursor = await item_service.get_page(skip=skip, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 @router.post("", response_model=ItemRead, status_code=status.HTTP_201_CREATED)
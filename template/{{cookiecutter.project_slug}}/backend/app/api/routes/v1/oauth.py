@@ -8,7 +8,7 @@ from fastapi.responses import RedirectResponse
 
 from app.api.deps import UserSvc
 from app.core.oauth import oauth
-from app.core.security import create_access_token, create_refresh_token
+from app.core.security import create_access_token, create_refresh_token, user_claims
 
 router = APIRouter()
 
@@ -67,7 +67,7 @@ async def google_callback(request: Request, user_service: UserSvc):
                     oauth_id=google_id,
                 )
 
-        access_token = create_access_token(subject=str(user.id))
+        access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
         refresh_token = create_refresh_token(subject=str(user.id))
 
         # Redirect to frontend with tokens
@@ -122,7 +122,7 @@ async def google_callback(request: Request, user_service: UserSvc):
                     oauth_id=google_id,
                 )
 
-        access_token = create_access_token(subject=str(user.id))
+        access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
         refresh_token = create_refresh_token(subject=str(user.id))
 
         # Redirect to frontend with tokens
@@ -179,7 +179,7 @@ async def google_callback(request: Request, user_service: UserSvc):
                     oauth_id=google_id,
                 )
 
-        access_token = create_access_token(subject=user.id)
+        access_token = create_access_token(subject=user.id, claims=user_claims(user))
         refresh_token = create_refresh_token(subject=user.id)
 
         # Redirect to frontend with tokens
@@ -16,8 +16,15 @@ from sqlalchemy import select
 {%- endif %}
 
 from app.api.deps import (
+{%- if cookiecutter.use_postgresql and cookiecutter.enable_pagination %}
+    ReadDBSession,
+{%- elif not cookiecutter.use_postgresql %}
     DBSession,
+{%- endif %}
     RoleChecker,
+{%- if cookiecutter.use_postgresql and not cookiecutter.enable_pagination %}
+    UserReadSvc,
+{%- endif %}
     UserSvc,
     get_current_user,
 )
@@ -64,7 +71,7 @@ async def update_current_user(
 
 @router.get("", response_model=Page[UserRead])
 async def read_users(
-    db: DBSession,
+    db: ReadDBSession,
     current_user: Annotated[User, Depends(RoleChecker(UserRole.ADMIN))],
 ):
     """Get all users (admin only)."""
@@ -76,7 +83,7 @@ async def read_users(
 
 @router.get("", response_model=list[UserRead])
 async def read_users(
-    user_service: UserSvc,
+    user_service: UserReadSvc,
     current_user: Annotated[User, Depends(RoleChecker(UserRole.ADMIN))],
     skip: int = 0,
     limit: int = 100,
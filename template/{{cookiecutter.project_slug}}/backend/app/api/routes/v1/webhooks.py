@@ -6,7 +6,11 @@ from fastapi import APIRouter, Query, status
 from uuid import UUID
 {%- endif %}
 
+{%- if cookiecutter.use_postgresql %}
+from app.api.deps import WebhookReadSvc, WebhookSvc
+{%- else %}
 from app.api.deps import WebhookSvc
+{%- endif %}
 {%- if cookiecutter.use_jwt %}
 from app.api.deps import CurrentUser
 {%- endif %}
@@ -158,14 +162,17 @@ async def regenerate_webhook_secret(
 @router.get("/{webhook_id}/deliveries", response_model=WebhookDeliveryListResponse)
 async def list_webhook_deliveries(
     webhook_id: UUID,
-    webhook_service: WebhookSvc,
+    webhook_service: WebhookReadSvc,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
-    """Get delivery history for a webhook."""
+    """Get delivery history for a webhook, newest first."""
     from app.schemas.webhook import WebhookDeliveryRead
 
-    deliveries, total = await webhook_service.get_deliveries(webhook_id, skip=skip, limit=limit)
+    deliveries, total, next_cursor = await webhook_service.get_deliveries(
+        webhook_id, skip=skip, limit=limit, cursor=cursor
+    )
     return WebhookDeliveryListResponse(
         items=[
             WebhookDeliveryRead(
@@ -176,12 +183,15 @@ async def list_webhook_deliveries(
                 error_message=d.error_message,
                 attempt_count=d.attempt_count,
                 success=d.success,
+                status=d.status,
+                next_attempt_at=d.next_attempt_at,
                 created_at=d.created_at,
                 delivered_at=d.delivered_at,
             )
             for d in deliveries
         ],
         total=total,
+        next_cursor=next_cursor,
     )
 
 
@@ -304,11 +314,14 @@ def list_webhook_deliveries(
     webhook_service: WebhookSvc,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
-    """Get delivery history for a webhook."""
+    """Get delivery history for a webhook, newest first."""
     from app.schemas.webhook import WebhookDeliveryRead
 
-    deliveries, total = webhook_service.get_deliveries(webhook_id, skip=skip, limit=limit)
+    deliveries, total, next_cursor = webhook_service.get_deliveries(
+        webhook_id, skip=skip, limit=limit, cursor=cursor
+    )
     return WebhookDeliveryListResponse(
         items=[
             WebhookDeliveryRead(
@@ -319,12 +332,15 @@ def list_webhook_deliveries(
                 error_message=d.error_message,
                 attempt_count=d.attempt_count,
                 success=d.success,
+                status=d.status,
+                next_attempt_at=d.next_attempt_at,
                 created_at=d.created_at,
                 delivered_at=d.delivered_at,
             )
             for d in deliveries
         ],
         total=total,
+        next_cursor=next_cursor,
     )
 
 
@@ -447,11 +463,14 @@ async def list_webhook_deliveries(
     webhook_service: WebhookSvc,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
-    """Get delivery history for a webhook."""
+    """Get delivery history for a webhook, newest first."""
     from app.schemas.webhook import WebhookDeliveryRead
 
-    deliveries, total = await webhook_service.get_deliveries(webhook_id, skip=skip, limit=limit)
+    deliveries, total, next_cursor = await webhook_service.get_deliveries(
+        webhook_id, skip=skip, limit=limit, cursor=cursor
+    )
     return WebhookDeliveryListResponse(
         items=[
             WebhookDeliveryRead(
@@ -462,12 +481,15 @@ async def list_webhook_deliveries(
                 error_message=d.error_message,
                 attempt_count=d.attempt_count,
                 success=d.success,
+                status=d.status,
+                next_attempt_at=d.next_attempt_at,
                 created_at=d.created_at,
                 delivered_at=d.delivered_at,
             )
             for d in deliveries
         ],
         total=total,
+        next_cursor=next_cursor,
     )
 
 
@@ -1,34 +1,142 @@
 {%- if cookiecutter.enable_websockets %}
-"""WebSocket routes."""
+"""WebSocket routes.
 
-from fastapi import APIRouter, WebSocket
+Each connection has a bounded send queue drained by its own writer task, so a
+slow client only delays its own messages. A client that falls
+``WS_SEND_QUEUE_SIZE`` messages behind is disconnected instead of buffering
+without limit.
+{%- if cookiecutter.enable_redis %}
+
+Broadcasts are published on a Redis channel, and every worker process
+delivers them to its own connections, so clients connected to any worker or
+pod receive them.
+{%- endif %}
+"""
+
+import asyncio
+import contextlib
+import logging
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+{%- if cookiecutter.enable_redis %}
+
+from app.clients.redis import RedisClient
+{%- endif %}
+from app.core.background import spawn
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
+{%- if cookiecutter.enable_redis %}
+
+BROADCAST_CHANNEL = "{{ cookiecutter.project_slug }}:ws:broadcast"
+{%- endif %}
 
 
 class ConnectionManager:
     """WebSocket connection manager."""
 
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
+    def __init__(self, queue_size: int | None = None):
+        self.queue_size = queue_size if queue_size is not None else settings.WS_SEND_QUEUE_SIZE
+        self.active_connections: set[WebSocket] = set()
+        self._queues: dict[WebSocket, asyncio.Queue[str]] = {}
+        self._writers: dict[WebSocket, asyncio.Task[None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+{%- if cookiecutter.enable_redis %}
+        self._redis: RedisClient | None = None
+{%- endif %}
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept and store a new WebSocket connection."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.queue_size)
+        self.active_connections.add(websocket)
+        self._queues[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._write(websocket, queue))
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self._queues.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
 
     async def send_personal_message(self, message: str, websocket: WebSocket) -> None:
         """Send a message to a specific WebSocket."""
-        await websocket.send_text(message)
+        self._enqueue(websocket, message)
 
     async def broadcast(self, message: str) -> None:
-        """Broadcast a message to all connected WebSockets."""
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        """Broadcast a message to all connected WebSockets{% if cookiecutter.enable_redis %} on every worker{% endif %}."""
+{%- if cookiecutter.enable_redis %}
+        if self._redis is not None:
+            try:
+                await self._redis.raw.publish(BROADCAST_CHANNEL, message)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to publish broadcast, delivering locally only: {e}")
+{%- endif %}
+        self._deliver(message)
+
+    def _deliver(self, message: str) -> None:
+        """Queue a message for every connection on this process."""
+        for websocket in list(self.active_connections):
+            self._enqueue(websocket, message)
+
+    def _enqueue(self, websocket: WebSocket, message: str) -> None:
+        queue = self._queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(f"Disconnecting slow WebSocket client ({self.queue_size} messages behind)")
+            self.disconnect(websocket)
+            spawn(self._close(websocket), self._tasks)
+
+    @staticmethod
+    async def _write(websocket: WebSocket, queue: asyncio.Queue[str]) -> None:
+        """Send queued messages to one connection, in order."""
+        # Stops when the connection closes; the endpoint then disconnects it
+        with contextlib.suppress(WebSocketDisconnect, RuntimeError):
+            while True:
+                await websocket.send_text(await queue.get())
+
+    @staticmethod
+    async def _close(websocket: WebSocket) -> None:
+        with contextlib.suppress(RuntimeError):  # Already closed
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Too slow to receive messages")
+{%- if cookiecutter.enable_redis %}
+
+    async def start(self, redis: RedisClient) -> None:
+        """Deliver broadcasts published by any worker through Redis pub/sub."""
+        self._redis = redis
+        spawn(self._listen(), self._tasks)
+
+    async def stop(self) -> None:
+        """Stop listening for broadcasts."""
+        self._redis = None
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _listen(self) -> None:
+        while self._redis is not None:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(BROADCAST_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._deliver(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket broadcast listener disconnected: {e}")
+                await asyncio.sleep(1)
+{%- endif %}
 
 
 manager = ConnectionManager()
@@ -38,9 +146,11 @@ manager = ConnectionManager()
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication."""
     await manager.connect(websocket)
-    async for data in websocket.iter_text():
-        await manager.broadcast(f"Message: {data}")
-    manager.disconnect(websocket)
+    try:
+        async for data in websocket.iter_text():
+            await manager.broadcast(f"Message: {data}")
+    finally:
+        manager.disconnect(websocket)
 {%- else %}
 """WebSocket - not configured."""
 {%- endif %}
@@ -11,11 +11,14 @@ from datetime import datetime
 from functools import wraps
 
 import logfire
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from fastapi import Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.middleware import RawHeaders, encode_headers, set_response_headers
 
-class VersionDeprecationMiddleware(BaseHTTPMiddleware):
+
+class VersionDeprecationMiddleware:
     """Middleware to add deprecation headers for deprecated API versions.
 
     Adds RFC 8594 compliant headers:
@@ -32,7 +35,7 @@ class VersionDeprecationMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         deprecated_versions: dict[str, dict] | None = None,
     ):
         """Initialize the middleware.
@@ -54,55 +57,68 @@ class VersionDeprecationMiddleware(BaseHTTPMiddleware):
                 }
             }
         """
-        super().__init__(app)
+        self.app = app
         self.deprecated_versions = deprecated_versions or {}
+        # Headers are encoded once per version rather than on every response
+        self._version_headers: dict[str, RawHeaders] = {
+            version: encode_headers(self._deprecation_headers(version, info))
+            for version, info in self.deprecated_versions.items()
+        }
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and add deprecation headers if needed."""
-        response = await call_next(request)
+        version = self._match_version(scope["path"]) if scope["type"] == "http" else None
+        if version is None:
+            await self.app(scope, receive, send)
+            return
 
-        # Check if request path matches a deprecated version
-        path = request.url.path
-        for version, info in self.deprecated_versions.items():
-            if f"/api/{version}/" in path or path.endswith(f"/api/{version}"):
-                self._add_deprecation_headers(response, version, info)
-                self._log_deprecated_usage(request, version)
-                break
+        self._log_deprecated_usage(scope, version)
+        headers = self._version_headers[version]
+
+        async def send_with_deprecation(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                set_response_headers(message, headers)
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_deprecation)
+
+    def _match_version(self, path: str) -> str | None:
+        """Return the deprecated version the request path belongs to, if any."""
+        for version in self.deprecated_versions:
+            if f"/api/{version}/" in path or path.endswith(f"/api/{version}"):
+                return version
+        return None
 
-    def _add_deprecation_headers(
-        self, response: Response, version: str, info: dict
-    ) -> None:
-        """Add RFC 8594 deprecation headers to the response."""
+    @staticmethod
+    def _deprecation_headers(version: str, info: dict) -> dict[str, str]:
+        """Build the RFC 8594 deprecation headers for a version."""
         # Deprecation header - indicates the API is deprecated
-        response.headers["Deprecation"] = "true"
+        headers = {"Deprecation": "true"}
 
         # Sunset header - when the API will be removed
         if sunset := info.get("sunset"):
             # Convert to HTTP date format
             sunset_date = datetime.fromisoformat(sunset)
-            response.headers["Sunset"] = sunset_date.strftime("%a, %d %b %Y %H:%M:%S GMT")
+            headers["Sunset"] = sunset_date.strftime("%a, %d %b %Y %H:%M:%S GMT")
 
         # Link header - documentation for migration
         if link := info.get("link"):
-            response.headers["Link"] = f'<{link}>; rel="deprecation"'
+            headers["Link"] = f'<{link}>; rel="deprecation"'
 
         # Custom warning header
-        message = info.get("message", f"API {version} is deprecated")
-        response.headers["X-API-Deprecation-Warning"] = message
+        headers["X-API-Deprecation-Warning"] = info.get("message", f"API {version} is deprecated")
+        return headers
 
-    def _log_deprecated_usage(self, request: Request, version: str) -> None:
+    def _log_deprecated_usage(self, scope: Scope, version: str) -> None:
         """Log usage of deprecated API version for monitoring."""
+        client = scope.get("client")
         logfire.warn(
             "Deprecated API version accessed",
             version=version,
-            path=request.url.path,
-            method=request.method,
-            client_ip=request.client.host if request.client else None,
-            user_agent=request.headers.get("User-Agent"),
+            path=scope["path"],
+            method=scope["method"],
+            client_ip=client[0] if client else None,
+            user_agent=Headers(scope=scope).get("User-Agent"),
         )
 
 
@@ -6,9 +6,17 @@ This module contains thin wrappers around external services like Redis.
 
 from app.clients.redis import RedisClient
 {%- endif %}
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+
+from app.clients.webhook import WebhookClient, webhook_client
+{%- endif %}
 
 __all__ = [
 {%- if cookiecutter.enable_redis %}
     "RedisClient",
 {%- endif %}
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+    "WebhookClient",
+    "webhook_client",
+{%- endif %}
 ]
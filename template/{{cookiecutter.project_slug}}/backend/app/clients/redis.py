@@ -2,12 +2,52 @@
 """Redis client wrapper.
 
 Provides a class-based Redis client for connection management and operations.
+
+Commands share a bounded connection pool (``REDIS_MAX_CONNECTIONS``): when
+every connection is busy, a command waits up to ``REDIS_POOL_TIMEOUT``
+seconds for one instead of opening more. Pub/sub uses separate connections
+that wait for messages without the command timeout.
+
+Keys under ``REDIS_CLIENT_CACHE_PREFIXES`` are also kept in process memory
+(client-side caching). Redis tracks those prefixes and reports every change
+to them on an invalidation channel, which drops the local copy. If that
+channel is lost, the local copies are dropped and reads go to Redis until
+tracking is restored. Writes made through this client drop the local copy
+at once, so a process always reads its own writes.
 """
 
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from contextlib import asynccontextmanager
+from typing import Any
+
 from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline, PubSub
+from redis.exceptions import NoScriptError
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+
+class LuaScript:
+    """A Lua script run by its SHA1 digest.
+
+    Define scripts once at module level and run them with
+    ``RedisClient.run_script``, which only sends the source when Redis does
+    not have the script cached yet.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+
 
 class RedisClient:
     """Redis client wrapper for connection lifecycle management.
@@ -20,20 +60,53 @@ class RedisClient:
             await redis.close()
     """
 
-    def __init__(self, url: str | None = None):
+    def __init__(self, url: str | None = None, cache_prefixes: Sequence[str] | None = None):
         self.url = url or settings.REDIS_URL
         self.client: aioredis.Redis | None = None
+        self.cache_prefixes = tuple(
+            cache_prefixes if cache_prefixes is not None else settings.REDIS_CLIENT_CACHE_PREFIXES
+        )
+        self._pubsub_client: aioredis.Redis | None = None
+        # Client-side cache: key -> (expires_at, value), used while tracking is on
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._tracking = False
+        self._generation = 0
+        self._tracker: asyncio.Task[None] | None = None
 
     async def connect(self) -> None:
         """Connect to Redis server."""
-        self.client = aioredis.from_url(
+        pool = aioredis.BlockingConnectionPool.from_url(
             self.url,
             encoding="utf-8",
             decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
         )
+        self.client = aioredis.Redis.from_pool(pool)
+        # No socket timeout: subscribers can wait any length of time for a message
+        self._pubsub_client = aioredis.Redis.from_url(
+            self.url,
+            encoding="utf-8",
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_keepalive=True,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        if self.cache_prefixes:
+            self._tracker = asyncio.create_task(self._track())
 
     async def close(self) -> None:
         """Close Redis connection."""
+        if self._tracker is not None:
+            self._tracker.cancel()
+            await asyncio.gather(self._tracker, return_exceptions=True)
+            self._tracker = None
+        if self._pubsub_client:
+            await self._pubsub_client.close()
+            self._pubsub_client = None
         if self.client:
             await self.client.close()
             self.client = None
@@ -42,24 +115,77 @@ class RedisClient:
         """Get a value by key."""
         if not self.client:
             raise RuntimeError("Redis client not connected")
-        return await self.client.get(key)
+        if not self._is_cached(key):
+            value: str | None = await self.client.get(key)
+            return value
+        values = await self.mget([key])
+        return values[0]
+
+    async def mget(self, keys: Sequence[str]) -> list[str | None]:
+        """Get several values in one round trip (``None`` for missing keys)."""
+        if not self.client:
+            raise RuntimeError("Redis client not connected")
+        if not keys:
+            return []
+        if not self._tracking:
+            fetched: list[str | None] = await self.client.mget(keys)
+            return fetched
+
+        values: dict[str, str | None] = {}
+        now = time.monotonic()
+        for key in keys:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > now:
+                self._local.move_to_end(key)
+                values[key] = entry[1]
+        missing = [key for key in dict.fromkeys(keys) if key not in values]
+        if missing:
+            generation = self._generation
+            fetched = await self.client.mget(missing)
+            for key, value in zip(missing, fetched, strict=True):
+                values[key] = value
+                if value is not None and self._is_cached(key):
+                    self._store_local(key, value, generation)
+        return [values[key] for key in keys]
 
     async def set(
         self,
         key: str,
         value: str,
         ttl: int | None = None,
+        nx: bool = False,
     ) -> None:
-        """Set a value with optional TTL (in seconds)."""
+        """Set a value with optional TTL (in seconds); with ``nx``, only if the key is missing."""
         if not self.client:
             raise RuntimeError("Redis client not connected")
-        await self.client.set(key, value, ex=ttl)
+        if nx:
+            await self.client.set(key, value, ex=ttl, nx=True)
+        else:
+            await self.client.set(key, value, ex=ttl)
+        self._drop_local((key,))
+
+    async def mset(self, mapping: Mapping[str, str], ttl: int | None = None) -> None:
+        """Set several values in one round trip, with an optional shared TTL."""
+        if not self.client:
+            raise RuntimeError("Redis client not connected")
+        if not mapping:
+            return
+        if ttl is None:
+            await self.client.mset(dict(mapping))
+        else:
+            # MSET cannot set expiry, so send one SET per key in a single transaction
+            async with self.pipeline() as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=ttl)
+        self._drop_local(mapping)
 
     async def delete(self, key: str) -> int:
         """Delete a key. Returns number of keys deleted."""
         if not self.client:
             raise RuntimeError("Redis client not connected")
-        return await self.client.delete(key)
+        deleted = int(await self.client.delete(key))
+        self._drop_local((key,))
+        return deleted
 
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
@@ -67,6 +193,48 @@ class RedisClient:
             raise RuntimeError("Redis client not connected")
         return bool(await self.client.exists(key))
 
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator[Pipeline]:
+        """Queue commands and send them in one round trip.
+
+        Commands still queued when the block exits are executed then, inside
+        MULTI/EXEC when ``transaction`` is set. Call ``await pipe.execute()``
+        in the block to get their replies.
+
+        Usage:
+            async with redis.pipeline() as pipe:
+                pipe.incr("hits")
+                pipe.expire("hits", 60)
+        """
+        if not self.client:
+            raise RuntimeError("Redis client not connected")
+        async with self.client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            if pipe.command_stack:
+                await pipe.execute()
+
+    async def run_script(
+        self,
+        script: LuaScript,
+        keys: Sequence[str] = (),
+        args: Sequence[Any] = (),
+    ) -> Any:
+        """Run a Lua script with EVALSHA, sending its source only if Redis lacks it."""
+        if not self.client:
+            raise RuntimeError("Redis client not connected")
+        # redis-py annotates both as returning Awaitable[str] | str
+        try:
+            return await self.client.evalsha(script.sha, len(keys), *keys, *args)  # type: ignore[misc]
+        except NoScriptError:
+            # First call after a Redis restart: EVAL runs the script and caches it
+            return await self.client.eval(script.source, len(keys), *keys, *args)  # type: ignore[misc]
+
+    def pubsub(self) -> PubSub:
+        """Create a pub/sub object on the subscriber connections."""
+        if not self._pubsub_client:
+            raise RuntimeError("Redis client not connected")
+        return self._pubsub_client.pubsub()
+
     async def ping(self) -> bool:
         """Ping Redis server. Returns True if connected."""
         if not self.client:
@@ -83,6 +251,93 @@ class RedisClient:
         if not self.client:
             raise RuntimeError("Redis client not connected")
         return self.client
+
+    def _is_cached(self, key: str) -> bool:
+        return self._tracking and key.startswith(self.cache_prefixes)
+
+    def _store_local(self, key: str, value: str, generation: int) -> None:
+        # Skipped if an invalidation arrived while the value was being read
+        if generation != self._generation:
+            return
+        self._local[key] = (time.monotonic() + settings.REDIS_CLIENT_CACHE_TTL, value)
+        self._local.move_to_end(key)
+        while len(self._local) > settings.REDIS_CLIENT_CACHE_MAX_SIZE:
+            self._local.popitem(last=False)
+
+    def _drop_local(self, keys: Iterable[str]) -> None:
+        # Redis reports our own writes too, but only after the next read may have run
+        written = [key for key in keys if self._is_cached(key)]
+        if written:
+            self._invalidate_local(written)
+
+    def _invalidate_local(self, keys: list[str] | None) -> None:
+        self._generation += 1
+        if keys is None:  # FLUSHDB / FLUSHALL
+            self._local.clear()
+            return
+        for key in keys:
+            self._local.pop(key, None)
+
+    async def _track(self) -> None:
+        """Keep server-assisted client-side caching on while connected.
+
+        Redis sends invalidations for the tracked prefixes to the subscriber
+        connection (``CLIENT TRACKING ... REDIRECT ... BCAST``). Tracking is
+        enabled from a dedicated connection, which is checked whenever the
+        channel is idle; if either connection is lost, caching stops and the
+        local copies are dropped until tracking is set up again.
+        """
+        prefixes = [arg for prefix in self.cache_prefixes for arg in ("PREFIX", prefix)]
+        while self.client is not None:
+            tracker = aioredis.Redis.from_url(
+                self.url,
+                encoding="utf-8",
+                decode_responses=True,
+                single_connection_client=True,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            )
+            try:
+                async with self.pubsub() as pubsub:
+                    # The subscriber's ID must be read before it enters subscribe mode
+                    await pubsub.connect()
+                    connection = pubsub.connection
+                    if connection is None:
+                        raise ConnectionError("no subscriber connection")
+                    await connection.send_command("CLIENT", "ID")
+                    subscriber_id = await connection.read_response()
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    await tracker.execute_command(
+                        "CLIENT", "TRACKING", "ON", "REDIRECT", subscriber_id, "BCAST", *prefixes
+                    )
+                    self._invalidate_local(None)
+                    self._tracking = True
+                    while True:
+                        message = await pubsub.get_message(
+                            timeout=settings.REDIS_HEALTH_CHECK_INTERVAL
+                        )
+                        if message is None:
+                            await self._check_tracking(tracker)
+                        elif message["type"] == "message":
+                            self._invalidate_local(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis client-side caching paused: {e}")
+                await asyncio.sleep(1)
+            finally:
+                self._tracking = False
+                self._invalidate_local(None)
+                await tracker.close()
+
+    @staticmethod
+    async def _check_tracking(tracker: aioredis.Redis) -> None:
+        info = await tracker.execute_command("CLIENT", "TRACKINGINFO")  # type: ignore[no-untyped-call]
+        if isinstance(info, list):
+            info = dict(zip(info[::2], info[1::2], strict=True))
+        flags = info.get("flags", [])
+        if "on" not in flags or "broken_redirect" in flags:
+            raise ConnectionError(f"client tracking is no longer active ({flags})")
 {%- else %}
 """Redis client - not configured."""
 {%- endif %}
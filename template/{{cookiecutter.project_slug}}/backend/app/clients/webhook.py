@@ -0,0 +1,200 @@
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+"""Shared HTTP client for outbound webhook deliveries.
+
+One pooled ``httpx`` client is reused for every delivery so connections to a
+subscriber stay alive between events. Requests are bounded globally
+(``WEBHOOK_MAX_CONNECTIONS``) and per subscriber host
+(``WEBHOOK_MAX_CONNECTIONS_PER_HOST``), so one slow endpoint cannot take every
+connection. A host's slots are dropped once no request is using them, so the
+table stays as small as the number of hosts being sent to.
+"""
+
+{%- if cookiecutter.use_sqlite %}
+
+import threading
+{%- else %}
+
+import asyncio
+{%- endif %}
+from urllib.parse import urlsplit
+
+import httpx
+{%- if cookiecutter.enable_prometheus %}
+from prometheus_client import Gauge
+{%- endif %}
+
+from app.core.config import settings
+
+{%- if cookiecutter.enable_prometheus %}
+
+WEBHOOK_DELIVERIES_IN_FLIGHT = Gauge(
+    "webhook_deliveries_in_flight",
+    "Webhook HTTP requests currently in flight",
+)
+{%- endif %}
+
+
+class WebhookClient:
+    """Pooled, concurrency-limited HTTP client for webhook deliveries.
+
+    The underlying client is created on first use, so services and workers
+    can share the module-level ``webhook_client`` without extra setup. The
+    application lifespan closes it on shutdown.
+
+    Usage:
+        response = {% if not cookiecutter.use_sqlite %}await {% endif %}webhook_client.post(url, content=body, headers=headers)
+        webhook_client.in_flight  # requests currently being sent
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        max_connections: int | None = None,
+        max_connections_per_host: int | None = None,
+        max_keepalive_connections: int | None = None,
+    ) -> None:
+        self.timeout = timeout if timeout is not None else settings.WEBHOOK_TIMEOUT
+        self.max_connections = max_connections or settings.WEBHOOK_MAX_CONNECTIONS
+        self.max_connections_per_host = (
+            max_connections_per_host or settings.WEBHOOK_MAX_CONNECTIONS_PER_HOST
+        )
+        self.max_keepalive_connections = (
+            max_keepalive_connections or settings.WEBHOOK_MAX_KEEPALIVE_CONNECTIONS
+        )
+        self.in_flight = 0
+{%- if cookiecutter.use_sqlite %}
+        self._client: httpx.Client | None = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+{%- else %}
+        self._client: httpx.AsyncClient | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+{%- endif %}
+        # Requests waiting for or holding each host's slots
+        self._host_users: dict[str, int] = {}
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Connection pool limits for the underlying client."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+{%- if cookiecutter.use_sqlite %}
+
+    @property
+    def client(self) -> httpx.Client:
+        """The shared ``httpx.Client``, created on first access."""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout, limits=self.limits)
+            return self._client
+
+    def post(self, url: str, *, content: str, headers: dict[str, str]) -> httpx.Response:
+        """Send a POST request, waiting for a free global and per-host slot."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            host_slots = self._use_host(host)
+        try:
+            with self._slots, host_slots:
+                self._track(1)
+                try:
+                    return self.client.post(url, content=content, headers=headers)
+                finally:
+                    self._track(-1)
+        finally:
+            with self._lock:
+                self._release_host(host)
+
+    def close(self) -> None:
+        """Close pooled connections. The client is recreated on next use."""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            self.in_flight += delta
+{%- if cookiecutter.enable_prometheus %}
+        WEBHOOK_DELIVERIES_IN_FLIGHT.inc(delta)
+{%- endif %}
+
+    def _use_host(self, host: str) -> threading.BoundedSemaphore:
+        """Register a request for ``host`` and return the host's slots."""
+        host_slots = self._host_slots.get(host)
+        if host_slots is None:
+            host_slots = self._host_slots[host] = threading.BoundedSemaphore(self.max_connections_per_host)
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        return host_slots
+
+    def _release_host(self, host: str) -> None:
+        """Drop the host's slots once no request is waiting for or holding them."""
+        self._host_users[host] -= 1
+        if not self._host_users[host]:
+            del self._host_users[host]
+            del self._host_slots[host]
+{%- else %}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared ``httpx.AsyncClient``, created on first access."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+        return self._client
+
+    async def post(
+        self, url: str, *, content: str, headers: dict[str, str]
+    ) -> httpx.Response:
+        """Send a POST request, waiting for a free global and per-host slot."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        host = urlsplit(url).netloc
+        host_slots = self._use_host(host)
+        try:
+            async with self._slots, host_slots:
+                self._track(1)
+                try:
+                    return await self.client.post(url, content=content, headers=headers)
+                finally:
+                    self._track(-1)
+        finally:
+            self._release_host(host)
+
+    async def close(self) -> None:
+        """Close pooled connections. The client is recreated on next use."""
+        client, self._client = self._client, None
+        self._slots = None
+        if client is not None:
+            await client.aclose()
+
+    def _track(self, delta: int) -> None:
+        self.in_flight += delta
+{%- if cookiecutter.enable_prometheus %}
+        WEBHOOK_DELIVERIES_IN_FLIGHT.inc(delta)
+{%- endif %}
+
+    def _use_host(self, host: str) -> asyncio.Semaphore:
+        """Register a request for ``host`` and return the host's slots."""
+        host_slots = self._host_slots.get(host)
+        if host_slots is None:
+            host_slots = self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        return host_slots
+
+    def _release_host(self, host: str) -> None:
+        """Drop the host's slots once no request is waiting for or holding them."""
+        self._host_users[host] -= 1
+        if not self._host_users[host]:
+            del self._host_users[host]
+            del self._host_slots[host]
+{%- endif %}
+
+
+webhook_client = WebhookClient()
+{%- else %}
+"""Webhook HTTP client - not configured."""
+{%- endif %}
@@ -0,0 +1,74 @@
+"""Background work started from request handlers.
+
+``spawn`` runs a coroutine as a task without awaiting it.
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+
+``on_commit`` defers work until the caller's transaction commits, so caches
+and queues never act on changes that are later rolled back:
+
+    on_commit(db, "user_cache_invalidate", self._after_commit, str(user_id))
+{%- endif %}
+"""
+
+import asyncio
+from collections.abc import {% if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}Callable, {% endif %}Coroutine
+from typing import Any, TypeVar
+
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+
+from sqlalchemy import event
+{%- endif %}
+{%- if cookiecutter.use_postgresql %}
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+{%- elif cookiecutter.use_sqlite %}
+from sqlalchemy.orm import Session
+{%- endif %}
+
+T = TypeVar("T")
+
+_tasks: set[asyncio.Task[Any]] = set()
+
+
+def spawn(
+    coro: Coroutine[Any, Any, T], tasks: set[asyncio.Task[Any]] | None = None
+) -> asyncio.Task[T]:
+    """Run ``coro`` as a task on the running event loop.
+
+    The loop only keeps weak references to tasks, so the task is held in
+    ``tasks`` until it is done. Pass your own set to cancel or await the
+    tasks later; by default they are held here.
+    """
+    task = asyncio.ensure_future(coro)
+    held = _tasks if tasks is None else tasks
+    held.add(task)
+    task.add_done_callback(held.discard)
+    return task
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+
+
+def on_commit(
+    db: {% if cookiecutter.use_postgresql %}AsyncSession{% else %}Session{% endif %},
+    key: str,
+    callback: Callable[[list[Any]], object],
+    *values: Any,
+) -> None:
+    """Call ``callback`` once ``db`` commits.
+
+    ``values`` added under the same ``key`` before the commit are collected in
+    ``db.info`` and passed to a single call, deduplicated and in order.
+{%- if cookiecutter.use_postgresql %}
+    The callback runs inside the commit on the event loop thread, so it may
+    ``spawn`` async work but not await it.
+{%- endif %}
+    """
+    pending: dict[Any, None] | None = db.info.get(key)
+    if pending is None:
+        pending = db.info[key] = {}
+
+        def after_commit(session: Session) -> None:
+            callback(list(session.info.pop(key, {})))
+
+        event.listen({% if cookiecutter.use_postgresql %}db.sync_session{% else %}db{% endif %}, "after_commit", after_commit, once=True)
+    pending.update(dict.fromkeys(values))
+{%- endif %}
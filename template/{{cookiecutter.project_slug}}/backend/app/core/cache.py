@@ -1,10 +1,75 @@
 {%- if cookiecutter.enable_caching %}
-"""Caching configuration using fastapi-cache2."""
+"""Caching.
+
+``setup_cache`` initializes fastapi-cache2 for route-level ``@cache()``.
+{%- if cookiecutter.use_postgresql %}
+
+Service methods are cached with ``@cached``, which stores their result in
+Redis as the given read schema:
+
+    @cached(model=ItemRead, tags=["item:{item_id}"])
+    async def get_item(self, item_id: UUID) -> ItemRead: ...
+
+    @invalidates("items", "item:{item_id}")
+    async def update(self, item_id: UUID, item_in: ItemUpdate) -> Item: ...
+
+- Tags name what an entry depends on; ``{placeholders}`` are filled from the
+  call's arguments. ``@invalidates`` expires every entry carrying one of its
+  tags once the service's session commits. Each tag has a version in Redis,
+  and an entry remembers the versions it was loaded under, so a load that
+  raced a write is never served.
+- Concurrent misses for the same key in one process share a single load.
+  Misses are loaded on the primary even when the service reads from a
+  replica, because a lagging replica could cache data older than the tag
+  versions stored with it.
+- For ``SERVICE_CACHE_STALE_TTL`` seconds after an entry stops being fresh it
+  is still served, while one background task reloads it with its own session.
+- With ``SERVICE_CACHE_LOCAL_TTL`` > 0, entries are also kept in a
+  per-process LRU. Invalidations clear it in the process that made them;
+  other processes see them once their local entry expires.
+
+Hits return schema instances, never ORM objects: cache methods whose callers
+only read the result, and keep using the uncached getters in write paths.
+{%- endif %}
+"""
+{%- if cookiecutter.use_postgresql %}
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+{%- endif %}
 
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
+{%- if cookiecutter.use_postgresql %}
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+{%- endif %}
 
 from app.clients.redis import RedisClient
+{%- if cookiecutter.use_postgresql %}
+from app.core.background import on_commit, spawn
+from app.core.config import settings
+from app.db.session import get_db_context, read_replicas
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "{{ cookiecutter.project_slug }}:svc"
+
+# Session.info key: tags to invalidate once the session commits
+_PENDING_KEY = "service_cache_invalidate"
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+{%- endif %}
 
 
 def setup_cache(redis: RedisClient) -> None:
@@ -13,6 +78,300 @@ def setup_cache(redis: RedisClient) -> None:
     Uses the shared Redis client from lifespan state.
     """
     FastAPICache.init(RedisBackend(redis.raw), prefix="{{ cookiecutter.project_slug }}:cache:")
+{%- if cookiecutter.use_postgresql %}
+
+
+@dataclass
+class CacheStats:
+    """Counters for one process."""
+
+    hits: int = 0  # fresh entries served, from either tier
+    local_hits: int = 0  # of which from the local tier
+    stale_hits: int = 0  # stale entries served while reloading
+    misses: int = 0
+    coalesced: int = 0  # misses that waited for another call's load
+    errors: int = 0  # Redis failures (the call falls back to loading)
+
+    def as_dict(self) -> dict[str, int]:
+        """Counters as a plain dict."""
+        return asdict(self)
+
+
+class ServiceCache:
+    """Tagged read-through cache backing ``@cached``."""
+
+    def __init__(
+        self,
+        ttl: int | None = None,
+        stale_ttl: int | None = None,
+        local_ttl: float | None = None,
+        local_maxsize: int | None = None,
+    ) -> None:
+        self.ttl = ttl if ttl is not None else settings.SERVICE_CACHE_TTL
+        self.stale_ttl = stale_ttl if stale_ttl is not None else settings.SERVICE_CACHE_STALE_TTL
+        self.local_ttl = local_ttl if local_ttl is not None else settings.SERVICE_CACHE_LOCAL_TTL
+        self.local_maxsize = (
+            local_maxsize if local_maxsize is not None else settings.SERVICE_CACHE_LOCAL_MAX_SIZE
+        )
+        self.stats = CacheStats()
+        self._redis: RedisClient | None = None
+        # key -> (expires_at, tags, value)
+        self._entries: OrderedDict[str, tuple[float, tuple[str, ...], Any]] = OrderedDict()
+        self._generation = 0
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    def setup(self, redis: RedisClient | None) -> None:
+        """Cache in ``redis`` (``None`` disables caching)."""
+        self._redis = redis
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        key: str,
+        tags: tuple[str, ...],
+        adapter: TypeAdapter[Any],
+        load: Callable[[], Awaitable[Any]],
+        reload: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Cached value for ``key``, calling ``load`` on a miss.
+
+        ``reload`` refreshes a stale entry in the background, so it must not
+        use the caller's session.
+        """
+        if self._redis is None:
+            return adapter.validate_python(await load(), from_attributes=True)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            self.stats.local_hits += 1
+            return entry[2]
+
+        generation = self._generation
+        try:
+            raw, *found = await self._redis.mget([key, *(_tag_key(tag) for tag in tags)])
+        except Exception as e:
+            logger.warning(f"Service cache read failed: {e}")
+            self.stats.errors += 1
+            return adapter.validate_python(await load(), from_attributes=True)
+        versions = {tag: version or "" for tag, version in zip(tags, found, strict=True)}
+
+        if raw is not None:
+            cached = json.loads(raw)
+            if cached["tags"] == versions:
+                value = adapter.validate_python(cached["value"])
+                if cached["fresh_until"] > time.time():
+                    self.stats.hits += 1
+                    self._store_local(key, tags, value, generation)
+                    return value
+                self.stats.stale_hits += 1
+                if key not in self._inflight:
+                    # Claimed before spawning so later stale hits do not start another
+                    future = self._claim(key)
+                    task = self._spawn(
+                        self._load(key, future, tags, versions, adapter, reload, generation)
+                    )
+                    # Releases waiters if the task is cancelled before it starts
+                    task.add_done_callback(lambda _: self._release(key, future))
+                return value
+
+        self.stats.misses += 1
+        return await self._load_once(key, tags, versions, adapter, load, generation)
+
+    async def invalidate(self, *tags: str) -> None:
+        """Expire every entry carrying any of ``tags``."""
+        self._drop_local(tags)
+        if self._redis is None:
+            return
+        # A fresh random version never matches one an entry recorded, even
+        # after the previous version key expired
+        versions = {_tag_key(tag): secrets.token_hex(8) for tag in tags}
+        try:
+            await self._redis.mset(versions, ttl=self.ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"Service cache invalidation failed for {', '.join(tags)}: {e}")
+            self.stats.errors += 1
+
+    def invalidate_on_commit(self, db: AsyncSession, *tags: str) -> None:
+        """Invalidate ``tags`` once ``db`` commits.
+
+        Invalidating before the commit would let a concurrent request cache
+        the data as it was before the change.
+        """
+        on_commit(db, _PENDING_KEY, self._after_commit, *tags)
+
+    def _after_commit(self, tags: list[str]) -> None:
+        self._spawn(self.invalidate(*tags))
+
+    async def _load_once(
+        self,
+        key: str,
+        tags: tuple[str, ...],
+        versions: dict[str, str],
+        adapter: TypeAdapter[Any],
+        load: Callable[[], Awaitable[Any]],
+        generation: int,
+    ) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+            try:
+                # Shielded so a cancelled waiter does not cancel the shared load
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The loading call was cancelled; load for ourselves instead
+        return await self._load(key, self._claim(key), tags, versions, adapter, load, generation)
+
+    def _claim(self, key: str) -> asyncio.Future[Any]:
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def _release(self, key: str, future: asyncio.Future[Any]) -> None:
+        future.cancel()
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def _load(
+        self,
+        key: str,
+        future: asyncio.Future[Any],
+        tags: tuple[str, ...],
+        versions: dict[str, str],
+        adapter: TypeAdapter[Any],
+        load: Callable[[], Awaitable[Any]],
+        generation: int,
+    ) -> Any:
+        try:
+            value = adapter.validate_python(await load(), from_attributes=True)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved here in case nobody was waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+
+        self._store_local(key, tags, value, generation)
+        if self._redis is not None:
+            entry = {
+                "tags": versions,
+                "fresh_until": time.time() + self.ttl,
+                "value": adapter.dump_python(value, mode="json"),
+            }
+            try:
+                await self._redis.set(key, json.dumps(entry), ttl=self.ttl + self.stale_ttl)
+            except Exception as e:
+                logger.warning(f"Service cache write failed: {e}")
+                self.stats.errors += 1
+        return value
+
+    def _store_local(self, key: str, tags: tuple[str, ...], value: Any, generation: int) -> None:
+        # Skipped if this process invalidated anything during the load
+        if self.local_ttl <= 0 or generation != self._generation:
+            return
+        self._entries[key] = (time.monotonic() + self.local_ttl, tags, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.local_maxsize:
+            self._entries.popitem(last=False)
+
+    def _drop_local(self, tags: Iterable[str]) -> None:
+        self._generation += 1
+        dropped = set(tags)
+        for key, (_, entry_tags, _) in list(self._entries.items()):
+            if dropped.intersection(entry_tags):
+                del self._entries[key]
+
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task[Any]:
+        task = spawn(coro, self._tasks)
+        task.add_done_callback(_log_failure)
+        return task
+
+
+service_cache = ServiceCache()
+
+
+def cached(*, model: Any, tags: Iterable[str] = ()) -> Callable[[F], F]:
+    """Cache an async service method's result as ``model``.
+
+    The key covers the method and all its arguments except ``self``. The
+    service must take its session as the only constructor argument, which
+    is how stale entries are reloaded outside the request.
+    """
+    tag_templates = tuple(tags)
+
+    def decorator(fn: F) -> F:
+        adapter: TypeAdapter[Any] = TypeAdapter(model)
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            arguments = _arguments(signature, self, args, kwargs)
+            digest = hashlib.sha256(
+                json.dumps(arguments, sort_keys=True, default=str).encode()
+            ).hexdigest()[:32]
+
+            async def reload() -> Any:
+                async with get_db_context() as db:
+                    return await fn(type(self)(db), *args, **kwargs)
+
+            return await service_cache.get_or_load(
+                f"{KEY_PREFIX}:{fn.__qualname__}:{digest}",
+                tuple(tag.format(**arguments) for tag in tag_templates),
+                adapter,
+                # Replica reads can lag behind an invalidation, so fill from the primary
+                reload if read_replicas.is_replica(self.db) else lambda: fn(self, *args, **kwargs),
+                reload,
+            )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def invalidates(*tags: str) -> Callable[[F], F]:
+    """Invalidate ``tags`` once the write's session (``self.db``) commits."""
+
+    def decorator(fn: F) -> F:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            result = await fn(self, *args, **kwargs)
+            arguments = _arguments(signature, self, args, kwargs)
+            service_cache.invalidate_on_commit(self.db, *(tag.format(**arguments) for tag in tags))
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _arguments(
+    signature: inspect.Signature, service: Any, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> dict[str, Any]:
+    bound = signature.bind(service, *args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    arguments.pop("self", None)
+    return arguments
+
+
+def _tag_key(tag: str) -> str:
+    return f"{KEY_PREFIX}:tag:{tag}"
+
+
+def _log_failure(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Service cache background task failed: {task.exception()}")
+{%- endif %}
 {%- else %}
 """Caching - not configured."""
 
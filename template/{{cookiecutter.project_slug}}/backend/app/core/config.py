@@ -77,6 +77,18 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = {{ cookiecutter.db_pool_size }}
     DB_MAX_OVERFLOW: int = {{ cookiecutter.db_max_overflow }}
     DB_POOL_TIMEOUT: int = {{ cookiecutter.db_pool_timeout }}
+
+    # Read replicas (JSON list of postgresql+asyncpg:// URLs). List endpoints read
+    # from them; when empty, everything uses the primary
+    DATABASE_READ_URLS: list[str] = []
+    # After a client writes, its reads go to the primary for this long (replication lag)
+    DB_READ_STICKY_SECONDS: int = 5
+    # How long a replica that could not be reached is skipped
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+
+    # How paginated lists compute `total`: "exact" counts in the page query itself
+    # (count(*) OVER ()), "estimated" uses the planner's row estimate and skips the scan
+    PAGINATION_TOTAL_MODE: Literal["exact", "estimated"] = "exact"
 {%- endif %}
 
 {%- if cookiecutter.use_mongodb %}
@@ -101,6 +113,12 @@ class Settings(BaseSettings):
 
     # === Database (SQLite sync) ===
     SQLITE_PATH: str = "./{{ cookiecutter.project_slug }}.db"
+    # How long a connection waits for the write lock before failing
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Page cache per connection
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    # Bytes of the database file read through memory-mapped I/O (0 disables)
+    SQLITE_MMAP_SIZE: int = 268435456
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -135,7 +153,53 @@ class Settings(BaseSettings):
     # === JWT Settings ===
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # 30 minutes
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    # HS256 signs with SECRET_KEY; ES256 or EdDSA sign with JWT_PRIVATE_KEY so
+    # other services can verify tokens from the JWKS endpoint without a shared secret
     ALGORITHM: str = "HS256"
+    JWT_PRIVATE_KEY: str = ""  # PEM
+    # PEM public keys of retired signing keys, accepted until their tokens expire
+    JWT_PUBLIC_KEYS: list[str] = []
+
+    @field_validator("JWT_PRIVATE_KEY")
+    @classmethod
+    def validate_jwt_private_key(cls, v: str, info: ValidationInfo) -> str:
+        """Require a signing key for asymmetric algorithms."""
+        algorithm = info.data.get("ALGORITHM", "HS256") if info.data else "HS256"
+        if not algorithm.startswith("HS") and not v:
+            raise ValueError(
+                f"JWT_PRIVATE_KEY is required for {algorithm}. Generate one with: "
+                "openssl genpkey -algorithm EC -pkeyopt ec_paramgen_curve:P-256 (ES256) "
+                "or openssl genpkey -algorithm ed25519 (EdDSA)"
+            )
+        return v
+
+    # === Password Hashing ===
+    # Existing hashes are upgraded on the next login after these change
+    PASSWORD_HASH_ALGORITHM: Literal["argon2id", "bcrypt"] = "argon2id"
+    ARGON2_TIME_COST: int = 3  # iterations
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_CONCURRENCY: int = 4  # hashes running at once per process
+
+    # === User Cache (get_current_user) ===
+    USER_CACHE_LOCAL_TTL: float = 5.0  # seconds, per process
+    USER_CACHE_MAX_SIZE: int = 10_000  # users per process
+{%- if cookiecutter.enable_redis and not cookiecutter.use_sqlite %}
+    USER_CACHE_TTL: int = 60  # seconds, shared in Redis
+{%- endif %}
+{%- if cookiecutter.enable_session_management %}
+
+    # === Sessions ===
+    # Minimum gap between writes of a session's last_used_at
+    SESSION_LAST_USED_INTERVAL_MINUTES: int = 5
+{%- if cookiecutter.enable_redis and not cookiecutter.use_sqlite %}
+    # "redis" keeps active sessions in Redis instead of the sessions table
+    SESSION_STORE: Literal["database", "redis"] = "database"
+    # With SESSION_STORE=redis, also record sessions in the sessions table
+    SESSION_AUDIT_LOG: bool = True
+{%- endif %}
+{%- endif %}
 {%- endif %}
 
 {%- if cookiecutter.enable_oauth_google %}
@@ -172,6 +236,16 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str | None = None
     REDIS_DB: int = 0
+    REDIS_MAX_CONNECTIONS: int = 50  # per process; commands wait for a free one
+    REDIS_POOL_TIMEOUT: float = 5.0  # seconds to wait for a free connection
+    REDIS_SOCKET_TIMEOUT: float = 5.0  # seconds per command
+    REDIS_CONNECT_TIMEOUT: float = 2.0  # seconds
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # seconds idle before a connection is pinged
+    # Client-side caching: keys under these prefixes are served from process
+    # memory, and Redis reports changes to them (off when empty)
+    REDIS_CLIENT_CACHE_PREFIXES: list[str] = []
+    REDIS_CLIENT_CACHE_TTL: float = 60.0  # seconds, bounds a local copy's age
+    REDIS_CLIENT_CACHE_MAX_SIZE: int = 10_000  # keys per process
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -182,11 +256,23 @@ class Settings(BaseSettings):
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 {%- endif %}
 
+{%- if cookiecutter.enable_caching and cookiecutter.use_postgresql %}
+
+    # === Service Cache (@cached service methods) ===
+    SERVICE_CACHE_TTL: int = 60  # seconds an entry is fresh
+    SERVICE_CACHE_STALE_TTL: int = 300  # seconds a stale entry is served while it is reloaded
+    SERVICE_CACHE_LOCAL_TTL: float = 0.0  # seconds, per-process tier in front of Redis (0 = off)
+    SERVICE_CACHE_LOCAL_MAX_SIZE: int = 1000  # entries per process
+{%- endif %}
+
 {%- if cookiecutter.enable_rate_limiting %}
 
     # === Rate Limiting ===
     RATE_LIMIT_REQUESTS: int = {{ cookiecutter.rate_limit_requests }}
     RATE_LIMIT_PERIOD: int = {{ cookiecutter.rate_limit_period }}  # seconds
+{%- if cookiecutter.enable_ai_agent %}
+    RATE_LIMIT_AGENT_TOKENS_PER_MINUTE: int = 20000
+{%- endif %}
 {%- endif %}
 
 {%- if cookiecutter.use_celery %}
@@ -235,6 +321,13 @@ class Settings(BaseSettings):
     S3_REGION: str = "us-east-1"
 {%- endif %}
 
+{%- if cookiecutter.enable_websockets %}
+
+    # === WebSockets ===
+    # Messages queued per connection; clients that fall further behind are disconnected
+    WS_SEND_QUEUE_SIZE: int = 100
+{%- endif %}
+
 {%- if cookiecutter.enable_ai_agent %}
 
     # === AI Agent ({{ cookiecutter.ai_framework }}, {{ cookiecutter.llm_provider }}) ===
@@ -253,6 +346,41 @@ class Settings(BaseSettings):
     AI_TEMPERATURE: float = 0.7
     AI_FRAMEWORK: str = "{{ cookiecutter.ai_framework }}"
     LLM_PROVIDER: str = "{{ cookiecutter.llm_provider }}"
+    # Server-side chat history window (estimated tokens) sent to the model each turn
+    AGENT_HISTORY_MAX_TOKENS: int = 8000
+    # WebSocket text deltas are merged into one frame per interval or once this much
+    # text is pending (clients can override per connection; 0 ms = a frame per delta)
+    AGENT_WS_COALESCE_MS: int = 20
+    AGENT_WS_COALESCE_BYTES: int = 1024
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+    # Max stored messages loaded when a WebSocket resumes an existing conversation
+    AGENT_HISTORY_LOAD_LIMIT: int = 200
+    # Write-behind persistence of agent messages/tool calls: rows are bulk-inserted
+    # once this many are pending or the oldest is this many seconds old (0 = every turn)
+    AGENT_PERSIST_MAX_PENDING: int = 50
+    AGENT_PERSIST_FLUSH_INTERVAL: float = 0.0
+{%- endif %}
+{%- if cookiecutter.use_pydantic_ai or cookiecutter.use_langchain or cookiecutter.use_langgraph %}
+    # Completion cache for repeated prompts (off by default; turns that call tools are never cached)
+    AGENT_CACHE_ENABLED: bool = False
+    AGENT_CACHE_LOCAL_TTL: float = 300.0  # seconds, per process
+    AGENT_CACHE_MAX_SIZE: int = 1000  # completions per process
+{%- if cookiecutter.enable_redis %}
+    AGENT_CACHE_TTL: int = 3600  # seconds, shared in Redis
+{%- endif %}
+    # Pooled HTTP connections shared by the model provider clients
+    AGENT_HTTP_MAX_CONNECTIONS: int = 100
+    AGENT_HTTP_TIMEOUT: float = 600.0  # seconds per model request
+{%- endif %}
+{%- if cookiecutter.use_crewai %}
+    # Crew kickoffs run on a shared thread pool; more turns wait for a free worker
+    AGENT_CREW_CONCURRENCY: int = 4
+{%- endif %}
+{%- if cookiecutter.use_langgraph %}
+    # Tool calls from one model step run concurrently, up to this many at a time
+    AGENT_TOOL_CONCURRENCY: int = 8
+    AGENT_TOOL_TIMEOUT: float = 30.0  # seconds per tool call
+{%- endif %}
 {%- if cookiecutter.use_langchain %}
 
     # === LangSmith (LangChain observability) ===
@@ -279,6 +407,25 @@ class Settings(BaseSettings):
 {%- endif %}
 {%- endif %}
 
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+
+    # === Webhooks ===
+    # Outbound deliveries share one pooled HTTP client (see app/clients/webhook.py)
+    WEBHOOK_TIMEOUT: float = 30.0
+    WEBHOOK_MAX_CONNECTIONS: int = 100
+    WEBHOOK_MAX_CONNECTIONS_PER_HOST: int = 10
+    WEBHOOK_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    # Failed deliveries are retried with exponential backoff and jitter, then
+    # dead-lettered; repeated failures open a per-webhook circuit breaker
+    WEBHOOK_MAX_ATTEMPTS: int = 8
+    WEBHOOK_RETRY_BASE_DELAY: float = 10.0  # seconds, doubled on each attempt
+    WEBHOOK_RETRY_MAX_DELAY: float = 3600.0
+    WEBHOOK_CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failures
+    WEBHOOK_CIRCUIT_RESET_TIMEOUT: float = 300.0  # seconds before trying again
+    # Subscriptions per event type are cached in memory for this long (seconds)
+    WEBHOOK_INDEX_TTL: float = 60.0
+{%- endif %}
+
 {%- if cookiecutter.enable_cors %}
 
     # === CORS ===
@@ -24,17 +24,17 @@ Usage:
 """
 
 import secrets
-from collections.abc import Callable
 from typing import ClassVar
 
-from fastapi import Request, Response
+from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+class CSRFMiddleware:
     """CSRF protection middleware.
 
     Protects against Cross-Site Request Forgery attacks by requiring
@@ -47,6 +47,7 @@ class CSRFMiddleware(BaseHTTPMiddleware):
     # Cookie settings
     COOKIE_NAME: ClassVar[str] = "csrf_token"
     HEADER_NAME: ClassVar[str] = "X-CSRF-Token"
+    COOKIE_MAX_AGE: ClassVar[int] = 3600 * 24  # 24 hours
 
     # Paths to exclude from CSRF protection
     EXEMPT_PATHS: ClassVar[set[str]] = {
@@ -60,64 +61,73 @@ class CSRFMiddleware(BaseHTTPMiddleware):
         "/redoc",
     }
 
-    def __init__(self, app: Callable, **kwargs):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, **kwargs):
+        self.app = app
         self.exempt_paths = set(kwargs.get("exempt_paths", self.EXEMPT_PATHS))
         self.cookie_name = kwargs.get("cookie_name", self.COOKIE_NAME)
         self.header_name = kwargs.get("header_name", self.HEADER_NAME)
+        # Everything after the token value; JavaScript needs to read the cookie, so no HttpOnly
+        self._cookie_attributes = f"; Max-Age={self.COOKIE_MAX_AGE}; Path=/; SameSite=lax"
+        if not settings.DEBUG:
+            self._cookie_attributes += "; Secure"
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle the request and apply CSRF protection."""
-        # Skip for exempt paths
-        if self._is_exempt(request):
-            return await call_next(request)
+        # Skip for websockets and exempt paths
+        if scope["type"] != "http" or self._is_exempt(scope):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
 
         # Get or generate CSRF token
-        csrf_token = request.cookies.get(self.cookie_name)
-        if not csrf_token:
-            csrf_token = self._generate_token()
+        cookie_token = connection.cookies.get(self.cookie_name)
+        csrf_token = cookie_token or self._generate_token()
 
         # Check CSRF for protected methods
-        if request.method in self.PROTECTED_METHODS:
-            header_token = request.headers.get(self.header_name)
+        if scope["method"] in self.PROTECTED_METHODS:
+            header_token = connection.headers.get(self.header_name)
 
             if not header_token:
-                return JSONResponse(
+                response = JSONResponse(
                     status_code=403,
                     content={
                         "detail": "CSRF token missing",
                         "message": f"Include the '{self.header_name}' header with the CSRF token",
                     },
                 )
+                await response(scope, receive, send)
+                return
 
             if not secrets.compare_digest(csrf_token, header_token):
-                return JSONResponse(
+                response = JSONResponse(
                     status_code=403,
                     content={
                         "detail": "CSRF token invalid",
                         "message": "The CSRF token does not match",
                     },
                 )
+                await response(scope, receive, send)
+                return
 
         # Process the request
-        response = await call_next(request)
+        if cookie_token:
+            await self.app(scope, receive, send)
+            return
 
         # Set CSRF token cookie if not present
-        if not request.cookies.get(self.cookie_name):
-            response.set_cookie(
-                key=self.cookie_name,
-                value=csrf_token,
-                httponly=False,  # JavaScript needs to read this
-                secure=not settings.DEBUG,
-                samesite="lax",
-                max_age=3600 * 24,  # 24 hours
-            )
-
-        return response
-
-    def _is_exempt(self, request: Request) -> bool:
+        cookie = (b"set-cookie", f"{self.cookie_name}={csrf_token}{self._cookie_attributes}".encode("latin-1"))
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), cookie]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    def _is_exempt(self, scope: Scope) -> bool:
         """Check if the request path is exempt from CSRF protection."""
-        path = request.url.path
+        path = scope["path"]
 
         # Check exact path matches
         if path in self.exempt_paths:
@@ -129,7 +139,7 @@ class CSRFMiddleware(BaseHTTPMiddleware):
                 return True
 
         # Check if endpoint has "csrf-exempt" tag
-        route = request.scope.get("route")
+        route = scope.get("route")
         return bool(route and hasattr(route, "tags") and "csrf-exempt" in route.tags)
 
     @staticmethod
@@ -1,14 +1,44 @@
-"""Application middleware."""
+"""Application middleware.
+
+These are plain ASGI middlewares rather than ``BaseHTTPMiddleware``
+subclasses: they only touch the ``http.response.start`` message, so response
+bodies (including streaming responses) pass through untouched and no extra
+task is spawned per request.
+"""
 
 from typing import ClassVar
 from uuid import uuid4
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers
+{%- if cookiecutter.use_postgresql %}
+from starlette.requests import cookie_parser
+{%- endif %}
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+{%- if cookiecutter.use_postgresql %}
+
+from app.db.session import primary_pinned
+{%- endif %}
+
+RawHeaders = list[tuple[bytes, bytes]]
+
+
+def encode_headers(headers: dict[str, str]) -> RawHeaders:
+    """Encode headers once into the ``(name, value)`` byte pairs ASGI sends."""
+    return [
+        (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()
+    ]
+
+
+def set_response_headers(message: Message, headers: RawHeaders) -> None:
+    """Set raw headers on an ``http.response.start`` message, replacing same-named ones."""
+    names = {name for name, _ in headers}
+    message["headers"] = [
+        *(header for header in message.get("headers", ()) if header[0].lower() not in names),
+        *headers,
+    ]
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """Middleware that adds a unique request ID to each request.
 
     The request ID is taken from the X-Request-ID header if present,
@@ -16,17 +46,28 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     headers and is available in request.state.request_id.
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add request ID to request state and response headers."""
-        request_id = request.headers.get("X-Request-ID", str(uuid4()))
-        request.state.request_id = request_id
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id") or str(uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        header = [(b"x-request-id", request_id.encode("latin-1"))]
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                set_response_headers(message, header)
+            await send(message)
 
+        await self.app(scope, receive, send_with_request_id)
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+
+class SecurityHeadersMiddleware:
     """Middleware that adds security headers to all responses.
 
     This includes:
@@ -37,6 +78,8 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Referrer-Policy
     - Permissions-Policy
 
+    The headers are encoded once, when the middleware is created.
+
     Usage:
         app.add_middleware(SecurityHeadersMiddleware)
 
@@ -64,36 +107,90 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         csp_directives: dict | None = None,
         exclude_paths: set | None = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.csp_directives = csp_directives or self.DEFAULT_CSP_DIRECTIVES
         self.exclude_paths = exclude_paths or {"/docs", "/redoc", "/openapi.json"}
+        csp_value = "; ".join(
+            f"{directive} {value}" for directive, value in self.csp_directives.items()
+        )
+        self.headers = encode_headers(
+            {
+                "Content-Security-Policy": csp_value,
+                "X-Content-Type-Options": "nosniff",
+                "X-Frame-Options": "DENY",
+                "X-XSS-Protection": "1; mode=block",
+                "Referrer-Policy": "strict-origin-when-cross-origin",
+                "Permissions-Policy": (
+                    "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
+                    "magnetometer=(), microphone=(), payment=(), usb=()"
+                ),
+            }
+        )
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add security headers to the response."""
-        response = await call_next(request)
-
         # Skip for docs/openapi endpoints which need different CSP
-        if request.url.path in self.exclude_paths:
-            return response
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
 
-        # Build CSP header
-        csp_value = "; ".join(
-            f"{directive} {value}" for directive, value in self.csp_directives.items()
-        )
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                set_response_headers(message, self.headers)
+            await send(message)
 
-        # Add security headers
-        response.headers["Content-Security-Policy"] = csp_value
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
-            "magnetometer=(), microphone=(), payment=(), usb=()"
-        )
+        await self.app(scope, receive, send_with_security_headers)
+{%- if cookiecutter.use_postgresql %}
+
+
+class PrimaryPinMiddleware:
+    """Middleware that sends a client's reads to the primary after it writes.
+
+    A successful request with an unsafe method (POST, PUT, PATCH, DELETE)
+    sets a short-lived cookie. Requests carrying the cookie, and unsafe
+    requests themselves, set ``primary_pinned``, so ``get_read_db_session``
+    reads from the primary until replicas have caught up.
+
+    Usage:
+        app.add_middleware(PrimaryPinMiddleware, max_age=5)
+    """
 
-        return response
+    COOKIE_NAME = "db_primary"
+    SAFE_METHODS: ClassVar[frozenset[str]] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app: ASGIApp, max_age: int) -> None:
+        self.app = app
+        self.header = [
+            (
+                b"set-cookie",
+                f"{self.COOKIE_NAME}=1; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax".encode(
+                    "latin-1"
+                ),
+            )
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pin the request to the primary and set the cookie after writes."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes = scope["method"] not in self.SAFE_METHODS
+        cookies = cookie_parser(Headers(scope=scope).get("cookie", ""))
+        token = primary_pinned.set(writes or self.COOKIE_NAME in cookies)
+
+        async def send_with_pin_cookie(message: Message) -> None:
+            if writes and message["type"] == "http.response.start" and message["status"] < 400:
+                # Appended, since other Set-Cookie headers must be kept
+                message["headers"] = [*message.get("headers", ()), *self.header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin_cookie)
+        finally:
+            primary_pinned.reset(token)
+{%- endif %}
@@ -0,0 +1,79 @@
+"""Cursor helpers for keyset pagination.
+
+List endpoints return a ``next_cursor`` that encodes the sort key of the last
+row on the page, e.g. ``(created_at, id)``. Passing it back fetches the next
+page with a ``WHERE (created_at, id) > (:created_at, :id)`` predicate instead of
+OFFSET, so a deep page costs the same as the first one.
+
+Cursors are opaque to clients: URL-safe base64 of a JSON array.
+"""
+
+import base64
+import json
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+
+from app.core.exceptions import BadRequestError
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort key values into an opaque cursor.
+
+    Datetimes are stored as ISO 8601 strings, other non-JSON values via ``str()``.
+    """
+    payload = [
+        value.isoformat()
+        if isinstance(value, datetime)
+        else value
+        if isinstance(value, int | str)
+        else str(value)
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple[Any, ...]:
+    """Decode a cursor back into typed sort key values.
+
+    Args:
+        cursor: Cursor returned by a previous page.
+        types: Expected type of each value, e.g. ``datetime, UUID``.
+
+    Raises:
+        BadRequestError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("unexpected cursor shape")
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for value, type_ in zip(payload, types, strict=True)
+        )
+    except Exception as e:
+        raise BadRequestError(
+            message="Invalid pagination cursor",
+            details={"cursor": cursor},
+        ) from e
+
+
+def next_page_cursor(
+    rows: Sequence[T],
+    limit: int,
+    key: Callable[[T], tuple[Any, ...]],
+) -> tuple[list[T], str | None]:
+    """Split a ``limit + 1`` fetch into the page and the cursor for the next one.
+
+    Repositories fetch one extra row; if it is present there is another page
+    and the cursor points at the last row that is returned.
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
+
@@ -1,58 +1,365 @@
 {%- if cookiecutter.enable_rate_limiting %}
-"""Rate limiting configuration using slowapi.
+{%- set use_redis = cookiecutter.rate_limit_storage_redis %}
+"""Rate limiting with the generic cell rate algorithm (GCRA).
 
-Default rate limit: {{ cookiecutter.rate_limit_requests }} requests per {{ cookiecutter.rate_limit_period }} seconds.
+GCRA is a token bucket that stores one number per client: the "theoretical
+arrival time" (TAT) at which the bucket is full again. A request of cost ``n``
+pushes the TAT forward by ``n * period / limit`` and is rejected if that would
+put it more than ``period`` ahead of now.
+{%- if use_redis %}
+
+State lives in Redis and is read and updated by a single Lua script, so every
+worker shares the same counters and concurrent requests cannot both take the
+last token. The script reads the Redis server clock, so worker clocks do not
+need to agree.
+{%- else %}
+
+State lives in process memory, so every worker process limits on its own.
+Choose Redis storage when running more than one worker.
+{%- endif %}
+
+Clients are identified by the user ID in their JWT access token and fall back
+to their IP address, so users behind one NAT do not share a budget.
+
+Default limit: {{ cookiecutter.rate_limit_requests }} requests per {{ cookiecutter.rate_limit_period }} seconds per client across the API.
 Override with RATE_LIMIT_REQUESTS and RATE_LIMIT_PERIOD environment variables.
 """
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import math
+{%- if not use_redis %}
+import time
+{%- endif %}
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+{%- if use_redis %}
 
+import logfire
+{%- endif %}
+from fastapi import Request, Response
+from starlette.requests import HTTPConnection
+
+{%- if use_redis %}
+
+from app.api.deps import Redis
+from app.clients.redis import LuaScript, RedisClient
+{%- endif %}
 from app.core.config import settings
+from app.core.exceptions import RateLimitError
+{%- if cookiecutter.use_jwt %}
+from app.core.security import verify_token
+{%- endif %}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+KEY_PREFIX = "{{ cookiecutter.project_slug }}:ratelimit"
+# Budget shared by every rate-limited API route
+API_SCOPE = "api"
+{%- if cookiecutter.enable_ai_agent %}
+# Model tokens used by agent WebSocket turns
+AGENT_TOKENS_SCOPE = "agent-tokens"
+{%- endif %}
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitResult:
+    """Outcome of one rate limit check."""
+
+    allowed: bool
+    limit: int
+    period: int
+    remaining: int
+    # Seconds until the bucket is full again
+    reset_after: float
+    # Seconds until a request of the same cost would be allowed
+    retry_after: float
+
+    def headers(self) -> dict[str, str]:
+        """``RateLimit-*`` response headers (IETF draft), plus ``Retry-After`` when rejected."""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": f"{self.limit};w={self.period}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+{%- if use_redis %}
+
+
+# KEYS[1]: bucket key; ARGV: limit, period (seconds), cost, force (1 = always charge)
+# Returns {allowed, remaining, reset_after, retry_after}; floats as strings,
+# since Redis truncates Lua numbers to integers.
+_GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local force = ARGV[4] == "1"
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local interval = period / limit
+-- Offsets from now: absolute times lose precision when the period is added and subtracted
+local slack = 0.000001
+local tat = tonumber(redis.call("GET", KEYS[1]))
+local backlog = 0
+if tat and tat > now then
+    backlog = tat - now
+end
+local new_backlog = backlog + interval * cost
+local wait = new_backlog - period
+if wait > slack and not force then
+    local remaining = math.max(0, math.floor((period - backlog + slack) / interval))
+    return {0, remaining, tostring(backlog), tostring(wait)}
+end
+if new_backlog > 0 then
+    redis.call("SET", KEYS[1], string.format("%.6f", now + new_backlog), "PX", math.ceil(new_backlog * 1000))
+end
+local remaining = math.max(0, math.floor((period - new_backlog + slack) / interval))
+local allowed = 1
+if wait > slack then
+    allowed = 0
+end
+return {allowed, remaining, tostring(new_backlog), tostring(math.max(0, wait))}
+"""
+_GCRA = LuaScript(_GCRA_SCRIPT)
 
 
-def get_default_rate_limit() -> str:
-    """Get default rate limit string from settings.
+async def consume(
+    redis: RedisClient,
+    key: str,
+    *,
+    limit: int,
+    period: int,
+    cost: int = 1,
+    force: bool = False,
+) -> RateLimitResult:
+    """Take ``cost`` tokens from the bucket at ``key``.
 
-    Returns a rate limit string like "100/minute" or "60/second".
+    With ``force``, the cost is recorded even if it exceeds the budget, which
+    suits charging for work that has already happened. Fails open: if Redis is
+    unavailable the request is allowed and a warning is logged.
     """
-    requests = settings.RATE_LIMIT_REQUESTS
-    period = settings.RATE_LIMIT_PERIOD
+    args = (limit, period, cost, int(force))
+    try:
+        reply = await redis.run_script(_GCRA, keys=[key], args=args)
+    except Exception as e:
+        logfire.warning("Rate limit check failed, allowing request", key=key, error=str(e))
+        return RateLimitResult(True, limit, period, limit, 0.0, 0.0)
+    allowed, remaining, reset_after, retry_after = reply
+    return RateLimitResult(
+        allowed=bool(int(allowed)),
+        limit=limit,
+        period=period,
+        remaining=int(remaining),
+        reset_after=float(reset_after),
+        retry_after=float(retry_after),
+    )
+{%- else %}
+
+
+# Seconds of floating point error tolerated when comparing times
+_SLACK = 1e-6
+
 
-    # Convert period to a human-readable format
-    period_map = {
-        60: "minute",
-        3600: "hour",
-        86400: "day",
-    }
+class MemoryRateLimitStore:
+    """Per-process GCRA state: bucket key -> theoretical arrival time."""
 
-    if period in period_map:
-        return f"{requests}/{period_map[period]}"
-    # For custom periods, use "per X seconds"
-    return f"{requests}/{period} seconds"
+    # Expired buckets are dropped once the store grows past this many keys
+    PRUNE_THRESHOLD = 10_000
 
+    def __init__(self) -> None:
+        self._tats: dict[str, float] = {}
 
-# Rate limiter instance with configurable default
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=[get_default_rate_limit()],
-)
+    def consume(
+        self,
+        key: str,
+        *,
+        limit: int,
+        period: int,
+        cost: int = 1,
+        force: bool = False,
+    ) -> RateLimitResult:
+        """Take ``cost`` tokens from the bucket at ``key``.
 
-# Common rate limit decorators for convenience
-# Usage: @rate_limit_low, @rate_limit_medium, @rate_limit_high
-def rate_limit_low(limit: str = "10/minute"):
-    """Low rate limit for expensive operations."""
-    return limiter.limit(limit)
+        With ``force``, the cost is recorded even if it exceeds the budget,
+        which suits charging for work that has already happened.
+        """
+        now = time.monotonic()
+        interval = period / limit
+        # Offsets from now: absolute times lose precision when the period is
+        # added and subtracted, which could refuse the last token of a burst
+        backlog = max(self._tats.get(key, now) - now, 0.0)
+        new_backlog = backlog + interval * cost
+        wait = new_backlog - period
+        if wait > _SLACK and not force:
+            return RateLimitResult(
+                allowed=False,
+                limit=limit,
+                period=period,
+                remaining=max(0, math.floor((period - backlog + _SLACK) / interval)),
+                reset_after=backlog,
+                retry_after=wait,
+            )
+        if len(self._tats) >= self.PRUNE_THRESHOLD:
+            self._prune(now)
+        self._tats[key] = now + new_backlog
+        return RateLimitResult(
+            allowed=wait <= _SLACK,
+            limit=limit,
+            period=period,
+            remaining=max(0, math.floor((period - new_backlog + _SLACK) / interval)),
+            reset_after=new_backlog,
+            retry_after=max(0.0, wait),
+        )
 
+    def clear(self) -> None:
+        """Forget all buckets."""
+        self._tats.clear()
 
-def rate_limit_medium(limit: str = "30/minute"):
-    """Medium rate limit for standard operations."""
-    return limiter.limit(limit)
+    def _prune(self, now: float) -> None:
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
 
 
-def rate_limit_high(limit: str = "100/minute"):
-    """High rate limit for lightweight operations."""
-    return limiter.limit(limit)
+store = MemoryRateLimitStore()
+
+
+async def consume(
+    key: str,
+    *,
+    limit: int,
+    period: int,
+    cost: int = 1,
+    force: bool = False,
+) -> RateLimitResult:
+    """Take ``cost`` tokens from the bucket at ``key`` (see ``MemoryRateLimitStore``)."""
+    return store.consume(key, limit=limit, period=period, cost=cost, force=force)
+{%- endif %}
+
+
+def rate_limit_key(connection: HTTPConnection, scope: str = API_SCOPE) -> str:
+    """Bucket key for a request or WebSocket: per user when authenticated, else per IP."""
+{%- if cookiecutter.use_jwt %}
+    token = connection.query_params.get("token")
+    authorization = connection.headers.get("Authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        token = authorization[7:]
+    if token:
+        payload = verify_token(token)
+        if payload and payload.get("type") == "access" and payload.get("sub"):
+            return f"{KEY_PREFIX}:{scope}:user:{payload['sub']}"
+{%- endif %}
+    host = connection.client.host if connection.client else "unknown"
+    return f"{KEY_PREFIX}:{scope}:ip:{host}"
+
+
+def rate_limit_cost(cost: int) -> Callable[[F], F]:
+    """Set how many tokens a call to a route takes from the client's budget.
+
+    Apply below the route decorator. A cost of 0 exempts the route.
+
+    Usage:
+        @router.post("/reports")
+        @rate_limit_cost(10)
+        async def create_report(...): ...
+    """
+
+    def decorator(endpoint: F) -> F:
+        endpoint.rate_limit_cost = cost  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorator
+
+
+class RateLimiter:
+    """FastAPI dependency that enforces a per-client limit and sets ``RateLimit-*`` headers.
+
+    Each call costs the route's ``rate_limit_cost`` (1 by default). Limiters
+    with the same ``scope`` share a budget.
+
+    Usage:
+        router = APIRouter(dependencies=[Depends(RateLimiter())])
+        login_limit = RateLimiter(requests=5, period=60, scope="login")
+    """
+
+    def __init__(
+        self,
+        requests: int | None = None,
+        period: int | None = None,
+        *,
+        scope: str = API_SCOPE,
+    ) -> None:
+        self.requests = requests
+        self.period = period
+        self.scope = scope
+
+    async def __call__(self, request: Request, response: Response{% if use_redis %}, redis: Redis{% endif %}) -> None:
+        cost = getattr(request.scope.get("endpoint"), "rate_limit_cost", 1)
+        if cost <= 0:
+            return
+        result = await consume(
+{%- if use_redis %}
+            redis,
+{%- endif %}
+            rate_limit_key(request, self.scope),
+            limit=self.requests or settings.RATE_LIMIT_REQUESTS,
+            period=self.period or settings.RATE_LIMIT_PERIOD,
+            cost=cost,
+        )
+        if not result.allowed:
+            raise RateLimitError(
+                details={"retry_after": math.ceil(result.retry_after)},
+                headers=result.headers(),
+            )
+        response.headers.update(result.headers())
+{%- if cookiecutter.enable_ai_agent %}
+
+
+async def check_agent_turn(connection: HTTPConnection) -> RateLimitResult:
+    """Admit an agent WebSocket message if the client has budget left.
+
+    The message costs one request from the client's API budget and is refused
+    while the client's model token budget is spent. Tokens are charged by
+    ``charge_agent_tokens`` once the turn has run.
+    """
+{%- if use_redis %}
+    redis: RedisClient = connection.state.redis
+{%- endif %}
+    result = await consume(
+{%- if use_redis %}
+        redis,
+{%- endif %}
+        rate_limit_key(connection),
+        limit=settings.RATE_LIMIT_REQUESTS,
+        period=settings.RATE_LIMIT_PERIOD,
+    )
+    if not result.allowed:
+        return result
+    return await consume(
+{%- if use_redis %}
+        redis,
+{%- endif %}
+        rate_limit_key(connection, AGENT_TOKENS_SCOPE),
+        limit=settings.RATE_LIMIT_AGENT_TOKENS_PER_MINUTE,
+        period=60,
+        cost=0,
+    )
+
+
+async def charge_agent_tokens(connection: HTTPConnection, tokens: int) -> None:
+    """Charge the model tokens an agent turn used against the client's per-minute budget."""
+    await consume(
+{%- if use_redis %}
+        connection.state.redis,
+{%- endif %}
+        rate_limit_key(connection, AGENT_TOKENS_SCOPE),
+        limit=settings.RATE_LIMIT_AGENT_TOKENS_PER_MINUTE,
+        period=60,
+        cost=tokens,
+        force=True,
+    )
+{%- endif %}
 {%- else %}
 """Rate limiting - not configured."""
 {%- endif %}
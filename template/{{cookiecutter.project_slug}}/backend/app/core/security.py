@@ -1,20 +1,119 @@
 {%- if cookiecutter.use_jwt %}
-"""Security utilities for JWT authentication."""
-
+"""Security utilities for JWT authentication.
+
+Tokens are signed with ``SECRET_KEY`` (HS256) or, with an asymmetric
+``ALGORITHM`` such as ES256 or EdDSA, with ``JWT_PRIVATE_KEY``. Asymmetric
+tokens carry the key ID (``kid``) of their signing key, and the public keys
+are published as a JWKS so other services can verify tokens on their own.
+To rotate keys, move the old public key to ``JWT_PUBLIC_KEYS`` and set a new
+private key; tokens signed with the old key stay valid until they expire.
+
+Passwords are hashed with argon2id or bcrypt (``PASSWORD_HASH_ALGORITHM``).
+Hashing is deliberately slow, so async code should use the ``*_async``
+variants: they run on a small dedicated thread pool
+(``PASSWORD_HASH_CONCURRENCY`` threads) instead of blocking the event loop.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from functools import cache
 from typing import Any
+from uuid import uuid4
 
 import bcrypt
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cryptography.hazmat.primitives import serialization
 
 from app.core.config import settings
 
+argon2_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# Both argon2-cffi and bcrypt release the GIL, so hashes on these threads run in parallel
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_CONCURRENCY,
+    thread_name_prefix="password-hash",
+)
+
+
+@dataclass(frozen=True)
+class JWTKeys:
+    """Keys for signing and verifying tokens with the configured algorithm."""
+
+    signing_key: Any
+    # Set for asymmetric algorithms: ID of the signing key and public keys by ID
+    kid: str | None = None
+    verification_keys: dict[str, Any] = field(default_factory=dict)
+    jwks: list[dict[str, str]] = field(default_factory=list)
+
+
+@cache
+def get_jwt_keys() -> JWTKeys:
+    """Load the signing key and verification keys once."""
+    if settings.ALGORITHM.startswith("HS"):
+        return JWTKeys(signing_key=settings.SECRET_KEY)
+
+    algorithm = jwt.get_algorithm_by_name(settings.ALGORITHM)
+    private_key = serialization.load_pem_private_key(settings.JWT_PRIVATE_KEY.encode(), password=None)
+    public_keys = [
+        private_key.public_key(),
+        *(serialization.load_pem_public_key(pem.encode()) for pem in settings.JWT_PUBLIC_KEYS),
+    ]
+    verification_keys = {}
+    jwks = []
+    for public_key in public_keys:
+        jwk = algorithm.to_jwk(public_key, as_dict=True)
+        jwk.update(kid=_jwk_thumbprint(jwk), alg=settings.ALGORITHM, use="sig")
+        verification_keys[jwk["kid"]] = public_key
+        jwks.append(jwk)
+    return JWTKeys(
+        signing_key=private_key,
+        kid=jwks[0]["kid"],
+        verification_keys=verification_keys,
+        jwks=jwks,
+    )
+
+
+def _jwk_thumbprint(jwk: dict[str, str]) -> str:
+    """RFC 7638 thumbprint of a public JWK, used as its key ID."""
+    required = {name: jwk[name] for name in ("crv", "e", "kty", "n", "x", "y") if name in jwk}
+    digest = hashlib.sha256(json.dumps(required, separators=(",", ":"), sort_keys=True).encode())
+    return base64.urlsafe_b64encode(digest.digest()).rstrip(b"=").decode()
+
+
+def get_jwks() -> dict[str, list[dict[str, str]]]:
+    """Public keys that verify access tokens, as a JWK Set (empty for HS256)."""
+    return {"keys": get_jwt_keys().jwks}
+
+
+def _encode(payload: dict[str, Any]) -> str:
+    keys = get_jwt_keys()
+    headers = {"kid": keys.kid} if keys.kid else None
+    return jwt.encode(payload, keys.signing_key, algorithm=settings.ALGORITHM, headers=headers)
+
+
+def user_claims(user: Any) -> dict[str, Any]:
+    """Access token claims that let endpoints authorize a user without loading it."""
+    return {"role": user.role, "is_active": user.is_active, "is_superuser": user.is_superuser}
+
 
 def create_access_token(
     subject: str | Any,
     expires_delta: timedelta | None = None,
+    *,
+    claims: dict[str, Any] | None = None,
 ) -> str:
-    """Create a JWT access token."""
+    """Create a JWT access token, with extra ``claims`` such as ``user_claims(user)``."""
     if expires_delta:
         expire = datetime.now(UTC) + expires_delta
     else:
@@ -22,8 +121,8 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject), "type": "access"}
+    return _encode(to_encode)
 
 
 def create_refresh_token(
@@ -38,16 +137,24 @@ def create_refresh_token(
             minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    # jti keeps tokens issued in the same second distinct, so each maps to one session
+    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh", "jti": uuid4().hex}
+    return _encode(to_encode)
 
 
 def verify_token(token: str) -> dict[str, Any] | None:
     """Verify a JWT token and return payload."""
+    keys = get_jwt_keys()
     try:
+        key = keys.signing_key
+        if keys.kid is not None:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = keys.verification_keys.get(kid) if isinstance(kid, str) else None
+            if key is None:
+                return None
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
+            key,
             algorithms=[settings.ALGORITHM],
         )
         return payload
@@ -56,7 +163,12 @@ def verify_token(token: str) -> dict[str, Any] | None:
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
+    """Verify a password against an argon2 or bcrypt hash."""
+    if hashed_password.startswith("$argon2"):
+        try:
+            return argon2_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
     return bcrypt.checkpw(
         plain_password.encode("utf-8"),
         hashed_password.encode("utf-8"),
@@ -64,13 +176,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
+    """Hash a password with the configured algorithm and cost."""
+    if settings.PASSWORD_HASH_ALGORITHM == "argon2id":
+        return argon2_hasher.hash(password)
     return bcrypt.hashpw(
         password.encode("utf-8"),
-        bcrypt.gensalt(),
+        bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS),
     ).decode("utf-8")
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was made with another algorithm or cost than configured."""
+    if settings.PASSWORD_HASH_ALGORITHM == "argon2id":
+        return not hashed_password.startswith("$argon2id$") or argon2_hasher.check_needs_rehash(
+            hashed_password
+        )
+    # bcrypt hashes look like $2b$<rounds>$<salt and hash>
+    prefix, _, rest = hashed_password.removeprefix("$").partition("$")
+    return not prefix.startswith("2") or rest[:2] != f"{settings.BCRYPT_ROUNDS:02d}"
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, get_password_hash, password)
+
+
 {%- elif cookiecutter.use_api_key %}
 """Security utilities for API Key authentication."""
 
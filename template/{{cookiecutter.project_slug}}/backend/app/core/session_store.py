@@ -0,0 +1,192 @@
+{%- if cookiecutter.enable_session_management and cookiecutter.use_jwt and cookiecutter.enable_redis and not cookiecutter.use_sqlite %}
+"""Redis store for login sessions.
+
+With ``SESSION_STORE=redis``, ``SessionService`` keeps active sessions here
+instead of in the ``sessions`` table. Each session is a JSON value keyed by its
+refresh token hash and expires with the session, so expired sessions need no
+cleanup. A set per user holds the hashes of that user's sessions; listing them
+or logging them all out touches only those keys.
+
+Rotating a session leaves a marker under the old token hash until the old
+session would have expired. That is how a replayed refresh token is told
+apart from an unknown one.
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+{%- if cookiecutter.use_postgresql %}
+from uuid import UUID, uuid4
+{%- else %}
+from uuid import uuid4
+{%- endif %}
+
+from app.clients.redis import LuaScript, RedisClient
+
+KEY_PREFIX = "{{ cookiecutter.project_slug }}:session"
+{%- if cookiecutter.use_postgresql %}
+
+SessionId = UUID
+UserId = UUID
+{%- else %}
+
+SessionId = str
+UserId = str
+{%- endif %}
+
+# Claims the old session and stores its successor in one round trip.
+# KEYS: old session, new session, rotated marker, user set
+# ARGV: new session JSON, new expiry (ms), user ID, old hash, new hash
+ROTATE_SCRIPT = LuaScript("""
+local old = redis.call('GET', KEYS[1])
+if not old then
+    return {0, redis.call('GET', KEYS[3])}
+end
+redis.call('SET', KEYS[3], ARGV[3], 'PX', math.max(redis.call('PTTL', KEYS[1]), 1))
+redis.call('DEL', KEYS[1])
+redis.call('SET', KEYS[2], ARGV[1], 'PXAT', ARGV[2])
+redis.call('SREM', KEYS[4], ARGV[4])
+redis.call('SADD', KEYS[4], ARGV[5])
+redis.call('PEXPIREAT', KEYS[4], ARGV[2], 'NX')
+redis.call('PEXPIREAT', KEYS[4], ARGV[2], 'GT')
+return {1, old}
+""")
+
+
+@dataclass
+class StoredSession:
+    """A session held in Redis; same fields as the ``Session`` model."""
+
+    user_id: UserId
+    refresh_token_hash: str
+    expires_at: datetime
+    device_name: str | None = None
+    device_type: str | None = None
+    ip_address: str | None = None
+    user_agent: str | None = None
+    id: SessionId = field(default_factory={% if cookiecutter.use_postgresql %}uuid4{% else %}lambda: str(uuid4()){% endif %})
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    last_used_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    is_active: bool = True
+
+    def dump(self) -> str:
+        """Serialize to JSON."""
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def load(cls, raw: str) -> "StoredSession":
+        """Deserialize from ``dump`` output."""
+        data = json.loads(raw)
+        data["id"] = SessionId(data["id"])
+        data["user_id"] = UserId(data["user_id"])
+        for name in ("expires_at", "created_at", "last_used_at"):
+            data[name] = datetime.fromisoformat(data[name])
+        return cls(**data)
+
+
+class RedisSessionStore:
+    """Active sessions keyed by refresh token hash, indexed per user."""
+
+    def __init__(self, redis: RedisClient):
+        self.redis = redis
+
+    @staticmethod
+    def _key(token_hash: str) -> str:
+        return f"{KEY_PREFIX}:{token_hash}"
+
+    @staticmethod
+    def _rotated_key(token_hash: str) -> str:
+        return f"{KEY_PREFIX}:rotated:{token_hash}"
+
+    @staticmethod
+    def _user_key(user_id: object) -> str:
+        return f"{KEY_PREFIX}:user:{user_id}"
+
+    async def get(self, token_hash: str) -> StoredSession | None:
+        """Get an active session by refresh token hash."""
+        raw = await self.redis.get(self._key(token_hash))
+        return StoredSession.load(raw) if raw is not None else None
+
+    async def get_user_sessions(self, user_id: object) -> list[StoredSession]:
+        """Get a user's active sessions, most recently used first."""
+        user_key = self._user_key(user_id)
+        token_hashes = list(await self.redis.raw.smembers(user_key))  # type: ignore[misc]
+        if not token_hashes:
+            return []
+        values = await self.redis.mget([self._key(h) for h in token_hashes])
+        expired = [h for h, raw in zip(token_hashes, values, strict=True) if raw is None]
+        if expired:
+            await self.redis.raw.srem(user_key, *expired)  # type: ignore[misc]
+        sessions = [StoredSession.load(raw) for raw in values if raw is not None]
+        return sorted(sessions, key=lambda s: s.last_used_at, reverse=True)
+
+    async def create(self, session: StoredSession) -> None:
+        """Store a new session and add it to its user's set."""
+        user_key = self._user_key(session.user_id)
+        expires_at = session.expires_at
+        async with self.redis.raw.pipeline(transaction=True) as pipe:
+            pipe.set(self._key(session.refresh_token_hash), session.dump(), exat=expires_at)
+            pipe.sadd(user_key, session.refresh_token_hash)
+            pipe.expireat(user_key, expires_at, nx=True)
+            pipe.expireat(user_key, expires_at, gt=True)
+            await pipe.execute()
+
+    async def touch(self, session: StoredSession) -> None:
+        """Save a new ``last_used_at``, keeping the expiry."""
+        session.last_used_at = datetime.now(UTC)
+        await self.redis.raw.set(
+            self._key(session.refresh_token_hash), session.dump(), keepttl=True, xx=True
+        )
+
+    async def rotate(
+        self, token_hash: str, new_session: StoredSession
+    ) -> tuple[bool, UserId | None]:
+        """Replace the session of ``token_hash`` with ``new_session`` atomically.
+
+        Returns ``(True, user_id)`` on success. On failure returns
+        ``(False, user_id)`` if the token was already rotated (a replay), or
+        ``(False, None)`` if it is unknown or expired.
+        """
+        rotated, value = await self.redis.run_script(
+            ROTATE_SCRIPT,
+            keys=[
+                self._key(token_hash),
+                self._key(new_session.refresh_token_hash),
+                self._rotated_key(token_hash),
+                self._user_key(new_session.user_id),
+            ],
+            args=[
+                new_session.dump(),
+                int(new_session.expires_at.timestamp() * 1000),
+                str(new_session.user_id),
+                token_hash,
+                new_session.refresh_token_hash,
+            ],
+        )
+        if rotated:
+            return True, StoredSession.load(value).user_id
+        return False, UserId(value) if value is not None else None
+
+    async def delete(self, token_hash: str) -> StoredSession | None:
+        """Remove a session. Returns it, or None if it was not active."""
+        raw = await self.redis.raw.getdel(self._key(token_hash))
+        if raw is None:
+            return None
+        session = StoredSession.load(raw)
+        await self.redis.raw.srem(self._user_key(session.user_id), token_hash)  # type: ignore[misc]
+        return session
+
+    async def delete_user_sessions(self, user_id: object) -> int:
+        """Remove all sessions of a user. Returns the number removed."""
+        user_key = self._user_key(user_id)
+        token_hashes: set[str] = await self.redis.raw.smembers(user_key)  # type: ignore[misc]
+        if not token_hashes:
+            return 0
+        async with self.redis.raw.pipeline(transaction=True) as pipe:
+            pipe.delete(*(self._key(h) for h in token_hashes))
+            pipe.delete(user_key)
+            deleted, _ = await pipe.execute()
+        return int(deleted)
+{%- else %}
+"""Redis session store - not configured."""
+{%- endif %}
@@ -0,0 +1,247 @@
+{%- if cookiecutter.use_jwt %}
+{%- set use_redis = cookiecutter.enable_redis and not cookiecutter.use_sqlite %}
+"""Cache of the user fields needed to authenticate a request.
+
+``get_current_user`` runs on every authenticated request. Instead of loading
+the user row each time, it reads a small projection of the user (ID, email,
+name, flags, role and timestamps, never the password hash) from this cache.
+{%- if use_redis %}
+
+There are two tiers: an in-process LRU with a short TTL
+(``USER_CACHE_LOCAL_TTL``) in front of Redis (``USER_CACHE_TTL``). Changes
+drop the local entry and replace the Redis one with a short-lived tombstone;
+other worker processes see them once their local entry expires. Entries are
+only written to Redis if the key is free, so a process that loaded the user
+before the change cannot overwrite the tombstone with the old row.
+{%- else %}
+
+Entries live in an in-process LRU and expire after ``USER_CACHE_LOCAL_TTL``
+seconds, which bounds how long other processes (such as the CLI) can take to
+see a change.
+{%- endif %}
+
+Cached users are rebuilt as detached ``User`` instances: read their fields,
+but load the user through ``UserService`` before changing it.
+"""
+
+{%- if use_redis %}
+
+import json
+{%- endif %}
+import time
+from collections import OrderedDict
+{%- if use_redis %}
+from datetime import datetime
+{%- endif %}
+from typing import Any
+{%- if use_redis and cookiecutter.use_postgresql %}
+from uuid import UUID
+{%- endif %}
+
+{%- if use_redis %}
+
+import logfire
+{%- endif %}
+{%- if cookiecutter.use_postgresql %}
+from sqlalchemy.ext.asyncio import AsyncSession
+{%- elif cookiecutter.use_sqlite %}
+from sqlalchemy.orm import Session
+{%- endif %}
+
+{%- if use_redis %}
+
+from app.clients.redis import RedisClient
+{%- endif %}
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+from app.core.background import on_commit{% if use_redis %}, spawn{% endif %}
+{%- endif %}
+from app.core.config import settings
+from app.db.models.user import User
+
+# Fields kept in the cache: what auth checks and the /me response need
+CACHED_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "is_active",
+    "is_superuser",
+    "role",
+    "created_at",
+    "updated_at",
+)
+{%- if use_redis %}
+
+KEY_PREFIX = "{{ cookiecutter.project_slug }}:user"
+
+# Written in place of an invalidated entry. It must outlive a user load that
+# started before the change, so that load cannot cache the old row.
+TOMBSTONE = ""
+TOMBSTONE_TTL = 10  # seconds
+{%- endif %}
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+
+# Session.info key: user IDs to invalidate once the session commits
+_PENDING_KEY = "user_cache_invalidate"
+{%- endif %}
+
+
+class UserCache:
+    """Two-tier cache of user projections keyed by user ID.
+
+    Usage:
+        user = {% if not cookiecutter.use_sqlite %}await {% endif %}user_cache.get(user_id)
+        if user is None:
+            generation = user_cache.generation
+            user = {% if not cookiecutter.use_sqlite %}await {% endif %}user_service.get_by_id(user_id)
+            {% if not cookiecutter.use_sqlite %}await {% endif %}user_cache.set(user, generation)
+    """
+
+    def __init__(
+        self,
+        local_ttl: float | None = None,
+        maxsize: int | None = None,
+{%- if use_redis %}
+        ttl: int | None = None,
+{%- endif %}
+    ) -> None:
+        self.local_ttl = local_ttl if local_ttl is not None else settings.USER_CACHE_LOCAL_TTL
+        self.maxsize = maxsize if maxsize is not None else settings.USER_CACHE_MAX_SIZE
+{%- if use_redis %}
+        self.ttl = ttl if ttl is not None else settings.USER_CACHE_TTL
+        self._redis: RedisClient | None = None
+{%- endif %}
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation in this process."""
+        return self._generation
+{%- if use_redis %}
+
+    def setup(self, redis: RedisClient | None) -> None:
+        """Use ``redis`` as the shared second tier (``None`` for local only)."""
+        self._redis = redis
+{%- endif %}
+
+    {% if not cookiecutter.use_sqlite %}async {% endif %}def get(self, user_id: object) -> User | None:
+        """Cached user, or ``None`` on a miss."""
+        key = str(user_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            return User(**entry[1])
+{%- if use_redis %}
+        if self._redis is None:
+            return None
+        generation = self._generation
+        try:
+            raw = await self._redis.get(f"{KEY_PREFIX}:{key}")
+        except Exception as e:
+            logfire.warning("User cache read failed", error=str(e))
+            return None
+        if not raw:  # missing or tombstone
+            return None
+        fields = _load(raw)
+        self._store(key, fields, generation)
+        return User(**fields)
+{%- else %}
+        return None
+{%- endif %}
+
+    {% if not cookiecutter.use_sqlite %}async {% endif %}def set(self, user: User, generation: int) -> None:
+        """Cache ``user`` as loaded while ``generation`` was current.
+
+        Skipped if the user was invalidated during the load, since the row
+        may predate the change. Redis is only written if the key is free,
+        which also keeps out loads that raced with another process's change.
+        """
+        fields = {name: getattr(user, name) for name in CACHED_FIELDS}
+        if not self._store(str(user.id), fields, generation):
+            return
+{%- if use_redis %}
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    f"{KEY_PREFIX}:{user.id}", _dump(fields), ttl=self.ttl, nx=True
+                )
+            except Exception as e:
+                logfire.warning("User cache write failed", error=str(e))
+{%- endif %}
+
+    {% if not cookiecutter.use_sqlite %}async {% endif %}def invalidate(self, user_id: object) -> None:
+        """Drop a user from the local{% if use_redis %} and Redis{% endif %} tier."""
+        self._drop_local(str(user_id))
+{%- if use_redis %}
+        if self._redis is not None:
+            try:
+                await self._redis.set(f"{KEY_PREFIX}:{user_id}", TOMBSTONE, ttl=TOMBSTONE_TTL)
+            except Exception as e:
+                logfire.warning("User cache invalidation failed", error=str(e))
+{%- endif %}
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+
+    def invalidate_on_commit(self, db: {% if cookiecutter.use_postgresql %}AsyncSession{% else %}Session{% endif %}, user_id: object) -> None:
+        """Invalidate a user once ``db`` commits.
+
+        Invalidating before the commit would let a concurrent request cache
+        the row as it was before the change.
+        """
+        on_commit(db, _PENDING_KEY, self._after_commit, str(user_id))
+
+    def _after_commit(self, user_ids: list[str]) -> None:
+        for user_id in user_ids:
+            self._drop_local(user_id)
+{%- if use_redis %}
+            if self._redis is not None:
+                spawn(self.invalidate(user_id))
+{%- endif %}
+{%- endif %}
+
+    def clear(self) -> None:
+        """Drop all local entries."""
+        self._generation += 1
+        self._entries.clear()
+
+    def _store(self, key: str, fields: dict[str, Any], generation: int) -> bool:
+        if generation != self._generation:
+            return False
+        self._entries[key] = (time.monotonic() + self.local_ttl, fields)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return True
+
+    def _drop_local(self, key: str) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+{%- if use_redis %}
+
+
+def _dump(fields: dict[str, Any]) -> str:
+    return json.dumps(
+        {
+            **fields,
+            "id": str(fields["id"]),
+            "created_at": fields["created_at"].isoformat() if fields["created_at"] else None,
+            "updated_at": fields["updated_at"].isoformat() if fields["updated_at"] else None,
+        }
+    )
+
+
+def _load(raw: str) -> dict[str, Any]:
+    fields: dict[str, Any] = json.loads(raw)
+{%- if cookiecutter.use_postgresql %}
+    fields["id"] = UUID(fields["id"])
+{%- endif %}
+    for name in ("created_at", "updated_at"):
+        if fields[name] is not None:
+            fields[name] = datetime.fromisoformat(fields[name])
+    return fields
+{%- endif %}
+
+
+user_cache = UserCache()
+{%- else %}
+"""User cache - not configured."""
+{%- endif %}
@@ -0,0 +1,185 @@
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+{%- set use_pubsub = cookiecutter.enable_redis and not cookiecutter.use_sqlite %}
+"""In-process index of webhook subscriptions by event type.
+
+``WebhookService.dispatch_event`` runs for every event, while subscriptions
+change rarely. The index keeps the IDs of the active webhooks subscribed to
+each event type in memory, so repeated events skip the database. The webhook
+repository fills entries on first use and drops them whenever a webhook is
+created, updated, deleted or has its secret rotated.
+{%- if use_pubsub %}
+
+Invalidations are published on a Redis channel so every worker process drops
+its copy. ``WEBHOOK_INDEX_TTL`` bounds staleness if a message is missed.
+{%- else %}
+
+Other worker processes pick up changes when their entries expire after
+``WEBHOOK_INDEX_TTL`` seconds.
+{%- endif %}
+"""
+
+{%- if use_pubsub %}
+
+import asyncio
+{%- endif %}
+import time
+{%- if cookiecutter.use_postgresql %}
+from uuid import UUID
+{%- endif %}
+{%- if use_pubsub %}
+
+import logfire
+{%- endif %}
+{%- if cookiecutter.use_postgresql %}
+from sqlalchemy.ext.asyncio import AsyncSession
+{%- elif cookiecutter.use_sqlite %}
+from sqlalchemy.orm import Session
+{%- endif %}
+
+{%- if use_pubsub %}
+
+from app.clients.redis import RedisClient
+{%- endif %}
+{%- if use_pubsub and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+from app.core.background import on_commit, spawn
+{%- elif use_pubsub %}
+from app.core.background import spawn
+{%- elif cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+from app.core.background import on_commit
+{%- endif %}
+from app.core.config import settings
+
+{%- if cookiecutter.use_postgresql %}
+
+WebhookId = UUID
+{%- else %}
+
+WebhookId = str
+{%- endif %}
+{%- if use_pubsub %}
+
+INVALIDATION_CHANNEL = "{{ cookiecutter.project_slug }}:webhooks:invalidate"
+{%- endif %}
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+
+# Session.info key: the index is invalidated once the session commits
+_PENDING_KEY = "webhook_index_invalidate"
+{%- endif %}
+
+
+class WebhookIndex:
+    """Event type -> IDs of the active webhooks subscribed to it.
+
+    Usage:
+        webhook_ids = webhook_index.get(event_type)
+        if webhook_ids is None:
+            generation = webhook_index.generation
+            webhook_ids = {% if not cookiecutter.use_sqlite %}await {% endif %}load_from_database(event_type)
+            webhook_index.set(event_type, webhook_ids, generation)
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        self.ttl = ttl if ttl is not None else settings.WEBHOOK_INDEX_TTL
+        self._entries: dict[str, tuple[float, list[WebhookId]]] = {}
+        self._generation = 0
+{%- if use_pubsub %}
+        self._redis: RedisClient | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+{%- endif %}
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation."""
+        return self._generation
+
+    def get(self, event_type: str) -> list[WebhookId] | None:
+        """Cached webhook IDs for an event type, or ``None`` on a miss."""
+        entry = self._entries.get(event_type)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, event_type: str, webhook_ids: list[WebhookId], generation: int) -> None:
+        """Cache webhook IDs loaded while ``generation`` was current.
+
+        The entry is discarded if an invalidation happened during the load,
+        since the IDs may predate the change.
+        """
+        if generation == self._generation:
+            self._entries[event_type] = (time.monotonic() + self.ttl, webhook_ids)
+
+    def clear(self) -> None:
+        """Drop all entries in this process."""
+        self._generation += 1
+        self._entries.clear()
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+
+    def invalidate_on_commit(self, db: {% if cookiecutter.use_postgresql %}AsyncSession{% else %}Session{% endif %}) -> None:
+        """Invalidate the index once ``db`` commits.
+
+        Invalidating before the commit would let a concurrent lookup reload
+        and cache the rows as they were before the change.
+        """
+        on_commit(db, _PENDING_KEY, self._after_commit)
+
+    def _after_commit(self, _values: list[object]) -> None:
+        self.clear()
+{%- if use_pubsub %}
+        if self._redis is not None:
+            spawn(self._publish(), self._tasks)
+{%- endif %}
+{%- else %}
+
+    async def invalidate(self) -> None:
+        """Invalidate the index in this process{% if use_pubsub %} and in every other worker{% endif %}."""
+        self.clear()
+{%- if use_pubsub %}
+        if self._redis is not None:
+            await self._publish()
+{%- endif %}
+{%- endif %}
+{%- if use_pubsub %}
+
+    async def start(self, redis: RedisClient) -> None:
+        """Exchange invalidations with other workers through Redis pub/sub."""
+        self._redis = redis
+        spawn(self._listen(), self._tasks)
+
+    async def stop(self) -> None:
+        """Stop listening for invalidations."""
+        self._redis = None
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _publish(self) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.raw.publish(INVALIDATION_CHANNEL, "invalidate")
+        except Exception as e:
+            logfire.warning("Failed to publish webhook index invalidation", error=str(e))
+
+    async def _listen(self) -> None:
+        while self._redis is not None:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # Invalidations may have been missed while not subscribed
+                    self.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logfire.warning("Webhook index listener disconnected", error=str(e))
+                await asyncio.sleep(1)
+{%- endif %}
+
+
+webhook_index = WebhookIndex()
+{%- else %}
+"""Webhook subscription index - not configured."""
+{%- endif %}
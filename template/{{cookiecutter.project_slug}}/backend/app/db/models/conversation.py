@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlmodel import Field, Relationship, SQLModel
 
@@ -24,6 +24,17 @@ class Conversation(TimestampMixin, SQLModel, table=True):
     """
 
     __tablename__ = "conversations"
+    # Backs keyset pagination ordered by last activity (see app/core/pagination.py)
+    __table_args__ = (
+        Index(
+            "ix_conversations_activity",
+{%- if cookiecutter.use_jwt %}
+            "user_id",
+{%- endif %}
+            text("coalesce(updated_at, created_at)"),
+            "id",
+        ),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -67,6 +78,7 @@ class Message(TimestampMixin, SQLModel, table=True):
     """
 
     __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),)
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -152,7 +164,7 @@ import uuid
 from datetime import datetime
 from typing import Literal
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -171,6 +183,17 @@ class Conversation(Base, TimestampMixin):
     """
 
     __tablename__ = "conversations"
+    # Backs keyset pagination ordered by last activity (see app/core/pagination.py)
+    __table_args__ = (
+        Index(
+            "ix_conversations_activity",
+{%- if cookiecutter.use_jwt %}
+            "user_id",
+{%- endif %}
+            text("coalesce(updated_at, created_at)"),
+            "id",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -212,6 +235,7 @@ class Message(Base, TimestampMixin):
     """
 
     __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -299,7 +323,7 @@ class ToolCall(Base):
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.db.base import TimestampMixin
@@ -309,6 +333,17 @@ class Conversation(TimestampMixin, SQLModel, table=True):
     """Conversation model - groups messages in a chat session."""
 
     __tablename__ = "conversations"
+    # Backs keyset pagination ordered by last activity (see app/core/pagination.py)
+    __table_args__ = (
+        Index(
+            "ix_conversations_activity",
+{%- if cookiecutter.use_jwt %}
+            "user_id",
+{%- endif %}
+            text("coalesce(updated_at, created_at)"),
+            "id",
+        ),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
@@ -342,6 +377,7 @@ class Message(TimestampMixin, SQLModel, table=True):
     """Message model - individual message in a conversation."""
 
     __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),)
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
@@ -413,7 +449,7 @@ class ToolCall(SQLModel, table=True):
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin
@@ -423,6 +459,17 @@ class Conversation(Base, TimestampMixin):
     """Conversation model - groups messages in a chat session."""
 
     __tablename__ = "conversations"
+    # Backs keyset pagination ordered by last activity (see app/core/pagination.py)
+    __table_args__ = (
+        Index(
+            "ix_conversations_activity",
+{%- if cookiecutter.use_jwt %}
+            "user_id",
+{%- endif %}
+            text("coalesce(updated_at, created_at)"),
+            "id",
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -454,6 +501,7 @@ class Message(Base, TimestampMixin):
     """Message model - individual message in a conversation."""
 
     __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -522,6 +570,7 @@ from typing import Literal, Optional
 
 from beanie import Document, Link
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class ToolCall(Document):
@@ -539,7 +588,9 @@ class ToolCall(Document):
 
     class Settings:
         name = "tool_calls"
-        indexes = ["message_id"]
+        indexes = [
+            IndexModel([("message_id", ASCENDING), ("started_at", ASCENDING)]),
+        ]
 
 
 class Message(Document):
@@ -554,7 +605,10 @@ class Message(Document):
 
     class Settings:
         name = "messages"
-        indexes = ["conversation_id"]
+        # Also serves lookups and deletes by conversation_id alone
+        indexes = [
+            IndexModel([("conversation_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]),
+        ]
 
 
 class Conversation(Document):
@@ -570,9 +624,23 @@ class Conversation(Document):
 
     class Settings:
         name = "conversations"
+        # The default listing filters on is_archived; the second index covers include_archived
+        indexes = [
 {%- if cookiecutter.use_jwt %}
-        indexes = ["user_id"]
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("is_archived", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+{%- else %}
+            IndexModel([("is_archived", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
 {%- endif %}
+        ]
 
 
 {%- else %}
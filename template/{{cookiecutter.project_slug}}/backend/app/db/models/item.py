@@ -3,7 +3,7 @@
 
 import uuid
 
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlmodel import Field, SQLModel
 
@@ -18,6 +18,7 @@ class Item(TimestampMixin, SQLModel, table=True):
     """
 
     __tablename__ = "items"
+    __table_args__ = (Index("ix_items_created", "created_at", "id"),)
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -41,7 +42,7 @@ class Item(TimestampMixin, SQLModel, table=True):
 
 import uuid
 
-from sqlalchemy import String, Text
+from sqlalchemy import Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -56,6 +57,7 @@ class Item(Base, TimestampMixin):
     """
 
     __tablename__ = "items"
+    __table_args__ = (Index("ix_items_created", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -73,7 +75,7 @@ class Item(Base, TimestampMixin):
 
 import uuid
 
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, Index, String, Text
 from sqlmodel import Field, SQLModel
 
 from app.db.base import TimestampMixin
@@ -87,6 +89,7 @@ class Item(TimestampMixin, SQLModel, table=True):
     """
 
     __tablename__ = "items"
+    __table_args__ = (Index("ix_items_created", "created_at", "id"),)
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
@@ -110,7 +113,7 @@ class Item(TimestampMixin, SQLModel, table=True):
 
 import uuid
 
-from sqlalchemy import Boolean, String, Text
+from sqlalchemy import Boolean, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base, TimestampMixin
@@ -124,6 +127,7 @@ class Item(Base, TimestampMixin):
     """
 
     __tablename__ = "items"
+    __table_args__ = (Index("ix_items_created", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -144,6 +148,7 @@ from typing import Optional
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class Item(Document):
@@ -163,6 +168,7 @@ class Item(Document):
         name = "items"
         indexes = [
             "title",
+            IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)]),
         ]
 
 
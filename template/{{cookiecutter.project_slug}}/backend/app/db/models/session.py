@@ -45,6 +45,11 @@ class Session(SQLModel, table=True):
     expires_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), nullable=False),
     )
+    # Set when a refresh replaced this session; presenting its token again is reuse
+    rotated_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
 
     # Relationship
     user: "User" = Relationship(back_populates="sessions")
@@ -96,6 +101,8 @@ class Session(Base):
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Set when a refresh replaced this session; presenting its token again is reuse
+    rotated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationship
     user = relationship("User", back_populates="sessions")
@@ -147,6 +154,8 @@ class Session(SQLModel, table=True):
         sa_column=Column(DateTime, nullable=False),
     )
     expires_at: datetime = Field(sa_column=Column(DateTime, nullable=False))
+    # Set when a refresh replaced this session; presenting its token again is reuse
+    rotated_at: datetime | None = Field(default=None, sa_column=Column(DateTime, nullable=True))
 
     # Relationship
     user: "User" = Relationship(back_populates="sessions")
@@ -197,6 +206,8 @@ class Session(Base):
         DateTime, default=datetime.utcnow, nullable=False
     )
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Set when a refresh replaced this session; presenting its token again is reuse
+    rotated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     # Relationship
     user = relationship("User", back_populates="sessions")
@@ -228,6 +239,8 @@ class Session(Document):
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     last_used_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     expires_at: datetime
+    # Set when a refresh replaced this session; presenting its token again is reuse
+    rotated_at: Optional[datetime] = None
 
     class Settings:
         name = "sessions"
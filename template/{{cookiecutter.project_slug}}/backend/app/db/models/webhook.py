@@ -4,9 +4,9 @@
 
 import uuid
 from datetime import datetime
-from enum import Enum
+from enum import Enum, StrEnum
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlmodel import Field, Relationship, SQLModel
 
@@ -27,10 +27,21 @@ class WebhookEventType(str, Enum):
     ITEM_DELETED = "item.deleted"
 
 
+class WebhookDeliveryStatus(StrEnum):
+    """Webhook delivery states."""
+
+    PENDING = "pending"
+    RETRYING = "retrying"
+    DELIVERED = "delivered"
+    DEAD = "dead"  # Gave up after WEBHOOK_MAX_ATTEMPTS (dead letter)
+
+
 class Webhook(TimestampMixin, SQLModel, table=True):
     """Webhook subscription model."""
 
     __tablename__ = "webhooks"
+    # GIN index for `events @> ARRAY[...]` lookups on a subscription index miss
+    __table_args__ = (Index("ix_webhooks_events", "events", postgresql_using="gin"),)
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -42,6 +53,12 @@ class Webhook(TimestampMixin, SQLModel, table=True):
     events: list[str] = Field(sa_column=Column(ARRAY(String), nullable=False))
     is_active: bool = Field(default=True)
     description: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
+    # Circuit breaker: deliveries are paused until circuit_open_until
+    consecutive_failures: int = Field(default=0)
+    circuit_open_until: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
 
 {%- if cookiecutter.use_jwt %}
     user_id: uuid.UUID | None = Field(
@@ -61,6 +78,10 @@ class WebhookDelivery(SQLModel, table=True):
     """Webhook delivery log model."""
 
     __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        Index("ix_webhook_deliveries_webhook_created", "webhook_id", "created_at", "id"),
+        Index("ix_webhook_deliveries_status_next_attempt", "status", "next_attempt_at"),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -74,8 +95,13 @@ class WebhookDelivery(SQLModel, table=True):
     response_status: int | None = Field(default=None)
     response_body: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
     error_message: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
-    attempt_count: int = Field(default=1)
+    attempt_count: int = Field(default=0)
     success: bool = Field(default=False)
+    status: str = Field(default=WebhookDeliveryStatus.PENDING.value, max_length=20)
+    next_attempt_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
     created_at: datetime = Field(sa_column=Column(DateTime, nullable=False))
     delivered_at: datetime | None = Field(
         default=None,
@@ -91,9 +117,9 @@ class WebhookDelivery(SQLModel, table=True):
 
 import uuid
 from datetime import datetime
-from enum import Enum
+from enum import Enum, StrEnum
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -114,10 +140,21 @@ class WebhookEventType(str, Enum):
     ITEM_DELETED = "item.deleted"
 
 
+class WebhookDeliveryStatus(StrEnum):
+    """Webhook delivery states."""
+
+    PENDING = "pending"
+    RETRYING = "retrying"
+    DELIVERED = "delivered"
+    DEAD = "dead"  # Gave up after WEBHOOK_MAX_ATTEMPTS (dead letter)
+
+
 class Webhook(Base, TimestampMixin):
     """Webhook subscription model."""
 
     __tablename__ = "webhooks"
+    # GIN index for `events @> ARRAY[...]` lookups on a subscription index miss
+    __table_args__ = (Index("ix_webhooks_events", "events", postgresql_using="gin"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -128,6 +165,11 @@ class Webhook(Base, TimestampMixin):
     events: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Circuit breaker: deliveries are paused until circuit_open_until
+    consecutive_failures: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    circuit_open_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Optional: Associate webhook with a user
 {%- if cookiecutter.use_jwt %}
@@ -146,6 +188,10 @@ class WebhookDelivery(Base):
     """Webhook delivery log model."""
 
     __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        Index("ix_webhook_deliveries_webhook_created", "webhook_id", "created_at", "id"),
+        Index("ix_webhook_deliveries_status_next_attempt", "status", "next_attempt_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -158,8 +204,12 @@ class WebhookDelivery(Base):
     response_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
     response_body: Mapped[str | None] = mapped_column(Text, nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
-    attempt_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    attempt_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     success: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), default=WebhookDeliveryStatus.PENDING.value, nullable=False
+    )
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -175,9 +225,9 @@ class WebhookDelivery(Base):
 import json
 import uuid
 from datetime import datetime
-from enum import Enum
+from enum import Enum, StrEnum
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.db.base import TimestampMixin
@@ -197,6 +247,15 @@ class WebhookEventType(str, Enum):
     ITEM_DELETED = "item.deleted"
 
 
+class WebhookDeliveryStatus(StrEnum):
+    """Webhook delivery states."""
+
+    PENDING = "pending"
+    RETRYING = "retrying"
+    DELIVERED = "delivered"
+    DEAD = "dead"  # Gave up after WEBHOOK_MAX_ATTEMPTS (dead letter)
+
+
 class Webhook(TimestampMixin, SQLModel, table=True):
     """Webhook subscription model."""
 
@@ -213,6 +272,12 @@ class Webhook(TimestampMixin, SQLModel, table=True):
     events_json: str = Field(sa_column=Column(Text, nullable=False))
     is_active: bool = Field(default=True)
     description: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
+    # Circuit breaker: deliveries are paused until circuit_open_until
+    consecutive_failures: int = Field(default=0)
+    circuit_open_until: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
 
 {%- if cookiecutter.use_jwt %}
     user_id: str | None = Field(
@@ -241,6 +306,10 @@ class WebhookDelivery(SQLModel, table=True):
     """Webhook delivery log model."""
 
     __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        Index("ix_webhook_deliveries_webhook_created", "webhook_id", "created_at", "id"),
+        Index("ix_webhook_deliveries_status_next_attempt", "status", "next_attempt_at"),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
@@ -254,8 +323,13 @@ class WebhookDelivery(SQLModel, table=True):
     response_status: int | None = Field(default=None)
     response_body: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
     error_message: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
-    attempt_count: int = Field(default=1)
+    attempt_count: int = Field(default=0)
     success: bool = Field(default=False)
+    status: str = Field(default=WebhookDeliveryStatus.PENDING.value, max_length=20)
+    next_attempt_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
     created_at: datetime = Field(sa_column=Column(DateTime, nullable=False))
     delivered_at: datetime | None = Field(
         default=None,
@@ -271,9 +345,9 @@ class WebhookDelivery(SQLModel, table=True):
 import json
 import uuid
 from datetime import datetime
-from enum import Enum
+from enum import Enum, StrEnum
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin
@@ -293,6 +367,15 @@ class WebhookEventType(str, Enum):
     ITEM_DELETED = "item.deleted"
 
 
+class WebhookDeliveryStatus(StrEnum):
+    """Webhook delivery states."""
+
+    PENDING = "pending"
+    RETRYING = "retrying"
+    DELIVERED = "delivered"
+    DEAD = "dead"  # Gave up after WEBHOOK_MAX_ATTEMPTS (dead letter)
+
+
 class Webhook(Base, TimestampMixin):
     """Webhook subscription model."""
 
@@ -308,6 +391,11 @@ class Webhook(Base, TimestampMixin):
     events_json: Mapped[str] = mapped_column(Text, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Circuit breaker: deliveries are paused until circuit_open_until
+    consecutive_failures: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    circuit_open_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
 {%- if cookiecutter.use_jwt %}
     user_id: Mapped[str | None] = mapped_column(
@@ -334,6 +422,10 @@ class WebhookDelivery(Base):
     """Webhook delivery log model."""
 
     __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        Index("ix_webhook_deliveries_webhook_created", "webhook_id", "created_at", "id"),
+        Index("ix_webhook_deliveries_status_next_attempt", "status", "next_attempt_at"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -346,8 +438,12 @@ class WebhookDelivery(Base):
     response_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
     response_body: Mapped[str | None] = mapped_column(Text, nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
-    attempt_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    attempt_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     success: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), default=WebhookDeliveryStatus.PENDING.value, nullable=False
+    )
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -360,11 +456,12 @@ class WebhookDelivery(Base):
 """Webhook document models (MongoDB)."""
 
 from datetime import UTC, datetime
-from enum import Enum
+from enum import Enum, StrEnum
 from typing import Optional
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class WebhookEventType(str, Enum):
@@ -381,6 +478,15 @@ class WebhookEventType(str, Enum):
     ITEM_DELETED = "item.deleted"
 
 
+class WebhookDeliveryStatus(StrEnum):
+    """Webhook delivery states."""
+
+    PENDING = "pending"
+    RETRYING = "retrying"
+    DELIVERED = "delivered"
+    DEAD = "dead"  # Gave up after WEBHOOK_MAX_ATTEMPTS (dead letter)
+
+
 class WebhookDelivery(Document):
     """Webhook delivery log document."""
 
@@ -390,14 +496,22 @@ class WebhookDelivery(Document):
     response_status: Optional[int] = None
     response_body: Optional[str] = None
     error_message: Optional[str] = None
-    attempt_count: int = 1
+    attempt_count: int = 0
     success: bool = False
+    status: str = WebhookDeliveryStatus.PENDING.value
+    next_attempt_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     delivered_at: Optional[datetime] = None
 
     class Settings:
         name = "webhook_deliveries"
-        indexes = ["webhook_id", "event_type", "created_at"]
+        indexes = [
+            "webhook_id",
+            "event_type",
+            "created_at",
+            IndexModel([("webhook_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+        ]
 
 
 class Webhook(Document):
@@ -409,6 +523,9 @@ class Webhook(Document):
     events: list[str]
     is_active: bool = True
     description: Optional[str] = None
+    # Circuit breaker: deliveries are paused until circuit_open_until
+    consecutive_failures: int = 0
+    circuit_open_until: Optional[datetime] = None
 {%- if cookiecutter.use_jwt %}
     user_id: Optional[str] = None
 {%- endif %}
@@ -1,13 +1,35 @@
 {%- if cookiecutter.use_postgresql %}
-"""Async PostgreSQL database session."""
-
+"""Async PostgreSQL database session.
+
+Writes always go to the primary (``engine``). Read-only endpoints use the
+``ReadDBSession`` dependency, which opens its session on one of the read
+replicas in ``DATABASE_READ_URLS`` when any are configured:
+
+- The replica with the fewest checked-out connections is chosen, rotating
+  between replicas that are tied.
+- A replica that cannot be reached is skipped for ``DB_REPLICA_RETRY_SECONDS``
+  and the read goes to the primary.
+- Requests for which ``primary_pinned`` is set read from the primary, so
+  clients see their own writes despite replication lag (see
+  ``PrimaryPinMiddleware``).
+"""
+
+import logging
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Set for requests that must read from the primary
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
@@ -52,9 +74,69 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+class ReplicaPool:
+    """Engines for the read replicas, with health tracking."""
+
+    def __init__(self, urls: list[str], retry_after: float) -> None:
+        self.engines: list[AsyncEngine] = [
+            create_async_engine(
+                url,
+                echo=settings.DEBUG,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                # Detect a replica that went away when a connection is checked out
+                pool_pre_ping=True,
+            )
+            for url in urls
+        ]
+        self.retry_after = retry_after
+        self._unhealthy_until: dict[AsyncEngine, float] = {}
+        self._next = 0
+
+    def choose(self) -> AsyncEngine | None:
+        """Pick the healthy replica with the fewest connections in use."""
+        now = time.monotonic()
+        healthy = [e for e in self.engines if self._unhealthy_until.get(e, 0.0) <= now]
+        if not healthy:
+            return None
+        # Rotate the starting point so ties are spread round-robin
+        self._next = (self._next + 1) % len(healthy)
+        candidates = healthy[self._next :] + healthy[: self._next]
+        return min(candidates, key=lambda e: e.sync_engine.pool.checkedout())  # type: ignore[attr-defined]
+
+    async def connect(self) -> AsyncSession | None:
+        """Open a session on a replica, or return None to use the primary."""
+        replica = self.choose()
+        if replica is None:
+            return None
+        session = async_session_maker(bind=replica)
+        try:
+            await session.connection()
+        except (OSError, SQLAlchemyError) as e:
+            await session.close()
+            self._unhealthy_until[replica] = time.monotonic() + self.retry_after
+            logger.warning(f"Read replica unavailable, reading from the primary: {e}")
+            return None
+        return session
+
+    def is_replica(self, session: AsyncSession) -> bool:
+        """Whether ``session`` was opened on one of the replicas."""
+        return session.bind in self.engines
+
+    async def dispose(self) -> None:
+        """Close all replica connections."""
+        for replica in self.engines:
+            await replica.dispose()
+
+
+read_replicas = ReplicaPool(settings.DATABASE_READ_URLS, settings.DB_REPLICA_RETRY_SECONDS)
+
+
 async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
+    await read_replicas.dispose()
 
 
 {%- elif cookiecutter.use_mongodb %}
@@ -84,22 +166,53 @@ async def close_db() -> None:
 
 
 {%- elif cookiecutter.use_sqlite %}
-"""Sync SQLite database session."""
+"""Sync SQLite database session.
+
+Every connection runs in WAL mode, so readers do not block the writer and the
+writer does not block readers, with ``synchronous=NORMAL`` (durable across
+application crashes, fsync only at checkpoints). SQLite allows one writer at a
+time; a connection that finds the database locked waits up to
+``SQLITE_BUSY_TIMEOUT_MS`` instead of failing.
+
+Sessions are blocking. Async code such as WebSocket handlers should use
+``run_in_session`` so disk I/O happens in a worker thread instead of on the
+event loop.
+"""
 
-from collections.abc import Generator
+import asyncio
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from typing import Any, TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False},
     echo=settings.DEBUG,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Tune each new connection for concurrent access."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS:d}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size={-settings.SQLITE_CACHE_SIZE_KB:d}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE:d}")
+    cursor.close()
+
+
+# Loaded objects stay usable after commit, e.g. when returned from run_in_session
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 def get_db_session() -> Generator[Session, None, None]:
@@ -115,6 +228,37 @@ def get_db_session() -> Generator[Session, None, None]:
         db.close()
 
 
+@contextmanager
+def get_db_context() -> Generator[Session, None, None]:
+    """Get sync database session as context manager.
+
+    Use this with 'with' for manual session management (e.g., WebSockets).
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_in_session(fn: Callable[..., T], *args: Any) -> T:
+    """Run ``fn(db, *args)`` in a worker thread and commit.
+
+    Use this from async code so the blocking SQLite calls do not stall the
+    event loop.
+    """
+
+    def run() -> T:
+        with get_db_context() as db:
+            return fn(db, *args)
+
+    return await asyncio.to_thread(run)
+
+
 def close_db() -> None:
     """Close database connection."""
     engine.dispose()
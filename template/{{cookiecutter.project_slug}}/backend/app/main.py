@@ -20,7 +20,7 @@ from app.core.config import settings
 {%- if cookiecutter.enable_logfire %}
 from app.core.logfire_setup import instrument_app, setup_logfire
 {%- endif %}
-from app.core.middleware import RequestIDMiddleware
+from app.core.middleware import {% if cookiecutter.use_postgresql %}PrimaryPinMiddleware, {% endif %}RequestIDMiddleware
 
 {%- if cookiecutter.enable_redis %}
 from app.clients.redis import RedisClient
@@ -80,11 +80,56 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[{% if cookiecutter.enable_red
     setup_cache(redis_client)
 {%- endif %}
 
+{%- if cookiecutter.enable_caching and cookiecutter.use_postgresql %}
+    from app.core.cache import service_cache
+    service_cache.setup(redis_client)
+{%- endif %}
+
+{%- if cookiecutter.use_jwt and cookiecutter.enable_redis and not cookiecutter.use_sqlite %}
+    from app.core.user_cache import user_cache
+    user_cache.setup(redis_client)
+{%- endif %}
+
+{%- if cookiecutter.enable_redis and cookiecutter.enable_ai_agent and (cookiecutter.use_pydantic_ai or cookiecutter.use_langchain or cookiecutter.use_langgraph) %}
+    from app.agents.completion_cache import completion_cache
+    completion_cache.setup(redis_client)
+{%- endif %}
+
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+    from app.services import webhook_queue
+    {% if not cookiecutter.use_sqlite %}await {% endif %}webhook_queue.start()
+{%- endif %}
+
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and cookiecutter.enable_redis and not cookiecutter.use_sqlite %}
+    from app.core.webhook_index import webhook_index
+    await webhook_index.start(redis_client)
+{%- endif %}
+
+{%- if cookiecutter.enable_websockets and cookiecutter.enable_redis %}
+    from app.api.routes.v1.ws import manager as ws_manager
+    await ws_manager.start(redis_client)
+{%- endif %}
+
 {%- if cookiecutter.enable_redis %}
 
     yield {"redis": redis_client}
 
     # === Shutdown ===
+{%- if cookiecutter.enable_websockets %}
+    await ws_manager.stop()
+{%- endif %}
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and not cookiecutter.use_sqlite %}
+    await webhook_index.stop()
+{%- endif %}
+{%- if cookiecutter.enable_caching and cookiecutter.use_postgresql %}
+    service_cache.setup(None)
+{%- endif %}
+{%- if cookiecutter.use_jwt and not cookiecutter.use_sqlite %}
+    user_cache.setup(None)
+{%- endif %}
+{%- if cookiecutter.enable_ai_agent and (cookiecutter.use_pydantic_ai or cookiecutter.use_langchain or cookiecutter.use_langgraph) %}
+    completion_cache.setup(None)
+{%- endif %}
     await redis_client.close()
 {%- else %}
 
@@ -92,6 +137,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[{% if cookiecutter.enable_red
 
     # === Shutdown ===
 {%- endif %}
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+    {% if not cookiecutter.use_sqlite %}await {% endif %}webhook_queue.stop()
+    from app.clients.webhook import webhook_client
+    {% if not cookiecutter.use_sqlite %}await {% endif %}webhook_client.close()
+{%- endif %}
+{%- if cookiecutter.enable_ai_agent and (cookiecutter.use_pydantic_ai or cookiecutter.use_langchain or cookiecutter.use_langgraph) %}
+    from app.agents.registry import agent_registry
+    await agent_registry.close()
+{%- endif %}
+{%- if cookiecutter.enable_ai_agent and cookiecutter.use_crewai %}
+    from app.agents.crewai_assistant import shutdown_crews
+    shutdown_crews()
+{%- endif %}
 {%- if cookiecutter.use_postgresql %}
     from app.db.session import close_db
     await close_db()
@@ -245,6 +303,13 @@ def create_app() -> FastAPI:
     # Request ID middleware (for request correlation/debugging)
     app.add_middleware(RequestIDMiddleware)
 
+{%- if cookiecutter.use_postgresql %}
+
+    # Keep clients that just wrote on the primary while read replicas catch up
+    if settings.DATABASE_READ_URLS:
+        app.add_middleware(PrimaryPinMiddleware, max_age=settings.DB_READ_STICKY_SECONDS)
+{%- endif %}
+
     # Exception handlers
     register_exception_handlers(app)
 
@@ -290,18 +355,6 @@ def create_app() -> FastAPI:
     )
 {%- endif %}
 
-{%- if cookiecutter.enable_rate_limiting %}
-
-    # Rate limiting
-    # Note: slowapi requires app.state.limiter - this is a library requirement,
-    # not suitable for lifespan state pattern which is for request-scoped access
-    from app.core.rate_limit import limiter
-    from slowapi import _rate_limit_exceeded_handler
-    from slowapi.errors import RateLimitExceeded
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-{%- endif %}
-
 {%- if (cookiecutter.enable_admin_panel and cookiecutter.use_postgresql and cookiecutter.admin_require_auth and not cookiecutter.admin_env_disabled) or cookiecutter.enable_oauth %}
 
     # Session middleware (for admin authentication and/or OAuth)
@@ -1,10 +1,16 @@
 {%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
 """Base repository with generic CRUD operations."""
+{%- if cookiecutter.use_postgresql %}
+
+import json
+from typing import Any, Generic, Literal, TypeVar
+{%- else %}
 
 from typing import Any, Generic, TypeVar
+{%- endif %}
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, func, select
 {%- if cookiecutter.use_postgresql %}
 from sqlalchemy.ext.asyncio import AsyncSession
 {%- else %}
@@ -22,6 +28,10 @@ ModelType = TypeVar("ModelType", bound=Base)
 {%- endif %}
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+{%- if cookiecutter.use_postgresql %}
+
+TotalMode = Literal["exact", "estimated"]
+{%- endif %}
 
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
@@ -155,6 +165,86 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db.flush()
         return obj
 {%- endif %}
+{%- if cookiecutter.use_postgresql %}
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select[Any],
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    total: TotalMode | None = "exact",
+) -> tuple[list[Any], int | None]:
+    """Fetch one page of an ORM query and, optionally, the total row count.
+
+    ``"exact"`` adds ``count(*) OVER ()`` to the page query, so the total comes
+    back with the rows instead of from a second COUNT query. ``"estimated"``
+    uses the planner's row estimate (see ``estimate_count``). ``None`` skips
+    the total.
+    """
+    page = query.offset(skip).limit(limit)
+    if total != "exact":
+        result = await db.execute(page)
+        items = list(result.scalars().all())
+        return items, await estimate_count(db, query) if total == "estimated" else None
+
+    result = await db.execute(page.add_columns(func.count().over()))
+    rows = result.all()
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    if skip == 0:
+        return [], 0
+    # Past the last page there is no row to carry the window count
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return [], await db.scalar(count_query) or 0
+
+
+async def estimate_count(db: AsyncSession, query: Select[Any]) -> int:
+    """Estimate how many rows a query returns without executing it.
+
+    Reads the row count from the top node of ``EXPLAIN``, which the planner
+    derives from ``pg_class.reltuples`` and column statistics. It costs about
+    the same on any table size but is only as fresh as the last (auto)ANALYZE.
+    """
+    conn = await db.connection()
+    sql = query.order_by(None).compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+{%- else %}
+
+
+def fetch_page(
+    db: Session,
+    query: Select[Any],
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    with_total: bool = True,
+) -> tuple[list[Any], int | None]:
+    """Fetch one page of an ORM query and, optionally, the total row count.
+
+    The total is computed with ``count(*) OVER ()`` in the page query itself,
+    so no second COUNT query is needed.
+    """
+    page = query.offset(skip).limit(limit)
+    if not with_total:
+        return list(db.execute(page).scalars().all()), None
+
+    rows = db.execute(page.add_columns(func.count().over())).all()
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    if skip == 0:
+        return [], 0
+    # Past the last page there is no row to carry the window count
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return [], db.scalar(count_query) or 0
+{%- endif %}
 {%- else %}
 """Base repository - not using SQLAlchemy."""
 {%- endif %}
@@ -7,11 +7,15 @@ Contains database operations for Conversation, Message, and ToolCall entities.
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func, select, update as sql_update
+from sqlalchemy import func, select, tuple_, update as sql_update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.models.conversation import Conversation, Message, ToolCall
+from app.repositories.base import TotalMode, fetch_page
+
+# Conversation list sort key: last activity, falling back to creation time
+conversation_activity = func.coalesce(Conversation.updated_at, Conversation.created_at)
 
 
 # =============================================================================
@@ -46,8 +50,15 @@ async def get_conversations_by_user(
     skip: int = 0,
     limit: int = 50,
     include_archived: bool = False,
-) -> list[Conversation]:
-    """Get conversations for a user with pagination."""
+    after: tuple[datetime, UUID] | None = None,
+    total: TotalMode | None = None,
+) -> tuple[list[Conversation], int | None]:
+    """Get conversations for a user, most recently active first.
+
+    Pass ``after`` (the sort key of the last conversation seen) for keyset
+    pagination instead of ``skip``. The total count comes back from the same
+    query when ``total`` is set (see ``fetch_page``), otherwise it is ``None``.
+    """
     query = select(Conversation)
 {%- if cookiecutter.use_jwt %}
     if user_id:
@@ -55,9 +66,10 @@ async def get_conversations_by_user(
 {%- endif %}
     if not include_archived:
         query = query.where(Conversation.is_archived == False)  # noqa: E712
-    query = query.order_by(Conversation.updated_at.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    if after:
+        query = query.where(tuple_(conversation_activity, Conversation.id) < tuple_(*after))
+    query = query.order_by(conversation_activity.desc(), Conversation.id.desc())
+    return await fetch_page(db, query, skip=skip, limit=limit, total=total)
 
 
 async def count_conversations(
@@ -158,14 +170,39 @@ async def get_messages_by_conversation(
     skip: int = 0,
     limit: int = 100,
     include_tool_calls: bool = False,
-) -> list[Message]:
-    """Get messages for a conversation with pagination."""
+    after: tuple[datetime, UUID] | None = None,
+    total: TotalMode | None = None,
+) -> tuple[list[Message], int | None]:
+    """Get messages for a conversation, oldest first.
+
+    Pass ``after`` (the sort key of the last message seen) for keyset
+    pagination instead of ``skip``. The total count comes back from the same
+    query when ``total`` is set (see ``fetch_page``), otherwise it is ``None``.
+    """
     query = select(Message).where(Message.conversation_id == conversation_id)
     if include_tool_calls:
         query = query.options(selectinload(Message.tool_calls))
-    query = query.order_by(Message.created_at.asc()).offset(skip).limit(limit)
+    if after:
+        query = query.where(tuple_(Message.created_at, Message.id) > tuple_(*after))
+    query = query.order_by(Message.created_at.asc(), Message.id.asc())
+    return await fetch_page(db, query, skip=skip, limit=limit, total=total)
+
+
+async def get_recent_messages_by_conversation(
+    db: AsyncSession,
+    conversation_id: UUID,
+    *,
+    limit: int = 100,
+) -> list[Message]:
+    """Get the most recent messages for a conversation, oldest first."""
+    query = (
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at.desc())
+        .limit(limit)
+    )
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return list(reversed(result.scalars().all()))
 
 
 async def count_messages(db: AsyncSession, conversation_id: UUID) -> int:
@@ -206,6 +243,37 @@ async def create_message(
     return message
 
 
+async def bulk_create_messages(
+    db: AsyncSession,
+    messages: list[Message],
+    tool_calls: list[ToolCall] | None = None,
+) -> None:
+    """Insert buffered messages and their tool calls in one flush per table.
+
+    Rows must already have ``id`` and ``created_at`` set, so tool calls can
+    reference their message and ordering does not depend on the shared
+    transaction timestamp. Each affected conversation's ``updated_at`` is
+    bumped once.
+    """
+    db.add_all(messages)
+    await db.flush()
+    if tool_calls:
+        db.add_all(tool_calls)
+        await db.flush()
+
+    latest: dict[UUID, datetime] = {}
+    for message in messages:
+        previous = latest.get(message.conversation_id)
+        if previous is None or message.created_at > previous:
+            latest[message.conversation_id] = message.created_at
+    for conversation_id, updated_at in latest.items():
+        await db.execute(
+            sql_update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(updated_at=updated_at)
+        )
+
+
 async def delete_message(db: AsyncSession, message_id: UUID) -> bool:
     """Delete a message."""
     message = await get_message_by_id(db, message_id)
@@ -296,10 +364,14 @@ Contains database operations for Conversation, Message, and ToolCall entities.
 
 from datetime import datetime
 
-from sqlalchemy import func, select, update as sql_update
+from sqlalchemy import func, select, tuple_, update as sql_update
 from sqlalchemy.orm import Session, selectinload
 
 from app.db.models.conversation import Conversation, Message, ToolCall
+from app.repositories.base import fetch_page
+
+# Conversation list sort key: last activity, falling back to creation time
+conversation_activity = func.coalesce(Conversation.updated_at, Conversation.created_at)
 
 
 # =============================================================================
@@ -334,8 +406,15 @@ def get_conversations_by_user(
     skip: int = 0,
     limit: int = 50,
     include_archived: bool = False,
-) -> list[Conversation]:
-    """Get conversations for a user with pagination."""
+    after: tuple[datetime, str] | None = None,
+    with_total: bool = False,
+) -> tuple[list[Conversation], int | None]:
+    """Get conversations for a user, most recently active first.
+
+    Pass ``after`` (the sort key of the last conversation seen) for keyset
+    pagination instead of ``skip``. The total count comes back from the same
+    query when ``with_total`` is set, otherwise it is ``None``.
+    """
     query = select(Conversation)
 {%- if cookiecutter.use_jwt %}
     if user_id:
@@ -343,9 +422,10 @@ def get_conversations_by_user(
 {%- endif %}
     if not include_archived:
         query = query.where(Conversation.is_archived == False)  # noqa: E712
-    query = query.order_by(Conversation.updated_at.desc()).offset(skip).limit(limit)
-    result = db.execute(query)
-    return list(result.scalars().all())
+    if after:
+        query = query.where(tuple_(conversation_activity, Conversation.id) < tuple_(*after))
+    query = query.order_by(conversation_activity.desc(), Conversation.id.desc())
+    return fetch_page(db, query, skip=skip, limit=limit, with_total=with_total)
 
 
 def count_conversations(
@@ -446,14 +526,39 @@ def get_messages_by_conversation(
     skip: int = 0,
     limit: int = 100,
     include_tool_calls: bool = False,
-) -> list[Message]:
-    """Get messages for a conversation with pagination."""
+    after: tuple[datetime, str] | None = None,
+    with_total: bool = False,
+) -> tuple[list[Message], int | None]:
+    """Get messages for a conversation, oldest first.
+
+    Pass ``after`` (the sort key of the last message seen) for keyset
+    pagination instead of ``skip``. The total count comes back from the same
+    query when ``with_total`` is set, otherwise it is ``None``.
+    """
     query = select(Message).where(Message.conversation_id == conversation_id)
     if include_tool_calls:
         query = query.options(selectinload(Message.tool_calls))
-    query = query.order_by(Message.created_at.asc()).offset(skip).limit(limit)
+    if after:
+        query = query.where(tuple_(Message.created_at, Message.id) > tuple_(*after))
+    query = query.order_by(Message.created_at.asc(), Message.id.asc())
+    return fetch_page(db, query, skip=skip, limit=limit, with_total=with_total)
+
+
+def get_recent_messages_by_conversation(
+    db: Session,
+    conversation_id: str,
+    *,
+    limit: int = 100,
+) -> list[Message]:
+    """Get the most recent messages for a conversation, oldest first."""
+    query = (
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at.desc())
+        .limit(limit)
+    )
     result = db.execute(query)
-    return list(result.scalars().all())
+    return list(reversed(result.scalars().all()))
 
 
 def count_messages(db: Session, conversation_id: str) -> int:
@@ -494,6 +599,37 @@ def create_message(
     return message
 
 
+def bulk_create_messages(
+    db: Session,
+    messages: list[Message],
+    tool_calls: list[ToolCall] | None = None,
+) -> None:
+    """Insert buffered messages and their tool calls in one flush per table.
+
+    Rows must already have ``id`` and ``created_at`` set, so tool calls can
+    reference their message and ordering does not depend on the shared
+    transaction timestamp. Each affected conversation's ``updated_at`` is
+    bumped once.
+    """
+    db.add_all(messages)
+    db.flush()
+    if tool_calls:
+        db.add_all(tool_calls)
+        db.flush()
+
+    latest: dict[str, datetime] = {}
+    for message in messages:
+        previous = latest.get(message.conversation_id)
+        if previous is None or message.created_at > previous:
+            latest[message.conversation_id] = message.created_at
+    for conversation_id, updated_at in latest.items():
+        db.execute(
+            sql_update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(updated_at=updated_at)
+        )
+
+
 def delete_message(db: Session, message_id: str) -> bool:
     """Delete a message."""
     message = get_message_by_id(db, message_id)
@@ -584,8 +720,12 @@ def complete_tool_call(
 Contains database operations for Conversation, Message, and ToolCall entities.
 """
 
+import asyncio
 from datetime import UTC, datetime
 
+from beanie import PydanticObjectId
+from beanie.operators import In, Set
+
 from app.db.models.conversation import Conversation, Message, ToolCall
 
 
@@ -613,17 +753,34 @@ async def get_conversations_by_user(
     skip: int = 0,
     limit: int = 50,
     include_archived: bool = False,
-) -> list[Conversation]:
-    """Get conversations for a user with pagination."""
-    query_filter = {}
+    after: tuple[datetime, PydanticObjectId] | None = None,
+    with_total: bool = False,
+) -> tuple[list[Conversation], int | None]:
+    """Get conversations for a user, newest first.
+
+    Pass ``after`` (the sort key of the last conversation seen) for keyset
+    pagination instead of ``skip``. With ``with_total`` the matching documents
+    are counted concurrently with the page query, otherwise the total is ``None``.
+    """
+    query_filter: dict = {}
 {%- if cookiecutter.use_jwt %}
     if user_id:
         query_filter["user_id"] = user_id
 {%- endif %}
     if not include_archived:
         query_filter["is_archived"] = False
+    if after:
+        created_at, last_id = after
+        query_filter["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": last_id}},
+        ]
 
-    return await Conversation.find(query_filter).sort("-created_at").skip(skip).limit(limit).to_list()
+    page = Conversation.find(query_filter).sort("-created_at", "-_id").skip(skip).limit(limit)
+    if not with_total:
+        return await page.to_list(), None
+    items, total = await asyncio.gather(page.to_list(), Conversation.find(query_filter).count())
+    return items, total
 
 
 async def count_conversations(
@@ -689,14 +846,20 @@ async def archive_conversation(
 
 
 async def delete_conversation(conversation_id: str) -> bool:
-    """Delete a conversation and all related messages/tool_calls."""
+    """Delete a conversation and all related messages/tool_calls.
+
+    Uses one ``delete_many`` per collection, however long the conversation.
+    Children go first, so if a step fails the conversation is still there
+    and deleting it again finishes the job without leaving orphans. (A
+    transaction would need a replica set, which standalone servers lack.)
+    """
     conversation = await get_conversation_by_id(conversation_id)
     if conversation:
-        # Delete related messages and tool calls
-        messages = await get_messages_by_conversation(str(conversation.id))
-        for message in messages:
-            await ToolCall.find(ToolCall.message_id == str(message.id)).delete()
-        await Message.find(Message.conversation_id == str(conversation.id)).delete()
+        conversation_id = str(conversation.id)
+        message_ids = await Message.distinct("_id", {"conversation_id": conversation_id})
+        if message_ids:
+            await ToolCall.find(In(ToolCall.message_id, [str(id_) for id_ in message_ids])).delete()
+        await Message.find(Message.conversation_id == conversation_id).delete()
         await conversation.delete()
         return True
     return False
@@ -717,15 +880,42 @@ async def get_messages_by_conversation(
     *,
     skip: int = 0,
     limit: int = 100,
+    after: tuple[datetime, PydanticObjectId] | None = None,
+    with_total: bool = False,
+) -> tuple[list[Message], int | None]:
+    """Get messages for a conversation, oldest first.
+
+    Pass ``after`` (the sort key of the last message seen) for keyset
+    pagination instead of ``skip``. With ``with_total`` the matching documents
+    are counted concurrently with the page query, otherwise the total is ``None``.
+    """
+    query_filter: dict = {"conversation_id": conversation_id}
+    if after:
+        created_at, last_id = after
+        query_filter["$or"] = [
+            {"created_at": {"$gt": created_at}},
+            {"created_at": created_at, "_id": {"$gt": last_id}},
+        ]
+    page = Message.find(query_filter).sort("created_at", "_id").skip(skip).limit(limit)
+    if not with_total:
+        return await page.to_list(), None
+    items, total = await asyncio.gather(page.to_list(), Message.find(query_filter).count())
+    return items, total
+
+
+async def get_recent_messages_by_conversation(
+    conversation_id: str,
+    *,
+    limit: int = 100,
 ) -> list[Message]:
-    """Get messages for a conversation with pagination."""
-    return await (
+    """Get the most recent messages for a conversation, oldest first."""
+    messages = await (
         Message.find(Message.conversation_id == conversation_id)
-        .sort("created_at")
-        .skip(skip)
+        .sort("-created_at")
         .limit(limit)
         .to_list()
     )
+    return list(reversed(messages))
 
 
 async def count_messages(conversation_id: str) -> int:
@@ -760,6 +950,30 @@ async def create_message(
     return message
 
 
+async def bulk_create_messages(
+    messages: list[Message],
+    tool_calls: list[ToolCall] | None = None,
+) -> None:
+    """Insert buffered messages and their tool calls with one insert_many each.
+
+    Documents must already have ``id`` set so tool calls can reference their
+    message. Each affected conversation's ``updated_at`` is bumped once.
+    """
+    await Message.insert_many(messages)
+    if tool_calls:
+        await ToolCall.insert_many(tool_calls)
+
+    latest: dict[str, datetime] = {}
+    for message in messages:
+        previous = latest.get(message.conversation_id)
+        if previous is None or message.created_at > previous:
+            latest[message.conversation_id] = message.created_at
+    for conversation_id, updated_at in latest.items():
+        await Conversation.find_one(Conversation.id == PydanticObjectId(conversation_id)).update(
+            Set({Conversation.updated_at: updated_at})
+        )
+
+
 async def delete_message(message_id: str) -> bool:
     """Delete a message and its tool calls."""
     message = await get_message_by_id(message_id)
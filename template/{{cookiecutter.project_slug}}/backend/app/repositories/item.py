@@ -5,9 +5,10 @@ Contains database operations for Item entity. Business logic
 should be handled by ItemService in app/services/item.py.
 """
 
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.item import Item
@@ -24,12 +25,19 @@ async def get_multi(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
+    after: tuple[datetime, UUID] | None = None,
 ) -> list[Item]:
-    """Get multiple items with pagination."""
+    """Get multiple items with pagination, oldest first.
+
+    ``after`` is the ``(created_at, id)`` of the last item seen (keyset
+    pagination); ``skip`` is applied on top of it.
+    """
     query = select(Item)
     if active_only:
         query = query.where(Item.is_active == True)  # noqa: E712
-    query = query.offset(skip).limit(limit)
+    if after is not None:
+        query = query.where(tuple_(Item.created_at, Item.id) > tuple_(*after))
+    query = query.order_by(Item.created_at, Item.id).offset(skip).limit(limit)
     result = await db.execute(query)
     return list(result.scalars().all())
 
@@ -83,7 +91,9 @@ Contains database operations for Item entity. Business logic
 should be handled by ItemService in app/services/item.py.
 """
 
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
 from app.db.models.item import Item
@@ -100,12 +110,19 @@ def get_multi(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
+    after: tuple[datetime, str] | None = None,
 ) -> list[Item]:
-    """Get multiple items with pagination."""
+    """Get multiple items with pagination, oldest first.
+
+    ``after`` is the ``(created_at, id)`` of the last item seen (keyset
+    pagination); ``skip`` is applied on top of it.
+    """
     query = select(Item)
     if active_only:
         query = query.where(Item.is_active == True)  # noqa: E712
-    query = query.offset(skip).limit(limit)
+    if after is not None:
+        query = query.where(tuple_(Item.created_at, Item.id) > tuple_(*after))
+    query = query.order_by(Item.created_at, Item.id).offset(skip).limit(limit)
     result = db.execute(query)
     return list(result.scalars().all())
 
@@ -161,6 +178,8 @@ should be handled by ItemService in app/services/item.py.
 
 from datetime import UTC, datetime
 
+from beanie import PydanticObjectId
+
 from app.db.models.item import Item
 
 
@@ -174,12 +193,27 @@ async def get_multi(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
+    after: tuple[datetime, PydanticObjectId] | None = None,
 ) -> list[Item]:
-    """Get multiple items with pagination."""
+    """Get multiple items with pagination, oldest first.
+
+    ``after`` is the ``(created_at, id)`` of the last item seen (keyset
+    pagination); ``skip`` is applied on top of it.
+    """
     query = Item.find_all()
     if active_only:
         query = Item.find(Item.is_active == True)  # noqa: E712
-    return await query.skip(skip).limit(limit).to_list()
+    if after is not None:
+        created_at, item_id = after
+        query = query.find(
+            {
+                "$or": [
+                    {"created_at": {"$gt": created_at}},
+                    {"created_at": created_at, "_id": {"$gt": item_id}},
+                ]
+            }
+        )
+    return await query.sort("created_at", "_id").skip(skip).limit(limit).to_list()
 
 
 async def create(
@@ -69,13 +69,90 @@ async def create(
     return session
 
 
-async def update_last_used(db: AsyncSession, session_id: UUID) -> None:
-    """Update session last used timestamp."""
-    await db.execute(
+async def rotate(
+    db: AsyncSession,
+    *,
+    token_hash: str,
+    new_token_hash: str,
+    expires_at: datetime,
+    device_name: str | None = None,
+    device_type: str | None = None,
+    ip_address: str | None = None,
+    user_agent: str | None = None,
+) -> Session | None:
+    """Replace an active, unexpired session with a new one.
+
+    The old row is retired with ``UPDATE ... RETURNING`` and the new row is
+    inserted in the same transaction. Only one of several concurrent
+    refreshes with the same token gets a row back. Returns the new session,
+    or None if the token does not belong to a usable session.
+    """
+    now = datetime.now(UTC)
+    result = await db.execute(
         update(Session)
-        .where(Session.id == session_id)
-        .values(last_used_at=datetime.now(UTC))
+        .where(
+            Session.refresh_token_hash == token_hash,
+            Session.is_active.is_(True),
+            Session.expires_at > now,
+        )
+        .values(is_active=False, rotated_at=now)
+        .returning(Session.user_id)
+    )
+    user_id = result.scalars().first()
+    if user_id is None:
+        return None
+
+    session = Session(
+        user_id=user_id,
+        refresh_token_hash=new_token_hash,
+        expires_at=expires_at,
+        device_name=device_name,
+        device_type=device_type,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        created_at=now,
+        last_used_at=now,
     )
+    db.add(session)
+    await db.flush()
+    return session
+
+
+async def deactivate_all_by_rotated_token_hash(db: AsyncSession, token_hash: str) -> int:
+    """Deactivate all sessions of the user whose token was already rotated.
+
+    Returns the count of deactivated sessions; 0 if the token was never rotated.
+    """
+    rotated_user = (
+        select(Session.user_id)
+        .where(Session.refresh_token_hash == token_hash, Session.rotated_at.is_not(None))
+        .limit(1)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Session)
+        .where(Session.user_id == rotated_user, Session.is_active.is_(True))
+        .values(is_active=False)
+        .returning(Session.id)
+    )
+    await db.flush()
+    return len(result.scalars().all())
+
+
+async def update_last_used(
+    db: AsyncSession,
+    session_id: UUID,
+    *,
+    stale_before: datetime | None = None,
+) -> None:
+    """Update session last used timestamp.
+
+    With ``stale_before``, rows used more recently than that are left alone.
+    """
+    query = update(Session).where(Session.id == session_id)
+    if stale_before is not None:
+        query = query.where(Session.last_used_at < stale_before)
+    await db.execute(query.values(last_used_at=datetime.now(UTC)))
     await db.flush()
 
 
@@ -179,14 +256,91 @@ def create(
     return session
 
 
-def update_last_used(db: DBSession, session_id: str) -> None:
-    """Update session last used timestamp."""
-    db.execute(
+def rotate(
+    db: DBSession,
+    *,
+    token_hash: str,
+    new_token_hash: str,
+    expires_at: datetime,
+    device_name: str | None = None,
+    device_type: str | None = None,
+    ip_address: str | None = None,
+    user_agent: str | None = None,
+) -> Session | None:
+    """Replace an active, unexpired session with a new one.
+
+    The old row is retired with ``UPDATE ... RETURNING`` and the new row is
+    inserted in the same transaction. Only one of several concurrent
+    refreshes with the same token gets a row back. Returns the new session,
+    or None if the token does not belong to a usable session.
+    """
+    now = datetime.now(UTC)
+    result = db.execute(
+        update(Session)
+        .where(
+            Session.refresh_token_hash == token_hash,
+            Session.is_active.is_(True),
+            Session.expires_at > now,
+        )
+        .values(is_active=False, rotated_at=now)
+        .returning(Session.user_id)
+    )
+    user_id = result.scalars().first()
+    if user_id is None:
+        return None
+
+    session = Session(
+        user_id=user_id,
+        refresh_token_hash=new_token_hash,
+        expires_at=expires_at,
+        device_name=device_name,
+        device_type=device_type,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        created_at=now,
+        last_used_at=now,
+    )
+    db.add(session)
+    db.flush()
+    return session
+
+
+def deactivate_all_by_rotated_token_hash(db: DBSession, token_hash: str) -> int:
+    """Deactivate all sessions of the user whose token was already rotated.
+
+    Returns the count of deactivated sessions; 0 if the token was never rotated.
+    """
+    rotated_user = (
+        select(Session.user_id)
+        .where(Session.refresh_token_hash == token_hash, Session.rotated_at.is_not(None))
+        .limit(1)
+        .scalar_subquery()
+    )
+    result = db.execute(
         update(Session)
-        .where(Session.id == session_id)
-        .values(last_used_at=datetime.now(UTC))
+        .where(Session.user_id == rotated_user, Session.is_active.is_(True))
+        .values(is_active=False)
+        .returning(Session.id)
     )
     db.flush()
+    return len(result.scalars().all())
+
+
+def update_last_used(
+    db: DBSession,
+    session_id: str,
+    *,
+    stale_before: datetime | None = None,
+) -> None:
+    """Update session last used timestamp.
+
+    With ``stale_before``, rows used more recently than that are left alone.
+    """
+    query = update(Session).where(Session.id == session_id)
+    if stale_before is not None:
+        query = query.where(Session.last_used_at < stale_before)
+    db.execute(query.values(last_used_at=datetime.now(UTC)))
+    db.flush()
 
 
 def deactivate(db: DBSession, session_id: str) -> Session | None:
@@ -225,6 +379,8 @@ def deactivate_by_refresh_token_hash(db: DBSession, token_hash: str) -> Session
 
 from datetime import UTC, datetime
 
+from beanie import PydanticObjectId, UpdateResponse
+
 from app.db.models.session import Session
 
 
@@ -277,12 +433,73 @@ async def create(
     return session
 
 
-async def update_last_used(session_id: str) -> None:
-    """Update session last used timestamp."""
-    session = await get_by_id(session_id)
-    if session:
-        session.last_used_at = datetime.now(UTC)
-        await session.save()
+async def rotate(
+    *,
+    token_hash: str,
+    new_token_hash: str,
+    expires_at: datetime,
+    device_name: str | None = None,
+    device_type: str | None = None,
+    ip_address: str | None = None,
+    user_agent: str | None = None,
+) -> Session | None:
+    """Replace an active, unexpired session with a new one.
+
+    The old document is retired with a single ``findOneAndUpdate``, so only
+    one of several concurrent refreshes with the same token gets it back.
+    Returns the new session, or None if the token does not belong to a
+    usable session.
+    """
+    now = datetime.now(UTC)
+    previous = await Session.find_one(
+        Session.refresh_token_hash == token_hash,
+        Session.is_active == True,  # noqa: E712
+        Session.expires_at > now,
+    ).update(
+        {"$set": {"is_active": False, "rotated_at": now}},
+        response_type=UpdateResponse.OLD_DOCUMENT,
+    )
+    if previous is None:
+        return None
+
+    session = Session(
+        user_id=previous.user_id,
+        refresh_token_hash=new_token_hash,
+        expires_at=expires_at,
+        device_name=device_name,
+        device_type=device_type,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        created_at=now,
+        last_used_at=now,
+    )
+    await session.insert()
+    return session
+
+
+async def deactivate_all_by_rotated_token_hash(token_hash: str) -> int:
+    """Deactivate all sessions of the user whose token was already rotated.
+
+    Returns the count of deactivated sessions; 0 if the token was never rotated.
+    """
+    rotated = await Session.find_one(
+        Session.refresh_token_hash == token_hash,
+        Session.rotated_at != None,  # noqa: E711
+    )
+    if rotated is None:
+        return 0
+    return await deactivate_all_user_sessions(rotated.user_id)
+
+
+async def update_last_used(session_id: str, *, stale_before: datetime | None = None) -> None:
+    """Update session last used timestamp.
+
+    With ``stale_before``, documents used more recently than that are left alone.
+    """
+    query = Session.find(Session.id == PydanticObjectId(session_id))
+    if stale_before is not None:
+        query = query.find(Session.last_used_at < stale_before)
+    await query.update({"$set": {"last_used_at": datetime.now(UTC)}})
 
 
 async def deactivate(session_id: str) -> Session | None:
@@ -2,12 +2,15 @@
 {%- if cookiecutter.use_postgresql %}
 """Webhook repository (PostgreSQL async)."""
 
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import case, select, tuple_, update as sql_update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models.webhook import Webhook, WebhookDelivery
+from app.core.webhook_index import webhook_index
+from app.db.models.webhook import Webhook, WebhookDelivery, WebhookDeliveryStatus
+from app.repositories.base import TotalMode, fetch_page
 from app.schemas.webhook import WebhookUpdate
 
 
@@ -22,21 +25,18 @@ async def get_list(
     user_id: UUID | None = None,
     skip: int = 0,
     limit: int = 50,
+    total: TotalMode = "exact",
 ) -> tuple[list[Webhook], int]:
-    """Get list of webhooks with pagination."""
+    """Get list of webhooks with pagination.
+
+    The total count comes back from the page query itself (see ``fetch_page``).
+    """
     query = select(Webhook)
     if user_id:
         query = query.where(Webhook.user_id == user_id)
     query = query.order_by(Webhook.created_at.desc())
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all()), total
+    webhooks, count = await fetch_page(db, query, skip=skip, limit=limit, total=total)
+    return webhooks, count or 0
 
 
 async def get_by_event(db: AsyncSession, event_type: str) -> list[Webhook]:
@@ -50,6 +50,26 @@ async def get_by_event(db: AsyncSession, event_type: str) -> list[Webhook]:
     return list(result.scalars().all())
 
 
+async def get_ids_by_event(db: AsyncSession, event_type: str) -> list[UUID]:
+    """Get IDs of all active webhooks subscribed to an event type.
+
+    Served from the in-process subscription index. On a miss, the query uses
+    the GIN index on ``events`` and the result is cached.
+    """
+    webhook_ids = webhook_index.get(event_type)
+    if webhook_ids is None:
+        generation = webhook_index.generation
+        result = await db.execute(
+            select(Webhook.id).where(
+                Webhook.is_active.is_(True),
+                Webhook.events.contains([event_type]),
+            )
+        )
+        webhook_ids = list(result.scalars().all())
+        webhook_index.set(event_type, webhook_ids, generation)
+    return webhook_ids
+
+
 async def create(
     db: AsyncSession,
     *,
@@ -74,6 +94,7 @@ async def create(
     db.add(webhook)
     await db.flush()
     await db.refresh(webhook)
+    webhook_index.invalidate_on_commit(db)
     return webhook
 
 
@@ -89,6 +110,7 @@ async def update(
     db.add(webhook)
     await db.flush()
     await db.refresh(webhook)
+    webhook_index.invalidate_on_commit(db)
     return webhook
 
 
@@ -98,6 +120,7 @@ async def update_secret(db: AsyncSession, webhook: Webhook, new_secret: str) ->
     db.add(webhook)
     await db.flush()
     await db.refresh(webhook)
+    webhook_index.invalidate_on_commit(db)
     return webhook
 
 
@@ -105,6 +128,7 @@ async def delete(db: AsyncSession, webhook: Webhook) -> None:
     """Delete a webhook."""
     await db.delete(webhook)
     await db.flush()
+    webhook_index.invalidate_on_commit(db)
 
 
 async def get_deliveries(
@@ -113,29 +137,108 @@ async def get_deliveries(
     *,
     skip: int = 0,
     limit: int = 50,
-) -> tuple[list[WebhookDelivery], int]:
-    """Get delivery history for a webhook."""
+    after: tuple[datetime, UUID] | None = None,
+    total: TotalMode = "exact",
+) -> tuple[list[WebhookDelivery], int | None]:
+    """Get delivery history for a webhook, newest first.
+
+    With ``after`` (the ``(created_at, id)`` of the last row seen), returns the
+    rows that follow it and skips the total count (returned as ``None``).
+    """
     query = (
         select(WebhookDelivery)
         .where(WebhookDelivery.webhook_id == webhook_id)
-        .order_by(WebhookDelivery.created_at.desc())
+        .order_by(WebhookDelivery.created_at.desc(), WebhookDelivery.id.desc())
+    )
+
+    if after is not None:
+        query = query.where(tuple_(WebhookDelivery.created_at, WebhookDelivery.id) < tuple_(*after))
+    return await fetch_page(
+        db, query, skip=skip, limit=limit, total=None if after is not None else total
     )
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
 
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all()), total
+async def get_delivery_for_update(
+    db: AsyncSession, delivery_id: UUID
+) -> WebhookDelivery | None:
+    """Get a delivery and lock its row for the rest of the transaction.
+
+    Returns ``None`` if another transaction holds the lock, so two jobs for the
+    same delivery never claim it concurrently.
+    """
+    result = await db.execute(
+        select(WebhookDelivery)
+        .where(WebhookDelivery.id == delivery_id)
+        .with_for_update(skip_locked=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def record_failure(
+    db: AsyncSession, webhook_id: UUID, *, threshold: int, open_until: datetime
+) -> int:
+    """Count a failed delivery, opening the circuit until ``open_until`` at ``threshold``.
+
+    The counter is incremented by a single UPDATE, so failures recorded
+    concurrently by other workers are never lost.
+
+    Returns:
+        Consecutive failures including this one (0 if the webhook is gone).
+    """
+    failures = Webhook.consecutive_failures + 1
+    result = await db.execute(
+        sql_update(Webhook)
+        .where(Webhook.id == webhook_id)
+        .values(
+            consecutive_failures=failures,
+            circuit_open_until=case(
+                (failures >= threshold, open_until), else_=Webhook.circuit_open_until
+            ),
+        )
+        .returning(Webhook.consecutive_failures)
+    )
+    count: int | None = result.scalar_one_or_none()
+    return count or 0
+
+
+async def reset_failures(db: AsyncSession, webhook_id: UUID) -> None:
+    """Close the circuit after a successful delivery."""
+    await db.execute(
+        sql_update(Webhook)
+        .where(Webhook.id == webhook_id)
+        .values(consecutive_failures=0, circuit_open_until=None)
+    )
+
+
+async def get_due_delivery_ids(
+    db: AsyncSession, *, before: datetime, limit: int = 500
+) -> list[UUID]:
+    """Get IDs of unfinished deliveries whose next attempt was due before ``before``."""
+    result = await db.execute(
+        select(WebhookDelivery.id)
+        .where(
+            WebhookDelivery.status.in_(
+                [WebhookDeliveryStatus.PENDING.value, WebhookDeliveryStatus.RETRYING.value]
+            ),
+            WebhookDelivery.next_attempt_at <= before,
+        )
+        .order_by(WebhookDelivery.next_attempt_at)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
 
 
 {%- elif cookiecutter.use_sqlite %}
 """Webhook repository (SQLite sync)."""
 
-from sqlalchemy import func, select
+from datetime import datetime
+
+from sqlalchemy import case, select, tuple_, update as sql_update
 from sqlalchemy.orm import Session as DBSession
 
-from app.db.models.webhook import Webhook, WebhookDelivery
+from app.core.webhook_index import webhook_index
+from app.db.models.webhook import Webhook, WebhookDelivery, WebhookDeliveryStatus
+from app.repositories.base import fetch_page
 from app.schemas.webhook import WebhookUpdate
 
 
@@ -151,18 +254,16 @@ def get_list(
     skip: int = 0,
     limit: int = 50,
 ) -> tuple[list[Webhook], int]:
-    """Get list of webhooks with pagination."""
+    """Get list of webhooks with pagination.
+
+    The total count comes back from the page query itself (see ``fetch_page``).
+    """
     query = select(Webhook)
     if user_id:
         query = query.where(Webhook.user_id == user_id)
     query = query.order_by(Webhook.created_at.desc())
-
-    count_query = select(func.count()).select_from(query.subquery())
-    total = db.scalar(count_query) or 0
-
-    query = query.offset(skip).limit(limit)
-    result = db.execute(query)
-    return list(result.scalars().all()), total
+    webhooks, count = fetch_page(db, query, skip=skip, limit=limit)
+    return webhooks, count or 0
 
 
 def get_by_event(db: DBSession, event_type: str) -> list[Webhook]:
@@ -173,6 +274,20 @@ def get_by_event(db: DBSession, event_type: str) -> list[Webhook]:
     return [w for w in webhooks if event_type in w.events]
 
 
+def get_ids_by_event(db: DBSession, event_type: str) -> list[str]:
+    """Get IDs of all active webhooks subscribed to an event type.
+
+    Served from the in-process subscription index, which saves decoding every
+    webhook's JSON event list on each event.
+    """
+    webhook_ids = webhook_index.get(event_type)
+    if webhook_ids is None:
+        generation = webhook_index.generation
+        webhook_ids = [webhook.id for webhook in get_by_event(db, event_type)]
+        webhook_index.set(event_type, webhook_ids, generation)
+    return webhook_ids
+
+
 def create(
     db: DBSession,
     *,
@@ -197,6 +312,7 @@ def create(
     db.add(webhook)
     db.flush()
     db.refresh(webhook)
+    webhook_index.invalidate_on_commit(db)
     return webhook
 
 
@@ -215,6 +331,7 @@ def update(
     db.add(webhook)
     db.flush()
     db.refresh(webhook)
+    webhook_index.invalidate_on_commit(db)
     return webhook
 
 
@@ -224,6 +341,7 @@ def update_secret(db: DBSession, webhook: Webhook, new_secret: str) -> Webhook:
     db.add(webhook)
     db.flush()
     db.refresh(webhook)
+    webhook_index.invalidate_on_commit(db)
     return webhook
 
 
@@ -231,6 +349,7 @@ def delete(db: DBSession, webhook: Webhook) -> None:
     """Delete a webhook."""
     db.delete(webhook)
     db.flush()
+    webhook_index.invalidate_on_commit(db)
 
 
 def get_deliveries(
@@ -239,26 +358,89 @@ def get_deliveries(
     *,
     skip: int = 0,
     limit: int = 50,
-) -> tuple[list[WebhookDelivery], int]:
-    """Get delivery history for a webhook."""
+    after: tuple[datetime, str] | None = None,
+) -> tuple[list[WebhookDelivery], int | None]:
+    """Get delivery history for a webhook, newest first.
+
+    With ``after`` (the ``(created_at, id)`` of the last row seen), returns the
+    rows that follow it and skips the total count (returned as ``None``).
+    """
     query = (
         select(WebhookDelivery)
         .where(WebhookDelivery.webhook_id == webhook_id)
-        .order_by(WebhookDelivery.created_at.desc())
+        .order_by(WebhookDelivery.created_at.desc(), WebhookDelivery.id.desc())
     )
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total = db.scalar(count_query) or 0
+    if after is not None:
+        query = query.where(tuple_(WebhookDelivery.created_at, WebhookDelivery.id) < tuple_(*after))
+    return fetch_page(db, query, skip=skip, limit=limit, with_total=after is None)
+
 
-    query = query.offset(skip).limit(limit)
-    result = db.execute(query)
-    return list(result.scalars().all()), total
+def get_delivery_by_id(db: DBSession, delivery_id: str) -> WebhookDelivery | None:
+    """Get delivery by ID."""
+    return db.get(WebhookDelivery, delivery_id)
+
+
+def record_failure(db: DBSession, webhook_id: str, *, threshold: int, open_until: datetime) -> int:
+    """Count a failed delivery, opening the circuit until ``open_until`` at ``threshold``.
+
+    The counter is incremented by a single UPDATE, so failures recorded
+    concurrently by other workers are never lost.
+
+    Returns:
+        Consecutive failures including this one (0 if the webhook is gone).
+    """
+    failures = Webhook.consecutive_failures + 1
+    result = db.execute(
+        sql_update(Webhook)
+        .where(Webhook.id == webhook_id)
+        .values(
+            consecutive_failures=failures,
+            circuit_open_until=case(
+                (failures >= threshold, open_until), else_=Webhook.circuit_open_until
+            ),
+        )
+        .returning(Webhook.consecutive_failures)
+    )
+    count: int | None = result.scalar_one_or_none()
+    return count or 0
+
+
+def reset_failures(db: DBSession, webhook_id: str) -> None:
+    """Close the circuit after a successful delivery."""
+    db.execute(
+        sql_update(Webhook)
+        .where(Webhook.id == webhook_id)
+        .values(consecutive_failures=0, circuit_open_until=None)
+    )
+
+
+def get_due_delivery_ids(db: DBSession, *, before: datetime, limit: int = 500) -> list[str]:
+    """Get IDs of unfinished deliveries whose next attempt was due before ``before``."""
+    result = db.execute(
+        select(WebhookDelivery.id)
+        .where(
+            WebhookDelivery.status.in_(
+                [WebhookDeliveryStatus.PENDING.value, WebhookDeliveryStatus.RETRYING.value]
+            ),
+            WebhookDelivery.next_attempt_at <= before,
+        )
+        .order_by(WebhookDelivery.next_attempt_at)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
 
 
 {%- elif cookiecutter.use_mongodb %}
 """Webhook repository (MongoDB)."""
 
-from app.db.models.webhook import Webhook, WebhookDelivery
+import asyncio
+from datetime import datetime
+
+from beanie import PydanticObjectId, UpdateResponse
+
+from app.core.webhook_index import webhook_index
+from app.db.models.webhook import Webhook, WebhookDelivery, WebhookDeliveryStatus
 from app.schemas.webhook import WebhookUpdate
 
 
@@ -273,13 +455,13 @@ async def get_list(
     skip: int = 0,
     limit: int = 50,
 ) -> tuple[list[Webhook], int]:
-    """Get list of webhooks with pagination."""
-    query = Webhook.find()
-    if user_id:
-        query = query.find(Webhook.user_id == user_id)
+    """Get list of webhooks with pagination.
 
-    total = await query.count()
-    webhooks = await query.sort(-Webhook.created_at).skip(skip).limit(limit).to_list()
+    The page and the total count are fetched concurrently.
+    """
+    query_filter = {"user_id": user_id} if user_id else {}
+    page = Webhook.find(query_filter).sort(-Webhook.created_at).skip(skip).limit(limit)
+    webhooks, total = await asyncio.gather(page.to_list(), Webhook.find(query_filter).count())
     return webhooks, total
 
 
@@ -291,6 +473,20 @@ async def get_by_event(event_type: str) -> list[Webhook]:
     ).to_list()
 
 
+async def get_ids_by_event(event_type: str) -> list[str]:
+    """Get IDs of all active webhooks subscribed to an event type.
+
+    Served from the in-process subscription index; a miss queries the
+    ``events`` index and fills it.
+    """
+    webhook_ids = webhook_index.get(event_type)
+    if webhook_ids is None:
+        generation = webhook_index.generation
+        webhook_ids = [str(webhook.id) for webhook in await get_by_event(event_type)]
+        webhook_index.set(event_type, webhook_ids, generation)
+    return webhook_ids
+
+
 async def create(
     *,
     name: str,
@@ -312,6 +508,7 @@ async def create(
 {%- endif %}
     )
     await webhook.insert()
+    await webhook_index.invalidate()
     return webhook
 
 
@@ -324,6 +521,7 @@ async def update(
     for field, value in update_data.items():
         setattr(webhook, field, value)
     await webhook.save()
+    await webhook_index.invalidate()
     return webhook
 
 
@@ -331,12 +529,14 @@ async def update_secret(webhook: Webhook, new_secret: str) -> Webhook:
     """Update webhook secret."""
     webhook.secret = new_secret
     await webhook.save()
+    await webhook_index.invalidate()
     return webhook
 
 
 async def delete(webhook: Webhook) -> None:
     """Delete a webhook."""
     await webhook.delete()
+    await webhook_index.invalidate()
 
 
 async def get_deliveries(
@@ -344,14 +544,82 @@ async def get_deliveries(
     *,
     skip: int = 0,
     limit: int = 50,
-) -> tuple[list[WebhookDelivery], int]:
-    """Get delivery history for a webhook."""
-    query = WebhookDelivery.find(WebhookDelivery.webhook_id == webhook_id)
-    total = await query.count()
-    deliveries = await query.sort(-WebhookDelivery.created_at).skip(skip).limit(limit).to_list()
+    after: tuple[datetime, PydanticObjectId] | None = None,
+) -> tuple[list[WebhookDelivery], int | None]:
+    """Get delivery history for a webhook, newest first.
+
+    With ``after`` (the ``(created_at, id)`` of the last row seen), returns the
+    rows that follow it and skips the total count (returned as ``None``).
+    Otherwise the page and the total count are fetched concurrently.
+    """
+    query_filter: dict = {"webhook_id": webhook_id}
+    if after is not None:
+        created_at, delivery_id = after
+        query_filter["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": delivery_id}},
+        ]
+    page = WebhookDelivery.find(query_filter).sort("-created_at", "-_id").skip(skip).limit(limit)
+    if after is not None:
+        return await page.to_list(), None
+    deliveries, total = await asyncio.gather(
+        page.to_list(), WebhookDelivery.find(query_filter).count()
+    )
     return deliveries, total
 
 
+async def get_delivery_by_id(delivery_id: str) -> WebhookDelivery | None:
+    """Get delivery by ID."""
+    return await WebhookDelivery.get(delivery_id)
+
+
+async def record_failure(webhook_id: str, *, threshold: int, open_until: datetime) -> int:
+    """Count a failed delivery, opening the circuit until ``open_until`` at ``threshold``.
+
+    The counter is incremented with ``$inc``, so failures recorded
+    concurrently by other workers are never lost.
+
+    Returns:
+        Consecutive failures including this one (0 if the webhook is gone).
+    """
+    webhook = await Webhook.find_one(Webhook.id == PydanticObjectId(webhook_id)).update(
+        {"$inc": {"consecutive_failures": 1}},
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+    if webhook is None:
+        return 0
+    if webhook.consecutive_failures >= threshold:
+        await Webhook.find_one(Webhook.id == webhook.id).update(
+            {"$set": {"circuit_open_until": open_until}}
+        )
+    return webhook.consecutive_failures
+
+
+async def reset_failures(webhook_id: str) -> None:
+    """Close the circuit after a successful delivery."""
+    await Webhook.find_one(Webhook.id == PydanticObjectId(webhook_id)).update(
+        {"$set": {"consecutive_failures": 0, "circuit_open_until": None}}
+    )
+
+
+async def get_due_delivery_ids(*, before: datetime, limit: int = 500) -> list[str]:
+    """Get IDs of unfinished deliveries whose next attempt was due before ``before``."""
+    deliveries = (
+        await WebhookDelivery.find(
+            {
+                "status": {
+                    "$in": [WebhookDeliveryStatus.PENDING.value, WebhookDeliveryStatus.RETRYING.value]
+                },
+                "next_attempt_at": {"$lte": before},
+            }
+        )
+        .sort("next_attempt_at")
+        .limit(limit)
+        .to_list()
+    )
+    return [str(delivery.id) for delivery in deliveries]
+
+
 {%- endif %}
 {%- else %}
 """Webhook repository - not configured."""
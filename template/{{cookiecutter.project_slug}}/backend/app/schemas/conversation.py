@@ -166,7 +166,8 @@ class ConversationList(BaseSchema):
     """Schema for listing conversations."""
 
     items: list[ConversationRead]
-    total: int
+    total: int | None = Field(default=None, description="Total count (offset pagination only)")
+    next_cursor: str | None = Field(default=None, description="Cursor for the next page, if any")
 
 
 # =============================================================================
@@ -178,7 +179,8 @@ class MessageList(BaseSchema):
     """Schema for listing messages."""
 
     items: list[MessageReadSimple]
-    total: int
+    total: int | None = Field(default=None, description="Total count (offset pagination only)")
+    next_cursor: str | None = Field(default=None, description="Cursor for the next page, if any")
 
 
 class ConversationWithLatestMessage(ConversationRead):
@@ -5,6 +5,8 @@ from typing import Literal
 
 from pydantic import BaseModel
 
+from app.schemas.user import UserRole
+
 
 class Token(BaseModel):
     """OAuth2 token response with refresh token."""
@@ -22,6 +24,23 @@ class TokenPayload(BaseModel):
     type: Literal["access", "refresh"] | None = None
 
 
+class AccessTokenClaims(BaseModel):
+    """Verified access token claims, enough to authorize without loading the user.
+
+    Role and flags are as of when the token was issued.
+    """
+
+    sub: str
+    exp: int
+    role: str
+    is_active: bool
+    is_superuser: bool = False
+
+    def has_role(self, required_role: UserRole) -> bool:
+        """Check if the token grants the required role or higher."""
+        return self.role in (UserRole.ADMIN.value, required_role.value)
+
+
 class RefreshTokenRequest(BaseModel):
     """Request body for token refresh."""
 
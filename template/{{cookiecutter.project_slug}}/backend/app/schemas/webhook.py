@@ -60,6 +60,8 @@ class WebhookDeliveryRead(BaseModel):
     error_message: str | None
     attempt_count: int
     success: bool
+    status: str = Field(description="pending, retrying, delivered or dead (retries exhausted)")
+    next_attempt_at: datetime | None = None
     created_at: datetime
     delivered_at: datetime | None
 
@@ -75,7 +77,8 @@ class WebhookDeliveryListResponse(BaseModel):
     """Response for list of webhook deliveries."""
 
     items: list[WebhookDeliveryRead]
-    total: int
+    total: int | None = Field(default=None, description="Total count (offset pagination only)")
+    next_cursor: str | None = Field(default=None, description="Cursor for the next page, if any")
 
 
 class WebhookTestResponse(BaseModel):
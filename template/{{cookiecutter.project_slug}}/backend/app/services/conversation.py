@@ -9,11 +9,18 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+{%- if cookiecutter.enable_caching %}
+
+from app.core.cache import cached, invalidates, service_cache
+{%- endif %}
+from app.core.config import settings
 from app.core.exceptions import NotFoundError
+from app.core.pagination import decode_cursor, next_page_cursor
 from app.db.models.conversation import Conversation, Message, ToolCall
 from app.repositories import conversation_repo
 from app.schemas.conversation import (
     ConversationCreate,
+    ConversationReadWithMessages,
     ConversationUpdate,
     MessageCreate,
     ToolCallCreate,
@@ -36,8 +43,14 @@ class ConversationService:
         conversation_id: UUID,
         *,
         include_messages: bool = False,
+{%- if cookiecutter.use_jwt %}
+        user_id: UUID | None = None,
+{%- endif %}
     ) -> Conversation:
-        """Get conversation by ID.
+        """Get conversation by ID.{% if cookiecutter.use_jwt %}
+
+        When ``user_id`` is given, conversations owned by another user are
+        treated as missing.{% endif %}
 
         Raises:
             NotFoundError: If conversation does not exist.
@@ -45,13 +58,45 @@ class ConversationService:
         conversation = await conversation_repo.get_conversation_by_id(
             self.db, conversation_id, include_messages=include_messages
         )
+{%- if cookiecutter.use_jwt %}
+        if not conversation or (user_id is not None and conversation.user_id != user_id):
+{%- else %}
         if not conversation:
+{%- endif %}
             raise NotFoundError(
                 message="Conversation not found",
                 details={"conversation_id": str(conversation_id)},
             )
         return conversation
 
+    {% if cookiecutter.enable_caching %}@cached(model=ConversationReadWithMessages, tags=["conversation:{conversation_id}"])
+    {% endif %}async def get_conversation_with_messages(
+        self,
+        conversation_id: UUID,
+{%- if cookiecutter.use_jwt %}
+        *,
+        user_id: UUID | None = None,
+{%- endif %}
+    ) -> ConversationReadWithMessages:
+        """Get a conversation with its messages for reading{% if cookiecutter.enable_caching %} (cached){% endif %}.
+{%- if cookiecutter.use_jwt %}
+
+        When ``user_id`` is given, conversations owned by another user are
+        treated as missing.{% if cookiecutter.enable_caching %} The cache key includes ``user_id``.{% endif %}
+{%- endif %}
+
+        Raises:
+            NotFoundError: If conversation does not exist.
+        """
+{%- if cookiecutter.use_jwt %}
+        conversation = await self.get_conversation(
+            conversation_id, include_messages=True, user_id=user_id
+        )
+{%- else %}
+        conversation = await self.get_conversation(conversation_id, include_messages=True)
+{%- endif %}
+        return ConversationReadWithMessages.model_validate(conversation)
+
     async def list_conversations(
         self,
 {%- if cookiecutter.use_jwt %}
@@ -61,29 +106,33 @@ class ConversationService:
         skip: int = 0,
         limit: int = 50,
         include_archived: bool = False,
-    ) -> tuple[list[Conversation], int]:
-        """List conversations with pagination.
+        cursor: str | None = None,
+    ) -> tuple[list[Conversation], int | None, str | None]:
+        """List conversations, most recently active first.
+
+        Pass ``cursor`` (a previous page's ``next_cursor``) for keyset pagination;
+        the total count is only computed for offset pagination.
 
         Returns:
-            Tuple of (conversations, total_count).
+            Tuple of (conversations, total_count or None, next_cursor).
+
+        Raises:
+            BadRequestError: If the cursor is invalid.
         """
-        items = await conversation_repo.get_conversations_by_user(
+        after = decode_cursor(cursor, datetime, UUID) if cursor else None
+        rows, total = await conversation_repo.get_conversations_by_user(
             self.db,
 {%- if cookiecutter.use_jwt %}
             user_id=user_id,
 {%- endif %}
             skip=skip,
-            limit=limit,
+            limit=limit + 1,
             include_archived=include_archived,
+            after=after,
+            total=None if cursor else settings.PAGINATION_TOTAL_MODE,
         )
-        total = await conversation_repo.count_conversations(
-            self.db,
-{%- if cookiecutter.use_jwt %}
-            user_id=user_id,
-{%- endif %}
-            include_archived=include_archived,
-        )
-        return items, total
+        items, next_cursor = next_page_cursor(rows, limit, lambda c: (c.updated_at or c.created_at, c.id))
+        return items, total, next_cursor
 
     async def create_conversation(
         self,
@@ -98,7 +147,8 @@ class ConversationService:
             title=data.title,
         )
 
-    async def update_conversation(
+    {% if cookiecutter.enable_caching %}@invalidates("conversation:{conversation_id}")
+    {% endif %}async def update_conversation(
         self,
         conversation_id: UUID,
         data: ConversationUpdate,
@@ -114,7 +164,8 @@ class ConversationService:
             self.db, db_conversation=conversation, update_data=update_data
         )
 
-    async def archive_conversation(self, conversation_id: UUID) -> Conversation:
+    {% if cookiecutter.enable_caching %}@invalidates("conversation:{conversation_id}")
+    {% endif %}async def archive_conversation(self, conversation_id: UUID) -> Conversation:
         """Archive a conversation.
 
         Raises:
@@ -130,7 +181,8 @@ class ConversationService:
             )
         return conversation
 
-    async def delete_conversation(self, conversation_id: UUID) -> bool:
+    {% if cookiecutter.enable_caching %}@invalidates("conversation:{conversation_id}")
+    {% endif %}async def delete_conversation(self, conversation_id: UUID) -> bool:
         """Delete a conversation.
 
         Raises:
@@ -169,25 +221,71 @@ class ConversationService:
         skip: int = 0,
         limit: int = 100,
         include_tool_calls: bool = False,
-    ) -> tuple[list[Message], int]:
-        """List messages in a conversation.
+        cursor: str | None = None,
+{%- if cookiecutter.use_jwt %}
+        user_id: UUID | None = None,
+{%- endif %}
+    ) -> tuple[list[Message], int | None, str | None]:
+        """List messages in a conversation, oldest first.
+
+        Pass ``cursor`` (a previous page's ``next_cursor``) for keyset pagination;
+        the total count is only computed for offset pagination.{% if cookiecutter.use_jwt %} When ``user_id``
+        is given, conversations owned by another user are treated as missing.{% endif %}
 
         Returns:
-            Tuple of (messages, total_count).
+            Tuple of (messages, total_count or None, next_cursor).
+
+        Raises:
+            NotFoundError: If conversation does not exist.
+            BadRequestError: If the cursor is invalid.
         """
+        after = decode_cursor(cursor, datetime, UUID) if cursor else None
         # Verify conversation exists
+        {%- if cookiecutter.use_jwt %}
+        await self.get_conversation(conversation_id, user_id=user_id)
+{%- else %}
         await self.get_conversation(conversation_id)
-        items = await conversation_repo.get_messages_by_conversation(
+{%- endif %}
+        rows, total = await conversation_repo.get_messages_by_conversation(
             self.db,
             conversation_id,
             skip=skip,
-            limit=limit,
+            limit=limit + 1,
             include_tool_calls=include_tool_calls,
+            after=after,
+            total=None if cursor else settings.PAGINATION_TOTAL_MODE,
         )
-        total = await conversation_repo.count_messages(self.db, conversation_id)
-        return items, total
+        items, next_cursor = next_page_cursor(rows, limit, lambda m: (m.created_at, m.id))
+        return items, total, next_cursor
 
-    async def add_message(
+    async def list_recent_messages(
+        self,
+        conversation_id: UUID,
+        *,
+        limit: int = 100,
+{%- if cookiecutter.use_jwt %}
+        user_id: UUID | None = None,
+{%- endif %}
+    ) -> list[Message]:
+        """List the most recent messages in a conversation, oldest first.
+
+        Used to seed the agent's server-side history window.{% if cookiecutter.use_jwt %} When ``user_id``
+        is given, conversations owned by another user are treated as missing.{% endif %}
+
+        Raises:
+            NotFoundError: If conversation does not exist.
+        """
+{%- if cookiecutter.use_jwt %}
+        await self.get_conversation(conversation_id, user_id=user_id)
+{%- else %}
+        await self.get_conversation(conversation_id)
+{%- endif %}
+        return await conversation_repo.get_recent_messages_by_conversation(
+            self.db, conversation_id, limit=limit
+        )
+
+    {% if cookiecutter.enable_caching %}@invalidates("conversation:{conversation_id}")
+    {% endif %}async def add_message(
         self,
         conversation_id: UUID,
         data: MessageCreate,
@@ -214,6 +312,10 @@ class ConversationService:
         Raises:
             NotFoundError: If message does not exist.
         """
+{%- if cookiecutter.enable_caching %}
+        message = await self.get_message(message_id)
+        service_cache.invalidate_on_commit(self.db, f"conversation:{message.conversation_id}")
+{%- endif %}
         deleted = await conversation_repo.delete_message(self.db, message_id)
         if not deleted:
             raise NotFoundError(
@@ -257,7 +359,12 @@ class ConversationService:
             NotFoundError: If message does not exist.
         """
         # Verify message exists
+{%- if cookiecutter.enable_caching %}
+        message = await self.get_message(message_id)
+        service_cache.invalidate_on_commit(self.db, f"conversation:{message.conversation_id}")
+{%- else %}
         await self.get_message(message_id)
+{%- endif %}
         return await conversation_repo.create_tool_call(
             self.db,
             message_id=message_id,
@@ -278,6 +385,10 @@ class ConversationService:
             NotFoundError: If tool call does not exist.
         """
         tool_call = await self.get_tool_call(tool_call_id)
+{%- if cookiecutter.enable_caching %}
+        message = await self.get_message(tool_call.message_id)
+        service_cache.invalidate_on_commit(self.db, f"conversation:{message.conversation_id}")
+{%- endif %}
         return await conversation_repo.complete_tool_call(
             self.db,
             db_tool_call=tool_call,
@@ -298,6 +409,7 @@ from datetime import UTC, datetime
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import NotFoundError
+from app.core.pagination import decode_cursor, next_page_cursor
 from app.db.models.conversation import Conversation, Message, ToolCall
 from app.repositories import conversation_repo
 from app.schemas.conversation import (
@@ -324,8 +436,14 @@ class ConversationService:
         conversation_id: str,
         *,
         include_messages: bool = False,
+{%- if cookiecutter.use_jwt %}
+        user_id: str | None = None,
+{%- endif %}
     ) -> Conversation:
-        """Get conversation by ID.
+        """Get conversation by ID.{% if cookiecutter.use_jwt %}
+
+        When ``user_id`` is given, conversations owned by another user are
+        treated as missing.{% endif %}
 
         Raises:
             NotFoundError: If conversation does not exist.
@@ -333,7 +451,11 @@ class ConversationService:
         conversation = conversation_repo.get_conversation_by_id(
             self.db, conversation_id, include_messages=include_messages
         )
+{%- if cookiecutter.use_jwt %}
+        if not conversation or (user_id is not None and conversation.user_id != user_id):
+{%- else %}
         if not conversation:
+{%- endif %}
             raise NotFoundError(
                 message="Conversation not found",
                 details={"conversation_id": conversation_id},
@@ -349,29 +471,33 @@ class ConversationService:
         skip: int = 0,
         limit: int = 50,
         include_archived: bool = False,
-    ) -> tuple[list[Conversation], int]:
-        """List conversations with pagination.
+        cursor: str | None = None,
+    ) -> tuple[list[Conversation], int | None, str | None]:
+        """List conversations, most recently active first.
+
+        Pass ``cursor`` (a previous page's ``next_cursor``) for keyset pagination;
+        the total count is only computed for offset pagination.
 
         Returns:
-            Tuple of (conversations, total_count).
+            Tuple of (conversations, total_count or None, next_cursor).
+
+        Raises:
+            BadRequestError: If the cursor is invalid.
         """
-        items = conversation_repo.get_conversations_by_user(
+        after = decode_cursor(cursor, datetime, str) if cursor else None
+        rows, total = conversation_repo.get_conversations_by_user(
             self.db,
 {%- if cookiecutter.use_jwt %}
             user_id=user_id,
 {%- endif %}
             skip=skip,
-            limit=limit,
-            include_archived=include_archived,
-        )
-        total = conversation_repo.count_conversations(
-            self.db,
-{%- if cookiecutter.use_jwt %}
-            user_id=user_id,
-{%- endif %}
+            limit=limit + 1,
             include_archived=include_archived,
+            after=after,
+            with_total=not cursor,
         )
-        return items, total
+        items, next_cursor = next_page_cursor(rows, limit, lambda c: (c.updated_at or c.created_at, c.id))
+        return items, total, next_cursor
 
     def create_conversation(
         self,
@@ -455,23 +581,68 @@ class ConversationService:
         skip: int = 0,
         limit: int = 100,
         include_tool_calls: bool = False,
-    ) -> tuple[list[Message], int]:
-        """List messages in a conversation.
+        cursor: str | None = None,
+{%- if cookiecutter.use_jwt %}
+        user_id: str | None = None,
+{%- endif %}
+    ) -> tuple[list[Message], int | None, str | None]:
+        """List messages in a conversation, oldest first.
+
+        Pass ``cursor`` (a previous page's ``next_cursor``) for keyset pagination;
+        the total count is only computed for offset pagination.{% if cookiecutter.use_jwt %} When ``user_id``
+        is given, conversations owned by another user are treated as missing.{% endif %}
 
         Returns:
-            Tuple of (messages, total_count).
+            Tuple of (messages, total_count or None, next_cursor).
+
+        Raises:
+            NotFoundError: If conversation does not exist.
+            BadRequestError: If the cursor is invalid.
         """
+        after = decode_cursor(cursor, datetime, str) if cursor else None
         # Verify conversation exists
+        {%- if cookiecutter.use_jwt %}
+        self.get_conversation(conversation_id, user_id=user_id)
+{%- else %}
         self.get_conversation(conversation_id)
-        items = conversation_repo.get_messages_by_conversation(
+{%- endif %}
+        rows, total = conversation_repo.get_messages_by_conversation(
             self.db,
             conversation_id,
             skip=skip,
-            limit=limit,
+            limit=limit + 1,
             include_tool_calls=include_tool_calls,
+            after=after,
+            with_total=not cursor,
+        )
+        items, next_cursor = next_page_cursor(rows, limit, lambda m: (m.created_at, m.id))
+        return items, total, next_cursor
+
+    def list_recent_messages(
+        self,
+        conversation_id: str,
+        *,
+        limit: int = 100,
+{%- if cookiecutter.use_jwt %}
+        user_id: str | None = None,
+{%- endif %}
+    ) -> list[Message]:
+        """List the most recent messages in a conversation, oldest first.
+
+        Used to seed the agent's server-side history window.{% if cookiecutter.use_jwt %} When ``user_id``
+        is given, conversations owned by another user are treated as missing.{% endif %}
+
+        Raises:
+            NotFoundError: If conversation does not exist.
+        """
+{%- if cookiecutter.use_jwt %}
+        self.get_conversation(conversation_id, user_id=user_id)
+{%- else %}
+        self.get_conversation(conversation_id)
+{%- endif %}
+        return conversation_repo.get_recent_messages_by_conversation(
+            self.db, conversation_id, limit=limit
         )
-        total = conversation_repo.count_messages(self.db, conversation_id)
-        return items, total
 
     def add_message(
         self,
@@ -581,7 +752,10 @@ Contains business logic for conversation, message, and tool call operations.
 
 from datetime import UTC, datetime
 
+from beanie import PydanticObjectId
+
 from app.core.exceptions import NotFoundError
+from app.core.pagination import decode_cursor, next_page_cursor
 from app.db.models.conversation import Conversation, Message, ToolCall
 from app.repositories import conversation_repo
 from app.schemas.conversation import (
@@ -605,8 +779,14 @@ class ConversationService:
         conversation_id: str,
         *,
         include_messages: bool = False,
+{%- if cookiecutter.use_jwt %}
+        user_id: str | None = None,
+{%- endif %}
     ) -> Conversation:
-        """Get conversation by ID.
+        """Get conversation by ID.{% if cookiecutter.use_jwt %}
+
+        When ``user_id`` is given, conversations owned by another user are
+        treated as missing.{% endif %}
 
         Raises:
             NotFoundError: If conversation does not exist.
@@ -614,7 +794,11 @@ class ConversationService:
         conversation = await conversation_repo.get_conversation_by_id(
             conversation_id, include_messages=include_messages
         )
+{%- if cookiecutter.use_jwt %}
+        if not conversation or (user_id is not None and conversation.user_id != user_id):
+{%- else %}
         if not conversation:
+{%- endif %}
             raise NotFoundError(
                 message="Conversation not found",
                 details={"conversation_id": conversation_id},
@@ -630,27 +814,32 @@ class ConversationService:
         skip: int = 0,
         limit: int = 50,
         include_archived: bool = False,
-    ) -> tuple[list[Conversation], int]:
-        """List conversations with pagination.
+        cursor: str | None = None,
+    ) -> tuple[list[Conversation], int | None, str | None]:
+        """List conversations, newest first.
+
+        Pass ``cursor`` (a previous page's ``next_cursor``) for keyset pagination;
+        the total count is only computed for offset pagination.
 
         Returns:
-            Tuple of (conversations, total_count).
+            Tuple of (conversations, total_count or None, next_cursor).
+
+        Raises:
+            BadRequestError: If the cursor is invalid.
         """
-        items = await conversation_repo.get_conversations_by_user(
+        after = decode_cursor(cursor, datetime, PydanticObjectId) if cursor else None
+        rows, total = await conversation_repo.get_conversations_by_user(
 {%- if cookiecutter.use_jwt %}
             user_id=user_id,
 {%- endif %}
             skip=skip,
-            limit=limit,
-            include_archived=include_archived,
-        )
-        total = await conversation_repo.count_conversations(
-{%- if cookiecutter.use_jwt %}
-            user_id=user_id,
-{%- endif %}
+            limit=limit + 1,
             include_archived=include_archived,
+            after=after,
+            with_total=not cursor,
         )
-        return items, total
+        items, next_cursor = next_page_cursor(rows, limit, lambda c: (c.created_at, c.id))
+        return items, total, next_cursor
 
     async def create_conversation(
         self,
@@ -732,21 +921,66 @@ class ConversationService:
         *,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Message], int]:
-        """List messages in a conversation.
+        cursor: str | None = None,
+{%- if cookiecutter.use_jwt %}
+        user_id: str | None = None,
+{%- endif %}
+    ) -> tuple[list[Message], int | None, str | None]:
+        """List messages in a conversation, oldest first.
+
+        Pass ``cursor`` (a previous page's ``next_cursor``) for keyset pagination;
+        the total count is only computed for offset pagination.{% if cookiecutter.use_jwt %} When ``user_id``
+        is given, conversations owned by another user are treated as missing.{% endif %}
 
         Returns:
-            Tuple of (messages, total_count).
+            Tuple of (messages, total_count or None, next_cursor).
+
+        Raises:
+            NotFoundError: If conversation does not exist.
+            BadRequestError: If the cursor is invalid.
         """
+        after = decode_cursor(cursor, datetime, PydanticObjectId) if cursor else None
         # Verify conversation exists
+{%- if cookiecutter.use_jwt %}
+        await self.get_conversation(conversation_id, user_id=user_id)
+{%- else %}
         await self.get_conversation(conversation_id)
-        items = await conversation_repo.get_messages_by_conversation(
+{%- endif %}
+        rows, total = await conversation_repo.get_messages_by_conversation(
             conversation_id,
             skip=skip,
-            limit=limit,
+            limit=limit + 1,
+            after=after,
+            with_total=not cursor,
+        )
+        items, next_cursor = next_page_cursor(rows, limit, lambda m: (m.created_at, m.id))
+        return items, total, next_cursor
+
+    async def list_recent_messages(
+        self,
+        conversation_id: str,
+        *,
+        limit: int = 100,
+{%- if cookiecutter.use_jwt %}
+        user_id: str | None = None,
+{%- endif %}
+    ) -> list[Message]:
+        """List the most recent messages in a conversation, oldest first.
+
+        Used to seed the agent's server-side history window.{% if cookiecutter.use_jwt %} When ``user_id``
+        is given, conversations owned by another user are treated as missing.{% endif %}
+
+        Raises:
+            NotFoundError: If conversation does not exist.
+        """
+{%- if cookiecutter.use_jwt %}
+        await self.get_conversation(conversation_id, user_id=user_id)
+{%- else %}
+        await self.get_conversation(conversation_id)
+{%- endif %}
+        return await conversation_repo.get_recent_messages_by_conversation(
+            conversation_id, limit=limit
         )
-        total = await conversation_repo.count_messages(conversation_id)
-        return items, total
 
     async def add_message(
         self,
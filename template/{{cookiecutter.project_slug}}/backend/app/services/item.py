@@ -4,14 +4,20 @@
 Contains business logic for item operations. Uses ItemRepository for database access.
 """
 
+from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+{%- if cookiecutter.enable_caching %}
+
+from app.core.cache import cached, invalidates
+{%- endif %}
 from app.core.exceptions import NotFoundError
+from app.core.pagination import decode_cursor, next_page_cursor
 from app.db.models.item import Item
 from app.repositories import item_repo
-from app.schemas.item import ItemCreate, ItemUpdate
+from app.schemas.item import ItemCreate, ItemRead, ItemUpdate
 
 
 class ItemService:
@@ -38,6 +44,15 @@ class ItemService:
             )
         return item
 
+    {% if cookiecutter.enable_caching %}@cached(model=ItemRead, tags=["item:{item_id}"])
+    {% endif %}async def get_item(self, item_id: UUID) -> ItemRead:
+        """Get an item for reading{% if cookiecutter.enable_caching %} (cached){% endif %}.
+
+        Raises:
+            NotFoundError: If item does not exist.
+        """
+        return ItemRead.model_validate(await self.get_by_id(item_id))
+
     async def get_multi(
         self,
         *,
@@ -50,7 +65,27 @@ class ItemService:
             self.db, skip=skip, limit=limit, active_only=active_only
         )
 
-    async def create(self, item_in: ItemCreate) -> Item:
+    {% if cookiecutter.enable_caching %}@cached(model=tuple[list[ItemRead], str | None], tags=["items"])
+    {% endif %}async def get_page(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Item], str | None]:
+        """Get a page of items and the cursor for the next page, if any.{% if cookiecutter.enable_caching %}
+
+        Cached: hits return ``ItemRead`` instances.{% endif %}
+        """
+        after = decode_cursor(cursor, datetime, UUID) if cursor else None
+        items = await item_repo.get_multi(
+            self.db, skip=skip, limit=limit + 1, active_only=active_only, after=after
+        )
+        return next_page_cursor(items, limit, lambda item: (item.created_at, item.id))
+
+    {% if cookiecutter.enable_caching %}@invalidates("items")
+    {% endif %}async def create(self, item_in: ItemCreate) -> Item:
         """Create a new item."""
         return await item_repo.create(
             self.db,
@@ -58,7 +93,8 @@ class ItemService:
             description=item_in.description,
         )
 
-    async def update(self, item_id: UUID, item_in: ItemUpdate) -> Item:
+    {% if cookiecutter.enable_caching %}@invalidates("items", "item:{item_id}")
+    {% endif %}async def update(self, item_id: UUID, item_in: ItemUpdate) -> Item:
         """Update an item.
 
         Raises:
@@ -68,7 +104,8 @@ class ItemService:
         update_data = item_in.model_dump(exclude_unset=True)
         return await item_repo.update(self.db, db_item=item, update_data=update_data)
 
-    async def delete(self, item_id: UUID) -> Item:
+    {% if cookiecutter.enable_caching %}@invalidates("items", "item:{item_id}")
+    {% endif %}async def delete(self, item_id: UUID) -> Item:
         """Delete an item.
 
         Raises:
@@ -89,9 +126,12 @@ class ItemService:
 Contains business logic for item operations. Uses ItemRepository for database access.
 """
 
+from datetime import datetime
+
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import NotFoundError
+from app.core.pagination import decode_cursor, next_page_cursor
 from app.db.models.item import Item
 from app.repositories import item_repo
 from app.schemas.item import ItemCreate, ItemUpdate
@@ -133,6 +173,21 @@ class ItemService:
             self.db, skip=skip, limit=limit, active_only=active_only
         )
 
+    def get_page(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Item], str | None]:
+        """Get a page of items and the cursor for the next page, if any."""
+        after = decode_cursor(cursor, datetime, str) if cursor else None
+        items = item_repo.get_multi(
+            self.db, skip=skip, limit=limit + 1, active_only=active_only, after=after
+        )
+        return next_page_cursor(items, limit, lambda item: (item.created_at, item.id))
+
     def create(self, item_in: ItemCreate) -> Item:
         """Create a new item."""
         return item_repo.create(
@@ -172,7 +227,12 @@ class ItemService:
 Contains business logic for item operations. Uses ItemRepository for database access.
 """
 
+from datetime import datetime
+
+from beanie import PydanticObjectId
+
 from app.core.exceptions import NotFoundError
+from app.core.pagination import decode_cursor, next_page_cursor
 from app.db.models.item import Item
 from app.repositories import item_repo
 from app.schemas.item import ItemCreate, ItemUpdate
@@ -209,6 +269,21 @@ class ItemService:
         """Get multiple items with pagination."""
         return await item_repo.get_multi(skip=skip, limit=limit, active_only=active_only)
 
+    async def get_page(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Item], str | None]:
+        """Get a page of items and the cursor for the next page, if any."""
+        after = decode_cursor(cursor, datetime, PydanticObjectId) if cursor else None
+        items = await item_repo.get_multi(
+            skip=skip, limit=limit + 1, active_only=active_only, after=after
+        )
+        return next_page_cursor(items, limit, lambda item: (item.created_at, item.id))
+
     async def create(self, item_in: ItemCreate) -> Item:
         """Create a new item."""
         return await item_repo.create(
@@ -0,0 +1,249 @@
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
+"""Write-behind buffer for agent messages and tool calls.
+
+The agent WebSocket records each turn's messages and tool calls here instead
+of opening a database session per row. Pending rows are written with one bulk
+insert per table, in a single transaction, when the turn ends (subject to the
+flush thresholds) and when the connection closes.
+"""
+
+import asyncio
+{%- if cookiecutter.use_sqlite %}
+import json
+{%- endif %}
+import logging
+import time
+from datetime import UTC, datetime
+from typing import Any
+{%- if cookiecutter.use_postgresql %}
+from uuid import UUID, uuid4
+{%- elif cookiecutter.use_sqlite %}
+from uuid import uuid4
+{%- endif %}
+{%- if cookiecutter.use_mongodb %}
+
+from beanie import PydanticObjectId
+{%- endif %}
+
+{%- if cookiecutter.use_postgresql and cookiecutter.enable_caching %}
+from app.core.cache import service_cache
+{%- endif %}
+from app.core.config import settings
+from app.db.models.conversation import Message, ToolCall
+{%- if cookiecutter.use_postgresql %}
+from app.db.session import get_db_context
+{%- elif cookiecutter.use_sqlite %}
+from app.db.session import run_in_session
+{%- endif %}
+from app.repositories import conversation_repo
+from app.schemas.conversation import MessageCreate, ToolCallComplete, ToolCallCreate
+
+logger = logging.getLogger(__name__)
+
+
+class MessageBuffer:
+    """Buffers one connection's Message and ToolCall rows for batched writes.
+
+    Tool calls are held open until the assistant message of the same turn is
+    added, then attached to it. ``maybe_flush()`` writes pending rows once
+    ``max_pending`` rows are queued or the oldest has waited ``flush_interval``
+    seconds (``0`` flushes at the end of every turn); with a positive interval
+    a timer also flushes idle connections. ``close()`` flushes whatever is
+    left. Rows of a failed flush are dropped, not retried.
+
+    Usage:
+        buffer = MessageBuffer()
+        buffer.add_message(conversation_id, MessageCreate(role="user", content=prompt))
+        buffer.start_tool_call(ToolCallCreate(tool_call_id="call_1", tool_name="search"))
+        buffer.complete_tool_call("call_1", ToolCallComplete(result="..."))
+        buffer.add_message(conversation_id, MessageCreate(role="assistant", content=reply))
+        await buffer.maybe_flush()
+    """
+
+    def __init__(
+        self,
+        max_pending: int | None = None,
+        flush_interval: float | None = None,
+    ) -> None:
+        self.max_pending = (
+            max_pending if max_pending is not None else settings.AGENT_PERSIST_MAX_PENDING
+        )
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else settings.AGENT_PERSIST_FLUSH_INTERVAL
+        )
+        self._messages: list[Message] = []
+        self._tool_calls: list[ToolCall] = []
+        self._open_tool_calls: dict[str, dict[str, Any]] = {}
+        self._first_pending_at: float | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._background_flushes: set[asyncio.Task[int]] = set()
+
+    def __len__(self) -> int:
+        """Number of rows waiting to be written."""
+        return len(self._messages) + len(self._tool_calls)
+
+    def add_message(
+        self,
+{%- if cookiecutter.use_postgresql %}
+        conversation_id: UUID,
+{%- else %}
+        conversation_id: str,
+{%- endif %}
+        data: MessageCreate,
+    ) -> Message:
+        """Queue a message.
+
+        A user message starts a new turn and discards tool calls left open by
+        a turn that never produced a reply. An assistant message takes
+        ownership of the turn's open tool calls.
+        """
+        message = Message(
+{%- if cookiecutter.use_postgresql %}
+            id=uuid4(),
+{%- elif cookiecutter.use_sqlite %}
+            id=str(uuid4()),
+{%- else %}
+            id=PydanticObjectId(),
+{%- endif %}
+            conversation_id=conversation_id,
+            role=data.role,
+            content=data.content,
+            model_name=data.model_name,
+            tokens_used=data.tokens_used,
+            # Set client-side: rows flushed together share one transaction timestamp
+            created_at=datetime.now(UTC),
+        )
+        self._messages.append(message)
+
+        if data.role == "user":
+            self._open_tool_calls.clear()
+        elif data.role == "assistant":
+            for fields in self._open_tool_calls.values():
+                self._tool_calls.append(
+{%- if cookiecutter.use_postgresql %}
+                    ToolCall(id=uuid4(), message_id=message.id, **fields)
+{%- elif cookiecutter.use_sqlite %}
+                    ToolCall(id=str(uuid4()), message_id=message.id, **fields)
+{%- else %}
+                    ToolCall(message_id=str(message.id), **fields)
+{%- endif %}
+                )
+            self._open_tool_calls.clear()
+
+        if self._first_pending_at is None:
+            self._first_pending_at = time.monotonic()
+            self._schedule_flush()
+        return message
+
+    def start_tool_call(self, data: ToolCallCreate) -> None:
+        """Open a tool call for the current turn.
+
+        Calling this again for the same ``tool_call_id`` only updates its args.
+        """
+        fields = self._open_tool_calls.get(data.tool_call_id)
+        if fields is not None:
+            if data.args:
+{%- if cookiecutter.use_sqlite %}
+                fields["args"] = json.dumps(data.args)
+{%- else %}
+                fields["args"] = data.args
+{%- endif %}
+            return
+        self._open_tool_calls[data.tool_call_id] = {
+            "tool_call_id": data.tool_call_id,
+            "tool_name": data.tool_name,
+{%- if cookiecutter.use_sqlite %}
+            "args": json.dumps(data.args),  # SQLite stores tool args as a JSON string
+{%- else %}
+            "args": data.args,
+{%- endif %}
+            "started_at": data.started_at or datetime.now(UTC),
+            "status": "running",
+        }
+
+    def complete_tool_call(self, tool_call_id: str, data: ToolCallComplete) -> None:
+        """Record the result of an open tool call. Unknown IDs are ignored."""
+        fields = self._open_tool_calls.get(tool_call_id)
+        if fields is None:
+            return
+        completed_at = data.completed_at or datetime.now(UTC)
+        fields["result"] = data.result
+        fields["completed_at"] = completed_at
+        fields["status"] = "completed" if data.success else "failed"
+        fields["duration_ms"] = int((completed_at - fields["started_at"]).total_seconds() * 1000)
+
+    def should_flush(self) -> bool:
+        """Whether a size or age threshold has been reached."""
+        if self._first_pending_at is None:
+            return False
+        if len(self) >= self.max_pending:
+            return True
+        return time.monotonic() - self._first_pending_at >= self.flush_interval
+
+    async def maybe_flush(self) -> int:
+        """Flush if a threshold has been reached. Call at the end of each turn."""
+        if self.should_flush():
+            return await self.flush()
+        return 0
+
+    async def flush(self) -> int:
+        """Write all pending rows in one transaction.
+
+        Returns:
+            Number of rows written.
+        """
+        messages, tool_calls = self._take_pending()
+        if not messages:
+            return 0
+{%- if cookiecutter.use_postgresql %}
+        async with get_db_context() as db:
+            await conversation_repo.bulk_create_messages(db, messages, tool_calls)
+{%- if cookiecutter.enable_caching %}
+            service_cache.invalidate_on_commit(
+                db, *{f"conversation:{message.conversation_id}" for message in messages}
+            )
+{%- endif %}
+{%- elif cookiecutter.use_sqlite %}
+        # SQLite writes block, so they run in a worker thread
+        await run_in_session(conversation_repo.bulk_create_messages, messages, tool_calls)
+{%- else %}
+        await conversation_repo.bulk_create_messages(messages, tool_calls)
+{%- endif %}
+        return len(messages) + len(tool_calls)
+
+    async def close(self) -> None:
+        """Flush remaining rows. Call when the connection closes."""
+        await self.flush()
+        if self._background_flushes:
+            await asyncio.gather(*self._background_flushes, return_exceptions=True)
+
+    def _take_pending(self) -> tuple[list[Message], list[ToolCall]]:
+        """Detach the pending rows so new ones can be queued during the write."""
+        messages, tool_calls = self._messages, self._tool_calls
+        self._messages, self._tool_calls = [], []
+        self._first_pending_at = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return messages, tool_calls
+
+    def _schedule_flush(self) -> None:
+        """Bound how long rows wait when the connection goes idle."""
+        if self.flush_interval > 0 and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._flush_on_timer
+            )
+
+    def _flush_on_timer(self) -> None:
+        self._timer = None
+        task = asyncio.create_task(self.flush())
+        self._background_flushes.add(task)
+        task.add_done_callback(self._on_background_flush_done)
+
+    def _on_background_flush_done(self, task: asyncio.Task[int]) -> None:
+        self._background_flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to flush buffered messages: {task.exception()}")
+{%- else %}
+"""Message write-behind buffer - not configured."""
+{%- endif %}
@@ -1,18 +1,30 @@
 {%- if cookiecutter.enable_session_management and cookiecutter.use_jwt %}
 {%- if cookiecutter.use_postgresql %}
+{%- set use_store = cookiecutter.enable_redis %}
+{%- set session_type = "Session | StoredSession" if use_store else "Session" %}
 """Session service (PostgreSQL async)."""
 
 import hashlib
+import logging
+{%- if use_store %}
+from collections.abc import Sequence
+{%- endif %}
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import AuthenticationError, NotFoundError
+from app.core.security import create_refresh_token, verify_token
+{%- if use_store %}
+from app.core.session_store import RedisSessionStore, StoredSession
+{%- endif %}
 from app.db.models.session import Session
 from app.repositories import session_repo
 
+logger = logging.getLogger(__name__)
+
 
 def _hash_token(token: str) -> str:
     """Hash a token for storage."""
@@ -50,10 +62,25 @@ def _parse_user_agent(user_agent: str | None) -> tuple[str | None, str | None]:
 
 
 class SessionService:
-    """Service for session management."""
+    """Service for session management.
+{%- if use_store %}
+
+    Sessions are rows in the ``sessions`` table, or Redis entries when a
+    ``RedisSessionStore`` is given (``SESSION_STORE=redis``). With a store,
+    the table is only written as an audit log (``SESSION_AUDIT_LOG``).
+{%- endif %}
+    """
+
+{%- if use_store %}
+
+    def __init__(self, db: AsyncSession, store: RedisSessionStore | None = None):
+        self.db = db
+        self.store = store
+{%- else %}
 
     def __init__(self, db: AsyncSession):
         self.db = db
+{%- endif %}
 
     async def create_session(
         self,
@@ -61,10 +88,36 @@ class SessionService:
         refresh_token: str,
         ip_address: str | None = None,
         user_agent: str | None = None,
-    ) -> Session:
+    ) -> {{ session_type }}:
         """Create a new session for a user."""
         device_name, device_type = _parse_user_agent(user_agent)
         expires_at = datetime.now(UTC) + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+{%- if use_store %}
+
+        if self.store is not None:
+            stored = StoredSession(
+                user_id=user_id,
+                refresh_token_hash=_hash_token(refresh_token),
+                expires_at=expires_at,
+                device_name=device_name,
+                device_type=device_type,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+            await self.store.create(stored)
+            if settings.SESSION_AUDIT_LOG:
+                await session_repo.create(
+                    self.db,
+                    user_id=user_id,
+                    refresh_token_hash=stored.refresh_token_hash,
+                    expires_at=expires_at,
+                    device_name=device_name,
+                    device_type=device_type,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                )
+            return stored
+{%- endif %}
 
         return await session_repo.create(
             self.db,
@@ -77,23 +130,142 @@ class SessionService:
             user_agent=user_agent,
         )
 
-    async def get_user_sessions(self, user_id: UUID) -> list[Session]:
+    async def get_user_sessions(self, user_id: UUID) -> {% if use_store %}Sequence{% else %}list{% endif %}[{{ session_type }}]:
         """Get all active sessions for a user."""
+{%- if use_store %}
+        if self.store is not None:
+            return await self.store.get_user_sessions(user_id)
+{%- endif %}
         return await session_repo.get_user_sessions(self.db, user_id, active_only=True)
 
-    async def validate_refresh_token(self, refresh_token: str) -> Session | None:
-        """Validate a refresh token and return the session if valid."""
+    async def validate_refresh_token(self, refresh_token: str) -> {{ session_type }} | None:
+        """Validate a refresh token and return the session if valid.
+
+        ``last_used_at`` is written at most once per
+        ``SESSION_LAST_USED_INTERVAL_MINUTES`` per session.
+        """
         token_hash = _hash_token(refresh_token)
-        session = await session_repo.get_by_refresh_token_hash(self.db, token_hash)
+        now = datetime.now(UTC)
+        stale_before = now - timedelta(minutes=settings.SESSION_LAST_USED_INTERVAL_MINUTES)
+{%- if use_store %}
+
+        if self.store is not None:
+            stored = await self.store.get(token_hash)
+            if stored is not None and stored.last_used_at < stale_before:
+                await self.store.touch(stored)
+            return stored
+{%- endif %}
 
-        if session and session.expires_at > datetime.now(UTC):
-            await session_repo.update_last_used(self.db, session.id)
+        session = await session_repo.get_by_refresh_token_hash(self.db, token_hash)
+        if session and session.expires_at > now:
+            if session.last_used_at < stale_before:
+                await session_repo.update_last_used(
+                    self.db, session.id, stale_before=stale_before
+                )
             return session
 
         return None
 
-    async def logout_session(self, session_id: UUID, user_id: UUID) -> Session:
+    async def rotate_refresh_token(
+        self,
+        refresh_token: str,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> tuple[{{ session_type }}, str]:
+        """Exchange a refresh token for a new session and refresh token.
+
+        A token that was already rotated is being replayed, so every session
+        of its user is revoked.
+
+        Raises AuthenticationError if the token is invalid, expired or reused.
+        """
+        payload = verify_token(refresh_token)
+        if payload is None or payload.get("type") != "refresh" or not payload.get("sub"):
+            raise AuthenticationError(message="Invalid or expired refresh token")
+
+        token_hash = _hash_token(refresh_token)
+        new_refresh_token = create_refresh_token(subject=payload["sub"])
+        device_name, device_type = _parse_user_agent(user_agent)
+        expires_at = datetime.now(UTC) + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+{%- if use_store %}
+
+        if self.store is not None:
+            stored = StoredSession(
+                user_id=UUID(payload["sub"]),
+                refresh_token_hash=_hash_token(new_refresh_token),
+                expires_at=expires_at,
+                device_name=device_name,
+                device_type=device_type,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+            rotated, user_id = await self.store.rotate(token_hash, stored)
+            if rotated:
+                if settings.SESSION_AUDIT_LOG:
+                    await session_repo.rotate(
+                        self.db,
+                        token_hash=token_hash,
+                        new_token_hash=stored.refresh_token_hash,
+                        expires_at=expires_at,
+                        device_name=device_name,
+                        device_type=device_type,
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                    )
+                return stored, new_refresh_token
+            if user_id is not None:
+                revoked = await self.store.delete_user_sessions(user_id)
+                if settings.SESSION_AUDIT_LOG:
+                    await session_repo.deactivate_all_user_sessions(self.db, user_id)
+                    # Commit now: the request's transaction is rolled back on the error below
+                    await self.db.commit()
+                logger.warning(
+                    f"Rotated refresh token reused for user {user_id}; revoked {revoked} sessions"
+                )
+            raise AuthenticationError(message="Invalid or expired refresh token")
+{%- endif %}
+
+        session = await session_repo.rotate(
+            self.db,
+            token_hash=token_hash,
+            new_token_hash=_hash_token(new_refresh_token),
+            expires_at=expires_at,
+            device_name=device_name,
+            device_type=device_type,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+        if session is None:
+            revoked = await session_repo.deactivate_all_by_rotated_token_hash(self.db, token_hash)
+            if revoked:
+                # Commit now: the request's transaction is rolled back on the error below
+                await self.db.commit()
+                logger.warning(
+                    f"Rotated refresh token reused for user {payload['sub']}; "
+                    f"revoked {revoked} sessions"
+                )
+            raise AuthenticationError(message="Invalid or expired refresh token")
+
+        return session, new_refresh_token
+
+    async def logout_session(self, session_id: UUID, user_id: UUID) -> {{ session_type }}:
         """Logout a specific session."""
+{%- if use_store %}
+        if self.store is not None:
+            sessions = await self.store.get_user_sessions(user_id)
+            stored = next((s for s in sessions if s.id == session_id), None)
+            if stored is None:
+                raise NotFoundError(message="Session not found")
+
+            await self.store.delete(stored.refresh_token_hash)
+            if settings.SESSION_AUDIT_LOG:
+                await session_repo.deactivate_by_refresh_token_hash(
+                    self.db,
+                    stored.refresh_token_hash
+                )
+            return stored
+
+{%- endif %}
         session = await session_repo.get_by_id(self.db, session_id)
         if not session or session.user_id != user_id:
             raise NotFoundError(message="Session not found")
@@ -103,27 +275,44 @@ class SessionService:
 
     async def logout_all_sessions(self, user_id: UUID) -> int:
         """Logout all sessions for a user. Returns count of logged out sessions."""
+{%- if use_store %}
+        if self.store is not None:
+            count = await self.store.delete_user_sessions(user_id)
+            if settings.SESSION_AUDIT_LOG:
+                await session_repo.deactivate_all_user_sessions(self.db, user_id)
+            return count
+{%- endif %}
         return await session_repo.deactivate_all_user_sessions(self.db, user_id)
 
-    async def logout_by_refresh_token(self, refresh_token: str) -> Session | None:
+    async def logout_by_refresh_token(self, refresh_token: str) -> {{ session_type }} | None:
         """Logout session by refresh token."""
         token_hash = _hash_token(refresh_token)
+{%- if use_store %}
+        if self.store is not None:
+            stored = await self.store.delete(token_hash)
+            if stored is not None and settings.SESSION_AUDIT_LOG:
+                await session_repo.deactivate_by_refresh_token_hash(self.db, token_hash)
+            return stored
+{%- endif %}
         return await session_repo.deactivate_by_refresh_token_hash(self.db, token_hash)
 
-
 {%- elif cookiecutter.use_sqlite %}
 """Session service (SQLite sync)."""
 
 import hashlib
+import logging
 from datetime import UTC, datetime, timedelta
 
 from sqlalchemy.orm import Session as DBSession
 
 from app.core.config import settings
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import AuthenticationError, NotFoundError
+from app.core.security import create_refresh_token, verify_token
 from app.db.models.session import Session
 from app.repositories import session_repo
 
+logger = logging.getLogger(__name__)
+
 
 def _hash_token(token: str) -> str:
     """Hash a token for storage."""
@@ -193,16 +382,67 @@ class SessionService:
         return session_repo.get_user_sessions(self.db, user_id, active_only=True)
 
     def validate_refresh_token(self, refresh_token: str) -> Session | None:
-        """Validate a refresh token and return the session if valid."""
+        """Validate a refresh token and return the session if valid.
+
+        ``last_used_at`` is written at most once per
+        ``SESSION_LAST_USED_INTERVAL_MINUTES`` per session.
+        """
         token_hash = _hash_token(refresh_token)
         session = session_repo.get_by_refresh_token_hash(self.db, token_hash)
 
-        if session and session.expires_at > datetime.now(UTC):
-            session_repo.update_last_used(self.db, session.id)
+        # SQLite returns naive datetimes, stored in UTC
+        now = datetime.now(UTC).replace(tzinfo=None)
+        if session and session.expires_at > now:
+            stale_before = now - timedelta(minutes=settings.SESSION_LAST_USED_INTERVAL_MINUTES)
+            if session.last_used_at < stale_before:
+                session_repo.update_last_used(self.db, session.id, stale_before=stale_before)
             return session
 
         return None
 
+    def rotate_refresh_token(
+        self,
+        refresh_token: str,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> tuple[Session, str]:
+        """Exchange a refresh token for a new session and refresh token.
+
+        A token that was already rotated is being replayed, so every session
+        of its user is revoked.
+
+        Raises AuthenticationError if the token is invalid, expired or reused.
+        """
+        payload = verify_token(refresh_token)
+        if payload is None or payload.get("type") != "refresh" or not payload.get("sub"):
+            raise AuthenticationError(message="Invalid or expired refresh token")
+
+        token_hash = _hash_token(refresh_token)
+        new_refresh_token = create_refresh_token(subject=payload["sub"])
+        device_name, device_type = _parse_user_agent(user_agent)
+        session = session_repo.rotate(
+            self.db,
+            token_hash=token_hash,
+            new_token_hash=_hash_token(new_refresh_token),
+            expires_at=datetime.now(UTC) + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+            device_name=device_name,
+            device_type=device_type,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+        if session is None:
+            revoked = session_repo.deactivate_all_by_rotated_token_hash(self.db, token_hash)
+            if revoked:
+                # Commit now: the request's transaction is rolled back on the error below
+                self.db.commit()
+                logger.warning(
+                    f"Rotated refresh token reused for user {payload['sub']}; "
+                    f"revoked {revoked} sessions"
+                )
+            raise AuthenticationError(message="Invalid or expired refresh token")
+
+        return session, new_refresh_token
+
     def logout_session(self, session_id: str, user_id: str) -> Session:
         """Logout a specific session."""
         session = session_repo.get_by_id(self.db, session_id)
@@ -223,16 +463,28 @@ class SessionService:
 
 
 {%- elif cookiecutter.use_mongodb %}
+{%- set use_store = cookiecutter.enable_redis %}
+{%- set session_type = "Session | StoredSession" if use_store else "Session" %}
 """Session service (MongoDB)."""
 
 import hashlib
+import logging
+{%- if use_store %}
+from collections.abc import Sequence
+{%- endif %}
 from datetime import UTC, datetime, timedelta
 
 from app.core.config import settings
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import AuthenticationError, NotFoundError
+from app.core.security import create_refresh_token, verify_token
+{%- if use_store %}
+from app.core.session_store import RedisSessionStore, StoredSession
+{%- endif %}
 from app.db.models.session import Session
 from app.repositories import session_repo
 
+logger = logging.getLogger(__name__)
+
 
 def _hash_token(token: str) -> str:
     """Hash a token for storage."""
@@ -270,7 +522,20 @@ def _parse_user_agent(user_agent: str | None) -> tuple[str | None, str | None]:
 
 
 class SessionService:
-    """Service for session management."""
+    """Service for session management.
+{%- if use_store %}
+
+    Sessions are rows in the ``sessions`` table, or Redis entries when a
+    ``RedisSessionStore`` is given (``SESSION_STORE=redis``). With a store,
+    the table is only written as an audit log (``SESSION_AUDIT_LOG``).
+{%- endif %}
+    """
+
+{%- if use_store %}
+
+    def __init__(self, store: RedisSessionStore | None = None):
+        self.store = store
+{%- endif %}
 
     async def create_session(
         self,
@@ -278,10 +543,35 @@ class SessionService:
         refresh_token: str,
         ip_address: str | None = None,
         user_agent: str | None = None,
-    ) -> Session:
+    ) -> {{ session_type }}:
         """Create a new session for a user."""
         device_name, device_type = _parse_user_agent(user_agent)
         expires_at = datetime.now(UTC) + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+{%- if use_store %}
+
+        if self.store is not None:
+            stored = StoredSession(
+                user_id=user_id,
+                refresh_token_hash=_hash_token(refresh_token),
+                expires_at=expires_at,
+                device_name=device_name,
+                device_type=device_type,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+            await self.store.create(stored)
+            if settings.SESSION_AUDIT_LOG:
+                await session_repo.create(
+                    user_id=user_id,
+                    refresh_token_hash=stored.refresh_token_hash,
+                    expires_at=expires_at,
+                    device_name=device_name,
+                    device_type=device_type,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                )
+            return stored
+{%- endif %}
 
         return await session_repo.create(
             user_id=user_id,
@@ -293,23 +583,133 @@ class SessionService:
             user_agent=user_agent,
         )
 
-    async def get_user_sessions(self, user_id: str) -> list[Session]:
+    async def get_user_sessions(self, user_id: str) -> {% if use_store %}Sequence{% else %}list{% endif %}[{{ session_type }}]:
         """Get all active sessions for a user."""
+{%- if use_store %}
+        if self.store is not None:
+            return await self.store.get_user_sessions(user_id)
+{%- endif %}
         return await session_repo.get_user_sessions(user_id, active_only=True)
 
-    async def validate_refresh_token(self, refresh_token: str) -> Session | None:
-        """Validate a refresh token and return the session if valid."""
+    async def validate_refresh_token(self, refresh_token: str) -> {{ session_type }} | None:
+        """Validate a refresh token and return the session if valid.
+
+        ``last_used_at`` is written at most once per
+        ``SESSION_LAST_USED_INTERVAL_MINUTES`` per session.
+        """
         token_hash = _hash_token(refresh_token)
-        session = await session_repo.get_by_refresh_token_hash(token_hash)
+        now = datetime.now(UTC)
+        stale_before = now - timedelta(minutes=settings.SESSION_LAST_USED_INTERVAL_MINUTES)
+{%- if use_store %}
+
+        if self.store is not None:
+            stored = await self.store.get(token_hash)
+            if stored is not None and stored.last_used_at < stale_before:
+                await self.store.touch(stored)
+            return stored
+{%- endif %}
 
-        if session and session.expires_at > datetime.now(UTC):
-            await session_repo.update_last_used(str(session.id))
+        session = await session_repo.get_by_refresh_token_hash(token_hash)
+        if session and session.expires_at > now:
+            if session.last_used_at < stale_before:
+                await session_repo.update_last_used(str(session.id), stale_before=stale_before)
             return session
 
         return None
 
-    async def logout_session(self, session_id: str, user_id: str) -> Session:
+    async def rotate_refresh_token(
+        self,
+        refresh_token: str,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> tuple[{{ session_type }}, str]:
+        """Exchange a refresh token for a new session and refresh token.
+
+        A token that was already rotated is being replayed, so every session
+        of its user is revoked.
+
+        Raises AuthenticationError if the token is invalid, expired or reused.
+        """
+        payload = verify_token(refresh_token)
+        if payload is None or payload.get("type") != "refresh" or not payload.get("sub"):
+            raise AuthenticationError(message="Invalid or expired refresh token")
+
+        token_hash = _hash_token(refresh_token)
+        new_refresh_token = create_refresh_token(subject=payload["sub"])
+        device_name, device_type = _parse_user_agent(user_agent)
+        expires_at = datetime.now(UTC) + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+{%- if use_store %}
+
+        if self.store is not None:
+            stored = StoredSession(
+                user_id=payload["sub"],
+                refresh_token_hash=_hash_token(new_refresh_token),
+                expires_at=expires_at,
+                device_name=device_name,
+                device_type=device_type,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+            rotated, user_id = await self.store.rotate(token_hash, stored)
+            if rotated:
+                if settings.SESSION_AUDIT_LOG:
+                    await session_repo.rotate(
+                        token_hash=token_hash,
+                        new_token_hash=stored.refresh_token_hash,
+                        expires_at=expires_at,
+                        device_name=device_name,
+                        device_type=device_type,
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                    )
+                return stored, new_refresh_token
+            if user_id is not None:
+                revoked = await self.store.delete_user_sessions(user_id)
+                if settings.SESSION_AUDIT_LOG:
+                    await session_repo.deactivate_all_user_sessions(user_id)
+                logger.warning(
+                    f"Rotated refresh token reused for user {user_id}; revoked {revoked} sessions"
+                )
+            raise AuthenticationError(message="Invalid or expired refresh token")
+{%- endif %}
+
+        session = await session_repo.rotate(
+            token_hash=token_hash,
+            new_token_hash=_hash_token(new_refresh_token),
+            expires_at=expires_at,
+            device_name=device_name,
+            device_type=device_type,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+        if session is None:
+            revoked = await session_repo.deactivate_all_by_rotated_token_hash(token_hash)
+            if revoked:
+                logger.warning(
+                    f"Rotated refresh token reused for user {payload['sub']}; "
+                    f"revoked {revoked} sessions"
+                )
+            raise AuthenticationError(message="Invalid or expired refresh token")
+
+        return session, new_refresh_token
+
+    async def logout_session(self, session_id: str, user_id: str) -> {{ session_type }}:
         """Logout a specific session."""
+{%- if use_store %}
+        if self.store is not None:
+            sessions = await self.store.get_user_sessions(user_id)
+            stored = next((s for s in sessions if s.id == session_id), None)
+            if stored is None:
+                raise NotFoundError(message="Session not found")
+
+            await self.store.delete(stored.refresh_token_hash)
+            if settings.SESSION_AUDIT_LOG:
+                await session_repo.deactivate_by_refresh_token_hash(
+                    stored.refresh_token_hash
+                )
+            return stored
+
+{%- endif %}
         session = await session_repo.get_by_id(session_id)
         if not session or session.user_id != user_id:
             raise NotFoundError(message="Session not found")
@@ -319,14 +719,27 @@ class SessionService:
 
     async def logout_all_sessions(self, user_id: str) -> int:
         """Logout all sessions for a user. Returns count of logged out sessions."""
+{%- if use_store %}
+        if self.store is not None:
+            count = await self.store.delete_user_sessions(user_id)
+            if settings.SESSION_AUDIT_LOG:
+                await session_repo.deactivate_all_user_sessions(user_id)
+            return count
+{%- endif %}
         return await session_repo.deactivate_all_user_sessions(user_id)
 
-    async def logout_by_refresh_token(self, refresh_token: str) -> Session | None:
+    async def logout_by_refresh_token(self, refresh_token: str) -> {{ session_type }} | None:
         """Logout session by refresh token."""
         token_hash = _hash_token(refresh_token)
+{%- if use_store %}
+        if self.store is not None:
+            stored = await self.store.delete(token_hash)
+            if stored is not None and settings.SESSION_AUDIT_LOG:
+                await session_repo.deactivate_by_refresh_token_hash(token_hash)
+            return stored
+{%- endif %}
         return await session_repo.deactivate_by_refresh_token_hash(token_hash)
 
-
 {%- endif %}
 {%- else %}
 """Session service - not configured."""
@@ -9,7 +9,12 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AlreadyExistsError, AuthenticationError, NotFoundError
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from app.core.user_cache import user_cache
 from app.db.models.user import User
 from app.repositories import user_repo
 from app.schemas.user import UserCreate, UserUpdate
@@ -61,7 +66,7 @@ class UserService:
                 details={"email": user_in.email},
             )
 
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await get_password_hash_async(user_in.password)
         return await user_repo.create(
             self.db,
             email=user_in.email,
@@ -73,14 +78,24 @@ class UserService:
     async def authenticate(self, email: str, password: str) -> User:
         """Authenticate user by email and password.
 
+        The stored hash is upgraded if the hashing settings changed since it was made.
+
         Raises:
             AuthenticationError: If credentials are invalid or user is inactive.
         """
         user = await user_repo.get_by_email(self.db, email)
-        if not user or not verify_password(password, user.hashed_password):
+        if (
+            not user
+            or not user.hashed_password
+            or not await verify_password_async(password, user.hashed_password)
+        ):
             raise AuthenticationError(message="Invalid email or password")
         if not user.is_active:
             raise AuthenticationError(message="User account is disabled")
+        if password_needs_rehash(user.hashed_password):
+            hashed_password = await get_password_hash_async(password)
+            user = await user_repo.update(self.db, db_user=user, update_data={"hashed_password": hashed_password})
+            user_cache.invalidate_on_commit(self.db, user.id)
         return user
 
     async def update(self, user_id: UUID, user_in: UserUpdate) -> User:
@@ -93,9 +108,11 @@ class UserService:
 
         update_data = user_in.model_dump(exclude_unset=True)
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
 
-        return await user_repo.update(self.db, db_user=user, update_data=update_data)
+        user = await user_repo.update(self.db, db_user=user, update_data=update_data)
+        user_cache.invalidate_on_commit(self.db, user.id)
+        return user
 
     async def delete(self, user_id: UUID) -> User:
         """Delete user.
@@ -109,6 +126,7 @@ class UserService:
                 message="User not found",
                 details={"user_id": str(user_id)},
             )
+        user_cache.invalidate_on_commit(self.db, user.id)
         return user
 
 {%- if cookiecutter.enable_oauth %}
@@ -154,7 +172,8 @@ Contains business logic for user operations. Uses UserRepository for database ac
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import AlreadyExistsError, AuthenticationError, NotFoundError
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, password_needs_rehash, verify_password
+from app.core.user_cache import user_cache
 from app.db.models.user import User
 from app.repositories import user_repo
 from app.schemas.user import UserCreate, UserUpdate
@@ -218,14 +237,24 @@ class UserService:
     def authenticate(self, email: str, password: str) -> User:
         """Authenticate user by email and password.
 
+        The stored hash is upgraded if the hashing settings changed since it was made.
+
         Raises:
             AuthenticationError: If credentials are invalid or user is inactive.
         """
         user = user_repo.get_by_email(self.db, email)
-        if not user or not verify_password(password, user.hashed_password):
+        if (
+            not user
+            or not user.hashed_password
+            or not verify_password(password, user.hashed_password)
+        ):
             raise AuthenticationError(message="Invalid email or password")
         if not user.is_active:
             raise AuthenticationError(message="User account is disabled")
+        if password_needs_rehash(user.hashed_password):
+            hashed_password = get_password_hash(password)
+            user = user_repo.update(self.db, db_user=user, update_data={"hashed_password": hashed_password})
+            user_cache.invalidate_on_commit(self.db, user.id)
         return user
 
     def update(self, user_id: str, user_in: UserUpdate) -> User:
@@ -240,7 +269,9 @@ class UserService:
         if "password" in update_data:
             update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
 
-        return user_repo.update(self.db, db_user=user, update_data=update_data)
+        user = user_repo.update(self.db, db_user=user, update_data=update_data)
+        user_cache.invalidate_on_commit(self.db, user.id)
+        return user
 
     def delete(self, user_id: str) -> User:
         """Delete user.
@@ -254,6 +285,7 @@ class UserService:
                 message="User not found",
                 details={"user_id": user_id},
             )
+        user_cache.invalidate_on_commit(self.db, user.id)
         return user
 
 {%- if cookiecutter.enable_oauth %}
@@ -297,7 +329,12 @@ Contains business logic for user operations. Uses UserRepository for database ac
 """
 
 from app.core.exceptions import AlreadyExistsError, AuthenticationError, NotFoundError
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from app.core.user_cache import user_cache
 from app.db.models.user import User
 from app.repositories import user_repo
 from app.schemas.user import UserCreate, UserUpdate
@@ -346,7 +383,7 @@ class UserService:
                 details={"email": user_in.email},
             )
 
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await get_password_hash_async(user_in.password)
         return await user_repo.create(
             email=user_in.email,
             hashed_password=hashed_password,
@@ -357,14 +394,23 @@ class UserService:
     async def authenticate(self, email: str, password: str) -> User:
         """Authenticate user by email and password.
 
+        The stored hash is upgraded if the hashing settings changed since it was made.
+
         Raises:
             AuthenticationError: If credentials are invalid or user is inactive.
         """
         user = await user_repo.get_by_email(email)
-        if not user or not verify_password(password, user.hashed_password):
+        if (
+            not user
+            or not user.hashed_password
+            or not await verify_password_async(password, user.hashed_password)
+        ):
             raise AuthenticationError(message="Invalid email or password")
         if not user.is_active:
             raise AuthenticationError(message="User account is disabled")
+        if password_needs_rehash(user.hashed_password):
+            hashed_password = await get_password_hash_async(password)
+            user = await user_repo.update(db_user=user, update_data={"hashed_password": hashed_password})
         return user
 
     async def update(self, user_id: str, user_in: UserUpdate) -> User:
@@ -377,9 +423,11 @@ class UserService:
 
         update_data = user_in.model_dump(exclude_unset=True)
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
 
-        return await user_repo.update(db_user=user, update_data=update_data)
+        user = await user_repo.update(db_user=user, update_data=update_data)
+        await user_cache.invalidate(user.id)
+        return user
 
     async def delete(self, user_id: str) -> User:
         """Delete user.
@@ -393,6 +441,7 @@ class UserService:
                 message="User not found",
                 details={"user_id": user_id},
             )
+        await user_cache.invalidate(user.id)
         return user
 
 {%- if cookiecutter.enable_oauth %}
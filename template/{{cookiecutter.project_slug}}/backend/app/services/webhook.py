@@ -5,18 +5,73 @@
 import hashlib
 import hmac
 import json
+import random
 import secrets
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
-import httpx
 import logfire
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.clients.webhook import webhook_client
+{%- if cookiecutter.enable_caching %}
+from app.core.cache import cached, invalidates
+{%- endif %}
+from app.core.config import settings
 from app.core.exceptions import NotFoundError
-from app.db.models.webhook import Webhook, WebhookDelivery
+from app.core.pagination import decode_cursor, next_page_cursor
+from app.db.models.webhook import Webhook, WebhookDelivery, WebhookDeliveryStatus
 from app.repositories import webhook_repo
-from app.schemas.webhook import WebhookCreate, WebhookUpdate
+from app.schemas.webhook import WebhookCreate, {% if cookiecutter.enable_caching %}WebhookRead, {% endif %}WebhookUpdate
+from app.services.webhook_queue import enqueue_on_commit
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds to wait after the given (1-based) failed attempt.
+
+    Exponential backoff from ``WEBHOOK_RETRY_BASE_DELAY`` capped at
+    ``WEBHOOK_RETRY_MAX_DELAY``. Half of the delay is random jitter, so
+    deliveries that failed together are not retried together.
+    """
+    delay: float = min(
+        settings.WEBHOOK_RETRY_MAX_DELAY,
+        settings.WEBHOOK_RETRY_BASE_DELAY * 2 ** (attempt - 1),
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _is_due(delivery: WebhookDelivery, now: datetime) -> bool:
+    """Whether a delivery is unfinished and its next attempt is due."""
+    if delivery.status not in (
+        WebhookDeliveryStatus.PENDING.value,
+        WebhookDeliveryStatus.RETRYING.value,
+    ):
+        return False
+    # Tolerate a little clock skew between the enqueuing process and the worker
+    due_at = delivery.next_attempt_at
+    return due_at is None or due_at <= now + timedelta(seconds=1)
+
+
+def _schedule_next_attempt(delivery: WebhookDelivery, now: datetime) -> float | None:
+    """Record an attempt's outcome on the delivery.
+
+    Returns:
+        Seconds until the next attempt, or ``None`` if the delivery is finished.
+    """
+    if delivery.success:
+        delivery.status = WebhookDeliveryStatus.DELIVERED.value
+        delivery.next_attempt_at = None
+        return None
+
+    if delivery.attempt_count >= settings.WEBHOOK_MAX_ATTEMPTS:
+        delivery.status = WebhookDeliveryStatus.DEAD.value
+        delivery.next_attempt_at = None
+        return None
+
+    delay = retry_delay(delivery.attempt_count)
+    delivery.status = WebhookDeliveryStatus.RETRYING.value
+    delivery.next_attempt_at = now + timedelta(seconds=delay)
+    return delay
 
 
 class WebhookService:
@@ -25,7 +80,8 @@ class WebhookService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_webhook(
+    {% if cookiecutter.enable_caching %}@invalidates("webhooks")
+    {% endif %}async def create_webhook(
         self,
         data: WebhookCreate,
         user_id: UUID | None = None,
@@ -51,18 +107,27 @@ class WebhookService:
             raise NotFoundError(message="Webhook not found")
         return webhook
 
-    async def list_webhooks(
+    {% if cookiecutter.enable_caching %}@cached(model=tuple[list[WebhookRead], int | None], tags=["webhooks"])
+    {% endif %}async def list_webhooks(
         self,
         user_id: UUID | None = None,
         skip: int = 0,
         limit: int = 50,
     ) -> tuple[list[Webhook], int]:
-        """List webhooks, optionally filtered by user."""
+        """List webhooks, optionally filtered by user.{% if cookiecutter.enable_caching %}
+
+        Cached: hits return ``WebhookRead`` instances.{% endif %}
+        """
         return await webhook_repo.get_list(
-            self.db, user_id=user_id, skip=skip, limit=limit
+            self.db,
+            user_id=user_id,
+            skip=skip,
+            limit=limit,
+            total=settings.PAGINATION_TOTAL_MODE,
         )
 
-    async def update_webhook(
+    {% if cookiecutter.enable_caching %}@invalidates("webhooks")
+    {% endif %}async def update_webhook(
         self,
         webhook_id: UUID,
         data: WebhookUpdate,
@@ -71,12 +136,14 @@ class WebhookService:
         webhook = await self.get_webhook(webhook_id)
         return await webhook_repo.update(self.db, webhook, data)
 
-    async def delete_webhook(self, webhook_id: UUID) -> None:
+    {% if cookiecutter.enable_caching %}@invalidates("webhooks")
+    {% endif %}async def delete_webhook(self, webhook_id: UUID) -> None:
         """Delete a webhook."""
         webhook = await self.get_webhook(webhook_id)
         await webhook_repo.delete(self.db, webhook)
 
-    async def regenerate_secret(self, webhook_id: UUID) -> str:
+    {% if cookiecutter.enable_caching %}@invalidates("webhooks")
+    {% endif %}async def regenerate_secret(self, webhook_id: UUID) -> str:
         """Regenerate the webhook secret."""
         webhook = await self.get_webhook(webhook_id)
         new_secret = secrets.token_urlsafe(32)
@@ -100,27 +167,111 @@ class WebhookService:
         self,
         event_type: str,
         data: dict,
-    ) -> None:
-        """Dispatch an event to all subscribed webhooks."""
-        webhooks = await webhook_repo.get_by_event(self.db, event_type)
+    ) -> list[UUID]:
+        """Queue an event for delivery to all subscribed webhooks.
+
+        One pending delivery is stored per subscriber and handed to the
+        delivery queue once the session commits; sending and retrying happen
+        in the background, so the caller never waits on subscriber endpoints.
+
+        Returns:
+            IDs of the queued deliveries.
+        """
+        webhook_ids = await webhook_repo.get_ids_by_event(self.db, event_type)
+        if not webhook_ids:
+            return []
 
         payload = {
             "event": event_type,
             "timestamp": datetime.now(UTC).isoformat(),
             "data": data,
         }
+        payload_json = json.dumps(payload, default=str)
+
+        now = datetime.now(UTC)
+        deliveries = [
+            WebhookDelivery(
+                webhook_id=webhook_id,
+                event_type=event_type,
+                payload=payload_json,
+                next_attempt_at=now,
+            )
+            for webhook_id in webhook_ids
+        ]
+        self.db.add_all(deliveries)
+        await self.db.flush()
+
+        delivery_ids = [delivery.id for delivery in deliveries]
+        # Enqueued once the caller commits; the request's session owns the transaction
+        enqueue_on_commit(self.db, [str(delivery_id) for delivery_id in delivery_ids])
+        return delivery_ids
+
+    async def process_delivery(self, delivery_id: UUID) -> float | None:
+        """Make one attempt at a queued delivery.
+
+        Updates the delivery status and the webhook's circuit breaker. The
+        delivery is claimed and committed before the request is sent, so no
+        row lock is held while waiting on the subscriber; call this with a
+        session of its own.
+
+        Returns:
+            Seconds until the next attempt, or ``None`` if there is nothing
+            left to do (delivered, dead-lettered, not due yet, or being
+            processed by another job).
+        """
+        delivery = await webhook_repo.get_delivery_for_update(self.db, delivery_id)
+        now = datetime.now(UTC)
+        if delivery is None or not _is_due(delivery, now):
+            return None
+
+        webhook = await webhook_repo.get_by_id(self.db, delivery.webhook_id)
+        if webhook is None or not webhook.is_active:
+            delivery.status = WebhookDeliveryStatus.DEAD.value
+            delivery.next_attempt_at = None
+            delivery.error_message = "Webhook is inactive"
+            await self.db.flush()
+            return None
+
+        if webhook.circuit_open_until is not None and webhook.circuit_open_until > now:
+            # Postpone without using up an attempt
+            delivery.status = WebhookDeliveryStatus.RETRYING.value
+            delivery.next_attempt_at = webhook.circuit_open_until
+            await self.db.flush()
+            return (webhook.circuit_open_until - now).total_seconds()
+
+        # Claim the attempt: other jobs and the sweep see the delivery as not
+        # due until the claim expires, which also recovers it if this worker dies
+        delivery.next_attempt_at = now + timedelta(seconds=2 * settings.WEBHOOK_TIMEOUT)
+        await self.db.commit()
+
+        await self._send(webhook, delivery)
+        await self._record_outcome(webhook, delivery, now)
+        delay = _schedule_next_attempt(delivery, now)
+        await self.db.flush()
+        return delay
+
+    async def _record_outcome(
+        self, webhook: Webhook, delivery: WebhookDelivery, now: datetime
+    ) -> None:
+        """Update the webhook's circuit breaker after an attempt."""
+        if not delivery.success:
+            # Counted in the database, so concurrent failures are not lost
+            await webhook_repo.record_failure(
+                self.db,
+                webhook.id,
+                threshold=settings.WEBHOOK_CIRCUIT_FAILURE_THRESHOLD,
+                open_until=now + timedelta(seconds=settings.WEBHOOK_CIRCUIT_RESET_TIMEOUT),
+            )
+        elif webhook.consecutive_failures or webhook.circuit_open_until is not None:
+            await webhook_repo.reset_failures(self.db, webhook.id)
+
+    async def get_due_delivery_ids(self, *, grace: float = 0.0) -> list[UUID]:
+        """Get unfinished deliveries that are overdue by more than ``grace`` seconds.
 
-        for webhook in webhooks:
-            # In production, you'd want to queue this for background processing
-            try:
-                await self._deliver(webhook, event_type, payload)
-            except Exception as e:
-                logfire.error(
-                    "Webhook delivery failed",
-                    webhook_id=str(webhook.id),
-                    event_type=event_type,
-                    error=str(e),
-                )
+        Used by the periodic sweep to re-enqueue deliveries whose job was lost.
+        """
+        before = datetime.now(UTC) - timedelta(seconds=grace)
+        return await webhook_repo.get_due_delivery_ids(self.db, before=before)
 
     async def _deliver(
         self,
@@ -128,38 +279,53 @@ class WebhookService:
         event_type: str,
         payload: dict,
     ) -> dict:
-        """Deliver a payload to a webhook with HMAC signature."""
-        payload_json = json.dumps(payload, default=str)
-
-        # Create HMAC signature
-        signature = self._create_signature(webhook.secret, payload_json)
-
-        headers = {
-            "Content-Type": "application/json",
-            "X-Webhook-Signature": signature,
-            "X-Webhook-Event": event_type,
-        }
-
+        """Deliver a payload to a webhook right away, without retries."""
         delivery = WebhookDelivery(
             webhook_id=webhook.id,
             event_type=event_type,
-            payload=payload_json,
+            payload=json.dumps(payload, default=str),
         )
         self.db.add(delivery)
         await self.db.flush()
 
+        await self._send(webhook, delivery)
+        delivery.status = (
+            WebhookDeliveryStatus.DELIVERED.value
+            if delivery.success
+            else WebhookDeliveryStatus.DEAD.value
+        )
+        await self.db.flush()
+
+        return {
+            "success": delivery.success,
+            "status_code": delivery.response_status,
+            "message": delivery.error_message or "Delivered successfully",
+        }
+
+    async def _send(self, webhook: Webhook, delivery: WebhookDelivery) -> None:
+        """POST a delivery's payload and record the outcome on it (no DB I/O)."""
+        event_type = delivery.event_type
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Signature": self._create_signature(webhook.secret, delivery.payload),
+            "X-Webhook-Event": event_type,
+            # Stable across retries, so receivers can drop duplicates
+            "X-Webhook-Delivery": str(delivery.id),
+        }
+        delivery.attempt_count += 1
+
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    webhook.url,
-                    content=payload_json,
-                    headers=headers,
-                )
+            response = await webhook_client.post(
+                webhook.url,
+                content=delivery.payload,
+                headers=headers,
+            )
 
             delivery.response_status = response.status_code
             delivery.response_body = response.text[:10000]  # Limit size
             delivery.success = 200 <= response.status_code < 300
             delivery.delivered_at = datetime.now(UTC)
+            delivery.error_message = None
 
             logfire.info(
                 "Webhook delivered",
@@ -180,14 +346,6 @@ class WebhookService:
                 error=str(e),
             )
 
-        await self.db.flush()
-
-        return {
-            "success": delivery.success,
-            "status_code": delivery.response_status,
-            "message": delivery.error_message or "Delivered successfully",
-        }
-
     def _create_signature(self, secret: str, payload: str) -> str:
         """Create HMAC-SHA256 signature for the payload."""
         signature = hmac.new(
@@ -203,11 +361,27 @@ class WebhookService:
         *,
         skip: int = 0,
         limit: int = 50,
-    ) -> tuple[list[WebhookDelivery], int]:
-        """Get delivery history for a webhook."""
+        cursor: str | None = None,
+    ) -> tuple[list[WebhookDelivery], int | None, str | None]:
+        """Get delivery history for a webhook, newest first.
+
+        Returns:
+            Tuple of (deliveries, total, next_cursor). ``total`` is ``None``
+            when paginating with ``cursor``.
+        """
         # Verify webhook exists
         await self.get_webhook(webhook_id)
-        return await webhook_repo.get_deliveries(self.db, webhook_id, skip=skip, limit=limit)
+        after = decode_cursor(cursor, datetime, UUID) if cursor else None
+        deliveries, total = await webhook_repo.get_deliveries(
+            self.db,
+            webhook_id,
+            skip=skip,
+            limit=limit + 1,
+            after=after,
+            total=settings.PAGINATION_TOTAL_MODE,
+        )
+        deliveries, next_cursor = next_page_cursor(deliveries, limit, lambda d: (d.created_at, d.id))
+        return deliveries, total, next_cursor
 
     @staticmethod
     def verify_signature(secret: str, payload: str, signature: str) -> bool:
@@ -227,17 +401,74 @@ class WebhookService:
 import hashlib
 import hmac
 import json
+import random
 import secrets
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
-import httpx
 import logfire
 from sqlalchemy.orm import Session as DBSession
 
+from app.clients.webhook import webhook_client
+from app.core.config import settings
 from app.core.exceptions import NotFoundError
-from app.db.models.webhook import Webhook, WebhookDelivery
+from app.core.pagination import decode_cursor, next_page_cursor
+from app.db.models.webhook import Webhook, WebhookDelivery, WebhookDeliveryStatus
 from app.repositories import webhook_repo
 from app.schemas.webhook import WebhookCreate, WebhookUpdate
+from app.services.webhook_queue import enqueue_on_commit
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds to wait after the given (1-based) failed attempt.
+
+    Exponential backoff from ``WEBHOOK_RETRY_BASE_DELAY`` capped at
+    ``WEBHOOK_RETRY_MAX_DELAY``. Half of the delay is random jitter, so
+    deliveries that failed together are not retried together.
+    """
+    delay: float = min(
+        settings.WEBHOOK_RETRY_MAX_DELAY,
+        settings.WEBHOOK_RETRY_BASE_DELAY * 2 ** (attempt - 1),
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, the way SQLite stores it."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _is_due(delivery: WebhookDelivery, now: datetime) -> bool:
+    """Whether a delivery is unfinished and its next attempt is due."""
+    if delivery.status not in (
+        WebhookDeliveryStatus.PENDING.value,
+        WebhookDeliveryStatus.RETRYING.value,
+    ):
+        return False
+    # Tolerate a little clock skew between the enqueuing process and the worker
+    due_at = delivery.next_attempt_at
+    return due_at is None or due_at <= now + timedelta(seconds=1)
+
+
+def _schedule_next_attempt(delivery: WebhookDelivery, now: datetime) -> float | None:
+    """Record an attempt's outcome on the delivery.
+
+    Returns:
+        Seconds until the next attempt, or ``None`` if the delivery is finished.
+    """
+    if delivery.success:
+        delivery.status = WebhookDeliveryStatus.DELIVERED.value
+        delivery.next_attempt_at = None
+        return None
+
+    if delivery.attempt_count >= settings.WEBHOOK_MAX_ATTEMPTS:
+        delivery.status = WebhookDeliveryStatus.DEAD.value
+        delivery.next_attempt_at = None
+        return None
+
+    delay = retry_delay(delivery.attempt_count)
+    delivery.status = WebhookDeliveryStatus.RETRYING.value
+    delivery.next_attempt_at = now + timedelta(seconds=delay)
+    return delay
 
 
 class WebhookService:
@@ -300,26 +531,100 @@ class WebhookService:
         self,
         event_type: str,
         data: dict,
-    ) -> None:
-        """Dispatch an event to all subscribed webhooks."""
-        webhooks = webhook_repo.get_by_event(self.db, event_type)
+    ) -> list[str]:
+        """Queue an event for delivery to all subscribed webhooks.
+
+        One pending delivery is stored per subscriber and handed to the
+        delivery queue once the session commits; sending and retrying happen
+        in the background, so the caller never waits on subscriber endpoints.
+
+        Returns:
+            IDs of the queued deliveries.
+        """
+        webhook_ids = webhook_repo.get_ids_by_event(self.db, event_type)
+        if not webhook_ids:
+            return []
 
         payload = {
             "event": event_type,
             "timestamp": datetime.now(UTC).isoformat(),
             "data": data,
         }
+        payload_json = json.dumps(payload, default=str)
+
+        now = _utcnow()
+        deliveries = [
+            WebhookDelivery(
+                webhook_id=webhook_id,
+                event_type=event_type,
+                payload=payload_json,
+                next_attempt_at=now,
+            )
+            for webhook_id in webhook_ids
+        ]
+        self.db.add_all(deliveries)
+        self.db.flush()
+
+        delivery_ids = [delivery.id for delivery in deliveries]
+        # Enqueued once the caller commits; the request's session owns the transaction
+        enqueue_on_commit(self.db, delivery_ids)
+        return delivery_ids
+
+    def process_delivery(self, delivery_id: str) -> float | None:
+        """Make one attempt at a queued delivery.
+
+        Updates the delivery status and the webhook's circuit breaker.
+
+        Returns:
+            Seconds until the next attempt, or ``None`` if there is nothing
+            left to do (delivered, dead-lettered or not due yet).
+        """
+        delivery = webhook_repo.get_delivery_by_id(self.db, delivery_id)
+        now = _utcnow()
+        if delivery is None or not _is_due(delivery, now):
+            return None
+
+        webhook = webhook_repo.get_by_id(self.db, delivery.webhook_id)
+        if webhook is None or not webhook.is_active:
+            delivery.status = WebhookDeliveryStatus.DEAD.value
+            delivery.next_attempt_at = None
+            delivery.error_message = "Webhook is inactive"
+            self.db.flush()
+            return None
+
+        if webhook.circuit_open_until is not None and webhook.circuit_open_until > now:
+            # Postpone without using up an attempt
+            delivery.status = WebhookDeliveryStatus.RETRYING.value
+            delivery.next_attempt_at = webhook.circuit_open_until
+            self.db.flush()
+            return (webhook.circuit_open_until - now).total_seconds()
+
+        self._send(webhook, delivery)
+        self._record_outcome(webhook, delivery, now)
+        delay = _schedule_next_attempt(delivery, now)
+        self.db.flush()
+        return delay
+
+    def _record_outcome(self, webhook: Webhook, delivery: WebhookDelivery, now: datetime) -> None:
+        """Update the webhook's circuit breaker after an attempt."""
+        if not delivery.success:
+            # Counted in the database, so concurrent failures are not lost
+            webhook_repo.record_failure(
+                self.db,
+                webhook.id,
+                threshold=settings.WEBHOOK_CIRCUIT_FAILURE_THRESHOLD,
+                open_until=now + timedelta(seconds=settings.WEBHOOK_CIRCUIT_RESET_TIMEOUT),
+            )
+        elif webhook.consecutive_failures or webhook.circuit_open_until is not None:
+            webhook_repo.reset_failures(self.db, webhook.id)
+
+    def get_due_delivery_ids(self, *, grace: float = 0.0) -> list[str]:
+        """Get unfinished deliveries that are overdue by more than ``grace`` seconds.
 
-        for webhook in webhooks:
-            try:
-                self._deliver(webhook, event_type, payload)
-            except Exception as e:
-                logfire.error(
-                    "Webhook delivery failed",
-                    webhook_id=str(webhook.id),
-                    event_type=event_type,
-                    error=str(e),
-                )
+        Used by the periodic sweep to re-enqueue deliveries whose job was lost.
+        """
+        before = _utcnow() - timedelta(seconds=grace)
+        return webhook_repo.get_due_delivery_ids(self.db, before=before)
 
     def _deliver(
         self,
@@ -327,48 +632,72 @@ class WebhookService:
         event_type: str,
         payload: dict,
     ) -> dict:
-        """Deliver a payload to a webhook with HMAC signature."""
-        payload_json = json.dumps(payload, default=str)
-        signature = self._create_signature(webhook.secret, payload_json)
-
-        headers = {
-            "Content-Type": "application/json",
-            "X-Webhook-Signature": signature,
-            "X-Webhook-Event": event_type,
-        }
-
+        """Deliver a payload to a webhook right away, without retries."""
         delivery = WebhookDelivery(
             webhook_id=webhook.id,
             event_type=event_type,
-            payload=payload_json,
+            payload=json.dumps(payload, default=str),
         )
         self.db.add(delivery)
         self.db.flush()
 
+        self._send(webhook, delivery)
+        delivery.status = (
+            WebhookDeliveryStatus.DELIVERED.value
+            if delivery.success
+            else WebhookDeliveryStatus.DEAD.value
+        )
+        self.db.flush()
+
+        return {
+            "success": delivery.success,
+            "status_code": delivery.response_status,
+            "message": delivery.error_message or "Delivered successfully",
+        }
+
+    def _send(self, webhook: Webhook, delivery: WebhookDelivery) -> None:
+        """POST a delivery's payload and record the outcome on it (no DB I/O)."""
+        event_type = delivery.event_type
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Signature": self._create_signature(webhook.secret, delivery.payload),
+            "X-Webhook-Event": event_type,
+            # Stable across retries, so receivers can drop duplicates
+            "X-Webhook-Delivery": str(delivery.id),
+        }
+        delivery.attempt_count += 1
+
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    webhook.url,
-                    content=payload_json,
-                    headers=headers,
-                )
+            response = webhook_client.post(
+                webhook.url,
+                content=delivery.payload,
+                headers=headers,
+            )
 
             delivery.response_status = response.status_code
             delivery.response_body = response.text[:10000]
             delivery.success = 200 <= response.status_code < 300
             delivery.delivered_at = datetime.now(UTC)
+            delivery.error_message = None
+
+            logfire.info(
+                "Webhook delivered",
+                webhook_id=str(webhook.id),
+                event_type=event_type,
+                status_code=response.status_code,
+                success=delivery.success,
+            )
 
         except Exception as e:
             delivery.error_message = str(e)
             delivery.success = False
 
-        self.db.flush()
-
-        return {
-            "success": delivery.success,
-            "status_code": delivery.response_status,
-            "message": delivery.error_message or "Delivered successfully",
-        }
+            logfire.error(
+                "Webhook delivery error",
+                webhook_id=str(webhook.id),
+                event_type=event_type,
+                error=str(e),
+            )
 
     def _create_signature(self, secret: str, payload: str) -> str:
         """Create HMAC-SHA256 signature for the payload."""
@@ -385,29 +714,99 @@ class WebhookService:
         *,
         skip: int = 0,
         limit: int = 50,
-    ) -> tuple[list[WebhookDelivery], int]:
-        """Get delivery history for a webhook."""
+        cursor: str | None = None,
+    ) -> tuple[list[WebhookDelivery], int | None, str | None]:
+        """Get delivery history for a webhook, newest first.
+
+        Returns:
+            Tuple of (deliveries, total, next_cursor). ``total`` is ``None``
+            when paginating with ``cursor``.
+        """
         # Verify webhook exists
         self.get_webhook(webhook_id)
-        return webhook_repo.get_deliveries(self.db, webhook_id, skip=skip, limit=limit)
+        after = decode_cursor(cursor, datetime, str) if cursor else None
+        deliveries, total = webhook_repo.get_deliveries(
+            self.db, webhook_id, skip=skip, limit=limit + 1, after=after
+        )
+        deliveries, next_cursor = next_page_cursor(deliveries, limit, lambda d: (d.created_at, d.id))
+        return deliveries, total, next_cursor
 
 
 {%- elif cookiecutter.use_mongodb %}
 """Webhook service (MongoDB)."""
 
+import asyncio
 import hashlib
 import hmac
 import json
+import random
 import secrets
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
-import httpx
 import logfire
+from beanie import PydanticObjectId
 
+from app.clients.webhook import webhook_client
+from app.core.config import settings
 from app.core.exceptions import NotFoundError
-from app.db.models.webhook import Webhook, WebhookDelivery
+from app.core.pagination import decode_cursor, next_page_cursor
+from app.db.models.webhook import Webhook, WebhookDelivery, WebhookDeliveryStatus
 from app.repositories import webhook_repo
 from app.schemas.webhook import WebhookCreate, WebhookUpdate
+from app.services.webhook_queue import enqueue_deliveries
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds to wait after the given (1-based) failed attempt.
+
+    Exponential backoff from ``WEBHOOK_RETRY_BASE_DELAY`` capped at
+    ``WEBHOOK_RETRY_MAX_DELAY``. Half of the delay is random jitter, so
+    deliveries that failed together are not retried together.
+    """
+    delay: float = min(
+        settings.WEBHOOK_RETRY_MAX_DELAY,
+        settings.WEBHOOK_RETRY_BASE_DELAY * 2 ** (attempt - 1),
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, the way MongoDB returns it."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _is_due(delivery: WebhookDelivery, now: datetime) -> bool:
+    """Whether a delivery is unfinished and its next attempt is due."""
+    if delivery.status not in (
+        WebhookDeliveryStatus.PENDING.value,
+        WebhookDeliveryStatus.RETRYING.value,
+    ):
+        return False
+    # Tolerate a little clock skew between the enqueuing process and the worker
+    due_at = delivery.next_attempt_at
+    return due_at is None or due_at <= now + timedelta(seconds=1)
+
+
+def _schedule_next_attempt(delivery: WebhookDelivery, now: datetime) -> float | None:
+    """Record an attempt's outcome on the delivery.
+
+    Returns:
+        Seconds until the next attempt, or ``None`` if the delivery is finished.
+    """
+    if delivery.success:
+        delivery.status = WebhookDeliveryStatus.DELIVERED.value
+        delivery.next_attempt_at = None
+        return None
+
+    if delivery.attempt_count >= settings.WEBHOOK_MAX_ATTEMPTS:
+        delivery.status = WebhookDeliveryStatus.DEAD.value
+        delivery.next_attempt_at = None
+        return None
+
+    delay = retry_delay(delivery.attempt_count)
+    delivery.status = WebhookDeliveryStatus.RETRYING.value
+    delivery.next_attempt_at = now + timedelta(seconds=delay)
+    return delay
 
 
 class WebhookService:
@@ -464,26 +863,99 @@ class WebhookService:
         self,
         event_type: str,
         data: dict,
-    ) -> None:
-        """Dispatch an event to all subscribed webhooks."""
-        webhooks = await webhook_repo.get_by_event(event_type)
+    ) -> list[str]:
+        """Queue an event for delivery to all subscribed webhooks.
+
+        One pending delivery is stored per subscriber and handed to the
+        delivery queue; sending and retrying happen in the background, so the
+        caller never waits on subscriber endpoints.
+
+        Returns:
+            IDs of the queued deliveries.
+        """
+        webhook_ids = await webhook_repo.get_ids_by_event(event_type)
+        if not webhook_ids:
+            return []
 
         payload = {
             "event": event_type,
             "timestamp": datetime.now(UTC).isoformat(),
             "data": data,
         }
+        payload_json = json.dumps(payload, default=str)
 
-        for webhook in webhooks:
-            try:
-                await self._deliver(webhook, event_type, payload)
-            except Exception as e:
-                logfire.error(
-                    "Webhook delivery failed",
-                    webhook_id=str(webhook.id),
-                    event_type=event_type,
-                    error=str(e),
-                )
+        now = _utcnow()
+        deliveries = [
+            WebhookDelivery(
+                webhook_id=webhook_id,
+                event_type=event_type,
+                payload=payload_json,
+                next_attempt_at=now,
+            )
+            for webhook_id in webhook_ids
+        ]
+        # insert_many does not set document IDs, so insert one by one
+        await asyncio.gather(*(delivery.insert() for delivery in deliveries))
+
+        delivery_ids = [str(delivery.id) for delivery in deliveries]
+        await enqueue_deliveries(delivery_ids)
+        return delivery_ids
+
+    async def process_delivery(self, delivery_id: str) -> float | None:
+        """Make one attempt at a queued delivery.
+
+        Updates the delivery status and the webhook's circuit breaker.
+
+        Returns:
+            Seconds until the next attempt, or ``None`` if there is nothing
+            left to do (delivered, dead-lettered or not due yet).
+        """
+        delivery = await webhook_repo.get_delivery_by_id(delivery_id)
+        now = _utcnow()
+        if delivery is None or not _is_due(delivery, now):
+            return None
+
+        webhook = await webhook_repo.get_by_id(delivery.webhook_id)
+        if webhook is None or not webhook.is_active:
+            delivery.status = WebhookDeliveryStatus.DEAD.value
+            delivery.next_attempt_at = None
+            delivery.error_message = "Webhook is inactive"
+            await delivery.save()
+            return None
+
+        if webhook.circuit_open_until is not None and webhook.circuit_open_until > now:
+            # Postpone without using up an attempt
+            delivery.status = WebhookDeliveryStatus.RETRYING.value
+            delivery.next_attempt_at = webhook.circuit_open_until
+            await delivery.save()
+            return (webhook.circuit_open_until - now).total_seconds()
+
+        await self._send(webhook, delivery)
+        delay = _schedule_next_attempt(delivery, now)
+        await asyncio.gather(delivery.save(), self._record_outcome(webhook, delivery, now))
+        return delay
+
+    async def _record_outcome(
+        self, webhook: Webhook, delivery: WebhookDelivery, now: datetime
+    ) -> None:
+        """Update the webhook's circuit breaker after an attempt."""
+        if not delivery.success:
+            # Counted in the database, so concurrent failures are not lost
+            await webhook_repo.record_failure(
+                str(webhook.id),
+                threshold=settings.WEBHOOK_CIRCUIT_FAILURE_THRESHOLD,
+                open_until=now + timedelta(seconds=settings.WEBHOOK_CIRCUIT_RESET_TIMEOUT),
+            )
+        elif webhook.consecutive_failures or webhook.circuit_open_until is not None:
+            await webhook_repo.reset_failures(str(webhook.id))
+
+    async def get_due_delivery_ids(self, *, grace: float = 0.0) -> list[str]:
+        """Get unfinished deliveries that are overdue by more than ``grace`` seconds.
+
+        Used by the periodic sweep to re-enqueue deliveries whose job was lost.
+        """
+        before = _utcnow() - timedelta(seconds=grace)
+        return await webhook_repo.get_due_delivery_ids(before=before)
 
     async def _deliver(
         self,
@@ -491,47 +963,71 @@ class WebhookService:
         event_type: str,
         payload: dict,
     ) -> dict:
-        """Deliver a payload to a webhook with HMAC signature."""
-        payload_json = json.dumps(payload, default=str)
-        signature = self._create_signature(webhook.secret, payload_json)
-
-        headers = {
-            "Content-Type": "application/json",
-            "X-Webhook-Signature": signature,
-            "X-Webhook-Event": event_type,
-        }
-
+        """Deliver a payload to a webhook right away, without retries."""
         delivery = WebhookDelivery(
             webhook_id=str(webhook.id),
             event_type=event_type,
-            payload=payload_json,
+            payload=json.dumps(payload, default=str),
         )
         await delivery.insert()
 
+        await self._send(webhook, delivery)
+        delivery.status = (
+            WebhookDeliveryStatus.DELIVERED.value
+            if delivery.success
+            else WebhookDeliveryStatus.DEAD.value
+        )
+        await delivery.save()
+
+        return {
+            "success": delivery.success,
+            "status_code": delivery.response_status,
+            "message": delivery.error_message or "Delivered successfully",
+        }
+
+    async def _send(self, webhook: Webhook, delivery: WebhookDelivery) -> None:
+        """POST a delivery's payload and record the outcome on it (no DB I/O)."""
+        event_type = delivery.event_type
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Signature": self._create_signature(webhook.secret, delivery.payload),
+            "X-Webhook-Event": event_type,
+            # Stable across retries, so receivers can drop duplicates
+            "X-Webhook-Delivery": str(delivery.id),
+        }
+        delivery.attempt_count += 1
+
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    webhook.url,
-                    content=payload_json,
-                    headers=headers,
-                )
+            response = await webhook_client.post(
+                webhook.url,
+                content=delivery.payload,
+                headers=headers,
+            )
 
             delivery.response_status = response.status_code
             delivery.response_body = response.text[:10000]
             delivery.success = 200 <= response.status_code < 300
             delivery.delivered_at = datetime.now(UTC)
+            delivery.error_message = None
+
+            logfire.info(
+                "Webhook delivered",
+                webhook_id=str(webhook.id),
+                event_type=event_type,
+                status_code=response.status_code,
+                success=delivery.success,
+            )
 
         except Exception as e:
             delivery.error_message = str(e)
             delivery.success = False
 
-        await delivery.save()
-
-        return {
-            "success": delivery.success,
-            "status_code": delivery.response_status,
-            "message": delivery.error_message or "Delivered successfully",
-        }
+            logfire.error(
+                "Webhook delivery error",
+                webhook_id=str(webhook.id),
+                event_type=event_type,
+                error=str(e),
+            )
 
     def _create_signature(self, secret: str, payload: str) -> str:
         """Create HMAC-SHA256 signature for the payload."""
@@ -548,11 +1044,22 @@ class WebhookService:
         *,
         skip: int = 0,
         limit: int = 50,
-    ) -> tuple[list[WebhookDelivery], int]:
-        """Get delivery history for a webhook."""
+        cursor: str | None = None,
+    ) -> tuple[list[WebhookDelivery], int | None, str | None]:
+        """Get delivery history for a webhook, newest first.
+
+        Returns:
+            Tuple of (deliveries, total, next_cursor). ``total`` is ``None``
+            when paginating with ``cursor``.
+        """
         # Verify webhook exists
         await self.get_webhook(webhook_id)
-        return await webhook_repo.get_deliveries(webhook_id, skip=skip, limit=limit)
+        after = decode_cursor(cursor, datetime, PydanticObjectId) if cursor else None
+        deliveries, total = await webhook_repo.get_deliveries(
+            webhook_id, skip=skip, limit=limit + 1, after=after
+        )
+        deliveries, next_cursor = next_page_cursor(deliveries, limit, lambda d: (d.created_at, d.id))
+        return deliveries, total, next_cursor
 
 
 {%- endif %}
@@ -0,0 +1,450 @@
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+{%- if cookiecutter.use_sqlite %}
+"""Background delivery queue for webhook events (sync).
+
+``WebhookService.dispatch_event`` stores one pending delivery per subscriber
+and passes the IDs to :func:`enqueue_on_commit`, which enqueues them once the
+caller's transaction commits. Each job makes one attempt via :func:`deliver`;
+a failed attempt is enqueued again after its backoff delay. Delivery state
+lives in the database, so jobs lost to a broker outage or a restart are picked
+up by :func:`retry_due_deliveries`, which runs every minute.
+{%- if cookiecutter.use_celery %}
+
+Jobs run on the Celery worker (``app.worker.tasks.webhooks``) and the sweep on
+Celery beat.
+{%- else %}
+
+Jobs run on a thread pool inside the application process, and the sweep on a
+background thread (see :func:`start`). This is fine for a single process;
+configure Celery for multi-process deployments.
+{%- endif %}
+"""
+
+{%- if not cookiecutter.use_celery %}
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+{%- endif %}
+
+import logfire
+from sqlalchemy.orm import Session
+
+from app.core.background import on_commit
+from app.db.session import get_db_context
+
+# Seconds between sweeps. A delivery must be overdue by this much before the
+# sweep enqueues it, so the sweep does not race a job that is about to run.
+SWEEP_INTERVAL = 60.0
+
+# Session.info key: delivery IDs to enqueue once the session commits
+_PENDING_KEY = "webhook_deliveries_to_enqueue"
+
+
+def enqueue_on_commit(db: Session, delivery_ids: list[str]) -> None:
+    """Enqueue deliveries once ``db`` commits.
+
+    Workers load deliveries in their own session, so a job enqueued before
+    the commit could miss its row, or send an event whose transaction is
+    later rolled back.
+    """
+    on_commit(db, _PENDING_KEY, enqueue_deliveries, *delivery_ids)
+
+
+def deliver(delivery_id: str) -> None:
+    """Make one delivery attempt and enqueue a retry if it failed."""
+    from app.services.webhook import WebhookService
+
+    with get_db_context() as db:
+        delay = WebhookService(db).process_delivery(delivery_id)
+    if delay is not None:
+        enqueue_delivery(delivery_id, delay=delay)
+
+
+def retry_due_deliveries() -> int:
+    """Enqueue deliveries that are overdue, e.g. after a lost job.
+
+    Returns:
+        Number of deliveries enqueued.
+    """
+    from app.services.webhook import WebhookService
+
+    with get_db_context() as db:
+        delivery_ids = WebhookService(db).get_due_delivery_ids(grace=SWEEP_INTERVAL)
+    enqueue_deliveries(delivery_ids)
+    return len(delivery_ids)
+
+
+def enqueue_deliveries(delivery_ids: list[str]) -> None:
+    """Enqueue a first attempt for each delivery.
+
+    Errors are logged rather than raised: the deliveries are already stored,
+    and the sweep enqueues them once the queue is reachable again.
+    """
+    for delivery_id in delivery_ids:
+        try:
+            enqueue_delivery(delivery_id)
+        except Exception as e:
+            logfire.error(
+                "Failed to enqueue webhook delivery",
+                delivery_id=delivery_id,
+                error=str(e),
+            )
+{%- if cookiecutter.use_celery %}
+
+
+def enqueue_delivery(delivery_id: str, *, delay: float = 0.0) -> None:
+    """Enqueue one delivery attempt, ``delay`` seconds from now."""
+    from app.worker.celery_app import celery_app
+
+    celery_app.send_task(
+        "app.worker.tasks.webhooks.deliver_webhook",
+        args=[delivery_id],
+        countdown=delay or None,
+    )
+
+
+def start() -> None:
+    """Nothing to start: Celery runs the jobs and the sweep."""
+
+
+def stop() -> None:
+    """Nothing to stop: pending jobs stay in the broker."""
+{%- else %}
+
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_timers: set[threading.Timer] = set()
+_stop_sweep = threading.Event()
+
+
+def enqueue_delivery(delivery_id: str, *, delay: float = 0.0) -> None:
+    """Run one delivery attempt on the delivery threads, ``delay`` seconds from now."""
+    if delay <= 0:
+        _submit(deliver, delivery_id)
+        return
+    timer = threading.Timer(delay, _fire_timer, args=(delivery_id,))
+    timer.daemon = True
+    with _lock:
+        _timers.add(timer)
+    timer.start()
+
+
+def start() -> None:
+    """Start the background thread that runs the sweep."""
+    _stop_sweep.clear()
+    threading.Thread(target=_sweep_forever, name="webhook-sweep", daemon=True).start()
+
+
+def stop() -> None:
+    """Stop the sweep and drop queued jobs.
+
+    Unfinished deliveries stay in the database and are enqueued by the sweep
+    after the next start.
+    """
+    global _executor
+    _stop_sweep.set()
+    with _lock:
+        timers, executor = list(_timers), _executor
+        _timers.clear()
+        _executor = None
+    for timer in timers:
+        timer.cancel()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(job: Callable[..., object], *args: object) -> None:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix="webhook-delivery")
+        executor = _executor
+    executor.submit(_run, job, *args)
+
+
+def _fire_timer(delivery_id: str) -> None:
+    timer = threading.current_thread()
+    if isinstance(timer, threading.Timer):
+        with _lock:
+            _timers.discard(timer)
+    _submit(deliver, delivery_id)
+
+
+def _sweep_forever() -> None:
+    while not _stop_sweep.wait(SWEEP_INTERVAL):
+        _run(retry_due_deliveries)
+
+
+def _run(job: Callable[..., object], *args: object) -> None:
+    try:
+        job(*args)
+    except Exception as e:
+        logfire.error("Webhook delivery job failed", job=job.__name__, error=str(e))
+{%- endif %}
+{%- else %}
+"""Background delivery queue for webhook events.
+
+``WebhookService.dispatch_event`` stores one pending delivery per subscriber
+and passes the IDs to {% if cookiecutter.use_postgresql %}:func:`enqueue_on_commit`, which enqueues them once the
+caller's transaction commits{% else %}:func:`enqueue_deliveries`{% endif %}. Each job makes one attempt via :func:`deliver`;
+a failed attempt is enqueued again after its backoff delay. Delivery state
+lives in the database, so jobs lost to a broker outage or a restart are picked
+up by :func:`retry_due_deliveries`, which runs every minute.
+{%- if cookiecutter.use_celery %}
+
+Jobs run on the Celery worker (``app.worker.tasks.webhooks``) and the sweep on
+Celery beat.
+{%- elif cookiecutter.use_taskiq %}
+
+Jobs run on the Taskiq worker (``app.worker.tasks.webhooks``) and the sweep on
+the Taskiq scheduler. The Redis list broker cannot delay messages, so retries
+are enqueued by the sweep once they are due.
+{%- elif cookiecutter.use_arq %}
+
+Jobs and the sweep run on the ARQ worker (``app.worker.arq_app``).
+{%- else %}
+
+Jobs run as tasks on the application's event loop, and the sweep alongside
+them (see :func:`start`). This is fine for a single process; configure a
+background worker for multi-process deployments.
+{%- endif %}
+"""
+
+import asyncio
+{%- if not (cookiecutter.use_celery or cookiecutter.use_taskiq or cookiecutter.use_arq) %}
+from collections.abc import Awaitable, Callable
+{%- endif %}
+{%- if cookiecutter.use_postgresql %}
+from uuid import UUID
+{%- endif %}
+
+import logfire
+{%- if cookiecutter.use_arq and not cookiecutter.use_celery and not cookiecutter.use_taskiq %}
+from arq import ArqRedis, create_pool
+{%- endif %}
+{%- if cookiecutter.use_postgresql %}
+from sqlalchemy.ext.asyncio import AsyncSession
+{%- endif %}
+{%- if cookiecutter.use_postgresql or not (cookiecutter.use_celery or cookiecutter.use_taskiq or cookiecutter.use_arq) %}
+
+from app.core.background import {% if cookiecutter.use_postgresql %}on_commit, {% endif %}spawn
+{%- endif %}
+{%- if cookiecutter.use_postgresql %}
+from app.db.session import get_db_context
+{%- endif %}
+
+# Seconds between sweeps. A delivery must be overdue by this much before the
+# sweep enqueues it, so the sweep does not race a job that is about to run.
+SWEEP_INTERVAL = 60.0
+{%- if cookiecutter.use_postgresql or not (cookiecutter.use_celery or cookiecutter.use_taskiq or cookiecutter.use_arq) %}
+
+_tasks: set[asyncio.Task[None]] = set()
+{%- endif %}
+{%- if cookiecutter.use_postgresql %}
+
+# Session.info key: delivery IDs to enqueue once the session commits
+_PENDING_KEY = "webhook_deliveries_to_enqueue"
+
+
+def enqueue_on_commit(db: AsyncSession, delivery_ids: list[str]) -> None:
+    """Enqueue deliveries once ``db`` commits.
+
+    Workers load deliveries in their own session, so a job enqueued before
+    the commit could miss its row, or send an event whose transaction is
+    later rolled back.
+    """
+    on_commit(db, _PENDING_KEY, _after_commit, *delivery_ids)
+
+
+def _after_commit(delivery_ids: list[str]) -> None:
+    spawn(enqueue_deliveries(delivery_ids), _tasks)
+{%- endif %}
+
+
+async def deliver(delivery_id: str) -> None:
+    """Make one delivery attempt and enqueue a retry if it failed."""
+    from app.services.webhook import WebhookService
+
+{%- if cookiecutter.use_postgresql %}
+
+    async with get_db_context() as db:
+        delay = await WebhookService(db).process_delivery(UUID(delivery_id))
+{%- else %}
+
+    delay = await WebhookService().process_delivery(delivery_id)
+{%- endif %}
+    if delay is not None:
+        await enqueue_delivery(delivery_id, delay=delay)
+
+
+async def retry_due_deliveries() -> int:
+    """Enqueue deliveries that are overdue, e.g. after a lost job.
+
+    Returns:
+        Number of deliveries enqueued.
+    """
+    from app.services.webhook import WebhookService
+
+{%- if cookiecutter.use_postgresql %}
+
+    async with get_db_context() as db:
+        delivery_ids = await WebhookService(db).get_due_delivery_ids(grace=SWEEP_INTERVAL)
+{%- else %}
+
+    delivery_ids = await WebhookService().get_due_delivery_ids(grace=SWEEP_INTERVAL)
+{%- endif %}
+    await enqueue_deliveries([str(delivery_id) for delivery_id in delivery_ids])
+    return len(delivery_ids)
+
+
+async def enqueue_deliveries(delivery_ids: list[str]) -> None:
+    """Enqueue a first attempt for each delivery.
+
+    Errors are logged rather than raised: the deliveries are already stored,
+    and the sweep enqueues them once the queue is reachable again.
+    """
+    results = await asyncio.gather(
+        *(enqueue_delivery(delivery_id) for delivery_id in delivery_ids),
+        return_exceptions=True,
+    )
+    for delivery_id, result in zip(delivery_ids, results, strict=True):
+        if isinstance(result, Exception):
+            logfire.error(
+                "Failed to enqueue webhook delivery",
+                delivery_id=delivery_id,
+                error=str(result),
+            )
+{%- if cookiecutter.use_celery %}
+
+
+async def enqueue_delivery(delivery_id: str, *, delay: float = 0.0) -> None:
+    """Enqueue one delivery attempt, ``delay`` seconds from now."""
+    from app.worker.celery_app import celery_app
+
+    # Publishing to the broker is blocking I/O
+    await asyncio.to_thread(
+        celery_app.send_task,
+        "app.worker.tasks.webhooks.deliver_webhook",
+        args=[delivery_id],
+        countdown=delay or None,
+    )
+
+
+async def start() -> None:
+    """Nothing to start: Celery runs the jobs and the sweep."""
+
+
+async def stop() -> None:
+    """Nothing to stop: pending jobs stay in the broker."""
+{%- elif cookiecutter.use_taskiq %}
+
+
+async def enqueue_delivery(delivery_id: str, *, delay: float = 0.0) -> None:
+    """Enqueue one delivery attempt.
+
+    Delayed attempts are not sent to the broker: the delivery's
+    ``next_attempt_at`` is already stored, and the sweep enqueues it when due.
+    """
+    if delay > 0:
+        return
+    from app.worker.tasks.webhooks import deliver_webhook
+
+    await deliver_webhook.kiq(delivery_id)
+
+
+async def start() -> None:
+    """Connect the Taskiq broker so this process can enqueue jobs."""
+    from app.worker.taskiq_app import broker
+
+    if not broker.is_worker_process:
+        await broker.startup()
+
+
+async def stop() -> None:
+    """Disconnect the Taskiq broker; pending jobs stay in Redis."""
+    from app.worker.taskiq_app import broker
+
+    if not broker.is_worker_process:
+        await broker.shutdown()
+{%- elif cookiecutter.use_arq %}
+
+
+_arq_pool: ArqRedis | None = None
+_arq_pool_lock = asyncio.Lock()
+
+
+async def enqueue_delivery(delivery_id: str, *, delay: float = 0.0) -> None:
+    """Enqueue one delivery attempt, ``delay`` seconds from now."""
+    pool = await _get_arq_pool()
+    await pool.enqueue_job("deliver_webhook", delivery_id, _defer_by=delay or None)
+
+
+async def start() -> None:
+    """Nothing to start: the ARQ pool is created on first use."""
+
+
+async def stop() -> None:
+    """Close the ARQ pool; pending jobs stay in Redis."""
+    global _arq_pool
+    pool, _arq_pool = _arq_pool, None
+    if pool is not None:
+        await pool.close()
+
+
+async def _get_arq_pool() -> ArqRedis:
+    global _arq_pool
+    async with _arq_pool_lock:
+        if _arq_pool is None:
+            from app.worker.arq_app import WorkerSettings
+
+            _arq_pool = await create_pool(WorkerSettings.redis_settings)
+        return _arq_pool
+{%- else %}
+
+
+async def enqueue_delivery(delivery_id: str, *, delay: float = 0.0) -> None:
+    """Run one delivery attempt on the event loop, ``delay`` seconds from now."""
+    spawn(_deliver_later(delivery_id, delay), _tasks)
+
+
+async def start() -> None:
+    """Start the sweep on the running event loop."""
+    spawn(_sweep_forever(), _tasks)
+
+
+async def stop() -> None:
+    """Cancel the sweep and queued jobs.
+
+    Unfinished deliveries stay in the database and are enqueued by the sweep
+    after the next start.
+    """
+    tasks = list(_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _deliver_later(delivery_id: str, delay: float) -> None:
+    if delay > 0:
+        await asyncio.sleep(delay)
+    await _run(deliver, delivery_id)
+
+
+async def _sweep_forever() -> None:
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        await _run(retry_due_deliveries)
+
+
+async def _run(job: Callable[..., Awaitable[object]], *args: object) -> None:
+    try:
+        await job(*args)
+    except Exception as e:
+        logfire.error("Webhook delivery job failed", job=job.__name__, error=str(e))
+{%- endif %}
+{%- endif %}
+{%- else %}
+"""Webhook delivery queue - not configured."""
+{%- endif %}
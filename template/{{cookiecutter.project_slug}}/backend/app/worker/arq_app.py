@@ -9,6 +9,9 @@ from arq import cron
 from arq.connections import RedisSettings
 
 from app.core.config import settings
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and not cookiecutter.use_sqlite %}
+from app.services import webhook_queue
+{%- endif %}
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,9 @@ async def shutdown(ctx: dict[str, Any]) -> None:
     """Cleanup resources on worker shutdown."""
     logger.info("ARQ worker shutting down...")
     # Add any cleanup here
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and not cookiecutter.use_sqlite %}
+    await webhook_queue.stop()
+{%- endif %}
 
 
 # === Example Tasks ===
@@ -113,6 +119,24 @@ async def send_email_task(
     }
 
 
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and not cookiecutter.use_sqlite %}
+
+
+# === Webhook Delivery ===
+# Enqueued by app.services.webhook_queue
+
+
+async def deliver_webhook(ctx: dict[str, Any], delivery_id: str) -> None:
+    """Make one webhook delivery attempt."""
+    await webhook_queue.deliver(delivery_id)
+
+
+async def retry_webhook_deliveries(ctx: dict[str, Any]) -> int:
+    """Enqueue overdue webhook deliveries."""
+    return await webhook_queue.retry_due_deliveries()
+{%- endif %}
+
+
 # === Scheduled Task (runs periodically) ===
 
 
@@ -142,12 +166,18 @@ class WorkerSettings:
         example_task,
         long_running_task,
         send_email_task,
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and not cookiecutter.use_sqlite %}
+        deliver_webhook,
+{%- endif %}
     ]
 
     # Scheduled/cron jobs
     cron_jobs = [
         cron(scheduled_example, minute={0, 15, 30, 45}),  # Every 15 minutes
         # cron(scheduled_example, minute=0, hour=0),  # Daily at midnight
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and not cookiecutter.use_sqlite %}
+        cron(retry_webhook_deliveries, run_at_startup=True),  # Every minute
+{%- endif %}
     ]
 
     # Worker lifecycle hooks
@@ -46,6 +46,13 @@ celery_app.conf.beat_schedule = {
         "schedule": 60.0,  # Every 60 seconds
         "args": ("periodic",),
     },
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+    # Re-enqueue webhook deliveries whose job was lost (see app/services/webhook_queue.py)
+    "retry-webhook-deliveries": {
+        "task": "app.worker.tasks.webhooks.retry_webhook_deliveries",
+        "schedule": 60.0,
+    },
+{%- endif %}
     # Example with crontab (runs at 00:00 every day)
     # "daily-cleanup": {
     #     "task": "app.worker.tasks.examples.cleanup_task",
@@ -2,6 +2,7 @@
 """Taskiq application configuration."""
 
 from taskiq import TaskiqScheduler
+from taskiq.schedule_sources import LabelScheduleSource
 from taskiq_redis import ListQueueBroker, RedisAsyncResultBackend
 
 from app.core.config import settings
@@ -18,7 +19,7 @@ broker = ListQueueBroker(
 # Create scheduler for periodic tasks
 scheduler = TaskiqScheduler(
     broker=broker,
-    sources=["app.worker.tasks.schedules"],
+    sources=[LabelScheduleSource(broker)],
 )
 
 
@@ -33,6 +34,12 @@ async def startup() -> None:
 async def shutdown() -> None:
     """Cleanup on shutdown."""
     pass
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and not cookiecutter.use_sqlite %}
+
+
+# Register webhook delivery tasks with the worker
+import app.worker.tasks.webhooks  # noqa: E402, F401
+{%- endif %}
 {%- else %}
 # Taskiq not enabled for this project
 {%- endif %}
@@ -3,6 +3,9 @@
 
 {%- if cookiecutter.use_celery %}
 from app.worker.tasks.examples import example_task, long_running_task
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+from app.worker.tasks.webhooks import deliver_webhook, retry_webhook_deliveries
+{%- endif %}
 {%- endif %}
 
 {%- if cookiecutter.use_taskiq %}
@@ -19,6 +22,10 @@ __all__ = [
 {%- if cookiecutter.use_celery %}
     "example_task",
     "long_running_task",
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database %}
+    "deliver_webhook",
+    "retry_webhook_deliveries",
+{%- endif %}
 {%- endif %}
 {%- if cookiecutter.use_taskiq %}
     "taskiq_example_task",
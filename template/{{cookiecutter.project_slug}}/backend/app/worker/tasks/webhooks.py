@@ -0,0 +1,105 @@
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_database and cookiecutter.use_celery %}
+"""Celery tasks for webhook delivery (enqueued by app.services.webhook_queue)."""
+
+{%- if not cookiecutter.use_sqlite %}
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+{%- endif %}
+
+from celery import shared_task
+{%- if not cookiecutter.use_sqlite %}
+from celery.signals import worker_process_init, worker_process_shutdown
+{%- endif %}
+
+{%- if not cookiecutter.use_sqlite %}
+
+from app.clients.webhook import webhook_client
+from app.db.session import close_db
+{%- endif %}
+from app.services import webhook_queue
+{%- if not cookiecutter.use_sqlite %}
+
+T = TypeVar("T")
+
+# One event loop per worker process. Pooled connections are bound to the loop
+# they were opened on, so keeping the loop lets later tasks reuse them.
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+@worker_process_init.connect
+def _open_loop(**kwargs: Any) -> None:
+    """Create the worker process's event loop after the fork."""
+    global _loop
+    _loop = asyncio.new_event_loop()
+
+
+@worker_process_shutdown.connect
+def _close_loop(**kwargs: Any) -> None:
+    """Close pooled connections and the event loop when the process exits."""
+    global _loop
+    loop, _loop = _loop, None
+    if loop is None:
+        return
+
+    async def close_connections() -> None:
+        await webhook_client.close()
+        await close_db()
+
+    loop.run_until_complete(close_connections())
+    loop.close()
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the worker process's event loop.
+
+    Celery tasks are synchronous. The HTTP client and database pools stay
+    open between tasks, so deliveries reuse keep-alive connections.
+    """
+    global _loop
+    if _loop is None:
+        # No worker_process_init, e.g. the solo pool or eager tasks
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+{%- endif %}
+
+
+@shared_task
+def deliver_webhook(delivery_id: str) -> None:
+    """Make one webhook delivery attempt."""
+{%- if cookiecutter.use_sqlite %}
+    webhook_queue.deliver(delivery_id)
+{%- else %}
+    _run(webhook_queue.deliver(delivery_id))
+{%- endif %}
+
+
+@shared_task
+def retry_webhook_deliveries() -> int:
+    """Enqueue overdue webhook deliveries."""
+{%- if cookiecutter.use_sqlite %}
+    return webhook_queue.retry_due_deliveries()
+{%- else %}
+    return _run(webhook_queue.retry_due_deliveries())
+{%- endif %}
+{%- elif cookiecutter.enable_webhooks and cookiecutter.use_database and cookiecutter.use_taskiq and not cookiecutter.use_sqlite %}
+"""Taskiq tasks for webhook delivery (enqueued by app.services.webhook_queue)."""
+
+from app.services import webhook_queue
+from app.worker.taskiq_app import broker
+
+
+@broker.task
+async def deliver_webhook(delivery_id: str) -> None:
+    """Make one webhook delivery attempt."""
+    await webhook_queue.deliver(delivery_id)
+
+
+@broker.task(schedule=[{"cron": "* * * * *"}])  # Every minute
+async def retry_webhook_deliveries() -> int:
+    """Enqueue overdue webhook deliveries."""
+    return await webhook_queue.retry_due_deliveries()
+{%- else %}
+# Webhook delivery tasks not enabled
+{%- endif %}
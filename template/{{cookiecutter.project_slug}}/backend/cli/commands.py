@@ -352,6 +352,10 @@ def user_set_role(email: str, role: str):
     from app.services.user import UserService
 {%- if cookiecutter.use_postgresql %}
     from app.db.session import async_session_maker
+{%- if cookiecutter.enable_redis %}
+    from app.clients.redis import RedisClient
+    from app.core.user_cache import user_cache
+{%- endif %}
 
     async def _update():
         async with async_session_maker() as session:
@@ -361,6 +365,14 @@ def user_set_role(email: str, role: str):
                 user.role = UserRole(role).value
                 session.add(user)
                 await session.commit()
+{%- if cookiecutter.enable_redis %}
+                # Drop the shared cached copy so running servers see the new role
+                redis = RedisClient()
+                await redis.connect()
+                user_cache.setup(redis)
+                await user_cache.invalidate(user.id)
+                await redis.close()
+{%- endif %}
                 return user
             except NotFoundError:
                 click.secho(f"User not found: {email}", fg="red")
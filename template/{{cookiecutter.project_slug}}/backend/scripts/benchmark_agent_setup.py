@@ -0,0 +1,86 @@
+{%- if cookiecutter.use_pydantic_ai %}
+{%- set module, assistant_class = "assistant", "AssistantAgent" %}
+{%- elif cookiecutter.use_langchain %}
+{%- set module, assistant_class = "langchain_assistant", "LangChainAssistant" %}
+{%- else %}
+{%- set module, assistant_class = "langgraph_assistant", "LangGraphAssistant" %}
+{%- endif %}
+{%- if cookiecutter.use_openai %}
+{%- set api_key_var = "OPENAI_API_KEY" %}
+{%- elif cookiecutter.use_anthropic %}
+{%- set api_key_var = "ANTHROPIC_API_KEY" %}
+{%- else %}
+{%- set api_key_var = "OPENROUTER_API_KEY" %}
+{%- endif %}
+"""Measure the per-turn cost of setting up the agent for a WebSocket message.
+
+Compares building a new {{ assistant_class }}, model and HTTP client for every
+message with taking the shared instances from ``app.agents.registry``. No
+model requests are sent, so the numbers cover object construction only; the
+TLS handshakes saved by reusing the HTTP client's connections come on top.
+
+Usage:
+    uv run python scripts/benchmark_agent_setup.py [--turns 500]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+# Clients need an API key to be built; nothing is sent
+os.environ.setdefault("{{ api_key_var }}", "benchmark-key")
+
+from app.agents import {{ module }} as agent_module
+from app.agents.{{ module }} import {{ assistant_class }}, get_agent
+from app.agents.registry import AgentRegistry, agent_registry
+
+
+def prepare(assistant: {{ assistant_class }}) -> None:
+    """Build everything a turn needs before the first model request."""
+{%- if cookiecutter.use_langgraph %}
+    _ = assistant.graph
+    _ = assistant.model
+{%- else %}
+    _ = assistant.agent
+{%- endif %}
+
+
+async def per_turn() -> None:
+    """A new assistant, model and HTTP client for the turn."""
+    registry = AgentRegistry()
+    with patch.object(agent_module, "agent_registry", registry):
+        prepare({{ assistant_class }}())
+    await registry.close()
+
+
+async def shared() -> None:
+    """The shared instances from the registry."""
+    prepare(get_agent())
+
+
+async def run(setup, turns: int) -> float:
+    """Run ``setup`` ``turns`` times and return the mean time per turn in seconds."""
+    start = time.perf_counter()
+    for _ in range(turns):
+        await setup()
+    return (time.perf_counter() - start) / turns
+
+
+async def main(turns: int) -> None:
+    results = {}
+    for name, setup in {"new per turn": per_turn, "registry": shared}.items():
+        await run(setup, min(turns, 20))  # Warm up
+        results[name] = await run(setup, turns)
+    await agent_registry.close()
+
+    print(f"{'setup':<14} {'per turn':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<14} {seconds * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=500)
+    asyncio.run(main(parser.parse_args().turns))
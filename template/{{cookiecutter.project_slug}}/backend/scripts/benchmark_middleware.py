@@ -0,0 +1,162 @@
+"""Measure the per-request overhead of the HTTP middleware stack.
+
+Sends requests straight into the ASGI app (no server or sockets involved) and
+compares the pure ASGI middlewares in ``app.core.middleware``,
+``app.core.csrf`` and ``app.api.versioning`` with equivalent
+``BaseHTTPMiddleware`` implementations, which is how they used to be written.
+
+Usage:
+    uv run python scripts/benchmark_middleware.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message
+
+from app.api.versioning import VersionDeprecationMiddleware
+{%- if cookiecutter.use_jwt %}
+from app.core.csrf import CSRFMiddleware
+{%- endif %}
+from app.core.middleware import RequestIDMiddleware, SecurityHeadersMiddleware
+
+DEPRECATED_VERSIONS = {"v1": {"sunset": "2030-01-01", "link": "/docs/migration/v2"}}
+CSRF_TOKEN = "benchmark-token"
+
+
+class LegacyRequestID(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID", str(uuid4()))
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        csp = "; ".join(
+            f"{directive} {value}"
+            for directive, value in SecurityHeadersMiddleware.DEFAULT_CSP_DIRECTIVES.items()
+        )
+        response.headers["Content-Security-Policy"] = csp
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Permissions-Policy"] = "camera=(), microphone=()"
+        return response
+{%- if cookiecutter.use_jwt %}
+
+
+class LegacyCSRF(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        csrf_token = request.cookies.get("csrf_token")
+        if request.method in CSRFMiddleware.PROTECTED_METHODS and (
+            request.headers.get("X-CSRF-Token") != csrf_token
+        ):
+            return PlainTextResponse("CSRF token invalid", status_code=403)
+        return await call_next(request)
+{%- endif %}
+
+
+class LegacyVersionDeprecation(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if "/api/v1/" in request.url.path:
+            response.headers["Deprecation"] = "true"
+            response.headers["Sunset"] = "Tue, 01 Jan 2030 00:00:00 GMT"
+            response.headers["Link"] = '</docs/migration/v2>; rel="deprecation"'
+        return response
+
+
+async def endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+def build_app(middleware: list[Middleware]) -> ASGIApp:
+    return Starlette(
+        routes=[Route("/api/v2/items", endpoint, methods=["GET", "POST"])],
+        middleware=middleware,
+    )
+
+
+async def run(app: ASGIApp, requests: int) -> float:
+    """Send ``requests`` POST requests and return the mean time per request in seconds."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v2/items",
+        "raw_path": b"/api/v2/items",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"benchmark"),
+            (b"cookie", f"csrf_token={CSRF_TOKEN}".encode()),
+            (b"x-csrf-token", CSRF_TOKEN.encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+async def main(requests: int) -> None:
+    stacks = {
+        "no middleware": [],
+        "BaseHTTPMiddleware": [
+            Middleware(LegacyRequestID),
+            Middleware(LegacySecurityHeaders),
+{%- if cookiecutter.use_jwt %}
+            Middleware(LegacyCSRF),
+{%- endif %}
+            Middleware(LegacyVersionDeprecation),
+        ],
+        "pure ASGI": [
+            Middleware(RequestIDMiddleware),
+            Middleware(SecurityHeadersMiddleware),
+{%- if cookiecutter.use_jwt %}
+            Middleware(CSRFMiddleware),
+{%- endif %}
+            Middleware(VersionDeprecationMiddleware, deprecated_versions=DEPRECATED_VERSIONS),
+        ],
+    }
+    results = {}
+    for name, middleware in stacks.items():
+        app = build_app(middleware)
+        await run(app, min(requests, 1000))  # Warm up
+        results[name] = await run(app, requests)
+
+    baseline = results["no middleware"]
+    print(f"{'stack':<20} {'per request':>12} {'overhead':>10}")
+    for name, seconds in results.items():
+        print(f"{name:<20} {seconds * 1e6:>10.1f}us {(seconds - baseline) * 1e6:>8.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -2,8 +2,11 @@
 # ruff: noqa: I001 - Imports structured for Jinja2 template conditionals
 """Tests for authentication routes."""
 
+{%- if cookiecutter.enable_session_management %}
+from collections.abc import Generator
+{%- endif %}
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock{% if cookiecutter.enable_session_management %}, patch{% endif %}
 from uuid import uuid4
 
 import pytest
@@ -25,12 +28,14 @@ class MockUser:
         full_name="Test User",
         is_active=True,
         is_superuser=False,
+        role="user",
     ):
         self.id = id or uuid4()
         self.email = email
         self.full_name = full_name
         self.is_active = is_active
         self.is_superuser = is_superuser
+        self.role = role
         self.hashed_password = "hashed"
         self.created_at = datetime.now(UTC)
         self.updated_at = datetime.now(UTC)
@@ -46,16 +51,43 @@ def mock_user() -> MockUser:
 def mock_user_service(mock_user: MockUser) -> MagicMock:
     """Create a mock user service."""
     service = MagicMock()
+{%- if cookiecutter.use_sqlite %}
+    service.authenticate.return_value = mock_user
+    service.register.return_value = mock_user
+    service.get_by_id.return_value = mock_user
+    service.get_by_email.return_value = mock_user
+{%- else %}
     service.authenticate = AsyncMock(return_value=mock_user)
     service.register = AsyncMock(return_value=mock_user)
     service.get_by_id = AsyncMock(return_value=mock_user)
     service.get_by_email = AsyncMock(return_value=mock_user)
+{%- endif %}
     return service
+{%- if cookiecutter.enable_session_management %}
+
+
+@pytest.fixture
+def mock_session_repo(mock_user: MockUser) -> Generator[MagicMock, None, None]:
+    """Patch the session repository behind SessionService."""
+    with patch("app.services.session.session_repo") as repo:
+{%- if cookiecutter.use_sqlite %}
+        repo.rotate.return_value = MagicMock(user_id=mock_user.id)
+        repo.deactivate_all_by_rotated_token_hash.return_value = 0
+{%- else %}
+        repo.create = AsyncMock()
+        repo.rotate = AsyncMock(return_value=MagicMock(user_id=mock_user.id))
+        repo.deactivate_all_by_rotated_token_hash = AsyncMock(return_value=0)
+{%- endif %}
+        yield repo
+{%- endif %}
 
 
 @pytest.fixture
 async def client_with_mock_service(
     mock_user_service: MagicMock,
+{%- if cookiecutter.enable_session_management %}
+    mock_session_repo: MagicMock,
+{%- endif %}
 {%- if cookiecutter.enable_redis %}
     mock_redis: MagicMock,
 {%- endif %}
@@ -211,7 +243,11 @@ async def test_refresh_token_inactive_user(
 ):
     """Test refresh token for inactive user."""
     inactive_user = MockUser(is_active=False)
+{%- if cookiecutter.use_sqlite %}
+    mock_user_service.get_by_id.return_value = inactive_user
+{%- else %}
     mock_user_service.get_by_id = AsyncMock(return_value=inactive_user)
+{%- endif %}
     refresh_token = create_refresh_token(subject=str(inactive_user.id))
 
     response = await client_with_mock_service.post(
@@ -219,6 +255,51 @@ async def test_refresh_token_inactive_user(
         json={"refresh_token": refresh_token},
     )
     assert response.status_code == 401
+{%- if cookiecutter.enable_session_management %}
+
+
+@pytest.mark.anyio
+async def test_refresh_token_rotates_session(
+    client_with_mock_service: AsyncClient,
+    mock_session_repo: MagicMock,
+    mock_user: MockUser,
+):
+    """Test refresh retires the old session and stores the new token's hash."""
+    from app.services.session import _hash_token
+
+    refresh_token = create_refresh_token(subject=str(mock_user.id))
+
+    response = await client_with_mock_service.post(
+        f"{settings.API_V1_STR}/auth/refresh",
+        json={"refresh_token": refresh_token},
+    )
+    assert response.status_code == 200
+    new_refresh_token = response.json()["refresh_token"]
+    assert new_refresh_token != refresh_token
+    kwargs = mock_session_repo.rotate.call_args.kwargs
+    assert kwargs["token_hash"] == _hash_token(refresh_token)
+    assert kwargs["new_token_hash"] == _hash_token(new_refresh_token)
+    mock_session_repo.deactivate_all_by_rotated_token_hash.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_refresh_token_reuse_revokes_sessions(
+    client_with_mock_service: AsyncClient,
+    mock_session_repo: MagicMock,
+    mock_user: MockUser,
+):
+    """Test replaying an already rotated refresh token revokes the user's sessions."""
+    mock_session_repo.rotate.return_value = None
+    mock_session_repo.deactivate_all_by_rotated_token_hash.return_value = 2
+    refresh_token = create_refresh_token(subject=str(mock_user.id))
+
+    response = await client_with_mock_service.post(
+        f"{settings.API_V1_STR}/auth/refresh",
+        json={"refresh_token": refresh_token},
+    )
+    assert response.status_code == 401
+    mock_session_repo.deactivate_all_by_rotated_token_hash.assert_called_once()
+{%- endif %}
 
 
 @pytest.mark.anyio
@@ -239,4 +320,13 @@ async def test_get_current_user(
     assert response.status_code == 200
     data = response.json()
     assert data["email"] == mock_user.email
+
+
+@pytest.mark.anyio
+async def test_jwks(client_with_mock_service: AsyncClient):
+    """Test the JWK Set is served with caching headers (empty for HS256)."""
+    response = await client_with_mock_service.get(f"{settings.API_V1_STR}/auth/jwks.json")
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
+    assert "max-age" in response.headers["Cache-Control"]
 {%- endif %}
@@ -60,13 +60,18 @@ def mock_item_service(mock_item: MockItem, mock_items: list[MockItem]) -> MagicM
     service = MagicMock()
 {%- if cookiecutter.use_postgresql or cookiecutter.use_mongodb %}
     service.get_by_id = AsyncMock(return_value=mock_item)
+{%- if cookiecutter.use_postgresql %}
+    service.get_item = AsyncMock(return_value=mock_item)
+{%- endif %}
     service.get_multi = AsyncMock(return_value=mock_items)
+    service.get_page = AsyncMock(return_value=(mock_items, None))
     service.create = AsyncMock(return_value=mock_item)
     service.update = AsyncMock(return_value=mock_item)
     service.delete = AsyncMock(return_value=mock_item)
 {%- elif cookiecutter.use_sqlite %}
     service.get_by_id = MagicMock(return_value=mock_item)
     service.get_multi = MagicMock(return_value=mock_items)
+    service.get_page = MagicMock(return_value=(mock_items, None))
     service.create = MagicMock(return_value=mock_item)
     service.update = MagicMock(return_value=mock_item)
     service.delete = MagicMock(return_value=mock_item)
@@ -80,19 +85,34 @@ async def client_with_mock_service(
 {%- if cookiecutter.use_database %}
     mock_db_session,
 {%- endif %}
+{%- if cookiecutter.enable_rate_limiting and cookiecutter.rate_limit_storage_redis %}
+    mock_redis: MagicMock,
+{%- endif %}
 ) -> AsyncClient:
     """Client with mocked item service."""
     from httpx import ASGITransport
 
     from app.api.deps import get_item_service
+{%- if cookiecutter.use_postgresql %}
+    from app.api.deps import get_item_read_service
+{%- endif %}
+{%- if cookiecutter.enable_rate_limiting and cookiecutter.rate_limit_storage_redis %}
+    from app.api.deps import get_redis
+{%- endif %}
 {%- if cookiecutter.use_database %}
     from app.db.session import get_db_session
 {%- endif %}
 
     app.dependency_overrides[get_item_service] = lambda db=None: mock_item_service
+{%- if cookiecutter.use_postgresql %}
+    app.dependency_overrides[get_item_read_service] = lambda db=None: mock_item_service
+{%- endif %}
 {%- if cookiecutter.use_database %}
     app.dependency_overrides[get_db_session] = lambda: mock_db_session
 {%- endif %}
+{%- if cookiecutter.enable_rate_limiting and cookiecutter.rate_limit_storage_redis %}
+    app.dependency_overrides[get_redis] = lambda: mock_redis
+{%- endif %}
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -158,7 +178,11 @@ async def test_get_item_not_found(
     """Test item retrieval when item doesn't exist."""
     from app.core.exceptions import NotFoundError
 
-{%- if cookiecutter.use_postgresql or cookiecutter.use_mongodb %}
+{%- if cookiecutter.use_postgresql %}
+    mock_item_service.get_item = AsyncMock(
+        side_effect=NotFoundError(message="Item not found")
+    )
+{%- elif cookiecutter.use_mongodb %}
     mock_item_service.get_by_id = AsyncMock(
         side_effect=NotFoundError(message="Item not found")
     )
@@ -204,6 +228,24 @@ async def test_list_items_pagination(client_with_mock_service: AsyncClient):
         f"{settings.API_V1_STR}/items?skip=0&limit=10",
     )
     assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_list_items_cursor(
+    client_with_mock_service: AsyncClient,
+    mock_item_service: MagicMock,
+    mock_items: list[MockItem],
+):
+    """Test keyset pagination returns the next cursor in a header."""
+    mock_item_service.get_page.return_value = (mock_items[:2], "next-page")
+    response = await client_with_mock_service.get(
+        f"{settings.API_V1_STR}/items?cursor=abc&limit=2",
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["X-Next-Cursor"] == "next-page"
+    mock_item_service.get_page.assert_called_once_with(skip=0, limit=2, cursor="abc")
 {%- endif %}
 
 
@@ -12,6 +12,9 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 from app.api.deps import get_current_active_superuser, get_current_user, get_user_service
+{%- if cookiecutter.use_postgresql %}
+from app.api.deps import get_user_read_service
+{%- endif %}
 {%- if cookiecutter.use_database %}
 from app.api.deps import get_db_session
 {%- endif %}
@@ -123,6 +126,9 @@ async def superuser_client(
     app.dependency_overrides[get_current_user] = lambda: mock_superuser
     app.dependency_overrides[get_current_active_superuser] = lambda: mock_superuser
     app.dependency_overrides[get_user_service] = lambda: mock_user_service
+{%- if cookiecutter.use_postgresql %}
+    app.dependency_overrides[get_user_read_service] = lambda: mock_user_service
+{%- endif %}
 {%- if cookiecutter.enable_redis %}
     app.dependency_overrides[get_redis] = lambda: mock_redis
 {%- endif %}
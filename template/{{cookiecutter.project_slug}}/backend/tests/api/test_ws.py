@@ -0,0 +1,80 @@
+{%- if cookiecutter.enable_websockets %}
+"""WebSocket connection manager tests."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.routes.v1.ws import ConnectionManager
+
+
+def make_websocket(send_text: AsyncMock | None = None) -> MagicMock:
+    return MagicMock(accept=AsyncMock(), close=AsyncMock(), send_text=send_text or AsyncMock())
+
+
+@pytest.mark.anyio
+async def test_broadcast_reaches_every_connection_in_order():
+    """Test broadcasts are queued for each connection and sent in order."""
+    manager = ConnectionManager(queue_size=10)
+    websockets = [make_websocket(), make_websocket()]
+    for websocket in websockets:
+        await manager.connect(websocket)
+
+    await manager.broadcast("one")
+    await manager.broadcast("two")
+    await asyncio.sleep(0)
+
+    for websocket in websockets:
+        assert [call.args[0] for call in websocket.send_text.await_args_list] == ["one", "two"]
+        manager.disconnect(websocket)
+    assert manager.active_connections == set()
+
+
+@pytest.mark.anyio
+async def test_slow_client_is_disconnected_without_blocking_others():
+    """Test a client that stops reading is evicted once its queue is full."""
+    manager = ConnectionManager(queue_size=2)
+
+    async def never_sends(message: str) -> None:
+        await asyncio.Event().wait()
+
+    slow = make_websocket(send_text=AsyncMock(side_effect=never_sends))
+    fast = make_websocket()
+    await manager.connect(slow)
+    await manager.connect(fast)
+
+    for i in range(4):
+        await manager.broadcast(str(i))
+        await asyncio.sleep(0)
+
+    assert slow not in manager.active_connections
+    slow.close.assert_awaited_once()
+    assert [call.args[0] for call in fast.send_text.await_args_list] == ["0", "1", "2", "3"]
+    manager.disconnect(fast)
+{%- if cookiecutter.enable_redis %}
+
+
+@pytest.mark.anyio
+async def test_broadcast_is_published_to_redis():
+    """Test broadcasts go through Redis so every worker delivers them."""
+    manager = ConnectionManager(queue_size=10)
+    websocket = make_websocket()
+    await manager.connect(websocket)
+    manager._redis = MagicMock()
+    manager._redis.raw.publish = AsyncMock()
+
+    await manager.broadcast("hello")
+    await asyncio.sleep(0)
+
+    manager._redis.raw.publish.assert_awaited_once()
+    # Local delivery happens when the pub/sub listener receives the message
+    websocket.send_text.assert_not_awaited()
+    manager._deliver("hello")
+    await asyncio.sleep(0)
+    websocket.send_text.assert_awaited_once_with("hello")
+    manager.disconnect(websocket)
+{%- endif %}
+{%- else %}
+# WebSockets are not enabled for this project
+{%- endif %}
@@ -54,12 +54,27 @@ def mock_redis() -> MagicMock:
     mock.set = AsyncMock(return_value=True)
     mock.delete = AsyncMock(return_value=1)
     mock.exists = AsyncMock(return_value=0)
+    mock.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
     mock.incr = AsyncMock(return_value=1)
     mock.expire = AsyncMock(return_value=True)
+{%- if cookiecutter.enable_rate_limiting and cookiecutter.rate_limit_storage_redis %}
+    # Rate limit script reply: allowed, remaining, reset_after, retry_after
+    mock.run_script = AsyncMock(return_value=[1, 99, "0.6", "0"])
+{%- endif %}
     return mock
 {%- endif %}
 
 
+{%- if cookiecutter.enable_rate_limiting and cookiecutter.rate_limit_storage_memory %}
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits() -> None:
+    """Start every test with full rate limit buckets."""
+    from app.core.rate_limit import store
+
+    store.clear()
+{%- endif %}
 {%- if cookiecutter.use_postgresql %}
 
 
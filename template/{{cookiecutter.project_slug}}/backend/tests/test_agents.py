@@ -1,12 +1,26 @@
 {%- if cookiecutter.enable_ai_agent and cookiecutter.use_pydantic_ai %}
 """Tests for AI agent module (PydanticAI)."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_postgresql %}
+from uuid import uuid4
+{%- endif %}
 
+import msgpack
 import pytest
 
 from app.agents.assistant import AssistantAgent, Deps, get_agent, run_agent
+from app.agents.completion_cache import CachedCompletion, CompletionCache, completion_key
+from app.agents.event_channel import AgentEventChannel
+from app.agents.history import ConversationHistory, estimate_tokens
 from app.agents.tools.datetime_tool import get_current_datetime
+from app.core.config import settings
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_postgresql %}
+from app.schemas.conversation import MessageCreate, ToolCallComplete, ToolCallCreate
+from app.services.message_buffer import MessageBuffer
+{%- endif %}
 
 
 class TestDeps:
@@ -88,6 +102,97 @@ class TestGetAgent:
         agent = get_agent()
         assert isinstance(agent, AssistantAgent)
 
+    def test_reuses_agent_per_configuration(self):
+        """Test get_agent shares one instance per model, temperature and prompt."""
+        assert get_agent() is get_agent()
+        assert get_agent(temperature=0.1) is not get_agent()
+        assert get_agent(temperature=0.1).temperature == 0.1
+
+
+class TestAgentRegistry:
+    """Tests for the process-wide agent registry."""
+
+    @pytest.mark.anyio
+    async def test_close_drops_instances_and_clients(self):
+        """Test close() closes the shared HTTP client and forgets instances."""
+        from app.agents.registry import AgentRegistry
+
+        registry = AgentRegistry()
+        instance = registry.get("key", object)
+        assert registry.get("key", object) is instance
+        client = registry.http_client
+        assert registry.http_client is client
+
+        await registry.close()
+
+        assert client.is_closed
+        assert registry.http_client is not client
+        assert registry.get("key", object) is not instance
+        await registry.close()
+
+
+class TestCompletionCache:
+    """Tests for the agent completion cache."""
+
+    @staticmethod
+    def key(user_input: str, temperature: float = 0.7, history=None) -> str:
+        """Key for a prompt to the default model and system prompt."""
+        return completion_key(
+            model_name="gpt-4o-mini",
+            temperature=temperature,
+            system_prompt="You are a helpful assistant.",
+            history=history,
+            user_input=user_input,
+        )
+
+    def test_key_normalizes_whitespace(self):
+        """Test the key ignores whitespace differences but not model settings or history."""
+        assert self.key("What is  FastAPI?") == self.key(" What is FastAPI?\n")
+        assert self.key("What is FastAPI?") != self.key("What is FastAPI?", temperature=0.2)
+        assert self.key("What is FastAPI?") != self.key(
+            "What is FastAPI?", history=[{"role": "user", "content": "Hi"}]
+        )
+
+    @pytest.mark.anyio
+    async def test_local_tier_evicts_and_expires(self):
+        """Test the LRU keeps at most maxsize entries, each for local_ttl seconds."""
+        with patch("app.agents.completion_cache.settings.AGENT_CACHE_ENABLED", True):
+            cache = CompletionCache(local_ttl=60, maxsize=2)
+            for name in ("a", "b", "c"):
+                await cache.set(name, CachedCompletion(name))
+            assert await cache.get("a") is None
+            assert (await cache.get("c")).output == "c"
+
+            cache.local_ttl = -1
+            await cache.set("d", CachedCompletion("d"))
+            assert await cache.get("d") is None
+
+    @pytest.mark.anyio
+    async def test_run_serves_repeated_prompts_from_cache(self):
+        """Test a repeated prompt skips the model, unless the first run called tools."""
+        agent = AssistantAgent()
+        agent._agent = MagicMock()
+        agent._agent.run = AsyncMock(
+            return_value=MagicMock(output="FastAPI is a web framework.", all_messages=lambda: [])
+        )
+
+        with (
+            patch("app.agents.completion_cache.settings.AGENT_CACHE_ENABLED", True),
+            patch("app.agents.assistant.completion_cache", CompletionCache()),
+        ):
+            first = await agent.run("What is FastAPI?")
+            second = await agent.run("What is  FastAPI?")
+            assert first[0] == second[0] == "FastAPI is a web framework."
+            assert agent._agent.run.await_count == 1
+
+            tool_part = MagicMock(tool_name="current_datetime")
+            agent._agent.run.return_value = MagicMock(
+                output="It is noon.", all_messages=lambda: [MagicMock(parts=[tool_part])]
+            )
+            await agent.run("What time is it?")
+            await agent.run("What time is it?")
+            assert agent._agent.run.await_count == 3
+
 
 class TestAgentRoutes:
     """Tests for agent WebSocket routes."""
@@ -120,6 +225,211 @@ class TestHistoryConversion:
         ]
         assert len(history) == 3
         assert all("role" in msg and "content" in msg for msg in history)
+
+
+class TestConversationHistory:
+    """Tests for the server-side, token-bounded conversation history."""
+
+    def test_append_and_messages(self):
+        """Test messages are kept in order as role/content dicts."""
+        history = ConversationHistory(max_tokens=1000)
+        history.append("user", "Hello")
+        history.append("assistant", "Hi there!")
+        assert history.messages == [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi there!"},
+        ]
+        assert history.total_tokens == estimate_tokens("Hello") + estimate_tokens("Hi there!")
+
+    def test_trims_oldest_messages_to_budget(self):
+        """Test the oldest turns are dropped once the token budget is exceeded."""
+        history = ConversationHistory(max_tokens=estimate_tokens("x" * 40) * 2)
+        for i in range(3):
+            history.append("user", f"{i}" * 40)
+            history.append("assistant", f"{i}" * 40)
+        assert len(history) == 2
+        assert history.messages[0] == {"role": "user", "content": "2" * 40}
+        assert history.total_tokens <= history.max_tokens
+
+    def test_window_does_not_start_with_assistant(self):
+        """Test an assistant reply is dropped together with its trimmed prompt."""
+        history = ConversationHistory(max_tokens=estimate_tokens("x" * 40) * 2)
+        history.append("user", "a" * 40)
+        history.append("assistant", "b" * 40)
+        history.append("user", "c" * 40)
+        assert history.messages == [{"role": "user", "content": "c" * 40}]
+
+    def test_keeps_newest_message_over_budget(self):
+        """Test a single oversized message is still kept."""
+        history = ConversationHistory(max_tokens=1)
+        history.append("user", "a long message")
+        assert len(history) == 1
+
+    def test_converts_messages_once(self):
+        """Test the converter runs once per message and skips unknown roles."""
+        convert = MagicMock(side_effect=lambda msg: msg["content"] if msg["role"] != "tool" else None)
+        history = ConversationHistory(convert=convert, max_tokens=1000)
+        history.append("user", "Hello")
+        history.append("tool", "ignored")
+        assert history.model_messages() == ["Hello"]
+        assert history.model_messages() == ["Hello"]
+        assert convert.call_count == 2
+
+    def test_replace_sets_conversation_id(self):
+        """Test replace swaps the contents and tracks the loaded conversation."""
+        history = ConversationHistory(max_tokens=1000)
+        history.append("user", "old")
+        history.replace([{"role": "user", "content": "new"}], conversation_id="conv-1")
+        assert history.messages == [{"role": "user", "content": "new"}]
+        assert history.conversation_id == "conv-1"
+        history.clear()
+        assert len(history) == 0
+        assert history.conversation_id is None
+        assert history.total_tokens == 0
+
+
+class TestAgentEventChannel:
+    """Tests for coalescing and encoding of agent WebSocket events."""
+
+    @staticmethod
+    def sent_events(websocket: MagicMock) -> list[dict]:
+        return [json.loads(call.args[0]) for call in websocket.send_text.await_args_list]
+
+    @pytest.mark.anyio
+    async def test_merges_deltas_until_next_event(self):
+        """Test consecutive deltas go out as one frame before the next event."""
+        websocket = MagicMock(send_text=AsyncMock())
+        channel = AgentEventChannel(websocket, coalesce_ms=1000, coalesce_bytes=1024)
+        for content in ("Hel", "lo", "!"):
+            await channel.send("text_delta", {"index": 0, "content": content})
+        websocket.send_text.assert_not_awaited()
+        await channel.send("final_result", {"output": "Hello!"})
+        assert self.sent_events(websocket) == [
+            {"type": "text_delta", "data": {"index": 0, "content": "Hello!"}},
+            {"type": "final_result", "data": {"output": "Hello!"}},
+        ]
+        channel.close()
+
+    @pytest.mark.anyio
+    async def test_flushes_after_interval_and_size(self):
+        """Test pending text is sent once the interval passes or the size limit is hit."""
+        websocket = MagicMock(send_text=AsyncMock())
+        channel = AgentEventChannel(websocket, coalesce_ms=10, coalesce_bytes=8)
+        await channel.send("text_delta", {"content": "Hi"})
+        await asyncio.sleep(0.05)
+        await channel.send("text_delta", {"content": "12345678"})
+        assert [event["data"]["content"] for event in self.sent_events(websocket)] == ["Hi", "12345678"]
+        channel.close()
+
+    @pytest.mark.anyio
+    async def test_does_not_merge_different_parts(self):
+        """Test deltas of different parts stay in separate frames."""
+        websocket = MagicMock(send_text=AsyncMock())
+        channel = AgentEventChannel(websocket, coalesce_ms=1000)
+        await channel.send("text_delta", {"index": 0, "content": "a"})
+        await channel.send("text_delta", {"index": 1, "content": "b"})
+        await channel.flush()
+        assert [event["data"] for event in self.sent_events(websocket)] == [
+            {"index": 0, "content": "a"},
+            {"index": 1, "content": "b"},
+        ]
+
+    @pytest.mark.anyio
+    async def test_zero_interval_sends_every_delta(self):
+        """Test coalesce_ms=0 turns coalescing off."""
+        websocket = MagicMock(send_text=AsyncMock())
+        channel = AgentEventChannel(websocket, coalesce_ms=0)
+        await channel.send("text_delta", {"content": "a"})
+        await channel.send("text_delta", {"content": "b"})
+        assert websocket.send_text.await_count == 2
+
+    @pytest.mark.anyio
+    async def test_msgpack_subprotocol(self):
+        """Test clients asking for msgpack get binary frames and per-connection settings."""
+        websocket = MagicMock(
+            send_bytes=AsyncMock(),
+            scope={"subprotocols": ["msgpack"]},
+            query_params={"coalesce_ms": "0", "coalesce_bytes": "oops"},
+        )
+        channel = AgentEventChannel.from_websocket(websocket)
+        assert channel.subprotocol == "msgpack"
+        assert channel.coalesce_ms == 0
+        assert channel.coalesce_bytes == settings.AGENT_WS_COALESCE_BYTES
+        await channel.send("text_delta", {"content": "Hi"})
+        payload = websocket.send_bytes.await_args.args[0]
+        assert msgpack.unpackb(payload) == {"type": "text_delta", "data": {"content": "Hi"}}
+{%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_postgresql %}
+
+
+class TestMessageBuffer:
+    """Tests for write-behind persistence of agent messages and tool calls."""
+
+    def test_tool_calls_attach_to_assistant_message(self):
+        """Test open tool calls are attached to the turn's assistant message."""
+        buffer = MessageBuffer(max_pending=100, flush_interval=0)
+        conversation_id = uuid4()
+        buffer.add_message(conversation_id, MessageCreate(role="user", content="Hi"))
+        buffer.start_tool_call(ToolCallCreate(tool_call_id="call_1", tool_name="search"))
+        buffer.complete_tool_call("call_1", ToolCallComplete(result="found", success=False))
+        message = buffer.add_message(
+            conversation_id, MessageCreate(role="assistant", content="Done")
+        )
+        assert len(buffer) == 3
+        tool_call = buffer._tool_calls[0]
+        assert tool_call.message_id == message.id
+        assert tool_call.result == "found"
+        assert tool_call.status == "failed"
+        assert tool_call.duration_ms is not None
+
+    def test_user_message_discards_unfinished_turn_tool_calls(self):
+        """Test tool calls from a turn without a reply are not carried over."""
+        buffer = MessageBuffer(max_pending=100, flush_interval=0)
+        conversation_id = uuid4()
+        buffer.start_tool_call(ToolCallCreate(tool_call_id="call_1", tool_name="search"))
+        buffer.add_message(conversation_id, MessageCreate(role="user", content="Hi"))
+        buffer.add_message(conversation_id, MessageCreate(role="assistant", content="Hello"))
+        assert buffer._tool_calls == []
+
+    @pytest.mark.anyio
+    async def test_should_flush_thresholds(self):
+        """Test size and age thresholds."""
+        buffer = MessageBuffer(max_pending=2, flush_interval=60)
+        assert buffer.should_flush() is False
+        buffer.add_message(uuid4(), MessageCreate(role="user", content="Hi"))
+        assert buffer.should_flush() is False
+        buffer.add_message(uuid4(), MessageCreate(role="assistant", content="Hello"))
+        assert buffer.should_flush() is True
+        buffer._take_pending()
+
+    @pytest.mark.anyio
+    async def test_flush_writes_turn_in_one_batch(self):
+        """Test pending rows are written with a single bulk call."""
+        buffer = MessageBuffer(max_pending=100, flush_interval=0)
+        conversation_id = uuid4()
+        buffer.add_message(conversation_id, MessageCreate(role="user", content="Hi"))
+        buffer.start_tool_call(ToolCallCreate(tool_call_id="call_1", tool_name="search"))
+        buffer.add_message(conversation_id, MessageCreate(role="assistant", content="Done"))
+
+        db = MagicMock()
+        db_context = MagicMock()
+        db_context.return_value.__aenter__ = AsyncMock(return_value=db)
+        db_context.return_value.__aexit__ = AsyncMock(return_value=None)
+        with (
+            patch("app.services.message_buffer.get_db_context", db_context),
+            patch("app.services.message_buffer.conversation_repo") as mock_repo,
+        ):
+            mock_repo.bulk_create_messages = AsyncMock()
+            written = await buffer.maybe_flush()
+            assert await buffer.flush() == 0
+
+        assert written == 3
+        assert len(buffer) == 0
+        mock_repo.bulk_create_messages.assert_awaited_once()
+        _, messages, tool_calls = mock_repo.bulk_create_messages.await_args.args
+        assert [m.role for m in messages] == ["user", "assistant"]
+        assert messages[0].created_at <= messages[1].created_at
+        assert len(tool_calls) == 1
+{%- endif %}
 {%- elif cookiecutter.enable_ai_agent and cookiecutter.use_langchain %}
 """Tests for AI agent module (LangChain)."""
 
@@ -127,6 +437,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from app.agents.completion_cache import CompletionCache
+from app.agents.history import ConversationHistory, estimate_tokens
 from app.agents.langchain_assistant import AgentContext, LangChainAssistant, get_agent, run_agent
 from app.agents.tools.datetime_tool import get_current_datetime
 
@@ -213,6 +525,36 @@ class TestGetAgent:
         agent = get_agent()
         assert isinstance(agent, LangChainAssistant)
 
+    def test_reuses_agent_per_configuration(self):
+        """Test get_agent shares one instance per model, temperature and prompt."""
+        assert get_agent() is get_agent()
+        assert get_agent(system_prompt="Be brief.") is not get_agent()
+
+
+class TestCompletionCache:
+    """Tests for the agent completion cache."""
+
+    @pytest.mark.anyio
+    async def test_run_serves_repeated_prompts_from_cache(self):
+        """Test a repeated prompt with the same history skips the model."""
+        from langchain.messages import AIMessage
+
+        agent = LangChainAssistant()
+        agent._agent = MagicMock()
+        agent._agent.invoke.return_value = {"messages": [AIMessage(content="Hello!")]}
+        history = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hi!"}]
+
+        with (
+            patch("app.agents.completion_cache.settings.AGENT_CACHE_ENABLED", True),
+            patch("app.agents.langchain_assistant.completion_cache", CompletionCache()),
+        ):
+            assert (await agent.run("Hello", history))[0] == "Hello!"
+            assert (await agent.run("Hello", history))[0] == "Hello!"
+            assert agent._agent.invoke.call_count == 1
+
+            await agent.run("Hello")
+            assert agent._agent.invoke.call_count == 2
+
 
 class TestAgentRoutes:
     """Tests for agent WebSocket routes."""
@@ -260,4 +602,258 @@ class TestHistoryConversion:
         assert isinstance(messages[0], HumanMessage)
         assert isinstance(messages[1], AIMessage)
         assert isinstance(messages[2], SystemMessage)
+
+
+class TestConversationHistory:
+    """Tests for the server-side, token-bounded conversation history."""
+
+    def test_append_and_messages(self):
+        """Test messages are kept in order as role/content dicts."""
+        history = ConversationHistory(max_tokens=1000)
+        history.append("user", "Hello")
+        history.append("assistant", "Hi there!")
+        assert history.messages == [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi there!"},
+        ]
+        assert history.total_tokens == estimate_tokens("Hello") + estimate_tokens("Hi there!")
+
+    def test_trims_oldest_messages_to_budget(self):
+        """Test the oldest turns are dropped once the token budget is exceeded."""
+        history = ConversationHistory(max_tokens=estimate_tokens("x" * 40) * 2)
+        for i in range(3):
+            history.append("user", f"{i}" * 40)
+            history.append("assistant", f"{i}" * 40)
+        assert len(history) == 2
+        assert history.messages[0] == {"role": "user", "content": "2" * 40}
+        assert history.total_tokens <= history.max_tokens
+
+    def test_window_does_not_start_with_assistant(self):
+        """Test an assistant reply is dropped together with its trimmed prompt."""
+        history = ConversationHistory(max_tokens=estimate_tokens("x" * 40) * 2)
+        history.append("user", "a" * 40)
+        history.append("assistant", "b" * 40)
+        history.append("user", "c" * 40)
+        assert history.messages == [{"role": "user", "content": "c" * 40}]
+
+    def test_keeps_newest_message_over_budget(self):
+        """Test a single oversized message is still kept."""
+        history = ConversationHistory(max_tokens=1)
+        history.append("user", "a long message")
+        assert len(history) == 1
+
+    def test_converts_messages_once(self):
+        """Test the converter runs once per message and skips unknown roles."""
+        convert = MagicMock(side_effect=lambda msg: msg["content"] if msg["role"] != "tool" else None)
+        history = ConversationHistory(convert=convert, max_tokens=1000)
+        history.append("user", "Hello")
+        history.append("tool", "ignored")
+        assert history.model_messages() == ["Hello"]
+        assert history.model_messages() == ["Hello"]
+        assert convert.call_count == 2
+
+    def test_replace_sets_conversation_id(self):
+        """Test replace swaps the contents and tracks the loaded conversation."""
+        history = ConversationHistory(max_tokens=1000)
+        history.append("user", "old")
+        history.replace([{"role": "user", "content": "new"}], conversation_id="conv-1")
+        assert history.messages == [{"role": "user", "content": "new"}]
+        assert history.conversation_id == "conv-1"
+        history.clear()
+        assert len(history) == 0
+        assert history.conversation_id is None
+        assert history.total_tokens == 0
+{%- elif cookiecutter.enable_ai_agent and cookiecutter.use_langgraph %}
+"""Tests for AI agent module (LangGraph)."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from app.agents.langgraph_assistant import LangGraphAssistant
+
+
+def tool_call(name: str, call_id: str) -> dict:
+    """Build a tool call as the model emits it."""
+    return {"name": name, "args": {}, "id": call_id, "type": "tool_call"}
+
+
+class TestToolsNode:
+    """Tests for concurrent tool execution in the tools node."""
+
+    @staticmethod
+    async def run_tools(tools: list, calls: list[dict]) -> list:
+        """Run the tools node on one model step with ``tools`` registered."""
+        with patch.dict("app.agents.langgraph_assistant.TOOLS_BY_NAME", {t.name: t for t in tools}):
+            state = {"messages": [AIMessage(content="", tool_calls=calls)]}
+            return (await LangGraphAssistant()._tools_node(state))["messages"]
+
+    @pytest.mark.anyio
+    async def test_results_keep_call_order(self):
+        """Test results come back in call order even when later calls finish first."""
+
+        @tool
+        async def slow() -> str:
+            """Finish last."""
+            await asyncio.sleep(0.05)
+            return "slow"
+
+        @tool
+        async def fast() -> str:
+            """Finish first."""
+            return "fast"
+
+        results = await self.run_tools([slow, fast], [tool_call("slow", "1"), tool_call("fast", "2")])
+
+        assert [(m.tool_call_id, m.content) for m in results] == [("1", "slow"), ("2", "fast")]
+        assert all(m.status == "success" for m in results)
+
+    @pytest.mark.anyio
+    async def test_concurrency_is_capped(self):
+        """Test at most AGENT_TOOL_CONCURRENCY calls run at once."""
+        running = peak = 0
+
+        @tool
+        async def counted() -> str:
+            """Track how many calls overlap."""
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "done"
+
+        with patch("app.agents.langgraph_assistant.settings.AGENT_TOOL_CONCURRENCY", 2):
+            results = await self.run_tools([counted], [tool_call("counted", str(i)) for i in range(5)])
+
+        assert len(results) == 5
+        assert peak == 2
+
+    @pytest.mark.anyio
+    async def test_slow_tool_times_out(self):
+        """Test a tool running past AGENT_TOOL_TIMEOUT returns an error message."""
+
+        @tool
+        async def hang() -> str:
+            """Never finish in time."""
+            await asyncio.sleep(1)
+            return "late"
+
+        with patch("app.agents.langgraph_assistant.settings.AGENT_TOOL_TIMEOUT", 0.01):
+            (result,) = await self.run_tools([hang], [tool_call("hang", "1")])
+
+        assert result.status == "error"
+        assert "timed out after 0.01s" in result.content
+
+    @pytest.mark.anyio
+    async def test_failing_tool_returns_error(self):
+        """Test an exception in a tool becomes an error ToolMessage."""
+
+        @tool
+        async def broken() -> str:
+            """Always fail."""
+            raise ValueError("boom")
+
+        (result,) = await self.run_tools([broken], [tool_call("broken", "1")])
+
+        assert result.status == "error"
+        assert result.content == "Error executing broken: boom"
+        assert result.tool_call_id == "1"
+
+    @pytest.mark.anyio
+    async def test_reports_duration(self):
+        """Test each result carries the call's duration in milliseconds."""
+
+        @tool
+        async def wait() -> str:
+            """Take a little while."""
+            await asyncio.sleep(0.02)
+            return "done"
+
+        (result,) = await self.run_tools([wait], [tool_call("wait", "1")])
+
+        assert result.response_metadata["duration_ms"] >= 20
+{%- elif cookiecutter.enable_ai_agent and cookiecutter.use_crewai %}
+"""Tests for AI agent module (CrewAI)."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+
+from app.agents.crewai_assistant import CrewAIAssistant, _get_listener
+
+
+def make_crew(name: str, barrier: threading.Barrier) -> MagicMock:
+    """Build a crew copy whose kickoff emits one agent event once every kickoff has started."""
+    crew = MagicMock()
+    crew.id = f"crew-{name}"
+    crew.agents = [SimpleNamespace(id=f"agent-{name}")]
+    crew.tasks = [SimpleNamespace(id=f"task-{name}")]
+
+    def kickoff(inputs):
+        barrier.wait()
+        _get_listener()._put(
+            SimpleNamespace(agent_id=f"agent-{name}", task_id=f"task-{name}"),
+            {"type": "agent_completed", "output": name},
+        )
+
+    crew.kickoff.side_effect = kickoff
+    return crew
+
+
+class TestCrewEventQueueListener:
+    """Tests for routing CrewAI bus events to the streams in progress."""
+
+    @pytest.mark.anyio
+    async def test_concurrent_streams_only_receive_their_own_events(self):
+        """Test two concurrent kickoffs do not see each other's events."""
+        barrier = threading.Barrier(2, timeout=5)
+        shared_crew = MagicMock()
+        shared_crew.copy.side_effect = [make_crew("a", barrier), make_crew("b", barrier)]
+
+        async def collect(assistant: CrewAIAssistant) -> list[dict]:
+            return [event async for event in assistant.stream("Hello")]
+
+        with patch.object(CrewAIAssistant, "crew", new_callable=PropertyMock, return_value=shared_crew):
+            first, second = await asyncio.gather(collect(CrewAIAssistant()), collect(CrewAIAssistant()))
+
+        assert len(first) == 1
+        assert len(second) == 1
+        assert {first[0]["output"], second[0]["output"]} == {"a", "b"}
+
+    def test_ignores_events_of_other_crews(self):
+        """Test an event is dropped when no subscribed crew emitted it."""
+        listener = _get_listener()
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = MagicMock()
+        with patch.dict(listener._subscribers, {queue: (loop, frozenset({"agent-a"}))}):
+            listener._put(SimpleNamespace(agent_id="agent-b"), {"type": "llm_completed"})
+            loop.call_soon_threadsafe.assert_not_called()
+            listener._put(SimpleNamespace(agent_id="agent-a"), {"type": "llm_completed"})
+            loop.call_soon_threadsafe.assert_called_once()
+
+
+class TestCrewAIStream:
+    """Tests for CrewAIAssistant.stream."""
+
+    @pytest.mark.anyio
+    async def test_sends_one_final_result_with_token_usage(self):
+        """Test the kickoff result is sent once, with the tokens the crew used."""
+        crew = MagicMock()
+        crew.agents = []
+        crew.tasks = []
+        crew.kickoff.return_value = SimpleNamespace(raw="Done", token_usage=SimpleNamespace(total_tokens=42))
+        shared_crew = MagicMock()
+        shared_crew.copy.return_value = crew
+
+        with patch.object(CrewAIAssistant, "crew", new_callable=PropertyMock, return_value=shared_crew):
+            events = [event async for event in CrewAIAssistant().stream("Hello")]
+
+        assert events == [{"type": "crew_complete", "result": "Done", "total_tokens": 42}]
 {%- endif %}
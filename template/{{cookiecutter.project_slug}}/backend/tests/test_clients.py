@@ -1,11 +1,24 @@
-{%- if cookiecutter.enable_redis %}
+{%- set test_webhook_client = cookiecutter.enable_webhooks and cookiecutter.use_database and not cookiecutter.use_sqlite %}
+{%- if cookiecutter.enable_redis or test_webhook_client %}
 """Tests for client modules."""
+{%- if test_webhook_client %}
 
+import asyncio
+{%- endif %}
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+{%- if cookiecutter.enable_redis %}
 
 from app.clients.redis import RedisClient
+{%- endif %}
+{%- if test_webhook_client %}
+{%- if not cookiecutter.enable_redis %}
+
+{%- endif %}
+from app.clients.webhook import WebhookClient
+{%- endif %}
+{%- if cookiecutter.enable_redis %}
 
 
 class TestRedisClient:
@@ -30,15 +43,21 @@ class TestRedisClient:
 
     @pytest.mark.anyio
     async def test_connect(self, redis_client: RedisClient):
-        """Test Redis connection."""
+        """Test Redis connection uses a bounded pool with timeouts."""
+        from app.core.config import settings
+
         with patch("app.clients.redis.aioredis") as mock_aioredis:
             mock_client = MagicMock()
-            mock_aioredis.from_url.return_value = mock_client
+            mock_aioredis.Redis.from_pool.return_value = mock_client
 
             await redis_client.connect()
 
-            assert redis_client.client is not None
-            mock_aioredis.from_url.assert_called_once()
+            assert redis_client.client is mock_client
+            pool_kwargs = mock_aioredis.BlockingConnectionPool.from_url.call_args.kwargs
+            assert pool_kwargs["max_connections"] == settings.REDIS_MAX_CONNECTIONS
+            assert pool_kwargs["socket_timeout"] == settings.REDIS_SOCKET_TIMEOUT
+            # Subscribers get their own client without a read timeout
+            assert "socket_timeout" not in mock_aioredis.Redis.from_url.call_args.kwargs
 
     @pytest.mark.anyio
     async def test_close(self, redis_client: RedisClient, mock_aioredis: MagicMock):
@@ -93,6 +112,15 @@ class TestRedisClient:
 
         mock_aioredis.set.assert_called_once_with("test_key", "test_value", ex=60)
 
+    @pytest.mark.anyio
+    async def test_set_if_missing(self, redis_client: RedisClient, mock_aioredis: MagicMock):
+        """Test setting a value only if the key does not exist."""
+        redis_client.client = mock_aioredis
+
+        await redis_client.set("test_key", "test_value", ttl=60, nx=True)
+
+        mock_aioredis.set.assert_called_once_with("test_key", "test_value", ex=60, nx=True)
+
     @pytest.mark.anyio
     async def test_set_not_connected(self, redis_client: RedisClient):
         """Test setting when not connected raises error."""
@@ -166,6 +194,92 @@ class TestRedisClient:
 
         assert result is False
 
+    @pytest.mark.anyio
+    async def test_mget_and_mset(self, redis_client: RedisClient, mock_aioredis: MagicMock):
+        """Test batched reads and writes take one call each."""
+        redis_client.client = mock_aioredis
+        mock_aioredis.mget = AsyncMock(return_value=["1", None])
+        mock_aioredis.mset = AsyncMock()
+
+        assert await redis_client.mget(["a", "b"]) == ["1", None]
+        await redis_client.mset({"a": "1", "b": "2"})
+
+        mock_aioredis.mget.assert_awaited_once_with(["a", "b"])
+        mock_aioredis.mset.assert_awaited_once_with({"a": "1", "b": "2"})
+
+    @pytest.mark.anyio
+    async def test_pipeline_executes_queued_commands(
+        self, redis_client: RedisClient, mock_aioredis: MagicMock
+    ):
+        """Test commands queued in the block are sent when it exits."""
+        pipe = MagicMock()
+        pipe.command_stack = []
+        pipe.set = MagicMock(side_effect=lambda *args, **kwargs: pipe.command_stack.append(args))
+        pipe.execute = AsyncMock()
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=None)
+        mock_aioredis.pipeline = MagicMock(return_value=pipe)
+        redis_client.client = mock_aioredis
+
+        await redis_client.mset({"a": "1", "b": "2"}, ttl=60)
+
+        mock_aioredis.pipeline.assert_called_once_with(transaction=True)
+        assert pipe.set.call_count == 2
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_run_script_uses_evalsha(
+        self, redis_client: RedisClient, mock_aioredis: MagicMock
+    ):
+        """Test scripts run by SHA and are sent in full only when Redis lacks them."""
+        from redis.exceptions import NoScriptError
+
+        from app.clients.redis import LuaScript
+
+        script = LuaScript("return ARGV[1]")
+        redis_client.client = mock_aioredis
+        mock_aioredis.evalsha = AsyncMock(return_value="x")
+        mock_aioredis.eval = AsyncMock(return_value="y")
+
+        assert await redis_client.run_script(script, keys=["k"], args=["x"]) == "x"
+        mock_aioredis.evalsha.assert_awaited_once_with(script.sha, 1, "k", "x")
+        mock_aioredis.eval.assert_not_awaited()
+
+        mock_aioredis.evalsha = AsyncMock(side_effect=NoScriptError("NOSCRIPT"))
+        assert await redis_client.run_script(script, keys=["k"], args=["y"]) == "y"
+        mock_aioredis.eval.assert_awaited_once_with(script.source, 1, "k", "y")
+
+    @pytest.mark.anyio
+    async def test_client_side_cache(self, mock_aioredis: MagicMock):
+        """Test tracked keys are served locally until Redis invalidates them."""
+        redis_client = RedisClient(url="redis://localhost:6379", cache_prefixes=["hot:"])
+        redis_client.client = mock_aioredis
+        redis_client._tracking = True
+        mock_aioredis.mget = AsyncMock(return_value=["v1"])
+
+        assert await redis_client.get("hot:a") == "v1"
+        assert await redis_client.get("hot:a") == "v1"
+        mock_aioredis.mget.assert_awaited_once_with(["hot:a"])
+        assert await redis_client.get("other") == "value"
+
+        redis_client._invalidate_local(["hot:a"])
+        mock_aioredis.mget = AsyncMock(return_value=["v2"])
+        assert await redis_client.get("hot:a") == "v2"
+
+    @pytest.mark.anyio
+    async def test_client_side_cache_reads_own_writes(self, mock_aioredis: MagicMock):
+        """Test a write through the client drops the local copy right away."""
+        redis_client = RedisClient(url="redis://localhost:6379", cache_prefixes=["hot:"])
+        redis_client.client = mock_aioredis
+        redis_client._tracking = True
+        mock_aioredis.mget = AsyncMock(return_value=["v1"])
+        assert await redis_client.get("hot:a") == "v1"
+
+        await redis_client.set("hot:a", "v2")
+        mock_aioredis.mget = AsyncMock(return_value=["v2"])
+
+        assert await redis_client.get("hot:a") == "v2"
+
     def test_raw_property(self, redis_client: RedisClient, mock_aioredis: MagicMock):
         """Test accessing raw client."""
         redis_client.client = mock_aioredis
@@ -181,3 +295,60 @@ class TestRedisClient:
         with pytest.raises(RuntimeError, match="not connected"):
             _ = redis_client.raw
 {%- endif %}
+{%- if test_webhook_client %}
+
+
+class TestWebhookClient:
+    """Tests for the shared webhook HTTP client."""
+
+    @pytest.mark.anyio
+    async def test_post_limits_concurrency_per_host(self):
+        """Test requests to one host wait for a free per-host slot."""
+        client = WebhookClient(max_connections=10, max_connections_per_host=1)
+        peak = 0
+
+        async def fake_post(url, **kwargs):
+            nonlocal peak
+            peak = max(peak, client.in_flight)
+            await asyncio.sleep(0.01)
+            return MagicMock(status_code=200)
+
+        client._client = MagicMock(post=AsyncMock(side_effect=fake_post))
+
+        await asyncio.gather(
+            client.post("https://a.example/hook", content="{}", headers={}),
+            client.post("https://a.example/hook", content="{}", headers={}),
+        )
+
+        assert peak == 1
+        assert client.in_flight == 0
+
+    @pytest.mark.anyio
+    async def test_idle_hosts_are_forgotten(self):
+        """Test per-host slots are dropped once a host has no requests."""
+        client = WebhookClient()
+        client._client = MagicMock(post=AsyncMock(return_value=MagicMock(status_code=200)))
+
+        await asyncio.gather(
+            *(
+                client.post(f"https://{host}.example/hook", content="{}", headers={})
+                for host in ("a", "b", "c", "a")
+            )
+        )
+
+        assert client._host_slots == {}
+        assert client._host_users == {}
+
+    @pytest.mark.anyio
+    async def test_close_resets_client(self):
+        """Test close releases the pooled client."""
+        client = WebhookClient()
+        inner = MagicMock(aclose=AsyncMock())
+        client._client = inner
+
+        await client.close()
+
+        inner.aclose.assert_awaited_once()
+        assert client._client is None
+{%- endif %}
+{%- endif %}
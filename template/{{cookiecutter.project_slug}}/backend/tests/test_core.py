@@ -1,14 +1,21 @@
 """Tests for core modules."""
 
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
 from app.core.config import settings
 from app.core.exceptions import (
     AlreadyExistsError,
     AppException,
     AuthenticationError,
     AuthorizationError,
+    BadRequestError,
     NotFoundError,
     ValidationError,
 )
+from app.core.pagination import decode_cursor, encode_cursor, next_page_cursor
 
 
 class TestSettings:
@@ -87,6 +94,246 @@ class TestCacheSetup:
         assert setup_cache is not None
         assert callable(setup_cache)
 {%- endif %}
+{%- if cookiecutter.enable_caching and cookiecutter.use_postgresql %}
+
+
+class TestServiceCache:
+    """Tests for the tagged service cache."""
+
+    class FakeRedis:
+        """In-memory stand-in for the RedisClient calls the cache makes."""
+
+        def __init__(self):
+            self.data: dict[str, str] = {}
+
+        async def mget(self, keys: list[str]) -> list[str | None]:
+            return [self.data.get(key) for key in keys]
+
+        async def set(self, key: str, value: str, ttl: int | None = None) -> None:
+            self.data[key] = value
+
+        async def mset(self, mapping: dict[str, str], ttl: int | None = None) -> None:
+            self.data.update(mapping)
+
+    @staticmethod
+    def make_cache(**kwargs):
+        """Build a cache backed by a fresh FakeRedis."""
+        from app.core.cache import ServiceCache
+
+        cache = ServiceCache(**{"ttl": 60, "stale_ttl": 60, "local_ttl": 0, **kwargs})
+        cache.setup(TestServiceCache.FakeRedis())
+        return cache
+
+    @staticmethod
+    def thing_model():
+        """A small read schema."""
+        from pydantic import BaseModel
+
+        class Thing(BaseModel):
+            id: int
+            name: str
+
+        return Thing
+
+    @staticmethod
+    def thing_adapter():
+        """Adapter for the read schema."""
+        from pydantic import TypeAdapter
+
+        return TypeAdapter(TestServiceCache.thing_model())
+
+    @pytest.mark.anyio
+    async def test_miss_then_hit(self):
+        """Test a loaded value is served from Redis on the next call."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        cache, adapter = self.make_cache(), self.thing_adapter()
+        load = AsyncMock(return_value=SimpleNamespace(id=1, name="one"))
+
+        first = await cache.get_or_load("k", ("thing:1",), adapter, load, load)
+        second = await cache.get_or_load("k", ("thing:1",), adapter, load, load)
+
+        assert first.name == second.name == "one"
+        load.assert_awaited_once()
+        assert cache.stats.misses == 1
+        assert cache.stats.hits == 1
+
+    @pytest.mark.anyio
+    async def test_invalidation_is_scoped_to_tags(self):
+        """Test invalidating a tag reloads only the entries carrying it."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        cache, adapter = self.make_cache(local_ttl=60), self.thing_adapter()
+        load_one = AsyncMock(return_value=SimpleNamespace(id=1, name="one"))
+        load_two = AsyncMock(return_value=SimpleNamespace(id=2, name="two"))
+        await cache.get_or_load("one", ("thing:1",), adapter, load_one, load_one)
+        await cache.get_or_load("two", ("thing:2",), adapter, load_two, load_two)
+
+        await cache.invalidate("thing:1")
+        await cache.get_or_load("one", ("thing:1",), adapter, load_one, load_one)
+        await cache.get_or_load("two", ("thing:2",), adapter, load_two, load_two)
+
+        assert load_one.await_count == 2
+        assert load_two.await_count == 1
+        assert cache.stats.local_hits == 1
+
+    @pytest.mark.anyio
+    async def test_concurrent_misses_share_one_load(self):
+        """Test simultaneous misses for one key wait for a single load."""
+        import asyncio
+        from types import SimpleNamespace
+
+        cache, adapter = self.make_cache(), self.thing_adapter()
+        release = asyncio.Event()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return SimpleNamespace(id=1, name="one")
+
+        waiting = [
+            asyncio.ensure_future(cache.get_or_load("k", (), adapter, load, load)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiting)
+
+        assert calls == 1
+        assert {result.name for result in results} == {"one"}
+        assert cache.stats.coalesced == 2
+
+    @pytest.mark.anyio
+    async def test_stale_entry_served_while_reloading(self):
+        """Test a stale entry is returned at once and reloaded in the background."""
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        cache, adapter = self.make_cache(ttl=0), self.thing_adapter()
+        load = AsyncMock(return_value=SimpleNamespace(id=1, name="old"))
+        reload = AsyncMock(return_value=SimpleNamespace(id=1, name="new"))
+        await cache.get_or_load("k", (), adapter, load, reload)
+
+        stale = await cache.get_or_load("k", (), adapter, load, reload)
+        await asyncio.gather(*cache._tasks)
+        refreshed = await cache.get_or_load("k", (), adapter, load, reload)
+
+        assert stale.name == "old"
+        assert refreshed.name == "new"
+        load.assert_awaited_once()
+        assert cache.stats.stale_hits == 2
+
+    @pytest.mark.anyio
+    async def test_stale_hits_start_one_reload(self):
+        """Test stale hits arriving together start a single background reload."""
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        cache, adapter = self.make_cache(ttl=0), self.thing_adapter()
+        load = AsyncMock(return_value=SimpleNamespace(id=1, name="old"))
+        reload = AsyncMock(return_value=SimpleNamespace(id=1, name="new"))
+        await cache.get_or_load("k", (), adapter, load, reload)
+
+        await asyncio.gather(*(cache.get_or_load("k", (), adapter, load, reload) for _ in range(3)))
+        await asyncio.gather(*cache._tasks)
+
+        reload.assert_awaited_once()
+        assert cache._inflight == {}
+
+    @pytest.mark.anyio
+    async def test_cached_decorator_keys_by_arguments(self, monkeypatch):
+        """Test @cached keys entries by argument and fills tags from them."""
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        from app.core import cache as cache_module
+        from app.core.cache import cached
+
+        cache = self.make_cache()
+        monkeypatch.setattr(cache_module, "service_cache", cache)
+        loads: list[int] = []
+
+        class ThingService:
+            def __init__(self, db=None):
+                self.db = db
+
+            @cached(model=self.thing_model(), tags=["thing:{thing_id}"])
+            async def get_thing(self, thing_id: int):
+                loads.append(thing_id)
+                return SimpleNamespace(id=thing_id, name=f"thing {thing_id}")
+
+        service = ThingService(MagicMock())
+        assert (await service.get_thing(1)).name == "thing 1"
+        assert (await service.get_thing(thing_id=1)).name == "thing 1"
+        assert (await service.get_thing(2)).name == "thing 2"
+        await cache.invalidate("thing:1")
+        await service.get_thing(1)
+
+        assert loads == [1, 2, 1]
+
+    @pytest.mark.anyio
+    async def test_replica_misses_load_from_primary(self, monkeypatch):
+        """Test a service reading from a replica fills the cache from the primary."""
+        from contextlib import asynccontextmanager
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        from app.core import cache as cache_module
+        from app.core.cache import cached
+
+        cache = self.make_cache()
+        monkeypatch.setattr(cache_module, "service_cache", cache)
+        replica, primary = MagicMock(), MagicMock()
+        monkeypatch.setattr(cache_module.read_replicas, "is_replica", lambda db: db is replica)
+
+        @asynccontextmanager
+        async def primary_context():
+            yield primary
+
+        monkeypatch.setattr(cache_module, "get_db_context", primary_context)
+        sessions = []
+
+        class ThingService:
+            def __init__(self, db):
+                self.db = db
+
+            @cached(model=self.thing_model())
+            async def get_thing(self, thing_id: int):
+                sessions.append(self.db)
+                return SimpleNamespace(id=thing_id, name="thing")
+
+        await ThingService(replica).get_thing(1)
+        await ThingService(primary).get_thing(2)
+
+        assert sessions == [primary, primary]
+{%- endif %}
+
+
+class TestPagination:
+    """Tests for keyset pagination cursors."""
+
+    def test_cursor_round_trip(self):
+        """Test a cursor decodes back to the typed sort key."""
+        created_at, row_id = datetime.now(UTC), uuid4()
+        cursor = encode_cursor(created_at, row_id)
+        assert decode_cursor(cursor, datetime, type(row_id)) == (created_at, row_id)
+
+    def test_invalid_cursor_raises_bad_request(self):
+        """Test malformed cursors are rejected with 400."""
+        with pytest.raises(BadRequestError):
+            decode_cursor("not-a-cursor", str, str)
+
+    def test_next_page_cursor(self):
+        """Test the extra row signals another page."""
+        page, cursor = next_page_cursor([1, 2, 3], 2, lambda n: (n,))
+        assert page == [1, 2]
+        assert decode_cursor(cursor, int) == (2,)
+        assert next_page_cursor([1, 2], 2, lambda n: (n,)) == ([1, 2], None)
 
 
 class TestMiddleware:
@@ -98,20 +345,558 @@ class TestMiddleware:
 
         assert RequestIDMiddleware is not None
 
+    @staticmethod
+    async def call(middleware, method: str = "GET", path: str = "/api/v1/items", headers=None):
+        """Run one request through ``middleware`` wrapped around a streaming endpoint."""
+        from httpx import ASGITransport, AsyncClient
+        from starlette.applications import Starlette
+        from starlette.middleware import Middleware
+        from starlette.responses import StreamingResponse
+        from starlette.routing import Route
+
+        async def endpoint(request):
+            async def body():
+                yield getattr(request.state, "request_id", "").encode()
+                yield b"!"
+
+            return StreamingResponse(body())
+
+        app = Starlette(
+            routes=[Route(path, endpoint, methods=["GET", "POST"])],
+            middleware=middleware,
+        )
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            return await client.request(method, path, headers=headers)
+
+    @pytest.mark.anyio
+    async def test_request_id_is_echoed_or_generated(self):
+        """Test the request ID is kept from the header or generated, and exposed on state."""
+        from starlette.middleware import Middleware
+
+        from app.core.middleware import RequestIDMiddleware
+
+        response = await self.call([Middleware(RequestIDMiddleware)], headers={"X-Request-ID": "abc"})
+        assert response.headers["X-Request-ID"] == "abc"
+        assert response.text == "abc!"
+
+        response = await self.call([Middleware(RequestIDMiddleware)])
+        assert len(response.headers["X-Request-ID"]) == 36
+        assert response.text == response.headers["X-Request-ID"] + "!"
+
+    @pytest.mark.anyio
+    async def test_security_headers(self):
+        """Test security headers are added except on excluded paths."""
+        from starlette.middleware import Middleware
+
+        from app.core.middleware import SecurityHeadersMiddleware
+
+        middleware = [Middleware(SecurityHeadersMiddleware, csp_directives={"default-src": "'none'"})]
+        response = await self.call(middleware)
+        assert response.headers["Content-Security-Policy"] == "default-src 'none'"
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+        response = await self.call(middleware, path="/docs")
+        assert "Content-Security-Policy" not in response.headers
+
+    @pytest.mark.anyio
+    async def test_version_deprecation_headers(self):
+        """Test deprecated versions get RFC 8594 headers."""
+        from starlette.middleware import Middleware
+
+        from app.api.versioning import VersionDeprecationMiddleware
+
+        middleware = [
+            Middleware(
+                VersionDeprecationMiddleware,
+                deprecated_versions={"v1": {"sunset": "2030-01-01", "link": "/docs/v2"}},
+            )
+        ]
+        response = await self.call(middleware)
+        assert response.headers["Deprecation"] == "true"
+        assert response.headers["Sunset"] == "Tue, 01 Jan 2030 00:00:00 GMT"
+        assert response.headers["Link"] == '</docs/v2>; rel="deprecation"'
+
+        response = await self.call(middleware, path="/api/v2/items")
+        assert "Deprecation" not in response.headers
+{%- if cookiecutter.use_postgresql %}
+
+    @pytest.mark.anyio
+    async def test_primary_pin_after_write(self):
+        """Test a write pins the client's following reads to the primary."""
+        from httpx import ASGITransport, AsyncClient
+        from starlette.applications import Starlette
+        from starlette.middleware import Middleware
+        from starlette.responses import PlainTextResponse
+        from starlette.routing import Route
+
+        from app.core.middleware import PrimaryPinMiddleware
+        from app.db.session import primary_pinned
+
+        async def endpoint(request):
+            return PlainTextResponse(str(primary_pinned.get()))
+
+        app = Starlette(
+            routes=[Route("/items", endpoint, methods=["GET", "POST"])],
+            middleware=[Middleware(PrimaryPinMiddleware, max_age=5)],
+        )
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/items")
+            assert response.text == "False"
+            assert "set-cookie" not in response.headers
+
+            response = await client.post("/items")
+            assert response.text == "True"
+            assert "Max-Age=5" in response.headers["set-cookie"]
+
+            # The client sends the cookie back
+            response = await client.get("/items")
+            assert response.text == "True"
+{%- endif %}
+{%- if cookiecutter.use_jwt %}
+
+    @pytest.mark.anyio
+    async def test_csrf(self):
+        """Test unsafe methods need a matching header and new clients get a cookie."""
+        from starlette.middleware import Middleware
+
+        from app.core.csrf import CSRFMiddleware
+
+        middleware = [Middleware(CSRFMiddleware)]
+        response = await self.call(middleware)
+        assert response.status_code == 200
+        token = response.cookies["csrf_token"]
+
+        response = await self.call(middleware, method="POST")
+        assert response.status_code == 403
+
+        response = await self.call(
+            middleware,
+            method="POST",
+            headers={"Cookie": f"csrf_token={token}", "X-CSRF-Token": token},
+        )
+        assert response.status_code == 200
+        assert "set-cookie" not in response.headers
+{%- endif %}
+
 
 {%- if cookiecutter.enable_rate_limiting %}
 
 
 class TestRateLimit:
     """Tests for rate limiting."""
+{%- if cookiecutter.rate_limit_storage_memory %}
+
+    def test_burst_then_reject(self):
+        """Test a bucket allows a full burst, then rejects until a token refills."""
+        from app.core.rate_limit import MemoryRateLimitStore
+
+        store = MemoryRateLimitStore()
+        results = [store.consume("k", limit=3, period=60) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert 19 < results[3].retry_after <= 20
+
+    def test_full_burst_is_not_refused_by_rounding(self):
+        """Test the last token of a burst is granted whatever the clock reads."""
+        from unittest.mock import patch
 
-    def test_limiter_exists(self):
-        """Test rate limiter is configured."""
-        from app.core.rate_limit import limiter
+        from app.core.rate_limit import MemoryRateLimitStore
 
-        assert limiter is not None
+        store = MemoryRateLimitStore()
+        with patch("app.core.rate_limit.time.monotonic", return_value=123456.789):
+            results = [store.consume("k", limit=7, period=60) for _ in range(8)]
+
+        assert [r.allowed for r in results] == [True] * 7 + [False]
+        assert [r.remaining for r in results[:7]] == [6, 5, 4, 3, 2, 1, 0]
+
+    def test_cost_and_forced_charge(self):
+        """Test costs weigh requests and forced charges can overdraw the bucket."""
+        from app.core.rate_limit import MemoryRateLimitStore
+
+        store = MemoryRateLimitStore()
+        assert store.consume("k", limit=10, period=60, cost=4).remaining == 6
+        assert not store.consume("k", limit=10, period=60, cost=7).allowed
+
+        overdrawn = store.consume("k", limit=10, period=60, cost=20, force=True)
+        assert not overdrawn.allowed
+        assert not store.consume("k", limit=10, period=60, cost=0).allowed
+
+    @pytest.mark.anyio
+    async def test_dependency_sets_headers_and_rejects(self):
+        """Test RateLimiter adds RateLimit headers and answers 429 when spent."""
+        from fastapi import Depends, FastAPI
+        from httpx import ASGITransport, AsyncClient
+
+        from app.api.exception_handlers import register_exception_handlers
+        from app.core.rate_limit import RateLimiter
+
+        app = FastAPI()
+        register_exception_handlers(app)
+
+        @app.get("/limited", dependencies=[Depends(RateLimiter(requests=1, period=60, scope="test"))])
+        async def limited() -> dict[str, str]:
+            return {}
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            first = await client.get("/limited")
+            second = await client.get("/limited")
+
+        assert first.status_code == 200
+        assert first.headers["RateLimit-Limit"] == "1"
+        assert first.headers["RateLimit-Remaining"] == "0"
+        assert second.status_code == 429
+        assert second.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+        assert int(second.headers["Retry-After"]) > 0
+{%- else %}
+
+    @pytest.mark.anyio
+    async def test_consume_parses_script_reply(self):
+        """Test the Lua script reply is turned into a result."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from app.core.rate_limit import consume
+
+        redis = MagicMock()
+        redis.run_script = AsyncMock(return_value=[0, 0, "59.5", "19.5"])
+
+        result = await consume(redis, "k", limit=3, period=60)
+
+        assert not result.allowed
+        assert result.retry_after == 19.5
+        assert result.headers()["Retry-After"] == "20"
+        assert redis.run_script.call_args.kwargs == {"keys": ["k"], "args": (3, 60, 1, 0)}
+
+    @pytest.mark.anyio
+    async def test_consume_fails_open(self):
+        """Test requests are allowed while Redis is unreachable."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from app.core.rate_limit import consume
+
+        redis = MagicMock()
+        redis.run_script = AsyncMock(side_effect=ConnectionError("down"))
+
+        assert (await consume(redis, "k", limit=3, period=60)).allowed
 {%- endif %}
 
+    def test_key_falls_back_to_ip(self):
+        """Test anonymous clients are keyed by IP address."""
+        from unittest.mock import MagicMock
+
+        from app.core.rate_limit import rate_limit_key
+
+        connection = MagicMock(headers={}, query_params={})
+        connection.client.host = "203.0.113.7"
+
+        assert rate_limit_key(connection).endswith(":api:ip:203.0.113.7")
+{%- if cookiecutter.use_jwt %}
+
+    def test_key_uses_jwt_subject(self):
+        """Test authenticated clients are keyed by user ID, not IP address."""
+        from unittest.mock import MagicMock
+
+        from app.core.rate_limit import rate_limit_key
+        from app.core.security import create_access_token
+
+        user_id = str(uuid4())
+        token = create_access_token(subject=user_id)
+        connection = MagicMock(headers={"Authorization": f"Bearer {token}"}, query_params={})
+
+        assert rate_limit_key(connection, "login").endswith(f":login:user:{user_id}")
+{%- endif %}
+{%- endif %}
+
+
+{%- if cookiecutter.use_jwt and (cookiecutter.use_postgresql or cookiecutter.use_sqlite) %}
+
+
+class TestUserCache:
+    """Tests for the authenticated user cache."""
+
+    @staticmethod
+    def make_user():
+        """Build an unsaved user."""
+        from app.db.models.user import User
+
+        return User(
+{%- if cookiecutter.use_postgresql %}
+            id=uuid4(),
+{%- else %}
+            id=str(uuid4()),
+{%- endif %}
+            email="cached@example.com",
+            hashed_password="secret-hash",
+            full_name="Cached",
+            is_active=True,
+            is_superuser=False,
+            role="user",
+            created_at=datetime.now(UTC),
+            updated_at=None,
+        )
+
+    @pytest.mark.anyio
+    async def test_hit_returns_copy_without_password(self):
+        """Test cached users are fresh instances carrying only the cached fields."""
+        from app.core.user_cache import UserCache
+
+        cache = UserCache(local_ttl=60, maxsize=10)
+        user = self.make_user()
+        {% if not cookiecutter.use_sqlite %}await {% endif %}cache.set(user, cache.generation)
+
+        cached = {% if not cookiecutter.use_sqlite %}await {% endif %}cache.get(str(user.id))
+
+        assert cached is not None and cached is not user
+        assert cached.id == user.id
+        assert cached.email == user.email
+        assert cached.hashed_password is None
+
+    @pytest.mark.anyio
+    async def test_invalidation_discards_racing_load(self):
+        """Test a load that started before an invalidation is not cached."""
+        from app.core.user_cache import UserCache
+
+        cache = UserCache(local_ttl=60, maxsize=10)
+        user = self.make_user()
+        generation = cache.generation
+        {% if not cookiecutter.use_sqlite %}await {% endif %}cache.invalidate(user.id)
+        {% if not cookiecutter.use_sqlite %}await {% endif %}cache.set(user, generation)
+
+        assert {% if not cookiecutter.use_sqlite %}await {% endif %}cache.get(user.id) is None
+
+    @pytest.mark.anyio
+    async def test_expiry_and_eviction(self):
+        """Test entries expire after the local TTL and the LRU is bounded."""
+        from app.core.user_cache import UserCache
+
+        expired = UserCache(local_ttl=0, maxsize=10)
+        user = self.make_user()
+        {% if not cookiecutter.use_sqlite %}await {% endif %}expired.set(user, expired.generation)
+        assert {% if not cookiecutter.use_sqlite %}await {% endif %}expired.get(user.id) is None
+
+        bounded = UserCache(local_ttl=60, maxsize=1)
+        first, second = self.make_user(), self.make_user()
+        {% if not cookiecutter.use_sqlite %}await {% endif %}bounded.set(first, bounded.generation)
+        {% if not cookiecutter.use_sqlite %}await {% endif %}bounded.set(second, bounded.generation)
+        assert {% if not cookiecutter.use_sqlite %}await {% endif %}bounded.get(first.id) is None
+        assert {% if not cookiecutter.use_sqlite %}await {% endif %}bounded.get(second.id) is not None
+{%- if cookiecutter.enable_redis and cookiecutter.use_postgresql %}
+
+    @pytest.mark.anyio
+    async def test_local_miss_reads_redis(self):
+        """Test a user cached by another process is served from Redis."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from app.core.user_cache import UserCache
+
+        writer, reader = UserCache(local_ttl=60, maxsize=10), UserCache(local_ttl=60, maxsize=10)
+        redis = MagicMock()
+        redis.set = AsyncMock()
+        writer.setup(redis)
+        user = self.make_user()
+        await writer.set(user, writer.generation)
+        stored = redis.set.call_args.args[1]
+
+        redis.get = AsyncMock(return_value=stored)
+        reader.setup(redis)
+        cached = await reader.get(user.id)
+
+        assert cached is not None
+        assert cached.id == user.id
+        assert cached.created_at == user.created_at
+
+    @pytest.mark.anyio
+    async def test_invalidation_blocks_stale_redis_writes(self):
+        """Test a load that started before another process's change is not shared."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from app.core.user_cache import UserCache
+
+        store: dict[str, str] = {}
+
+        async def redis_set(key: str, value: str, ttl: int | None = None, nx: bool = False) -> None:
+            if not (nx and key in store):
+                store[key] = value
+
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=store.get)
+        redis.set = AsyncMock(side_effect=redis_set)
+        editor, loader, reader = (UserCache(local_ttl=60, maxsize=10) for _ in range(3))
+        for cache in (editor, loader, reader):
+            cache.setup(redis)
+        user = self.make_user()
+
+        generation = loader.generation
+        await editor.invalidate(user.id)
+        await loader.set(user, generation)
+
+        assert await reader.get(user.id) is None
+{%- endif %}
+
+    @pytest.mark.anyio
+    async def test_get_current_user_uses_cache(self):
+        """Test repeated requests authenticate without loading the user again."""
+        from unittest.mock import {% if cookiecutter.use_sqlite %}MagicMock{% else %}AsyncMock, MagicMock{% endif %}, patch
+
+        from app.api.deps import get_current_user
+        from app.core.security import create_access_token
+        from app.core.user_cache import UserCache
+
+        user = self.make_user()
+        token = create_access_token(subject=str(user.id))
+        user_service = MagicMock()
+        user_service.get_by_id = {% if cookiecutter.use_sqlite %}MagicMock{% else %}AsyncMock{% endif %}(return_value=user)
+
+        with patch("app.core.user_cache.user_cache", UserCache(local_ttl=60, maxsize=10)):
+            for _ in range(3):
+                current = {% if not cookiecutter.use_sqlite %}await {% endif %}get_current_user(token, user_service)
+                assert current.id == user.id
+
+        user_service.get_by_id.assert_called_once()
+{%- endif %}
+
+
+class TestBackground:
+    """Tests for the background work helpers."""
+
+    @pytest.mark.anyio
+    async def test_spawn_holds_task_until_done(self):
+        """Test a spawned task is referenced until it finishes."""
+        import asyncio
+
+        from app.core.background import spawn
+
+        tasks: set[asyncio.Task[None]] = set()
+        task = spawn(asyncio.sleep(0), tasks)
+        assert tasks == {task}
+        await task
+        assert not tasks
+{%- if cookiecutter.use_postgresql or cookiecutter.use_sqlite %}
+
+    @pytest.mark.anyio
+    async def test_on_commit_runs_once_with_collected_values(self):
+        """Test values are deduplicated and passed to one call after the commit."""
+        from unittest.mock import MagicMock
+
+{%- if cookiecutter.use_postgresql %}
+        from sqlalchemy.ext.asyncio import AsyncSession
+{%- else %}
+        from sqlalchemy.orm import Session
+{%- endif %}
+
+        from app.core.background import on_commit
+
+        db = {% if cookiecutter.use_postgresql %}AsyncSession(){% else %}Session(){% endif %}
+        callback = MagicMock()
+        on_commit(db, "test_pending", callback, "a", "b")
+        on_commit(db, "test_pending", callback, "b", "c")
+        callback.assert_not_called()
+
+        {% if cookiecutter.use_postgresql %}await {% endif %}db.commit()
+        {% if cookiecutter.use_postgresql %}await {% endif %}db.commit()
+
+        callback.assert_called_once_with(["a", "b", "c"])
+{%- endif %}
+
+{%- if cookiecutter.use_sqlite %}
+
+
+class TestSQLiteSession:
+    """Tests for SQLite connection setup."""
+
+    def test_connections_use_wal_and_tuned_pragmas(self):
+        """Test pragmas are applied to every new connection."""
+        from sqlalchemy import text
+
+        from app.db.session import engine
+
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -settings.SQLITE_CACHE_SIZE_KB
+
+    @pytest.mark.anyio
+    async def test_run_in_session_uses_worker_thread(self):
+        """Test blocking session work runs off the event loop thread."""
+        import threading
+
+        from app.db.session import run_in_session
+
+        def work(db, value: int) -> tuple[int, str]:
+            return value, threading.current_thread().name
+
+        value, thread_name = await run_in_session(work, 42)
+        assert value == 42
+        assert thread_name != threading.current_thread().name
+{%- endif %}
+
+{%- if cookiecutter.use_postgresql %}
+
+
+class TestReadReplicas:
+    """Tests for read replica routing."""
+
+    @staticmethod
+    def make_replica(checked_out: int):
+        from unittest.mock import MagicMock
+
+        replica = MagicMock()
+        replica.sync_engine.pool.checkedout.return_value = checked_out
+        return replica
+
+    def test_choose_prefers_fewest_connections(self):
+        """Test the least busy replica is chosen."""
+        from app.db.session import ReplicaPool
+
+        pool = ReplicaPool([], retry_after=30)
+        busy, idle = self.make_replica(5), self.make_replica(1)
+        pool.engines = [busy, idle]
+        assert pool.choose() is idle
+        assert ReplicaPool([], retry_after=30).choose() is None
+
+    def test_choose_rotates_between_tied_replicas(self):
+        """Test replicas with equal load are used in turn."""
+        from app.db.session import ReplicaPool
+
+        pool = ReplicaPool([], retry_after=30)
+        pool.engines = [self.make_replica(0), self.make_replica(0)]
+        assert {pool.choose() for _ in range(2)} == set(pool.engines)
+
+    @pytest.mark.anyio
+    async def test_unreachable_replica_falls_back_to_primary(self):
+        """Test a failed replica returns None and is skipped afterwards."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app.db.session import ReplicaPool
+
+        pool = ReplicaPool([], retry_after=30)
+        pool.engines = [self.make_replica(0)]
+        session = MagicMock(connection=AsyncMock(side_effect=OSError("refused")), close=AsyncMock())
+        with patch("app.db.session.async_session_maker", return_value=session):
+            assert await pool.connect() is None
+        session.close.assert_awaited_once()
+        assert pool.choose() is None
+
+    @pytest.mark.anyio
+    async def test_read_session_uses_primary_when_pinned(self):
+        """Test pinned requests get the primary session without touching replicas."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app.api.deps import get_read_db_session
+        from app.db.session import primary_pinned
+
+        primary = MagicMock()
+        token = primary_pinned.set(True)
+        try:
+            with patch("app.api.deps.read_replicas") as replicas:
+                replicas.connect = AsyncMock()
+                sessions = get_read_db_session(primary)
+                assert await anext(sessions) is primary
+                replicas.connect.assert_not_awaited()
+        finally:
+            primary_pinned.reset(token)
+{%- endif %}
 
 {%- if cookiecutter.enable_logfire %}
 
@@ -138,6 +138,102 @@ class TestBaseRepository:
         mock_session.delete.assert_not_called()
 
 
+
+{%- if cookiecutter.use_postgresql %}
+
+
+class TestFetchPage:
+    """Tests for paginated queries with an in-query total."""
+
+    @pytest.fixture
+    def query(self):
+        """A simple select over a lightweight table."""
+        from sqlalchemy import column, select, table
+
+        items = table("items", column("id"), column("user_id"))
+        return select(items).where(items.c.user_id == 1)
+
+    @pytest.fixture
+    def mock_session(self):
+        """Create a mock async session."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.scalar = AsyncMock()
+        return session
+
+    @pytest.mark.anyio
+    async def test_exact_total_uses_single_query(self, query, mock_session):
+        """Test the exact total comes from count(*) OVER () in the page query."""
+        from app.repositories.base import fetch_page
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = [("a", 7), ("b", 7)]
+        mock_session.execute.return_value = mock_result
+
+        items, total = await fetch_page(mock_session, query, skip=0, limit=2)
+
+        assert items == ["a", "b"]
+        assert total == 7
+        mock_session.execute.assert_called_once()
+        assert "count(*) OVER ()" in str(mock_session.execute.call_args.args[0])
+        mock_session.scalar.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_exact_total_past_last_page(self, query, mock_session):
+        """Test an empty page past the end falls back to COUNT."""
+        from app.repositories.base import fetch_page
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_session.execute.return_value = mock_result
+        mock_session.scalar.return_value = 7
+
+        items, total = await fetch_page(mock_session, query, skip=50, limit=10)
+
+        assert items == []
+        assert total == 7
+
+    @pytest.mark.anyio
+    async def test_estimated_total_uses_planner_estimate(self, query, mock_session):
+        """Test the estimated total reads the EXPLAIN row estimate."""
+        from sqlalchemy.dialects import postgresql
+
+        from app.repositories.base import fetch_page
+
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = ["a"]
+        mock_session.execute.return_value = mock_result
+        mock_plan = MagicMock()
+        mock_plan.scalar_one.return_value = '[{"Plan": {"Plan Rows": 1234}}]'
+        conn = MagicMock()
+        conn.dialect = postgresql.dialect()
+        conn.exec_driver_sql = AsyncMock(return_value=mock_plan)
+        mock_session.connection = AsyncMock(return_value=conn)
+
+        items, total = await fetch_page(mock_session, query, limit=1, total="estimated")
+
+        assert items == ["a"]
+        assert total == 1234
+        sql = conn.exec_driver_sql.call_args.args[0]
+        assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "items.user_id = 1" in sql
+
+    @pytest.mark.anyio
+    async def test_no_total(self, query, mock_session):
+        """Test total=None skips counting."""
+        from app.repositories.base import fetch_page
+
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = ["a"]
+        mock_session.execute.return_value = mock_result
+
+        items, total = await fetch_page(mock_session, query, total=None)
+
+        assert items == ["a"]
+        assert total is None
+{%- endif %}
+
+
 {%- if cookiecutter.use_jwt %}
 
 
@@ -2,12 +2,26 @@
 """Tests for security module."""
 
 from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import bcrypt
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
 
 from app.core.security import (
     create_access_token,
     create_refresh_token,
+    get_jwks,
+    get_jwt_keys,
     get_password_hash,
+    get_password_hash_async,
+    password_needs_rehash,
+    user_claims,
     verify_password,
+    verify_password_async,
     verify_token,
 )
 
@@ -22,7 +36,7 @@ class TestPasswordHashing:
 
         assert hashed != password
         assert len(hashed) > 0
-        assert hashed.startswith("$2")  # bcrypt prefix
+        assert hashed.startswith("$argon2id$")
 
     def test_verify_password_correct(self):
         """Test verifying correct password."""
@@ -39,6 +53,32 @@ class TestPasswordHashing:
 
         assert verify_password(wrong_password, hashed) is False
 
+    def test_verify_bcrypt_hash(self):
+        """Test hashes made with bcrypt still verify."""
+        hashed = bcrypt.hashpw(b"mysecretpassword", bcrypt.gensalt(rounds=4)).decode()
+
+        assert verify_password("mysecretpassword", hashed) is True
+        assert verify_password("wrongpassword", hashed) is False
+
+    def test_needs_rehash(self):
+        """Test hashes are flagged when the algorithm or cost differs from the settings."""
+        bcrypt_hash = bcrypt.hashpw(b"mysecretpassword", bcrypt.gensalt(rounds=4)).decode()
+
+        assert password_needs_rehash(get_password_hash("mysecretpassword")) is False
+        assert password_needs_rehash(bcrypt_hash) is True
+        with patch("app.core.security.settings.PASSWORD_HASH_ALGORITHM", "bcrypt"):
+            with patch("app.core.security.settings.BCRYPT_ROUNDS", 4):
+                assert password_needs_rehash(bcrypt_hash) is False
+            assert password_needs_rehash(bcrypt_hash) is True
+
+    @pytest.mark.anyio
+    async def test_async_hash_and_verify(self):
+        """Test the thread pool variants round-trip."""
+        hashed = await get_password_hash_async("mysecretpassword")
+
+        assert await verify_password_async("mysecretpassword", hashed) is True
+        assert await verify_password_async("wrongpassword", hashed) is False
+
 
 class TestAccessToken:
     """Tests for access token functions."""
@@ -121,4 +161,88 @@ class TestRefreshToken:
         assert payload is not None
         assert payload["sub"] == subject
         assert payload["type"] == "refresh"
+
+
+class TestAsymmetricTokens:
+    """Tests for ES256/EdDSA signing, key rotation and the claims dependency."""
+
+    @pytest.fixture(autouse=True)
+    def reset_keys(self):
+        """Reload keys from the patched settings in each test."""
+        get_jwt_keys.cache_clear()
+        yield
+        get_jwt_keys.cache_clear()
+
+    @staticmethod
+    def pem(key) -> str:
+        """Serialize a private key as PKCS#8 PEM."""
+        return key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+
+    @staticmethod
+    def public_pem(key) -> str:
+        """Serialize the public half of a private key as PEM."""
+        return (
+            key.public_key()
+            .public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            .decode()
+        )
+
+    @pytest.mark.parametrize(
+        ("algorithm", "generate"),
+        [
+            ("ES256", lambda: ec.generate_private_key(ec.SECP256R1())),
+            ("EdDSA", ed25519.Ed25519PrivateKey.generate),
+        ],
+    )
+    def test_rotation_keeps_old_tokens_valid(self, algorithm, generate):
+        """Test tokens from a retired key verify while it is listed in JWT_PUBLIC_KEYS."""
+        old_key, new_key = generate(), generate()
+        with (
+            patch("app.core.security.settings.ALGORITHM", algorithm),
+            patch("app.core.security.settings.JWT_PRIVATE_KEY", self.pem(old_key)),
+        ):
+            old_token = create_access_token("user123")
+            old_kid = get_jwks()["keys"][0]["kid"]
+        get_jwt_keys.cache_clear()
+
+        with (
+            patch("app.core.security.settings.ALGORITHM", algorithm),
+            patch("app.core.security.settings.JWT_PRIVATE_KEY", self.pem(new_key)),
+        ):
+            with patch("app.core.security.settings.JWT_PUBLIC_KEYS", [self.public_pem(old_key)]):
+                new_token = create_access_token("user123")
+                keys = get_jwks()["keys"]
+                assert verify_token(old_token)["sub"] == "user123"
+                assert verify_token(new_token)["sub"] == "user123"
+                assert [key["kid"] for key in keys][1] == old_kid
+                assert all("d" not in key for key in keys)  # no private material
+            get_jwt_keys.cache_clear()
+
+            assert verify_token(old_token) is None
+            assert jwt.get_unverified_header(new_token)["alg"] == algorithm
+
+    def test_claims_dependency(self):
+        """Test endpoints can authorize from token claims without a user lookup."""
+        from app.api.deps import get_token_claims
+        from app.core.exceptions import AuthenticationError
+        from app.schemas.user import UserRole
+
+        user = SimpleNamespace(role="admin", is_active=True, is_superuser=False)
+        claims = get_token_claims(create_access_token("user123", claims=user_claims(user)))
+        assert claims.sub == "user123"
+        assert claims.has_role(UserRole.USER)
+
+        with pytest.raises(AuthenticationError):
+            get_token_claims(create_access_token("user123"))  # issued without claims
+
+        user.is_active = False
+        with pytest.raises(AuthenticationError):
+            get_token_claims(create_access_token("user123", claims=user_claims(user)))
 {%- endif %}
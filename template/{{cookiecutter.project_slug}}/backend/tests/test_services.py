@@ -1,6 +1,10 @@
 {%- if cookiecutter.use_jwt %}
 """Tests for service layer."""
-{%- if cookiecutter.use_postgresql or cookiecutter.use_mongodb %}
+{%- if cookiecutter.use_postgresql %}
+
+from collections.abc import Generator
+from unittest.mock import AsyncMock, MagicMock, patch
+{%- elif cookiecutter.use_mongodb %}
 
 from unittest.mock import AsyncMock, patch
 {%- elif cookiecutter.use_sqlite %}
@@ -24,7 +28,7 @@ class MockUser:
         id=None,
         email="test@example.com",
         full_name="Test User",
-        hashed_password="$2b$12$hashedpassword",
+        hashed_password="$argon2id$v=19$m=65536,t=3,p=4$TZyT/42602Ou51/A6GY6Vg$c/er5qpMn/sgMzMDXuE6JnJ6dCN0tEH7tUzjfEL4YXc",
         is_active=True,
         is_superuser=False,
     ):
@@ -51,6 +55,12 @@ class TestUserServicePostgresql:
         """Create mock database session."""
         return AsyncMock()
 
+    @pytest.fixture(autouse=True)
+    def mock_user_cache(self) -> Generator[MagicMock, None, None]:
+        """Patch the user cache, which hooks into real session commits."""
+        with patch("app.services.user.user_cache") as mock_cache:
+            yield mock_cache
+
     @pytest.fixture
     def user_service(self, mock_db: AsyncMock) -> UserService:
         """Create UserService instance with mock db."""
@@ -139,7 +149,7 @@ class TestUserServicePostgresql:
         """Test successful authentication."""
         with (
             patch("app.services.user.user_repo") as mock_repo,
-            patch("app.services.user.verify_password", return_value=True),
+            patch("app.services.user.verify_password_async", new_callable=AsyncMock, return_value=True),
         ):
             mock_repo.get_by_email = AsyncMock(return_value=mock_user)
 
@@ -147,12 +157,34 @@ class TestUserServicePostgresql:
 
             assert result == mock_user
 
+    @pytest.mark.anyio
+    async def test_authenticate_rehashes_outdated_hash(
+        self, user_service: UserService, mock_user_cache: MagicMock
+    ):
+        """Test a hash made with old settings is replaced after a successful login."""
+        user = MockUser(hashed_password="$2b$04$" + "a" * 53)
+        with (
+            patch("app.services.user.user_repo") as mock_repo,
+            patch("app.services.user.verify_password_async", new_callable=AsyncMock, return_value=True),
+            patch("app.services.user.password_needs_rehash", return_value=True),
+            patch("app.services.user.get_password_hash_async", new_callable=AsyncMock, return_value="new-hash"),
+        ):
+            mock_repo.get_by_email = AsyncMock(return_value=user)
+            mock_repo.update = AsyncMock(return_value=user)
+
+            await user_service.authenticate("test@example.com", "password123")
+
+            mock_repo.update.assert_awaited_once_with(
+                user_service.db, db_user=user, update_data={"hashed_password": "new-hash"}
+            )
+            mock_user_cache.invalidate_on_commit.assert_called_once_with(user_service.db, user.id)
+
     @pytest.mark.anyio
     async def test_authenticate_invalid_password(self, user_service: UserService, mock_user: MockUser):
         """Test authentication with wrong password."""
         with (
             patch("app.services.user.user_repo") as mock_repo,
-            patch("app.services.user.verify_password", return_value=False),
+            patch("app.services.user.verify_password_async", new_callable=AsyncMock, return_value=False),
         ):
             mock_repo.get_by_email = AsyncMock(return_value=mock_user)
 
@@ -168,13 +200,23 @@ class TestUserServicePostgresql:
             with pytest.raises(AuthenticationError):
                 await user_service.authenticate("unknown@example.com", "password")
 
+    @pytest.mark.anyio
+    async def test_authenticate_user_without_password(self, user_service: UserService):
+        """Test authentication with an OAuth-only user that has no password hash."""
+        oauth_user = MockUser(hashed_password=None)
+        with patch("app.services.user.user_repo") as mock_repo:
+            mock_repo.get_by_email = AsyncMock(return_value=oauth_user)
+
+            with pytest.raises(AuthenticationError):
+                await user_service.authenticate("test@example.com", "password")
+
     @pytest.mark.anyio
     async def test_authenticate_inactive_user(self, user_service: UserService):
         """Test authentication with inactive user."""
         inactive_user = MockUser(is_active=False)
         with (
             patch("app.services.user.user_repo") as mock_repo,
-            patch("app.services.user.verify_password", return_value=True),
+            patch("app.services.user.verify_password_async", new_callable=AsyncMock, return_value=True),
         ):
             mock_repo.get_by_email = AsyncMock(return_value=inactive_user)
 
@@ -182,7 +224,9 @@ class TestUserServicePostgresql:
                 await user_service.authenticate("test@example.com", "password")
 
     @pytest.mark.anyio
-    async def test_update_success(self, user_service: UserService, mock_user: MockUser):
+    async def test_update_success(
+        self, user_service: UserService, mock_user: MockUser, mock_user_cache: MagicMock
+    ):
         """Test updating user."""
         with patch("app.services.user.user_repo") as mock_repo:
             mock_repo.get_by_id = AsyncMock(return_value=mock_user)
@@ -192,6 +236,9 @@ class TestUserServicePostgresql:
             result = await user_service.update(mock_user.id, user_update)
 
             assert result == mock_user
+            mock_user_cache.invalidate_on_commit.assert_called_once_with(
+                user_service.db, mock_user.id
+            )
 
     @pytest.mark.anyio
     async def test_update_with_password(self, user_service: UserService, mock_user: MockUser):
@@ -226,6 +273,137 @@ class TestUserServicePostgresql:
 
             with pytest.raises(NotFoundError):
                 await user_service.delete(uuid4())
+{%- if cookiecutter.enable_session_management %}
+
+
+class TestSessionServicePostgresql:
+    """Tests for SessionService with PostgreSQL."""
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(("idle_minutes", "written"), [(1, False), (60, True)])
+    async def test_validate_coalesces_last_used(self, idle_minutes: int, written: bool):
+        """Test last_used_at is only written once the previous write is old enough."""
+        from datetime import UTC, datetime, timedelta
+
+        from app.services.session import SessionService
+
+        now = datetime.now(UTC)
+        session = MagicMock(
+            expires_at=now + timedelta(days=1),
+            last_used_at=now - timedelta(minutes=idle_minutes),
+        )
+        with patch("app.services.session.session_repo") as mock_repo:
+            mock_repo.get_by_refresh_token_hash = AsyncMock(return_value=session)
+            mock_repo.update_last_used = AsyncMock()
+
+            assert await SessionService(AsyncMock()).validate_refresh_token("token") is session
+            assert mock_repo.update_last_used.called is written
+{%- if cookiecutter.enable_redis %}
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("audit_log", [False, True])
+    async def test_redis_store_keeps_sql_as_audit_log(self, audit_log: bool):
+        """Test the Redis store serves sessions and SQL is only written for auditing."""
+        from app.core.security import create_refresh_token
+        from app.services.session import SessionService
+
+        user_id = uuid4()
+        store = AsyncMock()
+        store.rotate.return_value = (True, user_id)
+        with (
+            patch("app.services.session.session_repo") as mock_repo,
+            patch("app.services.session.settings.SESSION_AUDIT_LOG", audit_log),
+        ):
+            mock_repo.create = AsyncMock()
+            mock_repo.rotate = AsyncMock()
+            service = SessionService(AsyncMock(), store)
+
+            created = await service.create_session(user_id, create_refresh_token(user_id))
+            session, _ = await service.rotate_refresh_token(create_refresh_token(user_id))
+
+            assert store.create.await_args.args == (created,)
+            assert store.rotate.await_args.args[1] is session
+            assert session.user_id == user_id
+            mock_repo.get_by_refresh_token_hash.assert_not_called()
+            assert mock_repo.create.called is audit_log
+            assert mock_repo.rotate.called is audit_log
+
+    @pytest.mark.anyio
+    async def test_redis_store_reuse_revokes_sessions(self):
+        """Test a replayed token revokes the user's sessions in Redis and SQL."""
+        from app.core.security import create_refresh_token
+        from app.services.session import SessionService
+
+        user_id = uuid4()
+        db = AsyncMock()
+        store = AsyncMock()
+        store.rotate.return_value = (False, user_id)
+        store.delete_user_sessions.return_value = 2
+        with patch("app.services.session.session_repo") as mock_repo:
+            mock_repo.deactivate_all_user_sessions = AsyncMock()
+
+            with pytest.raises(AuthenticationError):
+                await SessionService(db, store).rotate_refresh_token(create_refresh_token(user_id))
+
+            store.delete_user_sessions.assert_awaited_once_with(user_id)
+            mock_repo.deactivate_all_user_sessions.assert_awaited_once_with(db, user_id)
+            db.commit.assert_awaited_once()
+
+    def test_stored_session_round_trip(self):
+        """Test stored sessions survive JSON serialization."""
+        from datetime import UTC, datetime
+
+        from app.core.session_store import StoredSession
+
+        session = StoredSession(
+            user_id=uuid4(),
+            refresh_token_hash="hash",
+            expires_at=datetime.now(UTC),
+            device_name="Chrome",
+        )
+
+        assert StoredSession.load(session.dump()) == session
+{%- endif %}
+{%- endif %}
+{%- if cookiecutter.enable_conversation_persistence %}
+
+
+class TestConversationServicePostgresql:
+    """Tests for ConversationService with PostgreSQL."""
+
+    @pytest.mark.anyio
+    async def test_recent_messages_require_ownership(self):
+        """Test another user's conversation is reported as missing."""
+        from app.services.conversation import ConversationService
+
+        owner_id = uuid4()
+        messages = [MagicMock(role="user", content="Hi")]
+        with patch("app.services.conversation.conversation_repo") as mock_repo:
+            mock_repo.get_conversation_by_id = AsyncMock(return_value=MagicMock(user_id=owner_id))
+            mock_repo.get_recent_messages_by_conversation = AsyncMock(return_value=messages)
+            service = ConversationService(AsyncMock())
+
+            assert await service.list_recent_messages(uuid4(), user_id=owner_id) == messages
+            with pytest.raises(NotFoundError):
+                await service.list_recent_messages(uuid4(), user_id=uuid4())
+            assert mock_repo.get_recent_messages_by_conversation.await_count == 1
+
+    @pytest.mark.anyio
+    async def test_reads_require_ownership(self):
+        """Test another user's conversation and its messages are reported as missing."""
+        from app.services.conversation import ConversationService
+
+        with patch("app.services.conversation.conversation_repo") as mock_repo:
+            mock_repo.get_conversation_by_id = AsyncMock(return_value=MagicMock(user_id=uuid4()))
+            mock_repo.get_messages_by_conversation = AsyncMock(return_value=([], 0))
+            service = ConversationService(AsyncMock())
+
+            with pytest.raises(NotFoundError):
+                await service.get_conversation_with_messages(uuid4(), user_id=uuid4())
+            with pytest.raises(NotFoundError):
+                await service.list_messages(uuid4(), user_id=uuid4())
+            mock_repo.get_messages_by_conversation.assert_not_awaited()
+{%- endif %}
 {%- endif %}
 
 
@@ -336,7 +514,7 @@ class TestUserServiceMongoDB:
         """Test successful authentication."""
         with (
             patch("app.services.user.user_repo") as mock_repo,
-            patch("app.services.user.verify_password", return_value=True),
+            patch("app.services.user.verify_password_async", new_callable=AsyncMock, return_value=True),
         ):
             mock_repo.get_by_email = AsyncMock(return_value=mock_user)
 
@@ -0,0 +1,283 @@
+{%- if cookiecutter.enable_webhooks and cookiecutter.use_postgresql %}
+"""Tests for queued webhook delivery: retries, circuit breaker, dead letters and the event index."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.core.webhook_index import WebhookIndex
+from app.db.models.webhook import Webhook, WebhookDelivery, WebhookDeliveryStatus
+from app.services.webhook import WebhookService, retry_delay
+
+
+def make_webhook(**kwargs) -> Webhook:
+    """Build an unsaved webhook."""
+    fields = {
+        "id": uuid4(),
+        "name": "Test",
+        "url": "https://example.com/hook",
+        "secret": "secret",
+        "events": ["item.created"],
+        "is_active": True,
+        "consecutive_failures": 0,
+        "circuit_open_until": None,
+    }
+    return Webhook(**{**fields, **kwargs})
+
+
+def make_delivery(webhook: Webhook, **kwargs) -> WebhookDelivery:
+    """Build an unsaved delivery that is due now."""
+    fields = {
+        "id": uuid4(),
+        "webhook_id": webhook.id,
+        "event_type": "item.created",
+        "payload": "{}",
+        "attempt_count": 0,
+        "success": False,
+        "status": WebhookDeliveryStatus.PENDING.value,
+        "next_attempt_at": datetime.now(UTC),
+        "created_at": datetime.now(UTC),
+    }
+    return WebhookDelivery(**{**fields, **kwargs})
+
+
+class TestRetryDelay:
+    """Tests for the backoff schedule."""
+
+    def test_delay_doubles_with_jitter(self):
+        """Test each delay lies in the upper half of its exponential step."""
+        base = settings.WEBHOOK_RETRY_BASE_DELAY
+        for attempt in (1, 2, 3):
+            step = base * 2 ** (attempt - 1)
+            assert step / 2 <= retry_delay(attempt) <= step
+
+    def test_delay_is_capped(self):
+        """Test late attempts never wait longer than the maximum delay."""
+        assert retry_delay(50) <= settings.WEBHOOK_RETRY_MAX_DELAY
+
+
+class TestProcessDelivery:
+    """Tests for WebhookService.process_delivery."""
+
+    @pytest.fixture
+    def service(self) -> WebhookService:
+        """Create WebhookService with a mock session."""
+        return WebhookService(AsyncMock())
+
+    @pytest.mark.anyio
+    async def test_success_marks_delivered_and_resets_circuit(self, service: WebhookService):
+        """Test a 2xx response finishes the delivery."""
+        webhook = make_webhook(consecutive_failures=3)
+        delivery = make_delivery(webhook)
+        with (
+            patch("app.services.webhook.webhook_repo") as mock_repo,
+            patch("app.services.webhook.webhook_client") as mock_client,
+        ):
+            mock_repo.get_delivery_for_update = AsyncMock(return_value=delivery)
+            mock_repo.get_by_id = AsyncMock(return_value=webhook)
+            mock_repo.reset_failures = AsyncMock()
+            mock_client.post = AsyncMock(return_value=MagicMock(status_code=200, text="ok"))
+
+            delay = await service.process_delivery(delivery.id)
+
+        assert delay is None
+        assert delivery.status == WebhookDeliveryStatus.DELIVERED.value
+        assert delivery.attempt_count == 1
+        mock_repo.reset_failures.assert_awaited_once_with(service.db, webhook.id)
+        headers = mock_client.post.call_args.kwargs["headers"]
+        assert headers["X-Webhook-Delivery"] == str(delivery.id)
+
+    @pytest.mark.anyio
+    async def test_failure_schedules_retry(self, service: WebhookService):
+        """Test a failed attempt is retried after a backoff delay."""
+        webhook = make_webhook()
+        delivery = make_delivery(webhook)
+        with (
+            patch("app.services.webhook.webhook_repo") as mock_repo,
+            patch("app.services.webhook.webhook_client") as mock_client,
+        ):
+            mock_repo.get_delivery_for_update = AsyncMock(return_value=delivery)
+            mock_repo.get_by_id = AsyncMock(return_value=webhook)
+            mock_repo.record_failure = AsyncMock(return_value=1)
+            mock_client.post = AsyncMock(return_value=MagicMock(status_code=503, text=""))
+
+            delay = await service.process_delivery(delivery.id)
+
+        assert delay is not None and delay > 0
+        assert delivery.status == WebhookDeliveryStatus.RETRYING.value
+        assert delivery.next_attempt_at > datetime.now(UTC)
+        mock_repo.record_failure.assert_awaited_once()
+        assert mock_repo.record_failure.call_args.args == (service.db, webhook.id)
+        assert (
+            mock_repo.record_failure.call_args.kwargs["threshold"]
+            == settings.WEBHOOK_CIRCUIT_FAILURE_THRESHOLD
+        )
+
+    @pytest.mark.anyio
+    async def test_claim_is_committed_before_sending(self, service: WebhookService):
+        """Test no row lock or transaction is held while the request is in flight."""
+        webhook = make_webhook()
+        delivery = make_delivery(webhook)
+
+        async def post(*args, **kwargs):
+            service.db.commit.assert_awaited_once()
+            assert delivery.next_attempt_at > datetime.now(UTC)
+            return MagicMock(status_code=200, text="ok")
+
+        with (
+            patch("app.services.webhook.webhook_repo") as mock_repo,
+            patch("app.services.webhook.webhook_client") as mock_client,
+        ):
+            mock_repo.get_delivery_for_update = AsyncMock(return_value=delivery)
+            mock_repo.get_by_id = AsyncMock(return_value=webhook)
+            mock_client.post = AsyncMock(side_effect=post)
+
+            await service.process_delivery(delivery.id)
+
+        mock_client.post.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_last_attempt_dead_letters(self, service: WebhookService):
+        """Test the delivery is dead-lettered once attempts run out."""
+        webhook = make_webhook()
+        delivery = make_delivery(
+            webhook,
+            attempt_count=settings.WEBHOOK_MAX_ATTEMPTS - 1,
+            status=WebhookDeliveryStatus.RETRYING.value,
+        )
+        with (
+            patch("app.services.webhook.webhook_repo") as mock_repo,
+            patch("app.services.webhook.webhook_client") as mock_client,
+        ):
+            mock_repo.get_delivery_for_update = AsyncMock(return_value=delivery)
+            mock_repo.get_by_id = AsyncMock(return_value=webhook)
+            mock_repo.record_failure = AsyncMock(return_value=1)
+            mock_client.post = AsyncMock(side_effect=ConnectionError("refused"))
+
+            delay = await service.process_delivery(delivery.id)
+
+        assert delay is None
+        assert delivery.status == WebhookDeliveryStatus.DEAD.value
+        assert delivery.next_attempt_at is None
+        assert delivery.error_message == "refused"
+
+    @pytest.mark.anyio
+    async def test_open_circuit_postpones_without_attempt(self, service: WebhookService):
+        """Test an open circuit defers the delivery without sending it."""
+        reopens_at = datetime.now(UTC) + timedelta(minutes=5)
+        webhook = make_webhook(consecutive_failures=10, circuit_open_until=reopens_at)
+        delivery = make_delivery(webhook)
+        with (
+            patch("app.services.webhook.webhook_repo") as mock_repo,
+            patch("app.services.webhook.webhook_client") as mock_client,
+        ):
+            mock_repo.get_delivery_for_update = AsyncMock(return_value=delivery)
+            mock_repo.get_by_id = AsyncMock(return_value=webhook)
+            mock_client.post = AsyncMock()
+
+            delay = await service.process_delivery(delivery.id)
+
+        mock_client.post.assert_not_called()
+        assert delay is not None and delay > 0
+        assert delivery.attempt_count == 0
+        assert delivery.next_attempt_at == reopens_at
+
+    @pytest.mark.anyio
+    async def test_finished_delivery_is_skipped(self, service: WebhookService):
+        """Test duplicate jobs for a finished delivery do nothing."""
+        webhook = make_webhook()
+        delivery = make_delivery(webhook, status=WebhookDeliveryStatus.DELIVERED.value)
+        with (
+            patch("app.services.webhook.webhook_repo") as mock_repo,
+            patch("app.services.webhook.webhook_client") as mock_client,
+        ):
+            mock_repo.get_delivery_for_update = AsyncMock(return_value=delivery)
+            mock_client.post = AsyncMock()
+
+            assert await service.process_delivery(delivery.id) is None
+
+        mock_client.post.assert_not_called()
+
+
+class TestDispatchEvent:
+    """Tests for WebhookService.dispatch_event."""
+
+    @pytest.mark.anyio
+    async def test_stores_deliveries_and_enqueues_on_commit(self):
+        """Test dispatching leaves the commit to the caller and sending to the queue."""
+        db = MagicMock()
+        db.flush = AsyncMock()
+        db.commit = AsyncMock()
+        webhook_ids = [uuid4(), uuid4()]
+        with (
+            patch("app.services.webhook.webhook_repo") as mock_repo,
+            patch("app.services.webhook.webhook_client") as mock_client,
+            patch("app.services.webhook.enqueue_on_commit") as enqueue_on_commit,
+        ):
+            mock_repo.get_ids_by_event = AsyncMock(return_value=webhook_ids)
+            mock_client.post = AsyncMock()
+
+            delivery_ids = await WebhookService(db).dispatch_event("item.created", {"id": 1})
+
+        deliveries = db.add_all.call_args.args[0]
+        assert [delivery.webhook_id for delivery in deliveries] == webhook_ids
+        db.commit.assert_not_awaited()
+        enqueue_on_commit.assert_called_once_with(
+            db, [str(delivery_id) for delivery_id in delivery_ids]
+        )
+        mock_client.post.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_enqueue_waits_for_commit(self):
+        """Test deliveries are enqueued together once the session commits."""
+        import asyncio
+
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        from app.services import webhook_queue
+
+        db = AsyncSession()
+        with patch.object(webhook_queue, "enqueue_deliveries", new_callable=AsyncMock) as enqueue:
+            webhook_queue.enqueue_on_commit(db, ["a"])
+            webhook_queue.enqueue_on_commit(db, ["b"])
+            await asyncio.sleep(0)
+            enqueue.assert_not_awaited()
+
+            await db.commit()
+            await asyncio.gather(*webhook_queue._tasks)
+
+        enqueue.assert_awaited_once_with(["a", "b"])
+
+
+class TestWebhookIndex:
+    """Tests for the in-process event subscription index."""
+
+    def test_miss_then_hit(self):
+        """Test stored IDs are served until the index is cleared."""
+        index = WebhookIndex(ttl=60)
+        webhook_ids = [uuid4()]
+        assert index.get("item.created") is None
+
+        index.set("item.created", webhook_ids, index.generation)
+        assert index.get("item.created") == webhook_ids
+
+        index.clear()
+        assert index.get("item.created") is None
+
+    def test_entries_expire(self):
+        """Test entries older than the TTL count as misses."""
+        index = WebhookIndex(ttl=0)
+        index.set("item.created", [uuid4()], index.generation)
+        assert index.get("item.created") is None
+
+    def test_stale_load_is_discarded(self):
+        """Test a load that raced with an invalidation is not stored."""
+        index = WebhookIndex(ttl=60)
+        generation = index.generation
+        index.clear()
+        index.set("item.created", [uuid4()], generation)
+        assert index.get("item.created") is None
+{%- endif %}
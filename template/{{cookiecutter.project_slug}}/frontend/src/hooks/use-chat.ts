@@ -6,6 +6,7 @@ import { useWebSocket } from "./use-websocket";
 import { useChatStore } from "@/stores";
 import type { ChatMessage, ToolCall, WSEvent, PendingApproval, Decision } from "@/types";
 import { WS_URL } from "@/lib/constants";
+import { decodeWSEvent, WS_PROTOCOLS } from "@/lib/ws-events";
 {%- if cookiecutter.enable_conversation_persistence and cookiecutter.use_database %}
 import { useConversationStore } from "@/stores";
 {%- endif %}
@@ -40,7 +41,7 @@ export function useChat() {
 
   const handleWebSocketMessage = useCallback(
     (event: MessageEvent) => {
-      const wsEvent: WSEvent = JSON.parse(event.data);
+      const wsEvent: WSEvent = decodeWSEvent(event.data);
 
       // Helper to create a new message
       const createNewMessage = (content: string): string => {
@@ -337,6 +338,7 @@ export function useChat() {
 
   const { isConnected, connect, disconnect, sendMessage } = useWebSocket({
     url: wsUrl,
+    protocols: WS_PROTOCOLS,
     onMessage: handleWebSocketMessage,
   });
 
@@ -6,6 +6,7 @@ import { useWebSocket } from "./use-websocket";
 import { useLocalChatStore } from "@/stores/local-chat-store";
 import type { ChatMessage, ToolCall, WSEvent, PendingApproval, Decision } from "@/types";
 import { WS_URL } from "@/lib/constants";
+import { decodeWSEvent, WS_PROTOCOLS } from "@/lib/ws-events";
 
 export function useLocalChat() {
   const {
@@ -29,7 +30,7 @@ export function useLocalChat() {
 
   const handleWebSocketMessage = useCallback(
     (event: MessageEvent) => {
-      const wsEvent: WSEvent = JSON.parse(event.data);
+      const wsEvent: WSEvent = decodeWSEvent(event.data);
 
       // Helper to create a new message for CrewAI events
       const createNewMessage = (content: string): string => {
@@ -302,6 +303,7 @@ export function useLocalChat() {
 
   const { isConnected, connect, disconnect, sendMessage } = useWebSocket({
     url: wsUrl,
+    protocols: WS_PROTOCOLS,
     onMessage: handleWebSocketMessage,
   });
 
@@ -4,6 +4,7 @@ import { useCallback, useEffect, useRef, useState } from "react";
 
 interface UseWebSocketOptions {
   url: string;
+  protocols?: string | string[];
   onMessage?: (event: MessageEvent) => void;
   onOpen?: () => void;
   onClose?: () => void;
@@ -15,6 +16,7 @@ interface UseWebSocketOptions {
 
 export function useWebSocket({
   url,
+  protocols,
   onMessage,
   onOpen,
   onClose,
@@ -45,7 +47,9 @@ export function useWebSocket({
   const connect = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) return;
 
-    const ws = new WebSocket(url);
+    const ws = new WebSocket(url, protocols);
+    // Binary frames (msgpack) arrive as ArrayBuffer rather than Blob
+    ws.binaryType = "arraybuffer";
     wsRef.current = ws;
 
     ws.onopen = () => {
@@ -73,7 +77,7 @@ export function useWebSocket({
     ws.onerror = (error) => {
       onErrorRef.current?.(error);
     };
-  }, [url, reconnect, reconnectInterval, maxReconnectAttempts]);
+  }, [url, protocols, reconnect, reconnectInterval, maxReconnectAttempts]);
 
   const disconnect = useCallback(() => {
     if (reconnectTimeoutRef.current) {
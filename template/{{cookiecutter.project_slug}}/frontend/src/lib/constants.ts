@@ -37,3 +37,6 @@ export const ROUTES = {
 
 // WebSocket URL (for chat - this needs to be direct to backend for WS)
 export const WS_URL = process.env.NEXT_PUBLIC_WS_URL || "ws://localhost:{{ cookiecutter.backend_port }}";
+
+// Agent WebSocket frame encoding: "json" (default) or "msgpack" (compact binary frames)
+export const WS_ENCODING = process.env.NEXT_PUBLIC_WS_ENCODING === "msgpack" ? "msgpack" : "json";
@@ -0,0 +1,22 @@
+{%- if cookiecutter.use_frontend %}
+import { describe, it, expect } from "vitest";
+import { encode } from "@msgpack/msgpack";
+import { decodeWSEvent } from "./ws-events";
+
+describe("decodeWSEvent", () => {
+  const event = { type: "text_delta", data: { content: "Hello" } };
+
+  it("should decode JSON text frames", () => {
+    expect(decodeWSEvent(JSON.stringify(event))).toEqual(event);
+  });
+
+  it("should decode msgpack binary frames", () => {
+    const bytes = encode(event);
+    const buffer = bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.byteLength);
+    expect(decodeWSEvent(buffer)).toEqual(event);
+  });
+});
+{%- else %}
+/* WebSocket event tests - frontend not configured */
+export {};
+{%- endif %}
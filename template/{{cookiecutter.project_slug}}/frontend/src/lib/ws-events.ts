@@ -0,0 +1,20 @@
+/**
+ * Agent WebSocket event decoding.
+ *
+ * The backend sends JSON text frames by default. When the client offers the
+ * "msgpack" subprotocol (NEXT_PUBLIC_WS_ENCODING=msgpack), it sends the same
+ * events as binary MessagePack frames instead.
+ */
+
+import { decode } from "@msgpack/msgpack";
+import type { WSEvent } from "@/types";
+import { WS_ENCODING } from "./constants";
+
+export const WS_PROTOCOLS = WS_ENCODING === "msgpack" ? ["msgpack"] : undefined;
+
+export function decodeWSEvent(data: string | ArrayBuffer): WSEvent {
+  if (typeof data === "string") {
+    return JSON.parse(data);
+  }
+  return decode(new Uint8Array(data)) as WSEvent;
+}
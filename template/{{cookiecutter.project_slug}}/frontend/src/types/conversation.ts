@@ -38,7 +38,8 @@ export interface ConversationToolCall {
 
 export interface ConversationListResponse {
   items: Conversation[];
-  total: number;
+  total?: number | null;
+  next_cursor?: string | null;
 }
 
 export interface ConversationWithMessages extends Conversation {